@@ -0,0 +1,40 @@
+-- Move vectors from the legacy per-(uid, folder) email_embeddings table to
+-- embedding_vectors, which holds one vector per emails.content_hash.
+--
+-- Run once after upgrading, once the engine has started and created
+-- embedding_vectors:
+--   psql "$DATABASE_URL" -f migrations/006_embedding_vectors.sql
+--
+-- The old table is renamed to email_embeddings_legacy, not dropped. Once
+-- semantic search has been checked, remove it with
+--   DROP TABLE email_embeddings_legacy;
+
+BEGIN;
+
+-- Fails if the table is already gone; nothing to migrate then
+LOCK TABLE email_embeddings IN ACCESS EXCLUSIVE MODE;
+
+INSERT INTO embedding_vectors (content_hash, embedding, model, created_at)
+SELECT DISTINCT ON (e.content_hash)
+    e.content_hash, emb.embedding, emb.model, emb.created_at
+FROM email_embeddings emb
+JOIN emails e ON e.uid = emb.email_uid AND e.folder = emb.email_folder
+WHERE e.content_hash IS NOT NULL
+ORDER BY e.content_hash, emb.created_at DESC
+ON CONFLICT (content_hash) DO NOTHING;
+
+ALTER TABLE email_embeddings RENAME TO email_embeddings_legacy;
+
+SELECT reconcile_mailbox_counters();
+
+COMMIT;
+
+-- Verify: legacy vectors of current mail that have no embedding_vectors row
+-- (expect 0)
+SELECT COUNT(*) AS missing
+FROM email_embeddings_legacy emb
+JOIN emails e ON e.uid = emb.email_uid AND e.folder = emb.email_folder
+WHERE e.content_hash IS NOT NULL
+  AND NOT EXISTS (
+      SELECT 1 FROM embedding_vectors v WHERE v.content_hash = e.content_hash
+  );
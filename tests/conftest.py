@@ -8,18 +8,19 @@ import re
 import time
 import logging
 import base64
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from email.header import Header
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union, Generator
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from workspace_secretary.models import Email, EmailAddress, EmailAttachment, EmailContent
 from workspace_secretary.config import ImapConfig, OAuth2Config, ServerConfig, CalendarConfig
+from workspace_secretary.db.metrics import QueryMetrics
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -210,3 +211,58 @@ def timed_operation(description: str) -> Generator[None, None, None]:
     finally:
         elapsed = time.time() - start_time
         logger.info(f"Completed: {description} in {elapsed:.2f} seconds")
+
+
+class FakeDatabase:
+    """Query-layer stand-in: ``connection()`` yields ``conn``, whose cursor is ``cursor``.
+
+    ``checkouts`` counts connections taken from the "pool".
+    """
+
+    _vector_type = "vector"
+
+    def __init__(self):
+        self.conn = MagicMock()
+        self.cursor = MagicMock()
+        self.conn.cursor.return_value.__enter__.return_value = self.cursor
+        self.checkouts = 0
+
+    @contextmanager
+    def connection(self):
+        self.checkouts += 1
+        yield self.conn
+
+
+class FakeAsyncDatabase:
+    """``FakeDatabase`` for the async query layer (``queries.aio``)."""
+
+    _vector_type = "halfvec"
+    hnsw_ef_search = 40
+
+    def __init__(self):
+        self.metrics = QueryMetrics()
+        self.conn = MagicMock()
+        self.cursor = MagicMock()
+        self.cursor.execute = AsyncMock()
+        self.cursor.fetchone = AsyncMock()
+        self.cursor.fetchall = AsyncMock(return_value=[])
+        self.conn.cursor.return_value.__aenter__ = AsyncMock(return_value=self.cursor)
+        self.conn.cursor.return_value.__aexit__ = AsyncMock(return_value=False)
+        self.conn.pipeline.return_value.__aenter__ = AsyncMock()
+        self.conn.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    @asynccontextmanager
+    async def connection(self):
+        yield self.conn
+
+
+@pytest.fixture
+def fake_db():
+    """A ``FakeDatabase`` for testing functions in ``db.queries``."""
+    return FakeDatabase()
+
+
+@pytest.fixture
+def fake_async_db():
+    """A ``FakeAsyncDatabase`` for testing ``db.queries.aio``."""
+    return FakeAsyncDatabase()
@@ -2,7 +2,10 @@ import sys
 from unittest.mock import MagicMock
 
 # Mock dependencies that might not be installed in the test env
-sys.modules["imapclient"] = MagicMock()
+try:
+    import imapclient  # noqa: F401
+except ImportError:
+    sys.modules.setdefault("imapclient", MagicMock())
 sys.modules["google.oauth2.credentials"] = MagicMock()
 sys.modules["google_auth_oauthlib.flow"] = MagicMock()
 sys.modules["google.auth.transport.requests"] = MagicMock()
@@ -11,7 +14,7 @@ import sys
 from unittest.mock import MagicMock
 
 # Mock optional dependencies to prevent ImportError during testing
-sys.modules["imapclient"] = MagicMock()
+sys.modules.setdefault("imapclient", MagicMock())
 sys.modules["google.oauth2.credentials"] = MagicMock()
 sys.modules["google_auth_oauthlib.flow"] = MagicMock()
 sys.modules["google.auth.transport.requests"] = MagicMock()
@@ -19,7 +22,7 @@ sys.modules["google.auth.transport.requests"] = MagicMock()
 import sys
 from unittest.mock import MagicMock
 
-sys.modules["imapclient"] = MagicMock()
+sys.modules.setdefault("imapclient", MagicMock())
 sys.modules["google.oauth2.credentials"] = MagicMock()
 sys.modules["google_auth_oauthlib.flow"] = MagicMock()
 sys.modules["google.auth.transport.requests"] = MagicMock()
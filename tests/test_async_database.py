@@ -0,0 +1,160 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from workspace_secretary.config import PostgresConfig
+from workspace_secretary.db import AsyncPostgresDatabase, QueryMetrics
+from workspace_secretary.db.metrics import LatencyHistogram
+from workspace_secretary.db.queries import aio
+from workspace_secretary.db.queries import emails as email_q
+from workspace_secretary.db.queries import embeddings as emb_q
+from workspace_secretary.db.queries import imap_jobs as imap_jobs_q
+
+
+def test_histogram_buckets_and_percentiles():
+    histogram = LatencyHistogram((10, 100))
+    for elapsed in (3, 8, 40, 250):
+        histogram.observe(elapsed)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["buckets"] == {"le_10ms": 2, "le_100ms": 1, "inf": 1}
+    assert snapshot["p50_ms"] == 10.0
+    assert snapshot["p95_ms"] == 250
+    assert snapshot["count"] == 4
+
+
+def test_metrics_time_records_failures_and_can_be_disabled():
+    metrics = QueryMetrics()
+    with pytest.raises(RuntimeError):
+        with metrics.time("get_email"):
+            raise RuntimeError("statement timeout")
+
+    assert metrics.snapshot()["get_email"]["errors"] == 1
+
+    disabled = QueryMetrics(enabled=False)
+    with disabled.time("get_email"):
+        pass
+    assert disabled.snapshot() == {}
+
+
+def test_async_inbox_page_runs_the_sync_sql_and_is_timed(fake_async_db):
+    when = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    fake_async_db.cursor.fetchall.return_value = [
+        {"uid": 3, "date": when},
+        {"uid": 2, "date": when},
+    ]
+
+    emails, next_cursor = asyncio.run(aio.get_inbox_page(fake_async_db, "INBOX", 1))
+
+    sql, params = fake_async_db.cursor.execute.call_args[0]
+    assert (sql, params) == email_q.inbox_emails_query("INBOX", 2)
+    assert emails == [{"uid": 3, "date": when}]
+    assert email_q.decode_email_cursor(next_cursor) == (when, 3)
+    assert fake_async_db.metrics.snapshot()["get_inbox_emails"]["count"] == 1
+
+
+def test_async_thread_view_is_one_pipeline_of_prepared_statements(fake_async_db):
+    fake_async_db.cursor.fetchone.side_effect = [{"uid": 2}, {"prev": 1, "next": 3}]
+    fake_async_db.cursor.fetchall.return_value = [{"uid": 1}, {"uid": 2}]
+
+    view = asyncio.run(aio.get_thread_view(fake_async_db, 2, "INBOX"))
+
+    fake_async_db.conn.pipeline.assert_called_once()
+    statements = [c.args[0] for c in fake_async_db.cursor.execute.await_args_list]
+    assert statements == [
+        email_q.EMAIL_BY_UID_SQL,
+        email_q.THREAD_BY_UID_SQL,
+        email_q.NEIGHBOR_UIDS_SQL[False],
+    ]
+    assert all(
+        c.kwargs["prepare"] for c in fake_async_db.cursor.execute.await_args_list
+    )
+    assert view["thread"] == [{"uid": 1}, {"uid": 2}]
+    assert view["neighbors"] == {"next": 3, "prev": 1}
+    assert "get_thread_view" in fake_async_db.metrics.snapshot()
+
+
+def test_job_delta_reads_events_and_status_in_one_pipeline(fake_async_db):
+    fake_async_db.cursor.fetchall.return_value = [{"id": 8, "message": "Sync complete"}]
+    fake_async_db.cursor.fetchone.return_value = {
+        "job_id": "job-1",
+        "status": "completed",
+    }
+
+    events, job = asyncio.run(aio.get_job_delta(fake_async_db, "job-1", after_id=7))
+
+    fake_async_db.conn.pipeline.assert_called_once()
+    calls = fake_async_db.cursor.execute.await_args_list
+    assert calls[0].args == (imap_jobs_q.EVENTS_AFTER_SQL, ("job-1", 7, 200))
+    assert calls[1].args == (imap_jobs_q.JOB_BY_ID_SQL, ("job-1",))
+    assert events == [{"id": 8, "message": "Sync complete"}]
+    assert job["status"] == "completed"
+
+
+def test_async_hybrid_search_sets_hnsw_options_in_the_pipeline(fake_async_db):
+    fake_async_db.cursor.fetchone.return_value = {"extversion": "0.8.0"}
+
+    asyncio.run(aio.hybrid_search(fake_async_db, "budget", [0.1, 0.2], "INBOX", 10))
+    asyncio.run(aio.hybrid_search(fake_async_db, "budget", [0.1, 0.2], "INBOX", 10))
+
+    calls = fake_async_db.cursor.execute.await_args_list
+    # The pgvector version is looked up once per database
+    assert calls[0].args[0] == emb_q.PGVECTOR_VERSION_SQL
+    assert calls[1].args == ("SELECT set_config('hnsw.ef_search', %s, true)", ("100",))
+    assert calls[2].args == (
+        "SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true)",
+        None,
+    )
+    assert "::halfvec" in calls[3].args[0]
+    assert "folders @> ARRAY['INBOX']" in calls[3].args[0]
+    assert len(calls) == 7
+    assert fake_async_db.conn.pipeline.call_count == 2
+
+
+def test_pool_size_and_statement_timeout_come_from_config():
+    config = SimpleNamespace(
+        postgres=PostgresConfig.from_dict(
+            {"pool_max_size": "4", "statement_timeout_ms": 5000}
+        ),
+        embeddings=SimpleNamespace(dimensions=3072, hnsw_ef_search=80, hot_folders=[]),
+    )
+    adb = AsyncPostgresDatabase.from_config(config)
+    pool = MagicMock()
+    pool.open = AsyncMock()
+
+    with patch("psycopg_pool.AsyncConnectionPool", return_value=pool) as pool_cls:
+        asyncio.run(adb.open())
+
+    kwargs = pool_cls.call_args.kwargs
+    assert kwargs["max_size"] == 4
+    assert kwargs["kwargs"] == {"options": "-c statement_timeout=5000"}
+    assert adb._vector_type == "halfvec"
+
+
+def test_failed_open_closes_the_pool_and_backs_off():
+    from workspace_secretary.server import MCPState
+
+    config = SimpleNamespace(
+        postgres=PostgresConfig(),
+        embeddings=SimpleNamespace(dimensions=3, hnsw_ef_search=40, hot_folders=[]),
+    )
+    pool = MagicMock()
+    pool.open = AsyncMock(side_effect=TimeoutError("pool timeout"))
+    pool.close = AsyncMock()
+    mcp_state = MCPState()
+    mcp_state.async_database = AsyncPostgresDatabase.from_config(config)
+
+    async def scenario():
+        return [await mcp_state.open_async_database() for _ in range(3)]
+
+    with patch("psycopg_pool.AsyncConnectionPool", return_value=pool) as pool_cls:
+        assert asyncio.run(scenario()) == [None, None, None]
+
+    # One attempt, then the failure is cached until the retry window passes
+    pool_cls.assert_called_once()
+    pool.close.assert_awaited_once()
+    assert mcp_state.async_database._pool is None
@@ -0,0 +1,94 @@
+import hashlib
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock
+
+from workspace_secretary.engine.api import app, state
+from workspace_secretary.engine.attachment_store import (
+    AttachmentStore,
+    RangeNotSatisfiable,
+    parse_range,
+)
+from workspace_secretary.engine.imap_sync import AttachmentPart
+
+PAYLOAD = bytes(range(256)) * 40  # 10 KiB
+
+
+def test_put_stream_is_content_addressed_and_sharded(tmp_path):
+    store = AttachmentStore(tmp_path)
+
+    sha256, size = store.put_stream([PAYLOAD[:100], PAYLOAD[100:]])
+    again, _ = store.put_bytes(PAYLOAD)
+
+    assert sha256 == again == hashlib.sha256(PAYLOAD).hexdigest()
+    assert size == len(PAYLOAD)
+    path = store.path_for(sha256)
+    assert path == tmp_path / sha256[:2] / sha256[2:4] / sha256
+    assert path.read_bytes() == PAYLOAD
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+
+def test_iter_range_reads_only_requested_bytes(tmp_path):
+    store = AttachmentStore(tmp_path)
+    sha256, _ = store.put_bytes(PAYLOAD)
+
+    assert b"".join(store.iter_range(sha256, 10, 19)) == PAYLOAD[10:20]
+    assert b"".join(store.iter_range(sha256)) == PAYLOAD
+
+
+def test_parse_range_forms():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-5", 100) == (95, 99)
+    assert parse_range("bytes=50-500", 100) == (50, 99)
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=100-", 100)
+
+
+@pytest.fixture
+def engine_state(tmp_path):
+    state.enrolled = True
+    state.config = MagicMock()
+    state.database = MagicMock()
+    state.imap_client = MagicMock()
+    state.attachment_store = AttachmentStore(tmp_path)
+    yield state
+    state.imap_client = None
+    state.attachment_store = None
+
+
+def test_download_fetches_part_once_then_serves_ranges(engine_state):
+    state.database.get_attachment_blob.return_value = None
+    state.imap_client.fetch_attachment_part.return_value = AttachmentPart(
+        part="2", filename="report.pdf", content_type="application/pdf", data=PAYLOAD
+    )
+    client = TestClient(app)
+
+    first = client.get("/api/email/INBOX/7/attachment/report.pdf")
+    assert first.status_code == status.HTTP_200_OK
+    assert first.content == PAYLOAD
+    etag = first.headers["etag"]
+    saved_blob = state.database.save_attachment_blobs.call_args[0][2][0]
+    assert saved_blob["part"] == "2"
+
+    state.database.get_attachment_blob.return_value = saved_blob
+    ranged = client.get(
+        "/api/email/INBOX/7/attachment/report.pdf",
+        headers={"Range": "bytes=100-199", "If-Range": etag},
+    )
+    assert ranged.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert ranged.content == PAYLOAD[100:200]
+    assert ranged.headers["content-range"] == f"bytes 100-199/{len(PAYLOAD)}"
+
+    cached = client.get(
+        "/api/email/INBOX/7/attachment/report.pdf",
+        headers={"If-None-Match": etag},
+    )
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    state.imap_client.fetch_attachment_part.assert_called_once_with(
+        7, "INBOX", "report.pdf"
+    )
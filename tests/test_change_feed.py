@@ -0,0 +1,145 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from workspace_secretary.db import schema
+from workspace_secretary.db.notify import NotificationHub
+from workspace_secretary.db.queries import changes as changes_q
+from workspace_secretary.web.routes import notifications
+
+
+def _statements(cur):
+    return [" ".join(c.args[0].split()) for c in cur.execute.call_args_list]
+
+
+def test_change_feed_triggers_publish_from_every_emails_write():
+    cur = MagicMock()
+
+    schema.initialize_change_feed_schema(cur)
+
+    statements = _statements(cur)
+    triggers = [s for s in statements if s.startswith("CREATE TRIGGER")]
+    assert [t.split()[2] for t in triggers] == [
+        "trg_emails_changes_insert",
+        "trg_emails_changes_update",
+        "trg_emails_changes_delete",
+    ]
+    assert all("FOR EACH STATEMENT" in t for t in triggers)
+    notify = next(s for s in statements if "mailbox_change_notify(" in s)
+    assert f"'{changes_q.MAILBOX_CHANNEL}'" in notify
+    assert f"<= {changes_q.MAX_NOTIFY_UIDS}" in notify
+
+
+def test_calendar_cache_writes_publish_a_calendar_change():
+    cur = MagicMock()
+
+    schema.initialize_calendar_schema(cur)
+
+    statements = _statements(cur)
+    assert any(
+        s.startswith("CREATE TRIGGER trg_calendar_events_changes_update")
+        for s in statements
+    )
+    assert any(
+        f"pg_notify('{changes_q.MAILBOX_CHANNEL}', '{{\"type\": \"calendar\"}}')" in s
+        for s in statements
+    )
+
+
+def test_merge_changes_unions_uids_per_folder_and_type():
+    payloads = [
+        json.dumps({"type": "new", "folder": "INBOX", "uids": [5], "count": 1}),
+        json.dumps({"type": "new", "folder": "INBOX", "uids": [6, 5], "count": 2}),
+        json.dumps({"type": "flags", "folder": "INBOX", "uids": None, "count": 900}),
+        json.dumps({"type": "flags", "folder": "INBOX", "uids": [7], "count": 1}),
+        "not json",
+        json.dumps({"type": "unknown"}),
+    ]
+
+    changes = [c for c in map(changes_q.parse_change, payloads) if c]
+    merged = changes_q.merge_changes(changes)
+
+    assert merged == [
+        {"type": "new", "folder": "INBOX", "uids": [5, 6], "count": 3},
+        {"type": "flags", "folder": "INBOX", "uids": None, "count": 901},
+    ]
+
+
+def test_change_messages_carry_counters_and_notify_new_unread_mail():
+    payloads = [
+        json.dumps({"type": "new", "folder": "INBOX", "uids": [9, 10], "count": 2}),
+        json.dumps({"type": "calendar"}),
+    ]
+    counters = {"total": 12, "unread": 3}
+    changed = [
+        {"uid": 10, "folder": "INBOX", "subject": "Hi", "is_unread": True},
+        {"uid": 9, "folder": "INBOX", "subject": "Read", "is_unread": False},
+    ]
+
+    with (
+        patch.object(
+            notifications.adb, "get_folder_counters", AsyncMock(return_value=counters)
+        ),
+        patch.object(
+            notifications.adb, "get_changed_emails", AsyncMock(return_value=changed)
+        ) as get_changed,
+    ):
+        messages = asyncio.run(notifications.change_messages(payloads))
+
+    get_changed.assert_awaited_once_with("INBOX", [9, 10])
+    assert [event for event, _ in messages] == ["mailbox", "notification", "calendar"]
+    assert messages[0][1]["counters"] == counters
+    assert [e["uid"] for e in messages[1][1]["new_emails"]] == [10]
+
+
+def test_streams_woken_by_one_burst_share_the_counter_read():
+    hub = NotificationHub("postgresql://", [changes_q.MAILBOX_CHANNEL])
+    payload = json.dumps({"type": "flags", "folder": "INBOX", "uids": [3]})
+
+    async def scenario():
+        hub.dispatch(changes_q.MAILBOX_CHANNEL, payload)
+        since = hub.sequence
+        first, second = await asyncio.gather(
+            notifications.change_messages([payload], hub, since),
+            notifications.change_messages([payload], hub, since),
+        )
+        # A later notification needs a fresh read
+        hub.dispatch(changes_q.MAILBOX_CHANNEL, payload)
+        third = await notifications.change_messages([payload], hub, hub.sequence)
+        return first, second, third
+
+    counters = AsyncMock(side_effect=[{"unread": 1}, {"unread": 0}])
+    with patch.object(notifications.adb, "get_folder_counters", counters):
+        first, second, third = asyncio.run(scenario())
+
+    assert counters.await_count == 2
+    assert first[0][1]["counters"] == second[0][1]["counters"] == {"unread": 1}
+    assert third[0][1]["counters"] == {"unread": 0}
+
+
+def test_lost_notifications_ask_clients_to_resync():
+    messages = asyncio.run(notifications.change_messages([None]))
+
+    assert messages == [
+        ("mailbox", {"type": "resync"}),
+        ("calendar", {"type": "calendar"}),
+    ]
+
+
+def test_due_reminders_fire_once_per_event_within_the_lead_time():
+    now = datetime(2025, 3, 1, 9, 0, tzinfo=timezone.utc)
+    soon = (now + timedelta(minutes=10)).isoformat()
+    later = (now + timedelta(minutes=50)).isoformat()
+    events = [
+        {"id": "a", "calendarId": "primary", "start": {"dateTime": soon}},
+        {"id": "b", "calendarId": "primary", "start": {"dateTime": later}},
+    ]
+    sent: set[str] = set()
+
+    assert [r["id"] for r in notifications.due_reminders(events, now, sent)] == ["a"]
+    assert notifications.due_reminders(events, now, sent) == []
+    assert [
+        r["id"]
+        for r in notifications.due_reminders(events, now + timedelta(minutes=25), sent)
+    ] == ["b"]
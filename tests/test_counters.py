@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock
+
+from workspace_secretary.db import schema
+from workspace_secretary.db.queries import counters as counter_q
+from workspace_secretary.db.queries import emails as email_q
+from workspace_secretary.db.queries import embeddings as emb_q
+
+
+def test_count_emails_reads_folder_counter_row(fake_db):
+    fake_db.cursor.fetchone.return_value = dict(
+        total=120_000, unread=7, flagged=3, with_attachments=40, needing_embedding=12
+    )
+
+    assert email_q.count_emails(fake_db, "INBOX") == 120_000
+    assert emb_q.count_emails_needing_embedding(fake_db, "INBOX") == 12
+
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "FROM folder_counters WHERE folder = %s" in sql
+    assert "COUNT(" not in sql
+    assert params == ("INBOX",)
+
+
+def test_missing_counter_rows_read_as_zero(fake_db):
+    fake_db.cursor.fetchone.return_value = None
+
+    assert counter_q.get_folder_counters(fake_db, "Empty")["unread"] == 0
+    assert email_q.count_emails_by_label(fake_db, "Secretary/Unclear") == 0
+
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "FROM label_counters" in sql
+    assert params == ("INBOX", "Secretary/Unclear")
+
+
+def test_reconcile_commits_and_returns_corrected_rows(fake_db):
+    fake_db.cursor.fetchone.return_value = (3,)
+
+    assert counter_q.reconcile_counters(fake_db) == 3
+    fake_db.cursor.execute.assert_called_once_with(
+        "SELECT reconcile_mailbox_counters()"
+    )
+    fake_db.conn.commit.assert_called_once()
+
+
+def test_counters_schema_uses_statement_triggers_with_transition_tables():
+    cur = MagicMock()
+
+    schema.initialize_counters_schema(cur)
+
+    statements = [" ".join(c.args[0].split()) for c in cur.execute.call_args_list]
+    triggers = [s for s in statements if s.startswith("CREATE TRIGGER")]
+    assert len(triggers) == 3
+    assert all("FOR EACH STATEMENT" in s for s in triggers)
+    assert any(
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows" in s for s in triggers
+    )
+    backfill = next(
+        i
+        for i, s in enumerate(statements)
+        if "reconcile_mailbox_counters()" in s and s.startswith("SELECT")
+    )
+    assert backfill < statements.index(triggers[0])
+
+
+def test_reconcile_adds_drift_as_a_delta_without_locking_the_counters():
+    cur = MagicMock()
+
+    schema.initialize_counters_schema(cur)
+
+    statements = [" ".join(c.args[0].split()) for c in cur.execute.call_args_list]
+    reconcile = next(
+        s for s in statements if "FUNCTION reconcile_mailbox_counters" in s
+    )
+    assert "LOCK TABLE" not in reconcile
+    assert "total = fc.total + EXCLUDED.total" in reconcile
+    assert "total = lc.total + EXCLUDED.total" in reconcile
+
+
+def test_admin_db_stats_sum_counter_rows(monkeypatch):
+    from workspace_secretary.web.routes import admin
+
+    monkeypatch.setattr(
+        admin.db,
+        "list_folder_counters",
+        lambda: [
+            {"folder": "INBOX", "total": 10, "unread": 4},
+            {"folder": "Sent", "total": 5, "unread": 0},
+        ],
+    )
+
+    stats = admin.get_db_stats()
+
+    assert stats["total_emails"] == 15
+    assert stats["unread_count"] == 4
+    assert stats["folder_count"] == 2
+    assert stats["folder_breakdown"][0] == {"folder": "INBOX", "count": 10}
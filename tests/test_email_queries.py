@@ -0,0 +1,339 @@
+from workspace_secretary.db.queries import emails as email_q
+
+
+def _email_params(uid: int, **overrides):
+    params = {
+        "uid": uid,
+        "folder": "INBOX",
+        "message_id": f"<{uid}@example.com>",
+        "subject": f"Subject {uid}",
+        "from_addr": "a@example.com",
+        "to_addr": "b@example.com",
+        "cc_addr": "",
+        "bcc_addr": "",
+        "date": None,
+        "internal_date": None,
+        "body_text": "body",
+        "body_html": "",
+        "flags": "",
+        "is_unread": True,
+        "is_important": False,
+        "size": 10,
+        "modseq": 1,
+        "in_reply_to": "",
+        "references_header": "",
+        "gmail_thread_id": None,
+        "gmail_msgid": None,
+        "gmail_labels": ["\\Inbox"],
+        "has_attachments": False,
+        "attachment_filenames": None,
+    }
+    params.update(overrides)
+    return params
+
+
+def test_upsert_emails_bulk_single_statement(fake_db):
+    written = email_q.upsert_emails_bulk(fake_db, [_email_params(1), _email_params(2)])
+
+    assert written == 2
+    assert fake_db.checkouts == 1
+    fake_db.cursor.execute.assert_called_once()
+    fake_db.cursor.executemany.assert_not_called()
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "ON CONFLICT (uid, folder)" in sql
+    assert sql.count("NOW()") == 3
+    assert len(params) == 2 * 34
+    assert [params[0], params[34]] == [1, 2]
+    assert params[22] == '["\\\\Inbox"]'
+    fake_db.conn.commit.assert_called_once()
+
+
+def test_upsert_emails_bulk_chunks_and_keeps_last_duplicate(fake_db, monkeypatch):
+    monkeypatch.setattr(email_q, "UPSERT_BATCH_ROWS", 2)
+    emails = [_email_params(1), _email_params(2), _email_params(3)]
+    emails.append(_email_params(1, subject="Edited"))
+
+    assert email_q.upsert_emails_bulk(fake_db, emails) == 3
+    calls = fake_db.cursor.execute.call_args_list
+    assert [len(c.args[1]) // 34 for c in calls] == [2, 1]
+    assert calls[0].args[1][3] == "Edited"
+
+
+def test_upsert_emails_bulk_empty_is_noop(fake_db):
+    assert email_q.upsert_emails_bulk(fake_db, []) == 0
+    assert fake_db.checkouts == 0
+
+
+def test_reconcile_email_flags_chunks_and_counts_changes(fake_db):
+    fake_db.cursor.rowcount = 2
+    changed = {
+        uid: {"flags": ["\\Seen"], "modseq": 100 + uid, "gmail_labels": None}
+        for uid in range(1, 6)
+    }
+    changed[3] = {"flags": [], "modseq": 103, "gmail_labels": ["\\Inbox"]}
+
+    applied = email_q.reconcile_email_flags(fake_db, "INBOX", changed, chunk_size=3)
+
+    assert applied == 4
+    assert fake_db.checkouts == 1
+    assert fake_db.cursor.execute.call_count == 2
+    sql, params = fake_db.cursor.execute.call_args_list[0][0]
+    assert "unnest(" in sql
+    assert "IS DISTINCT FROM" in sql
+    assert "e.modseq IS DISTINCT FROM c.modseq" in sql
+    uids, flags, unread, modseqs, labels, folder = params
+    assert uids == [1, 2, 3]
+    assert unread == [False, False, True]
+    assert labels == [None, None, '["\\\\Inbox"]']
+    assert folder == "INBOX"
+    fake_db.conn.commit.assert_called_once()
+
+
+def test_delete_emails_bulk_uses_single_statement(fake_db):
+    fake_db.cursor.rowcount = 3
+
+    assert email_q.delete_emails_bulk(fake_db, "INBOX", [41, 43, 44]) == 3
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "uid = ANY(%s)" in sql
+    assert params == ("INBOX", [41, 43, 44])
+    assert email_q.delete_emails_bulk(fake_db, "INBOX", []) == 0
+    assert fake_db.checkouts == 1
+
+
+def test_hydrate_email_bodies_marks_rows_hydrated(fake_db):
+    fake_db.cursor.rowcount = 2
+
+    updated = email_q.hydrate_email_bodies(
+        fake_db, "INBOX", {5: ("text five", ""), 6: ("text six", "<p>six</p>")}
+    )
+
+    assert updated == 2
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "body_hydrated = true" in sql
+    assert "sha256" in sql
+    assert params == ([5, 6], ["text five", "text six"], ["", "<p>six</p>"], "INBOX")
+    fake_db.conn.commit.assert_called_once()
+
+
+def test_unhydrated_uids_skip_messages_backing_off_or_given_up(fake_db):
+    fake_db.cursor.fetchall.return_value = [(9,), (8,)]
+
+    assert email_q.get_unhydrated_uids(fake_db, "INBOX", 2) == [9, 8]
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "hydrate_attempts < %s" in sql
+    assert "hydrate_attempted_at" in sql
+    assert params == (
+        "INBOX",
+        email_q.HYDRATE_MAX_ATTEMPTS,
+        email_q.HYDRATE_RETRY_BASE_MINUTES,
+        2,
+    )
+
+
+def test_record_hydrate_failures_counts_an_attempt(fake_db):
+    fake_db.cursor.rowcount = 2
+
+    assert email_q.record_hydrate_failures(fake_db, "INBOX", [5, 6]) == 2
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "hydrate_attempts = hydrate_attempts + 1" in sql
+    assert params == ("INBOX", [5, 6])
+    assert email_q.record_hydrate_failures(fake_db, "INBOX", []) == 0
+    assert fake_db.checkouts == 1
+
+
+def test_header_first_rows_carry_hydration_flag(fake_db):
+    email_q.upsert_emails_bulk(fake_db, [_email_params(1, body_hydrated=False)])
+
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "body_hydrated = emails.body_hydrated OR EXCLUDED.body_hydrated" in sql
+    assert params[-1] is False
+
+
+def test_mark_emails_read_bulk_single_statement(fake_db):
+    fake_db.cursor.rowcount = 3
+
+    assert email_q.mark_emails_read_bulk(fake_db, "INBOX", [1, 2, 3], True) == 3
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "uid = ANY(%s)" in sql
+    assert params == (False, "INBOX", [1, 2, 3])
+    assert email_q.mark_emails_read_bulk(fake_db, "INBOX", [], True) == 0
+    assert fake_db.checkouts == 1
+
+
+def test_modify_email_labels_bulk_add_and_remove(fake_db):
+    email_q.modify_email_labels_bulk(fake_db, "INBOX", [4, 5], ["Newsletter"], "add")
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "unnest(%s::text[])" in sql
+    assert params == (["Newsletter"], "INBOX", [4, 5])
+
+    email_q.modify_email_labels_bulk(fake_db, "INBOX", [4], ["Newsletter"], "remove")
+    sql, _ = fake_db.cursor.execute.call_args[0]
+    assert "gmail_labels - %s::text[]" in sql
+
+
+def test_search_emails_advanced_ranks_stored_tsvector(fake_db):
+    fake_db.cursor.fetchall.return_value = []
+
+    email_q.search_emails_advanced(
+        fake_db, '"quarterly report" -draft', "INBOX", 20, {"is_unread": True}
+    )
+
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "websearch_to_tsquery('english', %s) q" in sql
+    assert "search_tsv @@ q" in sql
+    assert "ORDER BY rank DESC, date DESC" in sql
+    assert "to_tsvector" not in sql
+    assert params == ['"quarterly report" -draft', "INBOX", True, 20]
+
+
+def test_search_emails_advanced_filters_only_orders_by_date(fake_db):
+    fake_db.cursor.fetchall.return_value = []
+
+    email_q.search_emails_advanced(fake_db, "  ", "INBOX", 20, {"from_addr": "bob"})
+
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "websearch_to_tsquery" not in sql
+    assert "ORDER BY date DESC" in sql
+    assert params == ["INBOX", "%bob%", 20]
+
+
+def test_search_suggestions_use_prefix_lookups(fake_db):
+    fake_db.cursor.fetchall.side_effect = [
+        [{"email": "bob@example.com"}],
+        [{"subject": "Budget review"}],
+    ]
+
+    suggestions = email_q.get_search_suggestions(fake_db, "Bo_", limit=5)
+
+    assert suggestions == [
+        {"type": "sender", "value": "bob@example.com"},
+        {"type": "subject", "value": "Budget review"},
+    ]
+    contacts_sql, contacts_params = fake_db.cursor.execute.call_args_list[0][0]
+    subjects_sql, subjects_params = fake_db.cursor.execute.call_args_list[1][0]
+    assert "FROM contacts" in contacts_sql
+    assert "FROM subject_suggestions" in subjects_sql
+    assert "FROM emails" not in contacts_sql + subjects_sql
+    assert contacts_params == ("bo\\_%", "bo\\_%", 5)
+
+
+def test_subject_suggestions_count_down_and_prune_on_delete():
+    from unittest.mock import MagicMock
+
+    from workspace_secretary.db import schema
+
+    cur = MagicMock()
+
+    schema.initialize_email_search_schema(cur)
+
+    statements = [" ".join(c.args[0].split()) for c in cur.execute.call_args_list]
+    created = [
+        s
+        for s in statements
+        if s.startswith("CREATE TRIGGER trg_emails_subject_suggestions")
+    ]
+    assert [s.split()[4] for s in created] == ["INSERT", "UPDATE", "DELETE"]
+    assert all("FOR EACH STATEMENT" in s for s in created)
+    trigger = next(s for s in statements if "FUNCTION subject_suggestions_trigger" in s)
+    assert "WHEN 'DELETE' THEN 'SELECT -1 AS sign" in trigger
+    assert "WHERE n.subject IS DISTINCT FROM o.subject" in trigger
+    assert "DELETE FROM subject_suggestions WHERE email_count <= 0" in trigger
+    # Counts kept by the old insert-only trigger are rebuilt once
+    rebuild = next(i for i, s in enumerate(statements) if "TRUNCATE subject" in s)
+    backfill = next(
+        i for i, s in enumerate(statements) if s.startswith("INSERT INTO subject")
+    )
+    assert rebuild < backfill < statements.index(created[0])
+
+
+def test_email_cursor_round_trip_and_rejects_garbage():
+    import pytest
+    from datetime import datetime, timezone
+
+    date = datetime(2026, 3, 1, 9, 30, tzinfo=timezone.utc)
+
+    assert email_q.decode_email_cursor(email_q.encode_email_cursor(date, 42)) == (
+        date,
+        42,
+    )
+    assert email_q.decode_email_cursor(email_q.encode_email_cursor(None, 7)) == (
+        None,
+        7,
+    )
+    with pytest.raises(ValueError):
+        email_q.decode_email_cursor("not-a-cursor")
+
+
+def test_inbox_page_uses_keyset_condition_and_returns_next_cursor(fake_db):
+    from datetime import datetime, timezone
+
+    date = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    fake_db.cursor.fetchall.return_value = [
+        {"uid": 30, "date": date},
+        {"uid": 20, "date": date},
+        {"uid": 10, "date": date},
+    ]
+
+    emails, next_cursor = email_q.get_inbox_page(
+        fake_db, "INBOX", 2, cursor=email_q.encode_email_cursor(date, 31)
+    )
+
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "(date, uid) < (%s, %s)" in sql
+    assert "ORDER BY date DESC, uid DESC" in sql
+    assert "OFFSET" in sql and params[-2:] == [3, 0]
+    assert params[:3] == ["INBOX", date, 31]
+    assert [e["uid"] for e in emails] == [30, 20]
+    assert email_q.decode_email_cursor(next_cursor) == (date, 20)
+
+
+def test_inbox_page_last_page_has_no_cursor(fake_db):
+    fake_db.cursor.fetchall.return_value = [{"uid": 1, "date": None}]
+
+    emails, next_cursor = email_q.get_inbox_page(fake_db, "INBOX", 2)
+
+    assert len(emails) == 1
+    assert next_cursor is None
+
+
+def test_neighbor_uids_probe_keyset_in_both_directions(fake_db):
+    fake_db.cursor.fetchone.return_value = {"prev": 4, "next": 9}
+
+    neighbors = email_q.get_neighbor_uids(fake_db, "INBOX", 5)
+
+    fake_db.cursor.execute.assert_called_once()
+    call = fake_db.cursor.execute.call_args
+    assert "(e.date, e.uid) < (cur.date, cur.uid)" in call.args[0]
+    assert "(e.date, e.uid) > (cur.date, cur.uid)" in call.args[0]
+    assert call.args[1] == {"uid": 5, "folder": "INBOX"}
+    assert call.kwargs == {"prepare": True}
+    assert neighbors == {"next": 9, "prev": 4}
+
+
+def test_neighbor_uids_for_missing_email_are_empty(fake_db):
+    fake_db.cursor.fetchone.return_value = None
+
+    assert email_q.get_neighbor_uids(fake_db, "INBOX", 5, unread_only=True) == {
+        "next": None,
+        "prev": None,
+    }
+    assert "e.is_unread = true" in fake_db.cursor.execute.call_args.args[0]
+
+
+def test_thread_view_pipelines_its_three_reads(fake_db):
+    fake_db.cursor.fetchone.side_effect = [{"uid": 5}, {"prev": 4, "next": None}]
+    fake_db.cursor.fetchall.return_value = []
+
+    view = email_q.get_thread_view(fake_db, 5, "INBOX")
+
+    fake_db.conn.pipeline.assert_called_once()
+    assert fake_db.checkouts == 1
+    assert fake_db.cursor.execute.call_count == 3
+    assert all(
+        c.kwargs == {"prepare": True} for c in fake_db.cursor.execute.call_args_list
+    )
+    assert view == {
+        "email": {"uid": 5},
+        "thread": [{"uid": 5}],
+        "neighbors": {"next": None, "prev": 4},
+    }
@@ -0,0 +1,262 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from workspace_secretary.db.queries import embeddings as emb_q
+from workspace_secretary.engine.embeddings import (
+    EmbeddingResult,
+    EmbeddingsSyncWorker,
+    unique_by_content_hash,
+)
+
+
+def test_upsert_embedding_keyed_by_content_hash(fake_db):
+    emb_q.upsert_embedding(fake_db, "abc123", [0.1, 0.2], "model-x")
+
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "INSERT INTO embedding_vectors" in sql
+    assert "ON CONFLICT (content_hash)" in sql
+    assert params == ("abc123", [0.1, 0.2], "model-x")
+
+
+def test_emails_needing_embedding_skip_known_hashes_and_filter_uids(fake_db):
+    fake_db.cursor.fetchall.return_value = []
+
+    emb_q.get_emails_needing_embedding(fake_db, "INBOX", limit=2, uids=[4, 5])
+
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "emb.content_hash = e.content_hash" in sql
+    assert "emb.content_hash IS NULL" in sql
+    assert "e.uid = ANY(%s)" in sql
+    assert params == ["INBOX", [4, 5], 2]
+
+
+def test_unique_by_content_hash_keeps_first_copy():
+    emails = [
+        {"uid": 1, "content_hash": "a"},
+        {"uid": 2, "content_hash": "b"},
+        {"uid": 3, "content_hash": "a"},
+        {"uid": 4, "content_hash": None},
+    ]
+
+    assert [e["uid"] for e in unique_by_content_hash(emails)] == [1, 2]
+
+
+def test_upsert_embeddings_bulk_single_statement_collapses_duplicates(fake_db):
+    written = emb_q.upsert_embeddings_bulk(
+        fake_db, [("a", [0.1], "m"), ("b", [0.2], "m"), ("a", [0.3], "m")]
+    )
+
+    assert written == 2
+    fake_db.cursor.execute.assert_called_once()
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert sql.count("(%s, %s, %s)") == 2
+    assert params == ["a", [0.3], "m", "b", [0.2], "m"]
+
+
+def test_emails_needing_embedding_keyset_cursor(fake_db):
+    fake_db.cursor.fetchall.return_value = []
+
+    emb_q.get_emails_needing_embedding(fake_db, "INBOX", limit=50, before_uid=900)
+
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "e.uid < %s" in sql
+    assert "ORDER BY e.uid DESC" in sql
+    assert params == ["INBOX", 900, 50]
+
+
+def _worker_database(pages):
+    database = MagicMock()
+    database.supports_embeddings.return_value = True
+    database.count_emails_needing_embedding.return_value = sum(map(len, pages))
+    database.get_emails_needing_embedding.side_effect = pages + [[]]
+    database.upsert_embeddings_bulk.side_effect = len
+    return database
+
+
+def test_sync_folder_embeds_each_content_hash_once():
+    database = _worker_database(
+        [
+            [
+                {"uid": 2, "folder": "INBOX", "content_hash": "same"},
+                {"uid": 1, "folder": "INBOX", "content_hash": "same"},
+            ]
+        ]
+    )
+    client = MagicMock()
+    client.embed_emails = AsyncMock(
+        return_value=[EmbeddingResult("t", [0.5], "model-x", "ignored", 1)]
+    )
+    worker = EmbeddingsSyncWorker(client, database, ["INBOX"])
+
+    stored = asyncio.run(worker.sync_folder("INBOX"))
+
+    assert stored == 1
+    assert len(client.embed_emails.call_args[0][0]) == 1
+    database.upsert_embeddings_bulk.assert_called_once_with(
+        [("same", [0.5], "model-x")]
+    )
+
+
+def test_sync_folder_pipelines_pages_with_keyset_cursor():
+    pages = [
+        [{"uid": uid, "folder": "INBOX", "content_hash": f"h{uid}"}]
+        for uid in (30, 20, 10)
+    ]
+    database = _worker_database(pages)
+    in_flight = 0
+    peak = 0
+
+    async def embed(emails):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [EmbeddingResult("t", [1.0], "m", "x", 1) for _ in emails]
+
+    client = MagicMock()
+    client.embed_emails = embed
+    worker = EmbeddingsSyncWorker(client, database, ["INBOX"], max_concurrent=2)
+
+    stored = asyncio.run(worker.sync_folder("INBOX"))
+
+    assert stored == 3
+    assert peak == 2
+    cursors = [
+        c.kwargs["before_uid"] for c in database.get_emails_needing_embedding.mock_calls
+    ]
+    assert cursors == [None, 30, 20, 10]
+    database.count_emails_needing_embedding.assert_called_once_with("INBOX")
+
+
+def test_hybrid_search_fuses_lexical_and_vector_in_one_statement(fake_db):
+    fake_db._hnsw_iterative_scan = False
+    fake_db.cursor.fetchall.return_value = []
+
+    emb_q.hybrid_search(
+        fake_db,
+        '"budget review" -draft',
+        [0.1, 0.2],
+        "INBOX",
+        10,
+        filters={"is_unread": True},
+        candidates=50,
+    )
+
+    ef_call, query_call = _executed(fake_db)
+    assert ef_call == ("SELECT set_config('hnsw.ef_search', %s, true)", ("100",))
+    sql, params = query_call
+    assert "websearch_to_tsquery('english', %s)" in sql
+    assert "ORDER BY embedding <#> %s::vector" in sql
+    assert "WHERE folders @> ARRAY['INBOX']::text[]" in sql
+    assert "SUM(1.0 / (%s + rnk))" in sql
+    assert ") > %s" not in sql  # no similarity cutoff
+    assert params == [
+        '"budget review" -draft',
+        "INBOX",
+        50,
+        [0.1, 0.2],
+        [0.1, 0.2],
+        50,
+        "INBOX",
+        60,
+        True,
+        10,
+    ]
+
+
+def _executed(db):
+    return [c.args for c in db.cursor.execute.call_args_list]
+
+
+def test_semantic_search_uses_iterative_scan_with_filters_in_index_scan(fake_db):
+    fake_db.hot_folders = ["INBOX"]
+    fake_db.cursor.fetchone.return_value = ("0.8.0",)
+    fake_db.cursor.fetchall.return_value = []
+
+    emb_q.semantic_search_advanced(
+        fake_db, [0.1], "INBOX", 5, {"is_unread": True}, ef_search=200
+    )
+
+    calls = _executed(fake_db)
+    assert calls[1] == ("SELECT set_config('hnsw.ef_search', %s, true)", ("200",))
+    assert "hnsw.iterative_scan', 'relaxed_order'" in calls[2][0]
+    sql, params = calls[3]
+    assert "emb.folders @> ARRAY['INBOX']::text[]" in sql
+    assert "e.is_unread = %s" in sql
+    assert params == [[0.1], "INBOX", True, [0.1], 5, 0.5]
+    fake_db.conn.pipeline.assert_called()
+
+
+def test_semantic_search_overfetches_until_limit_without_iterative_scan(fake_db):
+    fake_db.cursor.fetchone.return_value = ("0.7.4",)
+    fake_db.cursor.fetchall.side_effect = [[{"uid": 1}], [{"uid": 1}], [{"uid": 1}]]
+
+    rows = emb_q.semantic_search(fake_db, [0.1], "Archive", 40)
+
+    pools = [args[1][2] for args in _executed(fake_db) if "LIMIT %s" in args[0]]
+    assert pools == [160, 640, 1000]
+    assert rows == [{"uid": 1}]
+    assert not any("iterative_scan" in args[0] for args in _executed(fake_db))
+
+
+def test_folder_vector_indexes_are_partial_on_folders_array():
+    from workspace_secretary.db import schema
+
+    cur = MagicMock()
+    cur.fetchall.return_value = []
+
+    schema.create_folder_vector_indexes(cur, "halfvec", ["INBOX", "It's"])
+
+    statements = [c.args[0] for c in cur.execute.call_args_list]
+    created = [s for s in statements if "CREATE INDEX" in s]
+    assert len(created) == 2
+    assert schema.folder_vector_index_name("INBOX") in created[0]
+    assert "WHERE folders @> ARRAY['INBOX']::text[]" in created[0]
+    assert "ARRAY['It''s']::text[]" in created[1]
+
+
+def _placeholders(sql):
+    """Bound-parameter slots psycopg will see; any other '%' is a syntax error."""
+    stripped = sql.replace("%%", "")
+    assert stripped.count("%") == stripped.count("%s")
+    return stripped.count("%s")
+
+
+def test_folder_predicate_keeps_percent_out_of_the_placeholders(fake_db):
+    from workspace_secretary.db import schema
+
+    sql, params = emb_q.hybrid_search_query(
+        "vector", "budget", [0.1], "Receipts 100%", 10
+    )
+    assert "ARRAY['Receipts 100%%']::text[]" in sql
+    assert _placeholders(sql) == len(params)
+    fake_db.hot_folders = ["50%s off"]
+    fake_db.cursor.fetchone.return_value = ("0.8.0",)
+    fake_db.cursor.fetchall.return_value = []
+    emb_q.semantic_search(fake_db, [0.1], "50%s off", 5)
+    sql, params = _executed(fake_db)[-1]
+    assert _placeholders(sql) == len(params)
+
+    # CREATE INDEX runs without parameters, so the literal stays as is
+    cur = MagicMock()
+    cur.fetchall.return_value = []
+    schema.create_folder_vector_indexes(cur, "vector", ["Receipts 100%"])
+    created = [
+        c.args[0] for c in cur.execute.call_args_list if "CREATE INDEX" in c.args[0]
+    ]
+    assert "ARRAY['Receipts 100%']::text[]" in created[0]
+
+
+def test_embeddings_schema_leaves_the_legacy_table_to_the_migration():
+    from workspace_secretary.db import schema
+
+    cur = MagicMock()
+    cur.fetchone.return_value = (True,)  # email_embeddings still exists
+    cur.fetchall.return_value = []
+
+    schema.initialize_embeddings_schema(cur, "vector", 3)
+
+    statements = [c.args[0] for c in cur.execute.call_args_list]
+    assert not any("FROM email_embeddings" in s for s in statements)
+    assert not any("DROP TABLE" in s for s in statements)
@@ -0,0 +1,261 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from workspace_secretary.config import SyncConfig
+from workspace_secretary.engine import api
+from workspace_secretary.engine.idle_supervisor import (
+    IdleSupervisor,
+    parse_idle_responses,
+    plan_watch,
+)
+from workspace_secretary.engine.imap_sync import ImapClient
+
+
+def test_plan_watch_spends_the_idle_budget_on_hot_folders_in_order():
+    folders = ["INBOX", "Sent", "Receipts", "[Gmail]/All Mail", "Travel"]
+
+    idle, polled = plan_watch(folders, ["Travel", "INBOX", "Missing", "Receipts"], 2)
+
+    assert idle == ["Travel", "INBOX"]
+    assert polled == ["Sent", "Receipts", "[Gmail]/All Mail"]
+    assert plan_watch(folders, ["INBOX"], 0) == ([], folders)
+
+
+def test_status_poll_reports_a_folder_only_when_its_status_moves():
+    changed = []
+    supervisor = IdleSupervisor(
+        MagicMock(), [], ["Sent"], MagicMock(), changed.append, status_interval=60
+    )
+    client = MagicMock()
+    client.get_folder_status.side_effect = [
+        {"messages": 10, "uidnext": 11, "uidvalidity": 1, "highestmodseq": 90},
+        {"messages": 10, "uidnext": 11, "uidvalidity": 1, "highestmodseq": 90},
+        {"messages": 10, "uidnext": 11, "uidvalidity": 1, "highestmodseq": 95},
+    ]
+
+    assert [supervisor.poll_folder(client, "Sent") for _ in range(3)] == [
+        False,
+        False,
+        True,
+    ]
+    assert changed == ["Sent"]
+    assert supervisor.connections == 1
+
+
+def test_get_folder_status_does_not_select_the_folder(mock_imap_config):
+    client = ImapClient(mock_imap_config)
+    mock_imap = MagicMock()
+    mock_imap.folder_status.return_value = {
+        b"MESSAGES": 4,
+        b"UIDNEXT": 120,
+        b"UIDVALIDITY": 7,
+        b"HIGHESTMODSEQ": 900,
+    }
+
+    with (
+        patch.object(client, "_get_client", return_value=mock_imap),
+        patch.object(client, "has_condstore_capability", return_value=True),
+    ):
+        status = client.get_folder_status("Sent")
+
+    mock_imap.folder_status.assert_called_once_with(
+        "Sent", [b"MESSAGES", b"UIDNEXT", b"UIDVALIDITY", b"HIGHESTMODSEQ"]
+    )
+    mock_imap.select_folder.assert_not_called()
+    assert status == {
+        "messages": 4,
+        "uidnext": 120,
+        "uidvalidity": 7,
+        "highestmodseq": 900,
+    }
+
+
+def test_parse_idle_responses_sorts_what_can_be_applied():
+    events = parse_idle_responses(
+        [
+            (b"OK", b"Still here"),
+            (21, b"EXISTS"),
+            (4, b"FETCH", (b"UID", 50, b"FLAGS", (b"\\Seen",), b"MODSEQ", (880,))),
+            (6, b"FETCH", (b"FLAGS", (b"\\Flagged",))),
+            (b"VANISHED", b"41,43"),
+        ]
+    )
+
+    assert events.exists and not events.expunged
+    assert events.vanished == [41, 43]
+    assert events.fetched[50][b"MODSEQ"] == (880,)
+    assert events.sequences == [6]
+
+
+def _idle_database(folder_state=None):
+    database = MagicMock()
+    database.get_folder_state.return_value = folder_state
+    return database
+
+
+def test_idle_flag_changes_are_applied_without_a_folder_sync():
+    database = _idle_database()
+    client = MagicMock()
+    client.resolve_idle_fetches.return_value = {
+        50: {"flags": ["\\Seen"], "modseq": 880, "gmail_labels": None}
+    }
+    responses = [
+        (b"VANISHED", b"41,43"),
+        (3, b"FETCH", (b"FLAGS", (b"\\Seen",))),
+    ]
+
+    with (
+        patch.object(api.state, "database", database),
+        patch.object(api, "_schedule_folder_sync") as schedule,
+    ):
+        api._handle_idle_responses(client, "Travel", responses)
+
+    database.delete_emails_bulk.assert_called_once_with("Travel", [41, 43])
+    client.resolve_idle_fetches.assert_called_once_with({}, [3])
+    database.reconcile_email_flags.assert_called_once_with(
+        "Travel", client.resolve_idle_fetches.return_value
+    )
+    schedule.assert_not_called()
+
+
+def test_idle_exists_fetches_only_uids_from_the_stored_uidnext():
+    database = _idle_database({"uidvalidity": 7, "uidnext": 120, "highestmodseq": 900})
+    client = MagicMock()
+    client.selected_uidvalidity = 7
+    client.search_uids_from.return_value = [120, 121]
+
+    with (
+        patch.object(api.state, "database", database),
+        patch.object(api, "_store_email_batch", return_value=[120, 121]) as store,
+        patch.object(api, "_schedule_folder_sync") as schedule,
+    ):
+        api._handle_idle_responses(client, "Travel", [(31, b"EXISTS")])
+
+    client.search_uids_from.assert_called_once_with("Travel", 120)
+    store.assert_called_once_with(client, "Travel", [120, 121])
+    database.save_folder_state.assert_called_once_with(
+        folder="Travel", uidvalidity=7, uidnext=122, highestmodseq=900
+    )
+    schedule.assert_not_called()
+
+
+def test_idle_exists_keeps_skipped_uids_pending():
+    database = _idle_database({"uidvalidity": 7, "uidnext": 120, "highestmodseq": 900})
+    client = MagicMock()
+    client.selected_uidvalidity = 7
+    client.search_uids_from.return_value = [120, 121, 122]
+
+    with (
+        patch.object(api.state, "database", database),
+        # 121's body is not available yet, so the fetch drops it
+        patch.object(api, "_store_email_batch", return_value=[120, 122]),
+        patch.object(api, "_schedule_folder_sync") as schedule,
+    ):
+        api._handle_idle_responses(client, "Travel", [(31, b"EXISTS")])
+
+    database.save_folder_state.assert_called_once_with(
+        folder="Travel", uidvalidity=7, uidnext=121, highestmodseq=900
+    )
+    schedule.assert_called_once_with("Travel")
+
+
+def test_idle_exists_after_uidvalidity_change_falls_back_to_a_folder_sync():
+    database = _idle_database({"uidvalidity": 7, "uidnext": 120, "highestmodseq": 900})
+    client = MagicMock()
+    client.selected_uidvalidity = 8
+
+    with (
+        patch.object(api.state, "database", database),
+        patch.object(api, "_schedule_folder_sync") as schedule,
+    ):
+        api._handle_idle_responses(client, "Travel", [(31, b"EXISTS")])
+
+    client.search_uids_from.assert_not_called()
+    database.save_folder_state.assert_not_called()
+    schedule.assert_called_once_with("Travel")
+
+
+def test_idle_expunge_falls_back_to_a_folder_sync():
+    database = _idle_database()
+    client = MagicMock()
+    responses = [(3, b"EXPUNGE"), (5, b"FETCH", (b"FLAGS", ()))]
+
+    with (
+        patch.object(api.state, "database", database),
+        patch.object(api, "_schedule_folder_sync") as schedule,
+    ):
+        api._handle_idle_responses(client, "INBOX", responses)
+
+    # Sequence 5 may now name a different message; the sync reconciles it
+    client.resolve_idle_fetches.assert_not_called()
+    schedule.assert_called_once_with("INBOX")
+
+
+def test_resolve_idle_fetches_maps_sequence_numbers_on_the_same_connection(
+    mock_imap_config,
+):
+    client = ImapClient(mock_imap_config)
+    mock_imap = MagicMock()
+    mock_imap.use_uid = True
+
+    def _fetch(messages, attrs):
+        if mock_imap.use_uid:
+            return {51: {b"FLAGS": (b"\\Seen", b"\\Answered"), b"MODSEQ": (882,)}}
+        return {6: {b"UID": 52, b"FLAGS": (b"\\Flagged",), b"MODSEQ": (881,)}}
+
+    mock_imap.fetch.side_effect = _fetch
+    by_uid = {
+        50: {b"UID": 50, b"FLAGS": (b"\\Seen",), b"MODSEQ": (880,)},
+        # A MODSEQ-only update must not be read as "no flags"
+        51: {b"UID": 51, b"MODSEQ": (882,)},
+    }
+
+    with (
+        patch.object(client, "_get_client", return_value=mock_imap),
+        patch.object(client, "has_condstore_capability", return_value=True),
+        patch.object(client, "_has_gmail_extensions", return_value=False),
+    ):
+        changed = client.resolve_idle_fetches(by_uid, [6])
+
+    assert [c.args for c in mock_imap.fetch.call_args_list] == [
+        ([51], ["UID", "FLAGS", "MODSEQ"]),
+        ([6], ["UID", "FLAGS", "MODSEQ"]),
+    ]
+    assert mock_imap.use_uid is True
+    assert changed == {
+        50: {"flags": ["\\Seen"], "modseq": 880, "gmail_labels": None},
+        51: {"flags": ["\\Seen", "\\Answered"], "modseq": 882, "gmail_labels": None},
+        52: {"flags": ["\\Flagged"], "modseq": 881, "gmail_labels": None},
+    }
+
+
+def test_debounced_sync_collapses_per_folder_and_scopes_the_sync():
+    async def scenario():
+        await api.debounced_sync("Travel")
+        await api.debounced_sync("Travel")
+        await api.debounced_sync("INBOX")
+        await asyncio.gather(*api.state._sync_debounce_tasks.values())
+
+    sync = AsyncMock()
+    with (
+        patch.object(api.state, "_sync_debounce_delay", 0),
+        patch.object(api.state, "_sync_debounce_tasks", {}),
+        patch.object(api, "sync_emails_parallel", sync),
+    ):
+        asyncio.run(scenario())
+
+    assert [c.args for c in sync.await_args_list] == [(["Travel"],), (["INBOX"],)]
+
+
+def test_sync_config_reads_watch_settings():
+    config = SyncConfig.from_dict(
+        {"idle_folders": ["INBOX", "Travel"], "idle_max_connections": "2"}
+    )
+    assert config.idle_folders == ["INBOX", "Travel"]
+    assert config.idle_max_connections == 2
+    assert SyncConfig().status_interval == 60
+
+    with pytest.raises(ValueError):
+        SyncConfig(status_interval=0)
@@ -0,0 +1,129 @@
+from unittest.mock import MagicMock, patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from workspace_secretary.engine.api import (
+    EmailBatchOperation,
+    _group_batch_operations,
+    app,
+    state,
+)
+from workspace_secretary.engine.imap_sync import (
+    ImapClient,
+    format_uid_set,
+    parse_uid_set,
+    uid_set_chunks,
+)
+
+
+def test_format_uid_set_compresses_runs():
+    assert format_uid_set([12, 1, 5, 9, 10, 11, 5]) == "1,5,9:12"
+    assert format_uid_set([]) == ""
+    assert parse_uid_set(format_uid_set([3, 4, 8])) == [3, 4, 8]
+
+
+def test_uid_set_chunks_respect_max_len():
+    uids = list(range(1, 200, 2))
+    chunks = uid_set_chunks(uids, max_len=50)
+
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert [uid for chunk in chunks for uid in parse_uid_set(chunk)] == uids
+    assert uid_set_chunks(list(range(1, 2001))) == ["1:2000"]
+
+
+def _client_with(mock_imap_config, capabilities):
+    client = ImapClient(mock_imap_config)
+    mock_imap = MagicMock()
+    patches = (
+        patch.object(client, "_get_client", return_value=mock_imap),
+        patch.object(client, "select_folder"),
+        patch.object(client, "get_capabilities", return_value=capabilities),
+    )
+    return client, mock_imap, patches
+
+
+def test_mark_email_batch_sends_one_store(mock_imap_config):
+    client, mock_imap, patches = _client_with(mock_imap_config, ["CONDSTORE"])
+
+    with patches[0], patches[1], patches[2]:
+        results = client.mark_email_batch([1, 2, 3, 7], "INBOX", "read")
+
+    mock_imap.add_flags.assert_called_once_with("1:3,7", "\\Seen", silent=True)
+    mock_imap.fetch.assert_not_called()
+    assert results == {1: True, 2: True, 3: True, 7: True}
+
+
+def test_move_email_batch_uses_move_or_falls_back(mock_imap_config):
+    client, mock_imap, patches = _client_with(mock_imap_config, ["MOVE"])
+    with patches[0], patches[1], patches[2]:
+        client.move_email_batch(list(range(1, 2001)), "INBOX", "[Gmail]/All Mail")
+    mock_imap.move.assert_called_once_with("1:2000", "[Gmail]/All Mail")
+
+    client, mock_imap, patches = _client_with(mock_imap_config, ["UIDPLUS"])
+    with patches[0], patches[1], patches[2]:
+        client.move_email_batch([4, 5], "INBOX", "Archive")
+    mock_imap.copy.assert_called_once_with("4:5", "Archive")
+    mock_imap.uid_expunge.assert_called_once_with("4:5")
+    mock_imap.expunge.assert_not_called()
+
+
+def test_group_batch_operations_orders_moves_last():
+    ops = [
+        EmailBatchOperation(
+            uid=1, folder="INBOX", action="move", destination="[Gmail]/All Mail"
+        ),
+        EmailBatchOperation(uid=1, folder="INBOX", action="mark_read"),
+        EmailBatchOperation(uid=2, folder="INBOX", action="mark_read"),
+        EmailBatchOperation(
+            uid=2, folder="INBOX", action="add_labels", labels=["Newsletter"]
+        ),
+        EmailBatchOperation(uid=9, folder="Sent", action="mark_read"),
+    ]
+
+    grouped = _group_batch_operations(ops)
+
+    assert [g[0] for g in grouped["INBOX"]] == ["add_labels", "mark_read", "move"]
+    assert grouped["INBOX"][1][3] == [1, 2]
+    assert grouped["Sent"] == [("mark_read", None, (), [9])]
+
+
+def test_batch_endpoint_groups_and_updates_db_once():
+    state.enrolled = True
+    state.database = MagicMock()
+    state.imap_client = MagicMock()
+    state.imap_client.mark_email_batch.return_value = {1: True, 2: True, 3: False}
+    try:
+        response = TestClient(app).post(
+            "/api/email/batch",
+            json={
+                "operations": [
+                    {"uid": uid, "folder": "INBOX", "action": "mark_read"}
+                    for uid in (1, 2, 3)
+                ]
+            },
+        )
+    finally:
+        imap_client = state.imap_client
+        state.imap_client = None
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["succeeded"] == 2
+    assert body["failed"] == 1
+    imap_client.mark_email_batch.assert_called_once_with([1, 2, 3], "INBOX", "read")
+    state.database.mark_emails_read_bulk.assert_called_once_with("INBOX", [1, 2], True)
+
+
+def test_batch_endpoint_rejects_unknown_action():
+    state.enrolled = True
+    state.imap_client = MagicMock()
+    try:
+        response = TestClient(app).post(
+            "/api/email/batch",
+            json={"operations": [{"uid": 1, "folder": "INBOX", "action": "nuke"}]},
+        )
+    finally:
+        state.imap_client = None
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,200 @@
+import email
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from workspace_secretary.engine import api
+from workspace_secretary.engine.imap_sync import (
+    ImapClient,
+    decode_body_part,
+    message_attachment_parts,
+    walk_bodystructure,
+)
+
+_TEXT_PLAIN = (
+    b"TEXT",
+    b"PLAIN",
+    (b"CHARSET", b"utf-8"),
+    None,
+    None,
+    b"QUOTED-PRINTABLE",
+    10,
+    1,
+    None,
+    None,
+    None,
+)
+_TEXT_HTML = (
+    b"TEXT",
+    b"HTML",
+    (b"CHARSET", b"utf-8"),
+    None,
+    None,
+    b"BASE64",
+    10,
+    1,
+    None,
+    None,
+    None,
+)
+_PDF = (
+    b"APPLICATION",
+    b"PDF",
+    (b"NAME", b"report.pdf"),
+    None,
+    None,
+    b"BASE64",
+    200000,
+    None,
+    (b"ATTACHMENT", (b"FILENAME", b"report.pdf")),
+    None,
+)
+_ALTERNATIVE = (
+    [_TEXT_PLAIN, _TEXT_HTML],
+    b"ALTERNATIVE",
+    (b"BOUNDARY", b"b"),
+    None,
+    None,
+)
+_MIXED = ([_ALTERNATIVE, _PDF], b"MIXED", (b"BOUNDARY", b"a"), None, None)
+
+
+def test_walk_bodystructure_numbers_parts_and_flags_attachments():
+    parts = walk_bodystructure(_MIXED)
+
+    assert [(p.part, p.content_type, p.is_attachment) for p in parts] == [
+        ("1.1", "text/plain", False),
+        ("1.2", "text/html", False),
+        ("2", "application/pdf", True),
+    ]
+    assert parts[2].filename == "report.pdf"
+    assert walk_bodystructure(_TEXT_PLAIN)[0].part == "1"
+
+
+def test_decode_body_part_handles_transfer_encodings():
+    assert decode_body_part(b"caf=C3=A9", "quoted-printable", "utf-8") == "café"
+    assert decode_body_part(b"PGI+aGk8L2I+", "base64", "utf-8") == "<b>hi</b>"
+    assert decode_body_part(b"plain", "7bit", "unknown-charset") == "plain"
+
+
+def test_fetch_email_bodies_skips_attachment_parts(mock_imap_config):
+    client = ImapClient(mock_imap_config)
+    mock_imap = MagicMock()
+    mock_imap.fetch.side_effect = [
+        {7: {b"BODYSTRUCTURE": _MIXED}, 8: {b"BODYSTRUCTURE": _MIXED}},
+        {
+            7: {b"BODY[1.1]": b"hello", b"BODY[1.2]": b"PGI+aGk8L2I+"},
+            8: {b"BODY[1.1]": b"second", b"BODY[1.2]": b""},
+        },
+    ]
+
+    with (
+        patch.object(client, "_get_client", return_value=mock_imap),
+        patch.object(client, "select_folder"),
+    ):
+        bodies = client.fetch_email_bodies([7, 8], "INBOX")
+
+    assert bodies[7] == ("hello", "<b>hi</b>")
+    assert bodies[8][0] == "second"
+    assert mock_imap.fetch.call_count == 2
+    body_fetch = mock_imap.fetch.call_args_list[1][0]
+    assert sorted(body_fetch[0]) == [7, 8]
+    assert body_fetch[1] == ["BODY.PEEK[1.1]", "BODY.PEEK[1.2]"]
+
+
+def test_fetch_email_headers_uses_bounded_preview(mock_imap_config):
+    client = ImapClient(mock_imap_config)
+    mock_imap = MagicMock()
+    mock_imap.fetch.return_value = {
+        3: {
+            b"BODY[HEADER]": (
+                b"Subject: Quarterly\r\nFrom: a@example.com\r\n"
+                b"To: b@example.com\r\nMessage-ID: <3@example.com>\r\n\r\n"
+            ),
+            b"BODY[TEXT]<0>": b"Numbers attached",
+            b"BODYSTRUCTURE": _MIXED,
+            b"FLAGS": (b"\\Seen",),
+            b"RFC822.SIZE": 250000,
+        }
+    }
+
+    with (
+        patch.object(client, "_get_client", return_value=mock_imap),
+        patch.object(client, "select_folder"),
+        patch.object(client, "get_capabilities", return_value=[]),
+    ):
+        emails = client.fetch_email_headers([3], "INBOX", preview_bytes=8)
+
+    email_obj = emails[3]
+    assert "BODY.PEEK[TEXT]<0.8>" in mock_imap.fetch.call_args[0][1]
+    assert "BODY.PEEK[]" not in mock_imap.fetch.call_args[0][1]
+    assert email_obj.subject == "Quarterly"
+    assert email_obj.content.text == "Numbers "
+    assert email_obj.has_attachments
+    assert email_obj.attachment_filenames == ["report.pdf"]
+    assert email_obj.flags == ["\\Seen"]
+
+
+def test_fetch_attachment_part_fetches_only_that_section(mock_imap_config):
+    client = ImapClient(mock_imap_config)
+    mock_imap = MagicMock()
+    mock_imap.fetch.side_effect = [
+        {7: {b"BODYSTRUCTURE": _MIXED}},
+        {7: {b"BODY[2]": b"JVBERi0x"}},
+    ]
+
+    with (
+        patch.object(client, "_get_client", return_value=mock_imap),
+        patch.object(client, "select_folder"),
+    ):
+        att = client.fetch_attachment_part(7, "INBOX", "report.pdf")
+
+    assert att.part == "2"
+    assert att.data == b"%PDF-1"
+    assert mock_imap.fetch.call_args_list[1][0] == ([7], ["BODY.PEEK[2]"])
+
+
+def test_message_attachment_parts_match_bodystructure_numbering():
+    raw = (
+        b"Content-Type: multipart/mixed; boundary=a\r\n\r\n"
+        b"--a\r\nContent-Type: multipart/alternative; boundary=b\r\n\r\n"
+        b"--b\r\nContent-Type: text/plain\r\n\r\nhi\r\n"
+        b"--b\r\nContent-Type: text/html\r\n\r\n<b>hi</b>\r\n--b--\r\n"
+        b"--a\r\nContent-Type: application/pdf; name=report.pdf\r\n"
+        b"Content-Disposition: attachment; filename=report.pdf\r\n"
+        b"Content-Transfer-Encoding: base64\r\n\r\nJVBERi0x\r\n--a--\r\n"
+    )
+
+    parts = message_attachment_parts(email.message_from_bytes(raw))
+
+    assert [(p.part, p.filename, p.data) for p in parts] == [
+        ("2", "report.pdf", b"%PDF-1")
+    ]
+
+
+def test_hydrate_backs_off_uids_that_return_no_body():
+    database = MagicMock()
+    database.hydrate_email_bodies.return_value = 1
+    client = MagicMock()
+    client.fetch_email_bodies.return_value = {5: ("text", "")}
+
+    with patch.object(api.state, "database", database):
+        assert api._hydrate_with_client(client, "INBOX", [5, 6]) == 1
+
+    database.record_hydrate_failures.assert_called_once_with("INBOX", [6])
+    database.hydrate_email_bodies.assert_called_once_with("INBOX", {5: ("text", "")})
+
+
+def test_hydrate_backs_off_the_batch_when_the_fetch_fails():
+    database = MagicMock()
+    client = MagicMock()
+    client.fetch_email_bodies.side_effect = ConnectionError("gone")
+
+    with (
+        patch.object(api.state, "database", database),
+        pytest.raises(ConnectionError),
+    ):
+        api._hydrate_with_client(client, "INBOX", [5, 6])
+
+    database.record_hydrate_failures.assert_called_once_with("INBOX", [5, 6])
+    database.hydrate_email_bodies.assert_not_called()
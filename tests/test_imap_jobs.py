@@ -0,0 +1,122 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from workspace_secretary.db.notify import NotificationHub
+from workspace_secretary.db.queries import imap_jobs as imap_jobs_q
+from workspace_secretary.executor import imap_executor
+
+
+def _notifications(cursor):
+    return [
+        c.args[1]
+        for c in cursor.execute.call_args_list
+        if c.args[0] == "SELECT pg_notify(%s, %s)"
+    ]
+
+
+def test_create_job_notifies_the_executor_in_the_same_transaction(fake_db):
+    job_id = imap_jobs_q.create_job(fake_db, "sync")
+
+    assert _notifications(fake_db.cursor) == [(imap_jobs_q.EXECUTOR_CHANNEL, job_id)]
+    fake_db.conn.commit.assert_called_once()
+
+
+def test_mark_approved_notifies_only_when_the_status_changed(fake_db):
+    fake_db.cursor.rowcount = 1
+    imap_jobs_q.mark_approved(fake_db, "job-1")
+    assert _notifications(fake_db.cursor) == [(imap_jobs_q.EXECUTOR_CHANNEL, "job-1")]
+
+    fake_db.cursor.reset_mock()
+    fake_db.cursor.rowcount = 0
+    imap_jobs_q.mark_approved(fake_db, "job-1")
+    assert _notifications(fake_db.cursor) == []
+
+
+def test_claim_next_eligible_job_is_one_statement_in_priority_order(fake_db):
+    fake_db.cursor.fetchone.return_value = ("job-1", "triage_preview", "approved")
+    fake_db.cursor.description = [("job_id",), ("job_type",), ("claimed_status",)]
+
+    job = imap_jobs_q.claim_next_eligible_job(fake_db, imap_executor.JOB_PRIORITY)
+
+    sql, params = fake_db.cursor.execute.call_args_list[0].args
+    assert sql == imap_jobs_q.CLAIM_NEXT_ELIGIBLE_SQL
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert params["priority"][:3] == [
+        "pending:sync",
+        "pending:triage_preview",
+        "approved:triage_preview",
+    ]
+    assert params["job_types"] == [
+        "bulk_cleanup",
+        "sync",
+        "triage_apply",
+        "triage_preview",
+    ]
+    assert job == {
+        "job_id": "job-1",
+        "job_type": "triage_preview",
+        "claimed_status": "approved",
+    }
+    assert _notifications(fake_db.cursor) == [(imap_jobs_q.JOB_EVENTS_CHANNEL, "job-1")]
+
+
+def test_job_writes_notify_watchers_of_that_job(fake_db):
+    fake_db.cursor.fetchone.return_value = (7,)
+
+    imap_jobs_q.append_event(fake_db, "job-1", "Job claimed")
+    imap_jobs_q.update_progress(fake_db, "job-1", processed=50)
+    imap_jobs_q.mark_finished(fake_db, "job-1", status="completed")
+
+    assert (
+        _notifications(fake_db.cursor)
+        == [(imap_jobs_q.JOB_EVENTS_CHANNEL, "job-1")] * 3
+    )
+
+
+def test_hub_wakes_only_matching_subscribers():
+    async def scenario():
+        hub = NotificationHub("postgresql://", [imap_jobs_q.JOB_EVENTS_CHANNEL])
+        with hub.subscription(imap_jobs_q.JOB_EVENTS_CHANNEL, "job-1") as mine:
+            other = hub.subscribe(imap_jobs_q.JOB_EVENTS_CHANNEL, "job-2")
+            hub.dispatch(imap_jobs_q.JOB_EVENTS_CHANNEL, "job-1")
+            hub.dispatch(imap_jobs_q.JOB_EVENTS_CHANNEL, "job-1")
+            return await mine.wait(0.01), await mine.wait(0.01), await other.wait(0.01)
+
+    # Two notifications before the subscriber looks coalesce into one wake-up
+    assert asyncio.run(scenario()) == (True, False, False)
+
+    hub = NotificationHub("postgresql://", [imap_jobs_q.JOB_EVENTS_CHANNEL])
+    with pytest.raises(ValueError):
+        hub.subscribe(imap_jobs_q.EXECUTOR_CHANNEL)
+
+
+def test_hub_listens_and_wakes_everyone_on_connect():
+    hub = NotificationHub(
+        "postgresql://",
+        [imap_jobs_q.EXECUTOR_CHANNEL, imap_jobs_q.JOB_EVENTS_CHANNEL],
+    )
+    executor = hub.subscribe(imap_jobs_q.EXECUTOR_CHANNEL)
+    watcher = hub.subscribe(imap_jobs_q.JOB_EVENTS_CHANNEL, "job-1")
+    woken: list[tuple[bool, bool]] = []
+
+    async def _notifies():
+        woken.append((executor._event.is_set(), watcher._event.is_set()))
+        executor._event.clear()
+        watcher._event.clear()
+        yield SimpleNamespace(channel=imap_jobs_q.JOB_EVENTS_CHANNEL, payload="job-1")
+        woken.append((executor._event.is_set(), watcher._event.is_set()))
+
+    conn = MagicMock()
+    conn.execute = AsyncMock()
+    conn.notifies = _notifies
+
+    asyncio.run(hub._listen(conn))
+
+    assert [c.args[0] for c in conn.execute.await_args_list] == [
+        'LISTEN "imap_executor"',
+        'LISTEN "imap_job_events"',
+    ]
+    assert woken == [(True, True), (False, True)]
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from workspace_secretary.engine.api import _run_imap_job, app, state
+from workspace_secretary.engine.imap_pool import ImapConnectionPool, PoolTimeout
+from workspace_secretary.engine.imap_sync import ImapClient
+
+
+def _fake_client(folder=None):
+    client = MagicMock()
+    client.current_folder = folder
+    client.reconnects = 0
+    return client
+
+
+def _pool(clients, reserved=0):
+    it = iter(clients)
+    pool = ImapConnectionPool(lambda: next(it), size=len(clients), reserved=reserved)
+    pool.start()
+    return pool
+
+
+def test_lease_prefers_connection_with_folder_selected():
+    inbox, sent = _fake_client("INBOX"), _fake_client("Sent")
+    pool = _pool([inbox, sent])
+
+    with pool.lease("Sent") as client:
+        assert client is sent
+    with pool.lease("Drafts") as client:
+        assert client is inbox
+
+    metrics = pool.metrics()
+    assert metrics["leases"] == 2
+    assert metrics["folder_hits"] == 1
+    assert metrics["idle"] == 2
+    pool.close()
+
+
+def test_background_leases_leave_reserved_connections_free():
+    pool = _pool([_fake_client(), _fake_client()], reserved=1)
+
+    with pool.lease(background=True):
+        with pytest.raises(PoolTimeout):
+            with pool.lease(background=True, timeout=0.05):
+                pass
+        with pool.lease(timeout=0.05):
+            pass
+
+    assert pool.metrics()["timeouts"] == 1
+    pool.close()
+
+
+def test_lease_waits_for_release_and_counts_reconnects():
+    conn = _fake_client()
+    pool = _pool([conn])
+    leased = threading.Event()
+
+    def hold():
+        with pool.lease() as client:
+            leased.set()
+            client.reconnects += 1
+            threading.Event().wait(0.05)
+
+    worker = threading.Thread(target=hold)
+    worker.start()
+    leased.wait()
+    with pool.lease(timeout=5):
+        pass
+    worker.join()
+
+    metrics = pool.metrics()
+    assert metrics["reconnects"] == 1
+    assert metrics["wait_seconds_max"] > 0
+    pool.close()
+
+
+def test_ensure_selected_skips_redundant_select(mock_imap_config):
+    client = ImapClient(mock_imap_config)
+    client.connected = True
+
+    mock_imap = MagicMock()
+    mock_imap.select_folder.return_value = {}
+
+    with patch.object(client, "_get_client", return_value=mock_imap):
+        client.ensure_selected("INBOX", readonly=True)
+        client.ensure_selected("INBOX", readonly=True)
+        client.ensure_selected("INBOX")
+        client.ensure_selected("INBOX", readonly=True)
+        client.ensure_selected("INBOX")
+
+    calls = mock_imap.select_folder.call_args_list
+    assert [c.kwargs["readonly"] for c in calls] == [True, False]
+
+
+def test_mark_read_runs_on_pool_with_folder_affinity():
+    conn = _fake_client("INBOX")
+    state.enrolled = True
+    state.database = MagicMock()
+    state.imap_client = MagicMock()
+    state.imap_pool = _pool([_fake_client("Sent"), conn])
+    try:
+        response = TestClient(app).post(
+            "/api/email/mark-read", json={"uid": 9, "folder": "INBOX"}
+        )
+        metrics = state.imap_pool.metrics()
+    finally:
+        state.imap_pool.close()
+        state.imap_pool = None
+        state.imap_client = None
+
+    assert response.status_code == status.HTTP_200_OK
+    conn.mark_email.assert_called_once_with(9, "INBOX", "read")
+    state.database.mark_email_read.assert_called_once_with(9, "INBOX", True)
+    assert metrics["folder_hits"] == 1
+
+
+def test_shared_client_fallback_runs_one_call_at_a_time():
+    active = []
+    overlaps = []
+
+    def _job(client, n):
+        active.append(n)
+        overlaps.append(len(active))
+        time.sleep(0.02)
+        active.remove(n)
+        return n
+
+    async def scenario():
+        return await asyncio.gather(*(_run_imap_job(_job, n) for n in range(4)))
+
+    state.imap_client = MagicMock()
+    try:
+        results = asyncio.run(scenario())
+    finally:
+        state.imap_client = None
+
+    assert results == [0, 1, 2, 3]
+    assert max(overlaps) == 1
@@ -0,0 +1,108 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from workspace_secretary.engine import imap_sync
+from workspace_secretary.engine.imap_sync import (
+    ImapClient,
+    parse_uid_set,
+    parse_vanished_response,
+    select_with_parameters,
+    supports_select_parameters,
+)
+
+
+def test_parse_uid_set_expands_ranges():
+    assert parse_uid_set(b"41,43:45") == [41, 43, 44, 45]
+    assert parse_uid_set("7:5") == [5, 6, 7]
+    assert parse_uid_set(12) == [12]
+    assert parse_uid_set(None) == []
+
+
+def test_parse_vanished_response_skips_earlier_tag():
+    assert parse_vanished_response((b"VANISHED", b"3,9:10")) == [3, 9, 10]
+    assert parse_vanished_response((b"VANISHED", (b"EARLIER",), b"1:2")) == [1, 2]
+    assert parse_vanished_response((5, b"EXISTS")) == []
+
+
+def _qresync_client(mock_imap_config, select_response):
+    client = ImapClient(mock_imap_config)
+    client.qresync_enabled = True
+
+    mock_imap = MagicMock()
+    mock_imap._normalise_folder.side_effect = lambda f: f.encode()
+    mock_imap._imap._simple_command.return_value = ("OK", [b"EXAMINE completed"])
+    mock_imap._process_select_response.return_value = select_response
+    return client, mock_imap
+
+
+def test_select_folder_qresync_reports_vanished_and_changes(mock_imap_config):
+    select_response = {
+        b"EXISTS": 20,
+        b"UIDVALIDITY": 7,
+        b"UIDNEXT": 120,
+        b"HIGHESTMODSEQ": 900,
+        b"VANISHED": [b"(EARLIER) 41,43:45"],
+        b"FETCH": [b"4 (UID 50 FLAGS (\\Seen) MODSEQ (880))"],
+    }
+    client, mock_imap = _qresync_client(mock_imap_config, select_response)
+
+    with (
+        patch.object(client, "_get_client", return_value=mock_imap),
+        patch.object(client, "_has_gmail_extensions", return_value=False),
+    ):
+        info = client.select_folder_qresync("INBOX", 7, 850)
+
+    command_args = mock_imap._imap._simple_command.call_args[0]
+    assert command_args[0] == "EXAMINE"
+    assert command_args[2] == b"(QRESYNC (7 850))"
+    assert info["uidvalidity"] == 7
+    assert info["highestmodseq"] == 900
+    assert info["vanished"] == [41, 43, 44, 45]
+    assert info["changed"] == {
+        50: {"flags": ["\\Seen"], "modseq": 880, "gmail_labels": None}
+    }
+    assert client.current_folder == "INBOX"
+
+
+def test_select_folder_qresync_requires_enable(mock_imap_config):
+    client = ImapClient(mock_imap_config)
+    with pytest.raises(ValueError):
+        client.select_folder_qresync("INBOX", 1, 1)
+
+
+def test_select_parameters_need_a_known_imapclient_version():
+    client = MagicMock()
+
+    with patch.object(imap_sync.imapclient, "__version__", "3.0.1"):
+        assert supports_select_parameters(client)
+    with patch.object(imap_sync.imapclient, "__version__", "9.0.0"):
+        assert not supports_select_parameters(client)
+        with pytest.raises(NotImplementedError):
+            select_with_parameters(client, "INBOX", b"(QRESYNC (1 1))")
+    client._imap._simple_command.assert_not_called()
+
+    # The installed imapclient still has the internals the helper relies on
+    import imaplib
+
+    for name in imap_sync._SELECT_PARAMETERS_INTERNALS[1:]:
+        assert hasattr(imap_sync.imapclient.IMAPClient, name)
+    assert hasattr(imaplib.IMAP4, "_simple_command")
+
+
+def test_connect_skips_qresync_when_select_parameters_are_unsupported(
+    mock_imap_config,
+):
+    client = ImapClient(mock_imap_config)
+
+    with (
+        patch.object(imap_sync.imapclient, "IMAPClient") as imap_cls,
+        patch.object(imap_sync, "get_access_token", return_value=("token", None)),
+        patch.object(client, "get_capabilities", return_value=["QRESYNC", "CONDSTORE"]),
+        patch.object(imap_sync, "supports_select_parameters", return_value=False),
+    ):
+        client.connect()
+
+    # Falls back to CONDSTORE, so syncs use a plain SELECT
+    assert not client.has_qresync_capability()
+    imap_cls.return_value.enable.assert_called_once_with("CONDSTORE")
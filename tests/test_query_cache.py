@@ -0,0 +1,88 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from workspace_secretary.engine.embeddings import (
+    CohereEmbeddingsClient,
+    EmbeddingResult,
+    EmbeddingsClient,
+    FallbackEmbeddingsClient,
+)
+from workspace_secretary.engine.query_cache import (
+    QueryEmbeddingCache,
+    embed_query_cached,
+    embedder_identity,
+    query_cache_key,
+)
+
+
+def _client(model="text-embedding-3-small"):
+    client = EmbeddingsClient(endpoint="http://localhost/v1", model=model)
+    client.embed_query = AsyncMock(
+        side_effect=lambda q: EmbeddingResult(q, [0.1, 0.2], model, "h", 3)
+    )
+    return client
+
+
+def test_repeated_query_skips_provider():
+    client = _client()
+    cache = QueryEmbeddingCache()
+
+    first = asyncio.run(embed_query_cached(client, "Invoices from last month", cache))
+    second = asyncio.run(
+        embed_query_cached(client, "  invoices   FROM last month ", cache)
+    )
+
+    client.embed_query.assert_awaited_once()
+    assert second.embedding == first.embedding
+    assert second.tokens_used == 0
+    assert cache.stats()["hits"] == 1
+
+
+def test_key_separates_provider_model_and_dimensions():
+    base = query_cache_key("openai_compat", "m", 1536, "q")
+
+    assert base != query_cache_key("cohere", "m", 1536, "q")
+    assert base != query_cache_key("openai_compat", "m2", 1536, "q")
+    assert base != query_cache_key("openai_compat", "m", 768, "q")
+    assert embedder_identity(
+        CohereEmbeddingsClient(api_key="k", model="embed-v4.0", dimensions=1024)
+    ) == ("cohere", "embed-v4.0", 1024)
+
+
+def test_lru_eviction_and_ttl():
+    cache = QueryEmbeddingCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", [1.0], "m")
+    cache.put("b", [2.0], "m")
+    cache.get("a")
+    cache.put("c", [3.0], "m")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+
+    with patch("workspace_secretary.engine.query_cache.time.monotonic") as now:
+        now.return_value = 10**9
+        assert cache.get("c") is None
+
+
+def test_shared_tier_fills_local_cache():
+    cache = QueryEmbeddingCache(database=MagicMock())
+    with patch(
+        "workspace_secretary.db.queries.embeddings.get_query_embedding",
+        return_value=[0.5],
+    ) as shared_get:
+        assert cache.get("k") == [0.5]
+        assert cache.get("k") == [0.5]
+
+    shared_get.assert_called_once_with(cache.database, "k", cache.ttl_seconds)
+    assert cache.stats()["shared_hits"] == 1
+
+
+def test_fallback_provider_results_are_not_cached():
+    primary, secondary = _client("primary"), _client("secondary")
+    client = FallbackEmbeddingsClient([primary, secondary])
+    client.current_index = 1
+    cache = QueryEmbeddingCache()
+
+    asyncio.run(embed_query_cached(client, "budget", cache))
+
+    assert cache.stats()["size"] == 0
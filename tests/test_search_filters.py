@@ -0,0 +1,42 @@
+from workspace_secretary.db.queries.search_filters import (
+    escape_like,
+    plan_email_filters,
+)
+
+
+def test_full_sender_address_becomes_leading_equality():
+    plan = plan_email_filters(
+        {
+            "is_unread": True,
+            "subject_contains": "invoice",
+            "from_addr": "Bob@Example.com",
+        }
+    )
+
+    assert [c.sql for c in plan] == [
+        "email_address(from_addr) = %s",
+        "subject ILIKE %s",
+        "is_unread = %s",
+    ]
+    assert plan[0].params == ["bob@example.com"]
+
+
+def test_trigram_filters_ordered_by_operand_length_short_ones_last():
+    plan = plan_email_filters(
+        {"from_addr": "bob", "to_addr": "ab", "subject_contains": "quarterly"},
+        alias="e",
+    )
+
+    assert [c.sql for c in plan] == [
+        "e.subject ILIKE %s",
+        "e.from_addr ILIKE %s",
+        "e.to_addr ILIKE %s",
+    ]
+
+
+def test_attachment_filter_escapes_wildcards():
+    plan = plan_email_filters({"attachment_filename": "q3_100%.pdf"})
+
+    assert plan[0].sql == "(attachment_filenames::text) ILIKE %s"
+    assert plan[0].params == ["%q3\\_100\\%.pdf%"]
+    assert escape_like("a\\b") == "a\\\\b"
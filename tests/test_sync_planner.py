@@ -0,0 +1,120 @@
+from unittest.mock import MagicMock
+
+from workspace_secretary.engine.sync_planner import (
+    SyncPlan,
+    UidRangeSet,
+    build_incremental_plan,
+    build_sync_plan,
+)
+
+
+def test_range_set_compresses_uids():
+    ranges = UidRangeSet.from_uids([9, 1, 2, 3, 5, 4, 12, 11])
+    assert ranges.ranges == [(1, 5), (9, 9), (11, 12)]
+    assert len(ranges) == 8
+    assert ranges.to_imap() == "1:5,9,11:12"
+
+
+def test_range_set_difference_excludes_synced():
+    ranges = UidRangeSet.difference(range(1, 101), {uid for uid in range(1, 91)})
+    assert ranges.ranges == [(91, 100)]
+    assert len(ranges) == 10
+
+
+def test_pop_highest_walks_ranges_newest_first():
+    ranges = UidRangeSet.from_uids([1, 2, 3, 10, 11])
+    assert ranges.pop_highest(3) == [11, 10, 3]
+    assert ranges.ranges == [(1, 2)]
+    assert len(ranges) == 2
+    assert ranges.pop_highest(10) == [2, 1]
+    assert not ranges
+
+
+def test_add_range_merges_adjacent():
+    ranges = UidRangeSet([(1, 3), (10, 12)])
+    ranges.add_range(4, 9)
+    assert ranges.ranges == [(1, 12)]
+    assert len(ranges) == 12
+
+
+def test_plan_extends_when_uidnext_advances():
+    plan = SyncPlan(
+        folder="INBOX",
+        uidvalidity=7,
+        uidnext=101,
+        highestmodseq=50,
+        pending=UidRangeSet.from_uids([98, 99, 100]),
+        total=3,
+    )
+
+    assert plan.revalidate({"uidvalidity": 7, "uidnext": 104, "highestmodseq": 60})
+    assert plan.total == 6
+    assert plan.uidnext == 104
+    assert plan.highestmodseq == 50
+    assert plan.next_batch(2) == [103, 102]
+    assert plan.synced == 2
+    assert not plan.done
+
+
+def test_plan_invalidated_on_uidvalidity_change():
+    plan = SyncPlan(
+        folder="INBOX",
+        uidvalidity=7,
+        uidnext=10,
+        highestmodseq=0,
+        pending=UidRangeSet.from_uids([1, 2]),
+        total=2,
+    )
+
+    assert not plan.revalidate({"uidvalidity": 8, "uidnext": 10})
+    assert plan.done
+
+
+def test_build_sync_plan_searches_once():
+    client = MagicMock()
+    client.search.return_value = list(range(1, 201))
+    database = MagicMock()
+    database.get_synced_uids.return_value = list(range(1, 151))
+
+    plan = build_sync_plan(
+        client,
+        database,
+        "INBOX",
+        {"uidvalidity": 3, "uidnext": 201, "highestmodseq": 9},
+    )
+
+    assert plan.total == 50
+    assert plan.pending.ranges == [(151, 200)]
+    client.search.assert_called_once_with("ALL", folder="INBOX")
+    client.select_folder.assert_not_called()
+
+
+def test_incremental_plan_covers_only_new_uids():
+    plan = build_incremental_plan(
+        "INBOX", {"uidvalidity": 3, "uidnext": 205, "highestmodseq": 9}, 201
+    )
+    assert plan.pending.ranges == [(201, 204)]
+    assert plan.total == 4
+
+    idle = build_incremental_plan("INBOX", {"uidvalidity": 3, "uidnext": 201}, 201)
+    assert idle.done
+
+
+def test_plan_holds_back_uidnext_for_skipped_uids_still_on_the_server():
+    plan = build_incremental_plan(
+        "INBOX", {"uidvalidity": 3, "uidnext": 206, "highestmodseq": 9}, 201
+    )
+    batch = plan.next_batch(10)
+
+    plan.record_stored(batch, [205, 204, 201])
+    assert plan.skipped.ranges == [(202, 203)]
+
+    # 202 was expunged; 203 is still there, so the next pass starts at it
+    plan.hold_back([203])
+    assert plan.uidnext == 203
+    assert build_incremental_plan(
+        "INBOX", {"uidnext": 206}, plan.uidnext
+    ).pending.ranges == [(203, 205)]
+
+    plan.hold_back([])
+    assert plan.uidnext == 203
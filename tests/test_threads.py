@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from workspace_secretary.db import schema
+from workspace_secretary.db.queries import emails as email_q
+from workspace_secretary.db.queries import threads as thread_q
+
+
+def test_thread_cursor_round_trip_and_rejects_garbage():
+    when = datetime(2025, 3, 1, 9, 30, tzinfo=timezone.utc)
+
+    cursor = thread_q.encode_thread_cursor(when, "gm:123")
+
+    assert thread_q.decode_thread_cursor(cursor) == (when, "gm:123")
+    with pytest.raises(ValueError):
+        thread_q.decode_thread_cursor("not-a-cursor")
+
+
+def test_threads_page_filters_folder_and_continues_after_cursor(fake_db):
+    when = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    fake_db.cursor.fetchall.return_value = [
+        {"thread_key": "gm:3", "last_date": when},
+        {"thread_key": "gm:2", "last_date": when},
+        {"thread_key": "gm:1", "last_date": when},
+    ]
+
+    threads, next_cursor = thread_q.get_threads_page(
+        fake_db, "INBOX", 2, cursor=thread_q.encode_thread_cursor(when, "gm:9")
+    )
+
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "FROM threads" in sql
+    assert "folders @> ARRAY[%s]::text[]" in sql
+    assert "(last_date, thread_key) < (%s, %s)" in sql
+    assert "ORDER BY last_date DESC, thread_key DESC" in sql
+    assert params == ["INBOX", when, "gm:9", 3]
+    assert [t["thread_key"] for t in threads] == ["gm:3", "gm:2"]
+    assert thread_q.decode_thread_cursor(next_cursor) == (when, "gm:2")
+
+
+def test_get_thread_selects_by_thread_key_preferring_folder_copy(fake_db):
+    fake_db.cursor.fetchall.return_value = [{"uid": 1}, {"uid": 2}]
+
+    thread = email_q.get_thread(fake_db, 2, "INBOX")
+
+    fake_db.cursor.execute.assert_called_once()
+    sql, params = fake_db.cursor.execute.call_args[0]
+    assert "WHERE thread_key = (" in sql
+    assert "DISTINCT ON (COALESCE(message_id" in sql
+    assert "(folder = %(folder)s) DESC" in sql
+    assert params == {"uid": 2, "folder": "INBOX"}
+    assert thread == [{"uid": 1}, {"uid": 2}]
+
+
+def test_get_thread_without_key_returns_the_single_email(fake_db):
+    fake_db.cursor.fetchall.return_value = []
+    fake_db.cursor.fetchone.return_value = {"uid": 7}
+
+    assert email_q.get_thread(fake_db, 7, "INBOX") == [{"uid": 7}]
+
+
+def test_threads_schema_backfills_before_creating_triggers():
+    cur = MagicMock()
+
+    schema.initialize_threads_schema(cur)
+
+    statements = [" ".join(c.args[0].split()) for c in cur.execute.call_args_list]
+    backfill = next(
+        i for i, s in enumerate(statements) if "UPDATE emails SET thread_key" in s
+    )
+    created = [i for i, s in enumerate(statements) if s.startswith("CREATE TRIGGER")]
+    assert len(created) == 4
+    assert all(i > backfill for i in created)
+    # Thread summaries are refreshed once per statement, not per row
+    summary = [
+        statements[i] for i in created if "emails_threads_trigger" in statements[i]
+    ]
+    assert len(summary) == 3
+    assert all("FOR EACH STATEMENT" in s for s in summary)
+    assert any("'gm:' || NEW.gmail_thread_id" in s for s in statements)
+    assert any("DELETE FROM threads WHERE thread_key = key" in s for s in statements)
+    # In-Reply-To-only rows inherit the parent's key, as the trigger does
+    assert "SET thread_key = p.thread_key" in statements[backfill]
+
+
+def test_refresh_thread_serializes_writers_per_thread():
+    cur = MagicMock()
+
+    schema.initialize_threads_schema(cur)
+
+    refresh = next(
+        " ".join(c.args[0].split())
+        for c in cur.execute.call_args_list
+        if "FUNCTION refresh_thread" in c.args[0]
+    )
+    lock = refresh.index("PERFORM pg_advisory_xact_lock(hashtext(key))")
+    assert lock < refresh.index("INSERT INTO threads")
+
+    trigger = next(
+        " ".join(c.args[0].split())
+        for c in cur.execute.call_args_list
+        if "FUNCTION emails_threads_trigger" in c.args[0]
+    )
+    # Every statement locks its threads in the same order
+    assert "ORDER BY hashtext(k), k" in trigger
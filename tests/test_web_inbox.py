@@ -0,0 +1,13 @@
+from workspace_secretary.web.routes.inbox import page_links
+
+
+def test_page_links_walk_back_one_page_at_a_time():
+    # Page 1 -> 2 -> 3, following each page's Next link
+    assert page_links(None, None) == (None, None, "")
+    assert page_links("c2", "") == (None, None, ".c2")
+    prev_cursor, prev_back, next_back = page_links("c3", ".c2")
+
+    assert (prev_cursor, prev_back) == ("c2", "")
+    assert next_back == ".c2.c3"
+    # Previous from page 3 lands on page 2 with page 2's own links
+    assert page_links(prev_cursor, prev_back) == (None, None, ".c2")
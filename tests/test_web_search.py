@@ -0,0 +1,17 @@
+from workspace_secretary.web.routes.search import parse_search_operators
+
+
+def test_parse_search_operators_keeps_websearch_syntax():
+    query, filters = parse_search_operators(
+        'from:bob@example.com "quarterly report" -draft is:unread'
+    )
+
+    assert query == '"quarterly report" -draft'
+    assert filters == {"from_addr": "bob@example.com", "is_unread": True}
+
+
+def test_parse_search_operators_quoted_values_and_unknown_prefixes():
+    query, filters = parse_search_operators('subject:"q3 plan" re:budget')
+
+    assert query == "re:budget"
+    assert filters == {"subject_contains": "q3 plan"}
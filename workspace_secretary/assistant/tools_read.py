@@ -537,26 +537,29 @@ def quick_clean_inbox(
     timeout = 5.0  # 5 second time limit
 
     # Parse continuation state
-    offset = 0
+    cursor = None
     total_available = None
     if continuation_state:
         try:
             state = json.loads(continuation_state)
-            offset = state.get("offset", 0)
+            cursor = state.get("cursor")
             total_available = state.get(
                 "total_available"
             )  # Carry forward from first call
         except json.JSONDecodeError:
             pass
 
-    # Get total count on first call (offset=0)
-    if offset == 0:
+    # Get total count on first call
+    if cursor is None:
         total_available = email_queries.count_emails(ctx.db, folder)
 
-    # Get emails from folder
-    emails = email_queries.get_inbox_emails(
-        ctx.db, folder, limit, offset, unread_only=False
-    )
+    # Get emails from folder, keyset-paged after the last processed email
+    try:
+        emails = email_queries.get_inbox_emails(
+            ctx.db, folder, limit, unread_only=False, cursor=cursor
+        )
+    except ValueError:
+        return json.dumps({"error": "Invalid continuation_state"})
 
     candidates = []
     processed_count = 0
@@ -567,6 +570,7 @@ def quick_clean_inbox(
             break
 
         processed_count += 1
+        cursor = email_queries.email_cursor(email)
 
         # Extract fields
         to_addr = (email.get("to_addr") or "").lower()
@@ -621,8 +625,8 @@ def quick_clean_inbox(
             }
         )
 
-    # Determine if we have more to process
-    has_more = processed_count >= limit and time.time() - start_time < timeout
+    # More remain if the time box cut the page short or the page was full
+    has_more = processed_count < len(emails) or len(emails) >= limit
     status = "partial" if has_more else "complete"
 
     # Build continuation state with total_available for progress tracking
@@ -630,7 +634,7 @@ def quick_clean_inbox(
     if has_more:
         new_continuation_state = json.dumps(
             {
-                "offset": offset + processed_count,
+                "cursor": cursor,
                 "total_available": total_available,
             }
         )
@@ -681,22 +685,25 @@ def triage_priority_emails(
     start_time = time.time()
     timeout = 5.0
 
-    offset = 0
+    cursor = None
     total_available = None
     if continuation_state:
         try:
             state = json.loads(continuation_state)
-            offset = state.get("offset", 0)
+            cursor = state.get("cursor")
             total_available = state.get("total_available")
         except json.JSONDecodeError:
             pass
 
-    if offset == 0:
+    if cursor is None:
         total_available = email_queries.count_emails(ctx.db, folder)
 
-    emails = email_queries.get_inbox_emails(
-        ctx.db, folder, limit, offset, unread_only=False
-    )
+    try:
+        emails = email_queries.get_inbox_emails(
+            ctx.db, folder, limit, unread_only=False, cursor=cursor
+        )
+    except ValueError:
+        return json.dumps({"error": "Invalid continuation_state"})
 
     if not emails:
         return json.dumps({
@@ -717,6 +724,7 @@ def triage_priority_emails(
             break
 
         processed_count += 1
+        cursor = email_queries.email_cursor(email)
 
         gmail_labels = email.get("gmail_labels") or []
         if any(lbl.startswith("Secretary/") for lbl in gmail_labels):
@@ -748,13 +756,13 @@ def triage_priority_emails(
         job_id = imap_jobs_q.create_job(ctx.db, job_type="triage_apply", payload=payload)
         imap_jobs_q.append_event(ctx.db, job_id, f"Prioritize job queued: {len(all_items)} items")
 
-    has_more = (offset + processed_count) < (total_available or 0)
+    has_more = processed_count < len(emails) or len(emails) >= limit
     status = "partial" if has_more else "complete"
 
     new_continuation_state = None
     if has_more:
         new_continuation_state = json.dumps({
-            "offset": offset + processed_count,
+            "cursor": cursor,
             "total_available": total_available,
         })
 
@@ -804,17 +812,17 @@ async def triage_remaining_emails(
     start_time = time.time()
     timeout = 5.0
 
-    offset = 0
+    cursor = None
     total_available = None
     if continuation_state:
         try:
             state = json.loads(continuation_state)
-            offset = state.get("offset", 0)
+            cursor = state.get("cursor")
             total_available = state.get("total_available")
         except json.JSONDecodeError:
             pass
 
-    if offset == 0:
+    if cursor is None:
         total_available = email_queries.count_emails_by_label(ctx.db, "Secretary/Unclear", folder)
 
     if total_available == 0:
@@ -827,9 +835,13 @@ async def triage_remaining_emails(
             "summary": {},
         })
 
-    emails = email_queries.get_emails_by_label(
-        ctx.db, "Secretary/Unclear", folder, limit, offset
-    )
+    # Keyset paging: processed emails lose the label, so an offset would skip mail
+    try:
+        emails = email_queries.get_emails_by_label(
+            ctx.db, "Secretary/Unclear", folder, limit, cursor=cursor
+        )
+    except ValueError:
+        return json.dumps({"error": "Invalid continuation_state"})
 
     if not emails:
         return json.dumps({
@@ -845,10 +857,11 @@ async def triage_remaining_emails(
         if time.time() - start_time > timeout:
             break
 
+        processed_count += 1
+        cursor = email_queries.email_cursor(email)
         full_email = email_queries.get_email(ctx.db, email["uid"], folder)
         if full_email:
             batch_emails.append(full_email)
-            processed_count += 1
 
     from workspace_secretary.assistant.graph import create_llm
 
@@ -878,13 +891,13 @@ async def triage_remaining_emails(
         job_id = imap_jobs_q.create_job(ctx.db, job_type="triage_apply", payload=payload)
         imap_jobs_q.append_event(ctx.db, job_id, f"Triage job queued: {len(all_items)} items")
 
-    has_more = (offset + processed_count) < (total_available or 0)
+    has_more = processed_count < len(emails) or len(emails) >= limit
     status = "partial" if has_more else "complete"
 
     new_continuation_state = None
     if has_more:
         new_continuation_state = json.dumps({
-            "offset": offset + processed_count,
+            "cursor": cursor,
             "total_available": total_available,
         })
 
@@ -51,21 +51,23 @@ def prioritize_inbox(
     """
     ctx = get_context()
 
-    offset = 0
+    cursor = None
     if continuation_state:
         try:
             state = json.loads(continuation_state)
-            offset = state.get("offset", 0)
+            cursor = state.get("cursor")
         except json.JSONDecodeError:
             pass
 
-    emails = email_queries.get_inbox_emails(
-        ctx.db,
-        folder=folder,
-        unread_only=False,
-        limit=limit,
-        offset=offset,
-    )
+    try:
+        emails, next_cursor = email_queries.get_inbox_page(
+            ctx.db,
+            folder=folder,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError:
+        return json.dumps({"error": "Invalid continuation_state"})
 
     if not emails:
         return json.dumps({
@@ -97,13 +99,12 @@ def prioritize_inbox(
         job_id = imap_jobs_q.create_job(ctx.db, job_type="triage_apply", payload=payload)
         imap_jobs_q.append_event(ctx.db, job_id, f"Prioritize job queued: {len(all_items)} items")
 
-    total_in_folder = email_queries.count_emails(ctx.db, folder)
-    has_more = (offset + len(emails)) < total_in_folder
+    has_more = next_cursor is not None
 
     return json.dumps({
         "status": "partial" if has_more else "complete",
         "has_more": has_more,
-        "continuation_state": json.dumps({"offset": offset + len(emails)}) if has_more else None,
+        "continuation_state": json.dumps({"cursor": next_cursor}) if has_more else None,
         "job_id": job_id,
         "total_processed": result.total_processed,
         "high_confidence_count": len(result.high_confidence),
@@ -134,21 +135,25 @@ async def triage_inbox(
     """
     ctx = get_context()
 
-    offset = 0
+    cursor = None
     if continuation_state:
         try:
             state = json.loads(continuation_state)
-            offset = state.get("offset", 0)
+            cursor = state.get("cursor")
         except json.JSONDecodeError:
             pass
 
-    emails = email_queries.get_emails_by_label(
-        ctx.db,
-        label="Secretary/Unclear",
-        folder=folder,
-        limit=limit,
-        offset=offset,
-    )
+    # Keyset paging: triaged emails lose the label, so an offset would skip mail
+    try:
+        emails = email_queries.get_emails_by_label(
+            ctx.db,
+            label="Secretary/Unclear",
+            folder=folder,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError:
+        return json.dumps({"error": "Invalid continuation_state"})
 
     if not emails:
         return json.dumps({
@@ -187,13 +192,13 @@ async def triage_inbox(
         job_id = imap_jobs_q.create_job(ctx.db, job_type="triage_apply", payload=payload)
         imap_jobs_q.append_event(ctx.db, job_id, f"Triage job queued: {len(all_items)} items")
 
-    unclear_count = email_queries.count_emails_by_label(ctx.db, "Secretary/Unclear", folder)
-    has_more = (offset + len(emails)) < unclear_count
+    has_more = len(emails) >= limit
+    next_state = {"cursor": email_queries.email_cursor(emails[-1])}
 
     return json.dumps({
         "status": "partial" if has_more else "complete",
         "has_more": has_more,
-        "continuation_state": json.dumps({"offset": offset + len(emails)}) if has_more else None,
+        "continuation_state": json.dumps(next_state) if has_more else None,
         "job_id": job_id,
         **result.to_dict(),
     })
@@ -345,6 +345,10 @@ class PostgresConfig:
     user: str = "secretary"
     password: str = ""
     ssl_mode: str = "prefer"
+    pool_min_size: int = 1  # Async pool used by the web UI and MCP tools
+    pool_max_size: int = 10
+    statement_timeout_ms: int = 30000  # 0 disables the server-side limit
+    query_metrics: bool = True  # Per-query latency histograms
 
     @property
     def connection_string(self) -> str:
@@ -360,6 +364,10 @@ class PostgresConfig:
             user=data.get("user") or os.environ.get("POSTGRES_USER", "secretary"),
             password=data.get("password") or os.environ.get("POSTGRES_PASSWORD", ""),
             ssl_mode=data.get("ssl_mode", "prefer"),
+            pool_min_size=int(data.get("pool_min_size", 1)),
+            pool_max_size=int(data.get("pool_max_size", 10)),
+            statement_timeout_ms=int(data.get("statement_timeout_ms", 30000)),
+            query_metrics=bool(data.get("query_metrics", True)),
         )
 
 
@@ -375,6 +383,13 @@ class EmbeddingsConfig:
     api_key: str = ""
     dimensions: int = 3072  # 3072 recommended for best quality
     batch_size: int = 100
+    max_concurrent: int = 4  # Provider requests in flight during background sync
+    hnsw_ef_search: int = 100  # HNSW candidate list size per vector query
+    # Folders that get their own partial HNSW index (e.g. ["INBOX"])
+    hot_folders: List[str] = field(default_factory=list)
+    query_cache_size: int = 1024  # Search-query embeddings kept per process
+    query_cache_ttl: int = 86400  # Seconds before a cached query is re-embedded
+    query_cache_shared: bool = False  # Share cached queries via Postgres
     max_chars: int = 8000  # Gemini limit
     # Cohere-specific options
     input_type: str = "search_document"  # Cohere: search_document | search_query
@@ -403,6 +418,12 @@ class EmbeddingsConfig:
             api_key=api_key,
             dimensions=data.get("dimensions", 3072),
             batch_size=data.get("batch_size", 100),
+            max_concurrent=data.get("max_concurrent", 4),
+            hnsw_ef_search=data.get("hnsw_ef_search", 100),
+            hot_folders=data.get("hot_folders", []),
+            query_cache_size=data.get("query_cache_size", 1024),
+            query_cache_ttl=data.get("query_cache_ttl", 86400),
+            query_cache_shared=data.get("query_cache_shared", False),
             max_chars=data.get("max_chars", 8000),
             input_type=data.get("input_type", "search_document"),
             truncate=data.get("truncate", "END"),
@@ -443,6 +464,81 @@ class DatabaseConfig:
         )
 
 
+SYNC_BODY_MODES = ("full", "headers")
+
+
+@dataclass
+class SyncConfig:
+    """IMAP sync configuration.
+
+    ``body_mode`` controls what the first sync pass downloads:
+    ``full`` fetches the whole RFC822 message, ``headers`` fetches headers,
+    BODYSTRUCTURE and a ``preview_bytes`` text prefix and leaves the body to
+    the background hydrator. ``folders`` overrides the mode per folder.
+
+    ``idle_folders`` are watched with one IMAP IDLE connection each, up to
+    ``idle_max_connections``; every other synced folder is checked with a
+    rotating STATUS poll so each is seen at least every ``status_interval``
+    seconds.
+    """
+
+    body_mode: str = "full"
+    preview_bytes: int = 2048
+    hydrate_batch_size: int = 25
+    folders: Dict[str, str] = field(default_factory=dict)
+    idle_folders: List[str] = field(default_factory=lambda: ["INBOX"])
+    idle_max_connections: int = 3
+    status_interval: int = 60
+
+    def __post_init__(self):
+        for mode in [self.body_mode, *self.folders.values()]:
+            if mode not in SYNC_BODY_MODES:
+                raise ValueError(
+                    f"Invalid sync body_mode '{mode}'. "
+                    f"Must be one of: {', '.join(SYNC_BODY_MODES)}"
+                )
+        if self.idle_max_connections < 0:
+            raise ValueError("sync idle_max_connections must not be negative")
+        if self.status_interval <= 0:
+            raise ValueError("sync status_interval must be positive")
+
+    def body_mode_for(self, folder: str) -> str:
+        return self.folders.get(folder, self.body_mode)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SyncConfig":
+        return cls(
+            body_mode=data.get("body_mode", "full"),
+            preview_bytes=data.get("preview_bytes", 2048),
+            hydrate_batch_size=data.get("hydrate_batch_size", 25),
+            folders=data.get("folders") or {},
+            idle_folders=data.get("idle_folders") or ["INBOX"],
+            idle_max_connections=int(data.get("idle_max_connections", 3)),
+            status_interval=int(data.get("status_interval", 60)),
+        )
+
+
+@dataclass
+class AttachmentsConfig:
+    """On-disk attachment store configuration.
+
+    Attachments are stored content-addressed under ``path``. With
+    ``store_on_sync`` attachments of fully fetched messages are written during
+    sync; otherwise they are fetched lazily on first download.
+    """
+
+    path: str = "config/attachments"
+    store_on_sync: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AttachmentsConfig":
+        return cls(
+            path=data.get("path")
+            or os.environ.get("ATTACHMENTS_PATH", "config/attachments"),
+            store_on_sync=data.get("store_on_sync", False),
+        )
+
+
 @dataclass
 class ServerConfig:
     """MCP server configuration."""
@@ -457,6 +553,8 @@ class ServerConfig:
     bearer_auth: BearerAuthConfig = field(default_factory=BearerAuthConfig)
     database: DatabaseConfig = field(default_factory=DatabaseConfig)
     web: Optional["WebConfig"] = None
+    sync: SyncConfig = field(default_factory=SyncConfig)
+    attachments: AttachmentsConfig = field(default_factory=AttachmentsConfig)
 
     def __post_init__(self):
         """Validate server configuration."""
@@ -508,6 +606,8 @@ class ServerConfig:
             bearer_auth=BearerAuthConfig.from_dict(data.get("bearer_auth", {})),
             database=DatabaseConfig.from_dict(data.get("database", {})),
             web=web_config,
+            sync=SyncConfig.from_dict(data.get("sync", {})),
+            attachments=AttachmentsConfig.from_dict(data.get("attachments", {})),
         )
 
 
@@ -706,6 +806,12 @@ def save_config(config: ServerConfig, config_path: Optional[str] = None) -> Path
                 "api_key": config.database.embeddings.api_key,
                 "dimensions": config.database.embeddings.dimensions,
                 "batch_size": config.database.embeddings.batch_size,
+                "max_concurrent": config.database.embeddings.max_concurrent,
+                "hnsw_ef_search": config.database.embeddings.hnsw_ef_search,
+                "hot_folders": config.database.embeddings.hot_folders,
+                "query_cache_size": config.database.embeddings.query_cache_size,
+                "query_cache_ttl": config.database.embeddings.query_cache_ttl,
+                "query_cache_shared": config.database.embeddings.query_cache_shared,
                 "max_chars": config.database.embeddings.max_chars,
                 "input_type": config.database.embeddings.input_type,
                 "truncate": config.database.embeddings.truncate,
@@ -714,6 +820,16 @@ def save_config(config: ServerConfig, config_path: Optional[str] = None) -> Path
                 "task_type": config.database.embeddings.task_type,
             },
         },
+        "sync": {
+            "body_mode": config.sync.body_mode,
+            "preview_bytes": config.sync.preview_bytes,
+            "hydrate_batch_size": config.sync.hydrate_batch_size,
+            "folders": config.sync.folders,
+        },
+        "attachments": {
+            "path": config.attachments.path,
+            "store_on_sync": config.attachments.store_on_sync,
+        },
     }
 
     if config.calendar:
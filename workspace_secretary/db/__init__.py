@@ -1,8 +1,14 @@
 from workspace_secretary.db.types import DatabaseConnection, DatabaseInterface
 from workspace_secretary.db.postgres import PostgresDatabase
+from workspace_secretary.db.async_postgres import AsyncPostgresDatabase
+from workspace_secretary.db.metrics import QueryMetrics
+from workspace_secretary.db.notify import NotificationHub
 
 __all__ = [
     "DatabaseConnection",
     "DatabaseInterface",
     "PostgresDatabase",
+    "AsyncPostgresDatabase",
+    "QueryMetrics",
+    "NotificationHub",
 ]
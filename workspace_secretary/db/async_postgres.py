@@ -0,0 +1,137 @@
+"""
+Async PostgreSQL database for request handlers.
+
+The web UI routes and MCP tools are ``async def``; running their queries on
+the synchronous pool blocks the event loop, so one slow search stalls every
+other request in the worker. ``AsyncPostgresDatabase`` serves them from a
+``psycopg_pool.AsyncConnectionPool`` instead. The SQL is shared with the
+synchronous query modules (see ``db/queries/aio.py``).
+
+Schema initialization stays with ``PostgresDatabase``; this class only
+connects to an initialized database.
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from workspace_secretary.db.metrics import QueryMetrics
+
+
+class AsyncPostgresDatabase:
+    """PostgreSQL access over an async connection pool."""
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 5432,
+        database: str = "secretary",
+        user: str = "secretary",
+        password: str = "",
+        ssl_mode: str = "prefer",
+        embedding_dimensions: int = 1536,
+        hnsw_ef_search: int = 100,
+        hot_folders: list[str] | None = None,
+        min_size: int = 1,
+        max_size: int = 10,
+        statement_timeout_ms: int = 30000,
+        metrics: QueryMetrics | None = None,
+    ):
+        """
+        Args:
+            min_size: Connections kept open by the pool
+            max_size: Upper bound on concurrent connections
+            statement_timeout_ms: Server-side limit per statement; 0 disables it
+            metrics: Latency histogram registry (a new one by default)
+        """
+        self.host = host
+        self.port = port
+        self.database = database
+        self.user = user
+        self.password = password
+        self.ssl_mode = ssl_mode
+        self.embedding_dimensions = embedding_dimensions
+        self.hnsw_ef_search = hnsw_ef_search
+        self.hot_folders = list(hot_folders or [])
+        self.min_size = min_size
+        self.max_size = max_size
+        self.statement_timeout_ms = statement_timeout_ms
+        self.metrics = metrics or QueryMetrics()
+        self._pool: Any = None
+        self._vector_type = "halfvec" if embedding_dimensions > 2000 else "vector"
+
+    @classmethod
+    def from_config(
+        cls, config: Any, metrics: QueryMetrics | None = None
+    ) -> "AsyncPostgresDatabase":
+        """Build from a ``DatabaseConfig`` (postgres and embeddings sections)."""
+        pg = config.postgres
+        embeddings = getattr(config, "embeddings", None)
+        return cls(
+            host=pg.host,
+            port=pg.port,
+            database=pg.database,
+            user=pg.user,
+            password=pg.password,
+            ssl_mode=getattr(pg, "ssl_mode", "prefer"),
+            embedding_dimensions=getattr(embeddings, "dimensions", 1536),
+            hnsw_ef_search=getattr(embeddings, "hnsw_ef_search", 100),
+            hot_folders=getattr(embeddings, "hot_folders", []),
+            min_size=getattr(pg, "pool_min_size", 1),
+            max_size=getattr(pg, "pool_max_size", 10),
+            statement_timeout_ms=getattr(pg, "statement_timeout_ms", 30000),
+            metrics=metrics or QueryMetrics(enabled=getattr(pg, "query_metrics", True)),
+        )
+
+    def supports_embeddings(self) -> bool:
+        return True
+
+    def _get_connection_string(self) -> str:
+        return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}?sslmode={self.ssl_mode}"
+
+    async def open(self) -> None:
+        """Create the pool and wait until its minimum connections are up."""
+        if self._pool is not None:
+            return
+        try:
+            from psycopg_pool import AsyncConnectionPool
+        except ImportError:
+            raise ImportError(
+                "PostgreSQL support requires psycopg[binary] and psycopg_pool. "
+                "Install with: pip install 'psycopg[binary]' psycopg_pool"
+            )
+
+        kwargs: dict[str, Any] = {}
+        if self.statement_timeout_ms:
+            kwargs["options"] = f"-c statement_timeout={int(self.statement_timeout_ms)}"
+
+        pool = AsyncConnectionPool(
+            self._get_connection_string(),
+            min_size=self.min_size,
+            max_size=self.max_size,
+            kwargs=kwargs,
+            open=False,
+        )
+        try:
+            await pool.open(wait=True)
+        except Exception:
+            # A timed-out pool keeps reconnecting in the background
+            await pool.close()
+            raise
+        self._pool = pool
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Any]:
+        if self._pool is None:
+            raise RuntimeError("Database not initialized. Call open() first.")
+        async with self._pool.connection() as conn:
+            yield conn
+
+    def pool_stats(self) -> dict[str, Any]:
+        return dict(self._pool.get_stats()) if self._pool is not None else {}
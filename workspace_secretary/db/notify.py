@@ -0,0 +1,204 @@
+"""
+Fan-out of Postgres NOTIFY messages to in-process async subscribers.
+
+``NotificationHub`` holds one autocommit connection that LISTENs on a fixed
+set of channels and wakes every ``Subscription`` whose channel (and, if
+given, key) matches. The key is compared with the notification payload, so a
+subscriber can wait for one job. Waiting subscribers hold no connection and
+no thread.
+
+Notifications are wake-up signals: a woken subscriber re-reads whatever it is
+interested in, using the drained payloads at most to narrow that read. That
+makes them safe to coalesce, and it makes a reconnect simple: every
+subscriber is woken with a ``None`` payload because anything sent while the
+listener was down is lost.
+
+Subscribers woken by the same burst usually re-read the same thing;
+``NotificationHub.shared_read`` runs such a read once and hands the result to
+all of them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """A coalescing wake-up flag for one channel (and optional payload key).
+
+    Payloads received since the last ``drain`` are kept for subscribers that
+    want them, up to ``max_pending``; past that they collapse into a single
+    ``None``, which like a reconnect means "notifications may have been lost".
+    """
+
+    def __init__(
+        self, channel: str, key: Optional[str] = None, max_pending: int = 1000
+    ):
+        self.channel = channel
+        self.key = key
+        self.max_pending = max_pending
+        self._event = asyncio.Event()
+        self._pending: list[Optional[str]] = []
+
+    def notify(self, payload: Optional[str] = None) -> None:
+        if len(self._pending) >= self.max_pending:
+            self._pending = [None]
+        else:
+            self._pending.append(payload)
+        self._event.set()
+
+    def drain(self) -> list[Optional[str]]:
+        """Payloads received since the last call, oldest first."""
+        pending, self._pending = self._pending, []
+        return pending
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a notification and consume the wake-up.
+
+        Returns:
+            True if woken by a notification, False on timeout
+        """
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+
+class NotificationHub:
+    """One LISTEN connection shared by all subscribers in the process."""
+
+    def __init__(self, conninfo: str, channels: Iterable[str], retry_s: float = 5.0):
+        """
+        Args:
+            conninfo: libpq connection string
+            channels: Channels to LISTEN on
+            retry_s: Delay before reconnecting a dropped connection
+        """
+        self.conninfo = conninfo
+        self.channels = tuple(channels)
+        self.retry_s = retry_s
+        self._subscriptions: dict[str, set[Subscription]] = {
+            channel: set() for channel in self.channels
+        }
+        self._task: Optional[asyncio.Task[None]] = None
+        self._connected = False
+        self._sequence = 0
+        self._reads: dict[Hashable, tuple[int, asyncio.Future[Any]]] = {}
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    @property
+    def sequence(self) -> int:
+        """Number of notifications dispatched so far, reconnect wake-ups included."""
+        return self._sequence
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def subscribe(self, channel: str, key: Optional[str] = None) -> Subscription:
+        """Register a subscriber; ``key`` limits it to one payload value.
+
+        Raises:
+            ValueError: If the hub does not listen on ``channel``
+        """
+        if channel not in self._subscriptions:
+            raise ValueError(f"Not listening on channel {channel!r}")
+        sub = Subscription(channel, key)
+        self._subscriptions[channel].add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscriptions.get(sub.channel, set()).discard(sub)
+
+    @contextmanager
+    def subscription(
+        self, channel: str, key: Optional[str] = None
+    ) -> Iterator[Subscription]:
+        sub = self.subscribe(channel, key)
+        try:
+            yield sub
+        finally:
+            self.unsubscribe(sub)
+
+    def shared_read(
+        self, key: Hashable, since: int, read: Callable[[], Awaitable[Any]]
+    ) -> Awaitable[Any]:
+        """Result of ``read()``, shared by the subscribers of one burst.
+
+        ``since`` is the ``sequence`` a subscriber saw when it drained. A read
+        for ``key`` started at or after that point already reflects every
+        change the subscriber was told about, so it is reused rather than run
+        again. Failed reads are not reused.
+        """
+        entry = self._reads.get(key)
+        if entry is None or entry[0] < since or _failed(entry[1]):
+            self._reads = {
+                k: e for k, e in self._reads.items() if not e[1].done() or e[0] >= since
+            }
+            entry = (self._sequence, asyncio.ensure_future(read()))
+            self._reads[key] = entry
+        # A subscriber that disconnects mid-read must not cancel the others
+        return asyncio.shield(entry[1])
+
+    def dispatch(self, channel: str, payload: str) -> None:
+        self._sequence += 1
+        for sub in list(self._subscriptions.get(channel, ())):
+            if sub.key is None or sub.key == payload:
+                sub.notify(payload)
+
+    def _wake_all(self) -> None:
+        self._sequence += 1
+        for subs in self._subscriptions.values():
+            for sub in list(subs):
+                sub.notify(None)
+
+    async def _run(self) -> None:
+        import psycopg
+
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    self.conninfo, autocommit=True
+                ) as conn:
+                    await self._listen(conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"LISTEN connection lost, retrying in {self.retry_s}s: {e}"
+                )
+            finally:
+                self._connected = False
+            await asyncio.sleep(self.retry_s)
+
+    async def _listen(self, conn: Any) -> None:
+        for channel in self.channels:
+            await conn.execute(f'LISTEN "{channel}"')
+        self._connected = True
+        logger.info("Listening on %s", ", ".join(self.channels))
+        self._wake_all()
+        async for notification in conn.notifies():
+            self.dispatch(notification.channel, notification.payload)
+
+
+def _failed(future: asyncio.Future[Any]) -> bool:
+    return future.done() and (future.cancelled() or future.exception() is not None)
@@ -32,6 +32,8 @@ class PostgresDatabase(DatabaseInterface):
         password: str = "",
         ssl_mode: str = "prefer",
         embedding_dimensions: int = 1536,
+        hnsw_ef_search: int = 100,
+        hot_folders: list[str] | None = None,
     ):
         self.host = host
         self.port = port
@@ -40,6 +42,8 @@ class PostgresDatabase(DatabaseInterface):
         self.password = password
         self.ssl_mode = ssl_mode
         self.embedding_dimensions = embedding_dimensions
+        self.hnsw_ef_search = hnsw_ef_search
+        self.hot_folders = list(hot_folders or [])
         self._pool: Any = None
         self._vector_type = "halfvec" if embedding_dimensions > 2000 else "vector"
         self._vector_ops = (
@@ -85,7 +89,8 @@ class PostgresDatabase(DatabaseInterface):
                 schema.initialize_contacts_schema(cur)
                 schema.initialize_calendar_schema(cur)
                 schema.initialize_mutation_journal(cur)
-                schema.create_indexes(cur, self._vector_type)
+                schema.initialize_attachments_schema(cur)
+                schema.create_indexes(cur, self._vector_type, self.hot_folders)
                 conn.commit()
 
     @contextmanager
@@ -228,21 +233,44 @@ class PostgresDatabase(DatabaseInterface):
 
     def upsert_embedding(
         self,
-        uid: int,
-        folder: str,
+        content_hash: str,
         embedding: list[float],
         model: str,
-        content_hash: str,
     ) -> None:
         raise NotImplementedError(
             "CRUD methods not yet extracted to base. Use engine.database for now."
         )
 
+    def upsert_embeddings_bulk(self, rows: list[tuple[str, list[float], str]]) -> int:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
+    def prune_orphan_embeddings(self) -> int:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
+    def prune_query_embeddings(self, max_age_seconds: float) -> int:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
     def get_synced_folders(self) -> list[dict[str, Any]]:
         raise NotImplementedError(
             "CRUD methods not yet extracted to base. Use engine.database for now."
         )
 
+    def get_folder_counters(self, folder: str) -> dict[str, int]:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
+    def reconcile_mailbox_counters(self) -> int:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
     def get_thread_emails(
         self, uid: int, folder: str = "INBOX"
     ) -> list[dict[str, Any]]:
@@ -250,6 +278,17 @@ class PostgresDatabase(DatabaseInterface):
             "CRUD methods not yet extracted to base. Use engine.database for now."
         )
 
+    def get_threads_page(
+        self,
+        folder: str,
+        limit: int,
+        cursor: str | None = None,
+        unread_only: bool = False,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
     def semantic_search(
         self,
         query_embedding: list[float],
@@ -275,6 +314,18 @@ class PostgresDatabase(DatabaseInterface):
             "CRUD methods not yet extracted to base. Use engine.database for now."
         )
 
+    def hybrid_search(
+        self,
+        query: str,
+        query_embedding: list[float],
+        folder: str = "INBOX",
+        limit: int = 20,
+        filters: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
     def find_similar_emails(
         self, uid: int, folder: str = "INBOX", limit: int = 5
     ) -> list[dict[str, Any]]:
@@ -334,6 +385,49 @@ class PostgresDatabase(DatabaseInterface):
             "CRUD methods not yet extracted to base. Use engine.database for now."
         )
 
+    def upsert_emails_bulk(self, emails: list[dict[str, Any]]) -> int:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
+    def reconcile_email_flags(
+        self, folder: str, changed: dict[int, dict[str, Any]]
+    ) -> int:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
+    def get_unhydrated_uids(self, folder: str, limit: int = 25) -> list[int]:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
+    def hydrate_email_bodies(
+        self, folder: str, bodies: dict[int, tuple[str, str]]
+    ) -> int:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
+    def record_hydrate_failures(self, folder: str, uids: list[int]) -> int:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
+    def get_attachment_blob(
+        self, folder: str, uid: int, filename: str
+    ) -> dict[str, Any] | None:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
+    def save_attachment_blobs(
+        self, folder: str, uid: int, blobs: list[dict[str, Any]]
+    ) -> int:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
     def get_email_by_uid(self, uid: int, folder: str) -> dict[str, Any] | None:
         raise NotImplementedError(
             "CRUD methods not yet extracted to base. Use engine.database for now."
@@ -363,11 +457,28 @@ class PostgresDatabase(DatabaseInterface):
             "CRUD methods not yet extracted to base. Use engine.database for now."
         )
 
+    def delete_emails_bulk(self, folder: str, uids: list[int]) -> int:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
     def mark_email_read(self, uid: int, folder: str, is_read: bool) -> None:
         raise NotImplementedError(
             "CRUD methods not yet extracted to base. Use engine.database for now."
         )
 
+    def mark_emails_read_bulk(self, folder: str, uids: list[int], is_read: bool) -> int:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
+    def modify_email_labels_bulk(
+        self, folder: str, uids: list[int], labels: list[str], action: str
+    ) -> int:
+        raise NotImplementedError(
+            "CRUD methods not yet extracted to base. Use engine.database for now."
+        )
+
     def get_folder_state(self, folder: str) -> dict[str, Any] | None:
         raise NotImplementedError(
             "CRUD methods not yet extracted to base. Use engine.database for now."
@@ -5,6 +5,13 @@ from . import calendar
 from . import preferences
 from . import mutations
 from . import booking_links
+from . import attachments
+from . import search_filters
+from . import threads
+from . import counters
+from . import changes
+from . import prepared
+from . import aio
 
 __all__ = [
     "emails",
@@ -14,4 +21,11 @@ __all__ = [
     "preferences",
     "mutations",
     "booking_links",
+    "attachments",
+    "search_filters",
+    "threads",
+    "counters",
+    "changes",
+    "prepared",
+    "aio",
 ]
@@ -0,0 +1,315 @@
+"""Async variants of the request-path queries for ``AsyncPostgresDatabase``.
+
+Each function runs the SQL built by its synchronous counterpart in
+``emails``, ``threads``, ``counters``, ``embeddings``, ``preferences``,
+``changes`` and ``imap_jobs``, so the two access paths cannot drift apart;
+only the I/O differs. Every call is timed into ``db.metrics`` under the
+function's name.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from psycopg.rows import dict_row
+
+from workspace_secretary.db.queries import changes as changes_q
+from workspace_secretary.db.queries import counters as counter_q
+from workspace_secretary.db.queries import emails as email_q
+from workspace_secretary.db.queries import embeddings as emb_q
+from workspace_secretary.db.queries import imap_jobs as imap_jobs_q
+from workspace_secretary.db.queries import preferences as prefs_q
+from workspace_secretary.db.queries import prepared
+from workspace_secretary.db.queries import threads as thread_q
+
+
+async def _fetchall(
+    db: Any, name: str, sql: str, params: Any = None, prepare: bool = False
+) -> list[dict[str, Any]]:
+    with db.metrics.time(name):
+        async with db.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(sql, params, prepare=prepare or None)
+                return await cur.fetchall()
+
+
+async def _fetchone(
+    db: Any, name: str, sql: str, params: Any = None, prepare: bool = False
+) -> Optional[dict[str, Any]]:
+    with db.metrics.time(name):
+        async with db.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(sql, params, prepare=prepare or None)
+                return await cur.fetchone()
+
+
+async def get_inbox_emails(
+    db: Any,
+    folder: str,
+    limit: int,
+    offset: int = 0,
+    unread_only: bool = False,
+    label: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """See ``emails.get_inbox_emails``."""
+    sql, params = email_q.inbox_emails_query(
+        folder, limit, offset, unread_only, label, cursor
+    )
+    return await _fetchall(db, "get_inbox_emails", sql, params, prepare=True)
+
+
+async def get_inbox_page(
+    db: Any,
+    folder: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    unread_only: bool = False,
+    label: Optional[str] = None,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """See ``emails.get_inbox_page``."""
+    emails = await get_inbox_emails(
+        db, folder, limit + 1, unread_only=unread_only, label=label, cursor=cursor
+    )
+    return email_q.split_email_page(emails, limit)
+
+
+async def get_email(db: Any, uid: int, folder: str) -> Optional[dict[str, Any]]:
+    """See ``emails.get_email``."""
+    return await _fetchone(
+        db, "get_email", email_q.EMAIL_BY_UID_SQL, (uid, folder), prepare=True
+    )
+
+
+async def get_thread(db: Any, uid: int, folder: str) -> list[dict[str, Any]]:
+    """See ``emails.get_thread``."""
+    with db.metrics.time("get_thread"):
+        async with db.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await prepared.execute(
+                    cur, "thread_by_uid", {"uid": uid, "folder": folder}
+                )
+                thread = await cur.fetchall()
+                if thread:
+                    return thread
+
+                await prepared.execute(cur, "email_by_uid", (uid, folder))
+                single = await cur.fetchone()
+                return [single] if single else []
+
+
+async def get_neighbor_uids(
+    db: Any, folder: str, uid: int, unread_only: bool = False
+) -> dict[str, Optional[int]]:
+    """See ``emails.get_neighbor_uids``."""
+    row = await _fetchone(
+        db,
+        "get_neighbor_uids",
+        email_q.NEIGHBOR_UIDS_SQL[unread_only],
+        {"uid": uid, "folder": folder},
+        prepare=True,
+    )
+    return email_q.neighbors_from_row(row)
+
+
+async def get_thread_view(
+    db: Any, uid: int, folder: str, unread_only: bool = False
+) -> dict[str, Any]:
+    """See ``emails.get_thread_view``."""
+    with db.metrics.time("get_thread_view"):
+        async with db.connection() as conn:
+            async with (
+                conn.cursor(row_factory=dict_row) as email_cur,
+                conn.cursor(row_factory=dict_row) as thread_cur,
+                conn.cursor(row_factory=dict_row) as neighbor_cur,
+            ):
+                async with conn.pipeline():
+                    await prepared.execute(email_cur, "email_by_uid", (uid, folder))
+                    await prepared.execute(
+                        thread_cur, "thread_by_uid", {"uid": uid, "folder": folder}
+                    )
+                    await neighbor_cur.execute(
+                        email_q.NEIGHBOR_UIDS_SQL[unread_only],
+                        {"uid": uid, "folder": folder},
+                        prepare=True,
+                    )
+                return email_q.thread_view(
+                    await email_cur.fetchone(),
+                    await thread_cur.fetchall(),
+                    await neighbor_cur.fetchone(),
+                )
+
+
+async def get_threads_page(
+    db: Any,
+    folder: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    unread_only: bool = False,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """See ``threads.get_threads_page``."""
+    sql, params = thread_q.threads_query(folder, limit + 1, unread_only, cursor)
+    threads = await _fetchall(db, "get_threads_page", sql, params)
+    return thread_q.split_thread_page(threads, limit)
+
+
+async def search_emails_advanced(
+    db: Any,
+    query: str,
+    folder: str,
+    limit: int,
+    filters: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """See ``emails.search_emails_advanced``."""
+    sql, params = email_q.search_emails_advanced_query(query, folder, limit, filters)
+    return await _fetchall(db, "search_emails_advanced", sql, params)
+
+
+async def get_search_suggestions(
+    db: Any, query: str, limit: int = 5
+) -> list[dict[str, Any]]:
+    """See ``emails.get_search_suggestions``; both lookups share one pipeline."""
+    prefix = email_q.suggestion_prefix(query)
+    with db.metrics.time("get_search_suggestions"):
+        async with db.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as senders:
+                async with conn.cursor(row_factory=dict_row) as subjects:
+                    async with conn.pipeline():
+                        await senders.execute(
+                            email_q.SENDER_SUGGESTIONS_SQL, (prefix, prefix, limit)
+                        )
+                        await subjects.execute(
+                            email_q.SUBJECT_SUGGESTIONS_SQL, (prefix, limit)
+                        )
+                    suggestions = [
+                        {"type": "sender", "value": row["email"]}
+                        for row in await senders.fetchall()
+                    ]
+                    suggestions += [
+                        {"type": "subject", "value": row["subject"]}
+                        for row in await subjects.fetchall()
+                    ]
+    return suggestions[:limit]
+
+
+async def supports_iterative_scan(db: Any) -> bool:
+    """See ``embeddings.supports_iterative_scan``."""
+    cached = getattr(db, "_hnsw_iterative_scan", None)
+    if cached is not None:
+        return cached
+
+    row = await _fetchone(db, "pgvector_version", emb_q.PGVECTOR_VERSION_SQL)
+    supported = emb_q.iterative_scan_supported(row["extversion"] if row else None)
+    db._hnsw_iterative_scan = supported
+    return supported
+
+
+async def hybrid_search(
+    db: Any,
+    query: str,
+    query_embedding: list[float],
+    folder: str,
+    limit: int,
+    filters: Optional[dict[str, Any]] = None,
+    candidates: int = 100,
+    rrf_k: int = 60,
+) -> list[dict[str, Any]]:
+    """See ``embeddings.hybrid_search``."""
+    sql, params = emb_q.hybrid_search_query(
+        db._vector_type,
+        query,
+        query_embedding,
+        folder,
+        limit,
+        filters,
+        candidates,
+        rrf_k,
+    )
+    ef_search = getattr(db, "hnsw_ef_search", emb_q.DEFAULT_EF_SEARCH)
+    iterative = await supports_iterative_scan(db)
+    with db.metrics.time("hybrid_search"):
+        async with db.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                async with conn.pipeline():
+                    # The k-NN pool can only be as large as the HNSW candidate list
+                    for option_sql, option_params in emb_q.hnsw_option_statements(
+                        max(ef_search, candidates), iterative
+                    ):
+                        await cur.execute(option_sql, option_params or None)
+                    await cur.execute(sql, params)
+                return await cur.fetchall()
+
+
+async def has_embeddings(db: Any) -> bool:
+    """See ``embeddings.has_embeddings``."""
+    try:
+        return (
+            await _fetchone(db, "has_embeddings", emb_q.HAS_EMBEDDINGS_SQL) is not None
+        )
+    except Exception:
+        return False
+
+
+async def get_folder_counters(db: Any, folder: str) -> dict[str, int]:
+    """See ``counters.get_folder_counters``."""
+    row = await _fetchone(
+        db,
+        "get_folder_counters",
+        counter_q.FOLDER_COUNTERS_SQL,
+        (folder,),
+        prepare=True,
+    )
+    return counter_q.folder_counters_from_row(row)
+
+
+async def list_folder_counters(db: Any) -> list[dict[str, Any]]:
+    """See ``counters.list_folder_counters``."""
+    return await _fetchall(
+        db, "list_folder_counters", counter_q.LIST_FOLDER_COUNTERS_SQL
+    )
+
+
+async def get_changed_emails(
+    db: Any, folder: str, uids: list[int], limit: int = 10
+) -> list[dict[str, Any]]:
+    """See ``changes.get_changed_emails``."""
+    if not uids:
+        return []
+    return await _fetchall(
+        db,
+        "get_changed_emails",
+        changes_q.CHANGED_EMAILS_SQL,
+        (folder, list(uids), limit),
+    )
+
+
+async def get_user_preferences(db: Any, user_id: str) -> dict[str, Any]:
+    """See ``preferences.get_user_preferences``."""
+    with db.metrics.time("get_user_preferences"):
+        async with db.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(prefs_q.USER_PREFERENCES_SQL, (user_id,))
+                return prefs_q.preferences_from_row(await cur.fetchone())
+
+
+async def get_job(db: Any, job_id: str) -> Optional[dict[str, Any]]:
+    """See ``imap_jobs.get_job``."""
+    return await _fetchone(db, "get_job", imap_jobs_q.JOB_BY_ID_SQL, (job_id,))
+
+
+async def get_job_delta(
+    db: Any, job_id: str, after_id: int = 0, limit: int = 200
+) -> tuple[list[dict[str, Any]], Optional[dict[str, Any]]]:
+    """Job events after ``after_id`` and the current job row, in one pipeline."""
+    with db.metrics.time("get_job_delta"):
+        async with db.connection() as conn:
+            async with (
+                conn.cursor(row_factory=dict_row) as events_cur,
+                conn.cursor(row_factory=dict_row) as job_cur,
+            ):
+                async with conn.pipeline():
+                    await events_cur.execute(
+                        imap_jobs_q.EVENTS_AFTER_SQL, (job_id, after_id, limit)
+                    )
+                    await job_cur.execute(imap_jobs_q.JOB_BY_ID_SQL, (job_id,))
+                return await events_cur.fetchall(), await job_cur.fetchone()
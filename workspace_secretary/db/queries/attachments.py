@@ -0,0 +1,77 @@
+"""Attachment blob index - maps email MIME parts to content-addressed blobs."""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from psycopg.rows import dict_row
+
+from workspace_secretary.db.types import DatabaseInterface
+
+
+def get_attachment_blob(
+    db: DatabaseInterface,
+    folder: str,
+    uid: int,
+    filename: str,
+) -> Optional[dict[str, Any]]:
+    """Look up the stored blob for an attachment by filename (first part wins)."""
+    with db.connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                """
+                SELECT part, filename, content_type, size, sha256
+                FROM attachment_blobs
+                WHERE email_folder = %s AND email_uid = %s AND filename = %s
+                ORDER BY part
+                LIMIT 1
+                """,
+                (folder, uid, filename),
+            )
+            return cur.fetchone()
+
+
+def save_attachment_blobs(
+    db: DatabaseInterface,
+    folder: str,
+    uid: int,
+    blobs: list[dict[str, Any]],
+) -> int:
+    """Record stored blobs for an email.
+
+    Each item needs ``part``, ``filename``, ``content_type``, ``size`` and
+    ``sha256``. Existing rows for the same part are replaced.
+    """
+    if not blobs:
+        return 0
+
+    rows = [
+        (
+            uid,
+            folder,
+            blob["part"],
+            blob.get("filename"),
+            blob.get("content_type"),
+            blob["size"],
+            blob["sha256"],
+        )
+        for blob in blobs
+    ]
+
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.executemany(
+                """
+                INSERT INTO attachment_blobs (
+                    email_uid, email_folder, part, filename, content_type, size, sha256
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (email_uid, email_folder, part) DO UPDATE SET
+                    filename = EXCLUDED.filename,
+                    content_type = EXCLUDED.content_type,
+                    size = EXCLUDED.size,
+                    sha256 = EXCLUDED.sha256
+                """,
+                rows,
+            )
+        conn.commit()
+    return len(rows)
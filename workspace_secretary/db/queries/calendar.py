@@ -8,6 +8,7 @@ from typing import Any, Optional
 
 from psycopg.rows import dict_row
 
+from workspace_secretary.db.queries import prepared
 from workspace_secretary.db.types import DatabaseInterface
 
 
@@ -154,6 +155,22 @@ def delete_calendar_event_cache(
             conn.commit()
 
 
+prepared.register(
+    "calendar_events_in_range",
+    """
+    SELECT calendar_id, event_id, raw_json, local_status
+    FROM calendar_events_cache
+    WHERE calendar_id = ANY(%s)
+      AND (
+        (is_all_day = FALSE AND start_ts_utc < %s AND end_ts_utc > %s)
+        OR
+        (is_all_day = TRUE AND start_date < %s::date AND end_date > %s::date)
+      )
+    ORDER BY COALESCE(start_ts_utc, start_date::timestamp) ASC
+    """,
+)
+
+
 def query_calendar_events_cached(
     db: DatabaseInterface,
     calendar_ids: list[str],
@@ -164,22 +181,11 @@ def query_calendar_events_cached(
     if not calendar_ids:
         return []
 
-    query = """
-        SELECT calendar_id, event_id, raw_json, local_status
-        FROM calendar_events_cache
-        WHERE calendar_id = ANY(%s)
-          AND (
-            (is_all_day = FALSE AND start_ts_utc < %s AND end_ts_utc > %s)
-            OR
-            (is_all_day = TRUE AND start_date < %s::date AND end_date > %s::date)
-          )
-        ORDER BY COALESCE(start_ts_utc, start_date::timestamp) ASC
-    """
-
     with db.connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(
-                query,
+            prepared.execute(
+                cur,
+                "calendar_events_in_range",
                 (calendar_ids, time_max, time_min, time_max, time_min),
             )
             results: list[dict[str, Any]] = []
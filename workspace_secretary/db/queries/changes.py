@@ -0,0 +1,78 @@
+"""Mailbox change feed published by triggers on ``emails`` and the calendar cache.
+
+Every write to ``emails`` sends a JSON payload on ``MAILBOX_CHANNEL`` (see
+``initialize_change_feed_schema``)::
+
+    {"type": "new" | "flags" | "expunged", "folder": "INBOX",
+     "uids": [101, 102] | null, "count": 2}
+
+``uids`` is null when the statement touched more than ``MAX_NOTIFY_UIDS``
+rows; treat that as "re-read the folder". Calendar cache writes send
+``{"type": "calendar"}``.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, Optional
+
+from psycopg.rows import dict_row
+
+from workspace_secretary.db.types import DatabaseInterface
+
+MAILBOX_CHANNEL = "mailbox_changes"
+CHANGE_TYPES = ("new", "flags", "expunged", "calendar")
+MAX_NOTIFY_UIDS = 200
+
+CHANGED_EMAILS_SQL = """
+    SELECT uid, folder, from_addr, subject, LEFT(body_text, 200) AS preview,
+           date, is_unread
+    FROM emails
+    WHERE folder = %s AND uid = ANY(%s)
+    ORDER BY date DESC, uid DESC
+    LIMIT %s
+"""
+
+
+def parse_change(payload: str) -> Optional[dict[str, Any]]:
+    """Decode one notification payload; None if it is not a known change."""
+    try:
+        change = json.loads(payload)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(change, dict) or change.get("type") not in CHANGE_TYPES:
+        return None
+    return change
+
+
+def merge_changes(changes: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Fold a burst of changes into one per (type, folder), in arrival order.
+
+    A bulk sync publishes one payload per upserted row; listeners only need
+    the union. The merged ``uids`` is null if any part was truncated.
+    """
+    merged: dict[tuple[str, Optional[str]], dict[str, Any]] = {}
+    for change in changes:
+        key = (change["type"], change.get("folder"))
+        current = merged.get(key)
+        if current is None:
+            merged[key] = dict(change)
+            continue
+        current["count"] = current.get("count", 0) + change.get("count", 0)
+        if current.get("uids") is None or change.get("uids") is None:
+            current["uids"] = None
+        else:
+            current["uids"] = sorted(set(current["uids"]) | set(change["uids"]))
+    return list(merged.values())
+
+
+def get_changed_emails(
+    db: DatabaseInterface, folder: str, uids: list[int], limit: int = 10
+) -> list[dict[str, Any]]:
+    """Summary rows for the UIDs named by a change, newest first."""
+    if not uids:
+        return []
+    with db.connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(CHANGED_EMAILS_SQL, (folder, list(uids), limit))
+            return cur.fetchall()
@@ -0,0 +1,89 @@
+"""Materialized mailbox counters (folder_counters / label_counters).
+
+Triggers on emails and embedding_vectors keep these current (see
+``initialize_counters_schema``), so every read here is a primary-key lookup
+or a scan of one row per folder instead of COUNT(*) over emails.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from psycopg.rows import dict_row
+
+from workspace_secretary.db.queries import prepared
+from workspace_secretary.db.types import DatabaseInterface
+
+FOLDER_COUNTERS = (
+    "total",
+    "unread",
+    "flagged",
+    "with_attachments",
+    "needing_embedding",
+)
+
+
+FOLDER_COUNTERS_SQL = prepared.register(
+    "folder_counters",
+    f"SELECT {', '.join(FOLDER_COUNTERS)} FROM folder_counters WHERE folder = %s",
+)
+
+LIST_FOLDER_COUNTERS_SQL = f"""
+    SELECT folder, {", ".join(FOLDER_COUNTERS)}
+    FROM folder_counters
+    WHERE total > 0
+    ORDER BY total DESC, folder
+"""
+
+
+def folder_counters_from_row(row: Optional[dict[str, Any]]) -> dict[str, int]:
+    """Normalize a ``folder_counters`` row; a missing row counts as zeros."""
+    if not row:
+        return dict.fromkeys(FOLDER_COUNTERS, 0)
+    return {key: int(row[key]) for key in FOLDER_COUNTERS}
+
+
+def get_folder_counters(db: DatabaseInterface, folder: str) -> dict[str, int]:
+    """Counters for one folder; all zero for a folder with no cached mail."""
+    with db.connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            prepared.execute(cur, "folder_counters", (folder,))
+            return folder_counters_from_row(cur.fetchone())
+
+
+def list_folder_counters(db: DatabaseInterface) -> list[dict[str, Any]]:
+    """Counters for every folder with cached mail, largest first."""
+    with db.connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(LIST_FOLDER_COUNTERS_SQL)
+            return cur.fetchall()
+
+
+def get_label_counters(
+    db: DatabaseInterface, label: str, folder: str = "INBOX"
+) -> dict[str, int]:
+    """Total and unread emails carrying a Gmail label in ``folder``."""
+    with db.connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                "SELECT total, unread FROM label_counters WHERE folder = %s AND label = %s",
+                (folder, label),
+            )
+            row = cur.fetchone()
+            if not row:
+                return {"total": 0, "unread": 0}
+            return {"total": int(row["total"]), "unread": int(row["unread"])}
+
+
+def reconcile_counters(db: DatabaseInterface) -> int:
+    """Recount every counter from emails; returns the number of rows corrected.
+
+    Drift is applied as a delta, so concurrent writers are never blocked on
+    the recount and only counter rows that were actually wrong are written.
+    """
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT reconcile_mailbox_counters()")
+            row = cur.fetchone()
+            conn.commit()
+            return int(row[0]) if row else 0
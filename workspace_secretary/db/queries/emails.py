@@ -2,12 +2,22 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
 import hashlib
 import json
+from datetime import datetime
+from functools import lru_cache
 from typing import Any, Optional
 
 from psycopg.rows import dict_row
 
+from workspace_secretary.db.queries import counters as counter_q
+from workspace_secretary.db.queries import prepared
+from workspace_secretary.db.queries.search_filters import (
+    escape_like,
+    plan_email_filters,
+)
 from workspace_secretary.db.types import DatabaseInterface
 
 
@@ -15,9 +25,86 @@ from workspace_secretary.db.types import DatabaseInterface
 # Core Email CRUD Operations (from engine/database.py)
 # ============================================================================
 
-
-def upsert_email(
-    db: DatabaseInterface,
+# Body hydration gives up on a message after this many failed fetches
+HYDRATE_MAX_ATTEMPTS = 5
+# Wait before retrying a failed fetch, doubled after each failure
+HYDRATE_RETRY_BASE_MINUTES = 5
+
+EMAIL_BY_UID_SQL = prepared.register(
+    "email_by_uid", "SELECT * FROM emails WHERE uid = %s AND folder = %s"
+)
+
+
+_UPSERT_EMAIL_INSERT = """
+    INSERT INTO emails (
+        uid, folder, message_id, subject, from_addr, to_addr, cc_addr,
+        bcc_addr, date, internal_date, body_text, body_html, flags,
+        is_unread, is_important, size, modseq, synced_at, in_reply_to,
+        references_header, content_hash, gmail_thread_id, gmail_msgid,
+        gmail_labels, has_attachments, attachment_filenames,
+        auth_results_raw, spf, dkim, dmarc, is_suspicious_sender, suspicious_sender_signals,
+        security_score, warning_type, body_hydrated
+    ) VALUES
+"""
+
+_UPSERT_EMAIL_VALUES = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+
+_UPSERT_EMAIL_CONFLICT = """
+    ON CONFLICT (uid, folder) DO UPDATE SET
+        message_id = EXCLUDED.message_id,
+        subject = EXCLUDED.subject,
+        from_addr = EXCLUDED.from_addr,
+        to_addr = EXCLUDED.to_addr,
+        cc_addr = EXCLUDED.cc_addr,
+        bcc_addr = EXCLUDED.bcc_addr,
+        date = EXCLUDED.date,
+        internal_date = EXCLUDED.internal_date,
+        -- A header-only row never replaces a body that is already hydrated
+        body_text = CASE WHEN EXCLUDED.body_hydrated OR NOT emails.body_hydrated
+            THEN EXCLUDED.body_text ELSE emails.body_text END,
+        body_html = CASE WHEN EXCLUDED.body_hydrated OR NOT emails.body_hydrated
+            THEN EXCLUDED.body_html ELSE emails.body_html END,
+        flags = EXCLUDED.flags,
+        is_unread = EXCLUDED.is_unread,
+        is_important = EXCLUDED.is_important,
+        size = EXCLUDED.size,
+        modseq = EXCLUDED.modseq,
+        synced_at = NOW(),
+        in_reply_to = EXCLUDED.in_reply_to,
+        references_header = EXCLUDED.references_header,
+        content_hash = CASE WHEN EXCLUDED.body_hydrated OR NOT emails.body_hydrated
+            THEN EXCLUDED.content_hash ELSE emails.content_hash END,
+        gmail_thread_id = EXCLUDED.gmail_thread_id,
+        gmail_msgid = EXCLUDED.gmail_msgid,
+        gmail_labels = EXCLUDED.gmail_labels,
+        has_attachments = EXCLUDED.has_attachments,
+        attachment_filenames = EXCLUDED.attachment_filenames,
+        auth_results_raw = EXCLUDED.auth_results_raw,
+        spf = EXCLUDED.spf,
+        dkim = EXCLUDED.dkim,
+        dmarc = EXCLUDED.dmarc,
+        is_suspicious_sender = EXCLUDED.is_suspicious_sender,
+        suspicious_sender_signals = EXCLUDED.suspicious_sender_signals,
+        security_score = EXCLUDED.security_score,
+        warning_type = EXCLUDED.warning_type,
+        body_hydrated = emails.body_hydrated OR EXCLUDED.body_hydrated
+"""
+
+_UPSERT_EMAIL_SQL = _UPSERT_EMAIL_INSERT + _UPSERT_EMAIL_VALUES + _UPSERT_EMAIL_CONFLICT
+
+# Rows per bulk upsert statement; 34 parameters each stays well under the
+# 65535 bind parameter limit of the protocol
+UPSERT_BATCH_ROWS = 500
+
+
+@lru_cache(maxsize=8)
+def _upsert_emails_sql(count: int) -> str:
+    """Build a multi-row upsert statement for ``count`` rows."""
+    values = ",\n    ".join([_UPSERT_EMAIL_VALUES] * count)
+    return _UPSERT_EMAIL_INSERT + "    " + values + _UPSERT_EMAIL_CONFLICT
+
+
+def _email_row(
     uid: int,
     folder: str,
     message_id: Optional[str],
@@ -50,8 +137,13 @@ def upsert_email(
     suspicious_sender_signals: Optional[dict[str, Any]] = None,
     security_score: int = 100,
     warning_type: Optional[str] = None,
-) -> None:
-    """Insert or update email with full metadata."""
+    body_hydrated: bool = True,
+) -> tuple[Any, ...]:
+    """Build the positional parameter tuple for _UPSERT_EMAIL_SQL.
+
+    ``body_hydrated=False`` marks a header-first row whose ``body_text`` is
+    only a preview; the body hydrator fills it in later.
+    """
     content = f"{subject or ''}{body_text}"
     content_hash = hashlib.sha256(content.encode()).hexdigest()[:32]
 
@@ -63,92 +155,157 @@ def upsert_email(
         json.dumps(suspicious_sender_signals) if suspicious_sender_signals else None
     )
 
+    return (
+        uid,
+        folder,
+        message_id,
+        subject,
+        from_addr,
+        to_addr,
+        cc_addr,
+        bcc_addr,
+        date,
+        internal_date,
+        body_text,
+        body_html,
+        flags,
+        is_unread,
+        is_important,
+        size,
+        modseq,
+        in_reply_to,
+        references_header,
+        content_hash,
+        gmail_thread_id,
+        gmail_msgid,
+        gmail_labels_json,
+        has_attachments,
+        attachment_filenames_json,
+        auth_results_raw,
+        spf,
+        dkim,
+        dmarc,
+        is_suspicious_sender,
+        suspicious_sender_signals_json,
+        security_score,
+        warning_type,
+        body_hydrated,
+    )
+
+
+def upsert_email(
+    db: DatabaseInterface,
+    uid: int,
+    folder: str,
+    message_id: Optional[str],
+    subject: Optional[str],
+    from_addr: str,
+    to_addr: str,
+    cc_addr: str,
+    bcc_addr: str,
+    date: Optional[str],
+    internal_date: Optional[str],
+    body_text: str,
+    body_html: str,
+    flags: str,
+    is_unread: bool,
+    is_important: bool,
+    size: int,
+    modseq: int,
+    in_reply_to: str,
+    references_header: str,
+    gmail_thread_id: Optional[int],
+    gmail_msgid: Optional[int],
+    gmail_labels: Optional[list[str]],
+    has_attachments: bool,
+    attachment_filenames: Optional[list[str]],
+    auth_results_raw: Optional[str] = None,
+    spf: Optional[str] = None,
+    dkim: Optional[str] = None,
+    dmarc: Optional[str] = None,
+    is_suspicious_sender: bool = False,
+    suspicious_sender_signals: Optional[dict[str, Any]] = None,
+    security_score: int = 100,
+    warning_type: Optional[str] = None,
+) -> None:
+    """Insert or update email with full metadata."""
+    row = _email_row(
+        uid,
+        folder,
+        message_id,
+        subject,
+        from_addr,
+        to_addr,
+        cc_addr,
+        bcc_addr,
+        date,
+        internal_date,
+        body_text,
+        body_html,
+        flags,
+        is_unread,
+        is_important,
+        size,
+        modseq,
+        in_reply_to,
+        references_header,
+        gmail_thread_id,
+        gmail_msgid,
+        gmail_labels,
+        has_attachments,
+        attachment_filenames,
+        auth_results_raw,
+        spf,
+        dkim,
+        dmarc,
+        is_suspicious_sender,
+        suspicious_sender_signals,
+        security_score,
+        warning_type,
+    )
+
     with db.connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO emails (
-                    uid, folder, message_id, subject, from_addr, to_addr, cc_addr,
-                    bcc_addr, date, internal_date, body_text, body_html, flags,
-                    is_unread, is_important, size, modseq, synced_at, in_reply_to,
-                    references_header, content_hash, gmail_thread_id, gmail_msgid,
-                    gmail_labels, has_attachments, attachment_filenames,
-                    auth_results_raw, spf, dkim, dmarc, is_suspicious_sender, suspicious_sender_signals,
-                    security_score, warning_type
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (uid, folder) DO UPDATE SET
-                    message_id = EXCLUDED.message_id,
-                    subject = EXCLUDED.subject,
-                    from_addr = EXCLUDED.from_addr,
-                    to_addr = EXCLUDED.to_addr,
-                    cc_addr = EXCLUDED.cc_addr,
-                    bcc_addr = EXCLUDED.bcc_addr,
-                    date = EXCLUDED.date,
-                    internal_date = EXCLUDED.internal_date,
-                    body_text = EXCLUDED.body_text,
-                    body_html = EXCLUDED.body_html,
-                    flags = EXCLUDED.flags,
-                    is_unread = EXCLUDED.is_unread,
-                    is_important = EXCLUDED.is_important,
-                    size = EXCLUDED.size,
-                    modseq = EXCLUDED.modseq,
-                    synced_at = NOW(),
-                    in_reply_to = EXCLUDED.in_reply_to,
-                    references_header = EXCLUDED.references_header,
-                    content_hash = EXCLUDED.content_hash,
-                    gmail_thread_id = EXCLUDED.gmail_thread_id,
-                    gmail_msgid = EXCLUDED.gmail_msgid,
-                    gmail_labels = EXCLUDED.gmail_labels,
-                    has_attachments = EXCLUDED.has_attachments,
-                    attachment_filenames = EXCLUDED.attachment_filenames,
-                    auth_results_raw = EXCLUDED.auth_results_raw,
-                    spf = EXCLUDED.spf,
-                    dkim = EXCLUDED.dkim,
-                    dmarc = EXCLUDED.dmarc,
-                    is_suspicious_sender = EXCLUDED.is_suspicious_sender,
-                    suspicious_sender_signals = EXCLUDED.suspicious_sender_signals,
-                    security_score = EXCLUDED.security_score,
-                    warning_type = EXCLUDED.warning_type
-                """,
-                (
-                    uid,
-                    folder,
-                    message_id,
-                    subject,
-                    from_addr,
-                    to_addr,
-                    cc_addr,
-                    bcc_addr,
-                    date,
-                    internal_date,
-                    body_text,
-                    body_html,
-                    flags,
-                    is_unread,
-                    is_important,
-                    size,
-                    modseq,
-                    in_reply_to,
-                    references_header,
-                    content_hash,
-                    gmail_thread_id,
-                    gmail_msgid,
-                    gmail_labels_json,
-                    has_attachments,
-                    attachment_filenames_json,
-                    auth_results_raw,
-                    spf,
-                    dkim,
-                    dmarc,
-                    is_suspicious_sender,
-                    suspicious_sender_signals_json,
-                    security_score,
-                    warning_type,
-                ),
-            )
+            cur.execute(_UPSERT_EMAIL_SQL, row)
             conn.commit()
 
 
+def upsert_emails_bulk(
+    db: DatabaseInterface,
+    emails: list[dict[str, Any]],
+) -> int:
+    """Insert or update a batch of emails in a single transaction.
+
+    Each item takes the same keyword arguments as upsert_email. The rows go
+    out as one multi-row INSERT per UPSERT_BATCH_ROWS, so the statement-level
+    triggers on emails (threads, counters, change feed) fire once per batch
+    rather than once per message. A statement cannot upsert the same row
+    twice, so repeated (uid, folder) keys keep only their last entry.
+
+    Returns:
+        Number of rows written
+    """
+    if not emails:
+        return 0
+
+    by_key: dict[tuple[int, str], tuple[Any, ...]] = {}
+    for params in emails:
+        row = _email_row(**params)
+        by_key[(row[0], row[1])] = row
+    rows = list(by_key.values())
+
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            for start in range(0, len(rows), UPSERT_BATCH_ROWS):
+                chunk = rows[start : start + UPSERT_BATCH_ROWS]
+                cur.execute(
+                    _upsert_emails_sql(len(chunk)),
+                    [value for row in chunk for value in row],
+                )
+        conn.commit()
+    return len(rows)
+
+
 def update_email_flags(
     db: DatabaseInterface,
     uid: int,
@@ -174,6 +331,169 @@ def update_email_flags(
             conn.commit()
 
 
+def reconcile_email_flags(
+    db: DatabaseInterface,
+    folder: str,
+    changed: dict[int, dict[str, Any]],
+    chunk_size: int = 5000,
+) -> int:
+    """Apply a CONDSTORE CHANGEDSINCE result to the cache with set-based UPDATEs.
+
+    Args:
+        db: Database interface
+        folder: Folder the UIDs belong to
+        changed: Result of ImapClient.fetch_changed_since, mapping UID to
+            {"flags": [...], "modseq": int, "gmail_labels": [...] | None}
+        chunk_size: Maximum rows per UPDATE statement
+
+    Returns:
+        Number of rows whose flags, unread state, modseq or labels changed
+    """
+    if not changed:
+        return 0
+
+    items = list(changed.items())
+    updated = 0
+
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            for i in range(0, len(items), chunk_size):
+                chunk = items[i : i + chunk_size]
+                uids = [uid for uid, _ in chunk]
+                flags = [",".join(data["flags"]) for _, data in chunk]
+                unread = ["\\Seen" not in data["flags"] for _, data in chunk]
+                modseqs = [data.get("modseq") or 0 for _, data in chunk]
+                labels = [
+                    json.dumps(data["gmail_labels"])
+                    if data.get("gmail_labels")
+                    else None
+                    for _, data in chunk
+                ]
+                cur.execute(
+                    """
+                    UPDATE emails AS e SET
+                        flags = c.flags,
+                        is_unread = c.is_unread,
+                        modseq = c.modseq,
+                        gmail_labels = COALESCE(c.gmail_labels::jsonb, e.gmail_labels),
+                        synced_at = NOW()
+                    FROM unnest(
+                        %s::int[], %s::text[], %s::bool[], %s::bigint[], %s::text[]
+                    ) AS c(uid, flags, is_unread, modseq, gmail_labels)
+                    WHERE e.folder = %s
+                      AND e.uid = c.uid
+                      AND (
+                        e.flags IS DISTINCT FROM c.flags
+                        OR e.is_unread IS DISTINCT FROM c.is_unread
+                        OR e.modseq IS DISTINCT FROM c.modseq
+                        OR (
+                            c.gmail_labels IS NOT NULL
+                            AND e.gmail_labels IS DISTINCT FROM c.gmail_labels::jsonb
+                        )
+                      )
+                    """,
+                    (uids, flags, unread, modseqs, labels, folder),
+                )
+                updated += cur.rowcount
+        conn.commit()
+    return updated
+
+
+def get_unhydrated_uids(
+    db: DatabaseInterface,
+    folder: str,
+    limit: int = 25,
+) -> list[int]:
+    """UIDs in ``folder`` still waiting for their body, newest first.
+
+    Messages whose fetch failed are skipped while they back off and dropped
+    after ``HYDRATE_MAX_ATTEMPTS``, so they cannot hold the batch forever.
+    """
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT uid FROM emails
+                WHERE folder = %s AND body_hydrated = false
+                  AND hydrate_attempts < %s
+                  AND (hydrate_attempted_at IS NULL
+                       OR hydrate_attempted_at < NOW() - interval '1 minute'
+                          * %s * power(2, GREATEST(hydrate_attempts - 1, 0)))
+                ORDER BY uid DESC
+                LIMIT %s
+                """,
+                (folder, HYDRATE_MAX_ATTEMPTS, HYDRATE_RETRY_BASE_MINUTES, limit),
+            )
+            return [row[0] for row in cur.fetchall()]
+
+
+def record_hydrate_failures(
+    db: DatabaseInterface,
+    folder: str,
+    uids: list[int],
+) -> int:
+    """Count a failed body fetch against each UID, starting its backoff."""
+    if not uids:
+        return 0
+
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE emails SET
+                    hydrate_attempts = hydrate_attempts + 1,
+                    hydrate_attempted_at = NOW()
+                WHERE folder = %s AND uid = ANY(%s) AND body_hydrated = false
+                """,
+                (folder, uids),
+            )
+            updated = cur.rowcount
+        conn.commit()
+    return updated
+
+
+def hydrate_email_bodies(
+    db: DatabaseInterface,
+    folder: str,
+    bodies: dict[int, tuple[str, str]],
+) -> int:
+    """Store fetched bodies for header-first rows and mark them hydrated.
+
+    ``bodies`` maps UID to ``(body_text, body_html)``. ``content_hash`` is
+    recomputed in SQL the same way _email_row computes it, so embeddings keyed
+    on the hash pick up the full body.
+
+    Returns:
+        Number of rows updated
+    """
+    if not bodies:
+        return 0
+
+    uids = list(bodies)
+    texts = [bodies[uid][0] or "" for uid in uids]
+    htmls = [bodies[uid][1] or "" for uid in uids]
+
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE emails AS e SET
+                    body_text = c.body_text,
+                    body_html = c.body_html,
+                    content_hash = left(encode(sha256(convert_to(
+                        COALESCE(e.subject, '') || c.body_text, 'UTF8')), 'hex'), 32),
+                    body_hydrated = true
+                FROM unnest(%s::int[], %s::text[], %s::text[])
+                    AS c(uid, body_text, body_html)
+                WHERE e.folder = %s AND e.uid = c.uid
+                """,
+                (uids, texts, htmls, folder),
+            )
+            updated = cur.rowcount
+        conn.commit()
+    return updated
+
+
 def get_email(
     db: DatabaseInterface,
     uid: int,
@@ -182,10 +502,7 @@ def get_email(
     """Get email by UID and folder."""
     with db.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
-                "SELECT * FROM emails WHERE uid = %s AND folder = %s",
-                (uid, folder),
-            )
+            prepared.execute(cur, "email_by_uid", (uid, folder))
             return cur.fetchone()
 
 
@@ -256,6 +573,25 @@ def delete_email(db: DatabaseInterface, uid: int, folder: str) -> None:
             conn.commit()
 
 
+def delete_emails_bulk(db: DatabaseInterface, folder: str, uids: list[int]) -> int:
+    """Delete many emails from a folder in one statement (e.g. QRESYNC VANISHED).
+
+    Returns the number of rows removed; embeddings cascade via FK.
+    """
+    if not uids:
+        return 0
+
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "DELETE FROM emails WHERE folder = %s AND uid = ANY(%s)",
+                (folder, list(uids)),
+            )
+            deleted = cur.rowcount
+            conn.commit()
+            return deleted
+
+
 def mark_email_read(
     db: DatabaseInterface,
     uid: int,
@@ -284,6 +620,30 @@ def mark_email_read(
             conn.commit()
 
 
+def mark_emails_read_bulk(
+    db: DatabaseInterface,
+    folder: str,
+    uids: list[int],
+    is_read: bool,
+) -> int:
+    """Mark many emails in a folder read or unread in one statement."""
+    if not uids:
+        return 0
+
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE emails SET is_unread = %s
+                WHERE folder = %s AND uid = ANY(%s)
+                """,
+                (not is_read, folder, list(uids)),
+            )
+            updated = cur.rowcount
+            conn.commit()
+            return updated
+
+
 def get_synced_uids(db: DatabaseInterface, folder: str) -> list[int]:
     """Get all synced UIDs for a folder."""
     with db.connection() as conn:
@@ -294,23 +654,14 @@ def get_synced_uids(db: DatabaseInterface, folder: str) -> list[int]:
 
 
 def count_emails(db: DatabaseInterface, folder: str) -> int:
-    """Count emails in folder."""
-    with db.connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("SELECT COUNT(*) FROM emails WHERE folder = %s", (folder,))
-            row = cur.fetchone()
-            return int(row[0]) if row else 0
+    """Count emails in folder (from the maintained folder_counters row)."""
+    return counter_q.get_folder_counters(db, folder)["total"]
 
 
-def count_emails_by_label(db: DatabaseInterface, label: str, folder: str = "INBOX") -> int:
-    with db.connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT COUNT(*) FROM emails WHERE folder = %s AND gmail_labels @> %s::jsonb",
-                (folder, json.dumps([label])),
-            )
-            row = cur.fetchone()
-            return int(row[0]) if row else 0
+def count_emails_by_label(
+    db: DatabaseInterface, label: str, folder: str = "INBOX"
+) -> int:
+    return counter_q.get_label_counters(db, label, folder)["total"]
 
 
 def get_emails_by_label(
@@ -319,20 +670,37 @@ def get_emails_by_label(
     folder: str = "INBOX",
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
 ) -> list[dict[str, Any]]:
+    """Emails carrying ``label``, newest first.
+
+    Pass ``cursor`` (from ``email_cursor``) when walking a label whose members
+    are relabelled as they are processed; an offset would skip mail.
+
+    Raises:
+        ValueError: If ``cursor`` is malformed
+    """
+    conditions = ["folder = %s", "gmail_labels @> %s::jsonb"]
+    params: list[Any] = [folder, json.dumps([label])]
+    if cursor:
+        condition, cursor_params = _older_than(*decode_email_cursor(cursor))
+        conditions.append(condition)
+        params.extend(cursor_params)
+    params.extend([limit, offset])
+
     with db.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
             cur.execute(
-                """
-                SELECT uid, folder, message_id, subject, sender, recipients, cc, bcc,
-                       date, body_text, body_html, is_read, is_flagged, gmail_labels,
-                       has_attachments, attachment_count, thread_id
+                f"""
+                SELECT uid, folder, message_id, subject, from_addr, to_addr, cc_addr,
+                       date, body_text, body_html, is_unread, gmail_labels,
+                       has_attachments, gmail_thread_id
                 FROM emails
-                WHERE folder = %s AND gmail_labels @> %s::jsonb
-                ORDER BY date DESC
+                WHERE {" AND ".join(conditions)}
+                ORDER BY date DESC, uid DESC
                 LIMIT %s OFFSET %s
                 """,
-                (folder, json.dumps([label]), limit, offset),
+                params,
             )
             return list(cur.fetchall())
 
@@ -376,6 +744,47 @@ def remove_email_label(
             conn.commit()
 
 
+def modify_email_labels_bulk(
+    db: DatabaseInterface,
+    folder: str,
+    uids: list[int],
+    labels: list[str],
+    action: str,
+) -> int:
+    """Add, remove or set Gmail labels on many emails in one statement."""
+    if not uids:
+        return 0
+
+    if action == "add":
+        sql = """
+            UPDATE emails
+            SET gmail_labels = COALESCE(gmail_labels, '[]'::jsonb) || COALESCE((
+                SELECT jsonb_agg(l) FROM unnest(%s::text[]) AS l
+                WHERE NOT COALESCE(emails.gmail_labels, '[]'::jsonb) @> to_jsonb(l)
+            ), '[]'::jsonb)
+            WHERE folder = %s AND uid = ANY(%s)
+        """
+    elif action == "remove":
+        sql = """
+            UPDATE emails SET gmail_labels = gmail_labels - %s::text[]
+            WHERE folder = %s AND uid = ANY(%s)
+        """
+    elif action == "set":
+        sql = """
+            UPDATE emails SET gmail_labels = to_jsonb(%s::text[])
+            WHERE folder = %s AND uid = ANY(%s)
+        """
+    else:
+        raise ValueError(f"Invalid label action: {action}")
+
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql, (list(labels), folder, list(uids)))
+            updated = cur.rowcount
+            conn.commit()
+            return updated
+
+
 # ============================================================================
 # Folder State Management (CONDSTORE)
 # ============================================================================
@@ -482,13 +891,99 @@ def log_sync_error(
 # ============================================================================
 
 
+def encode_email_cursor(date: Optional[datetime], uid: int) -> str:
+    """Opaque keyset cursor for the email at ``(date, uid)``."""
+    payload = json.dumps({"d": date.isoformat() if date else None, "u": uid})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_email_cursor(cursor: str) -> tuple[Optional[datetime], int]:
+    """Inverse of ``encode_email_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        date = datetime.fromisoformat(payload["d"]) if payload["d"] else None
+        return date, int(payload["u"])
+    except (binascii.Error, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid email cursor: {cursor!r}") from e
+
+
+def email_cursor(email: dict[str, Any]) -> str:
+    """Cursor positioned after ``email`` in (date DESC, uid DESC) order."""
+    return encode_email_cursor(email.get("date"), email["uid"])
+
+
+def _older_than(date: Optional[datetime], uid: int) -> tuple[str, list[Any]]:
+    """Condition for rows after ``(date, uid)`` in ``date DESC, uid DESC`` order.
+
+    DESC sorts NULL dates first, so they precede every dated row. The dated
+    case is a plain row comparison that walks idx_emails_folder_date_uid.
+    """
+    if date is None:
+        return "(date IS NOT NULL OR uid < %s)", [uid]
+    return "(date, uid) < (%s, %s)", [date, uid]
+
+
+@lru_cache(maxsize=None)
+def _inbox_sql(by_label: bool, unread_only: bool, after: Optional[str]) -> str:
+    """Fixed statement text for one combination of inbox filters."""
+    filters = ["gmail_labels::jsonb ? %s" if by_label else "folder = %s"]
+    if unread_only:
+        filters.append("is_unread = true")
+    if after:
+        filters.append(after)
+
+    sql = f"""
+        SELECT uid, folder, from_addr, to_addr, cc_addr, subject,
+               LEFT(body_text, 200) as preview, date, is_unread, has_attachments,
+               gmail_labels
+        FROM emails
+        WHERE {" AND ".join(filters)}
+        ORDER BY date DESC, uid DESC
+        LIMIT %s OFFSET %s
+    """
+    name = f"inbox_emails:{'label' if by_label else 'folder'}:{int(unread_only)}:{after or ''}"
+    return prepared.register(name, sql)
+
+
+def inbox_emails_query(
+    folder: str,
+    limit: int,
+    offset: int = 0,
+    unread_only: bool = False,
+    label: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> tuple[str, list[Any]]:
+    """SQL and parameters for ``get_inbox_emails``.
+
+    The SQL is one of a few fixed statements (label or folder, unread,
+    cursor kind), each prepared once per connection.
+
+    Raises:
+        ValueError: If ``cursor`` is malformed
+    """
+    # Filter by Gmail label (stored as JSON array) or by folder
+    params: list[Any] = [label or folder]
+    after = None
+    if cursor:
+        after, cursor_params = _older_than(*decode_email_cursor(cursor))
+        params.extend(cursor_params)
+    params.extend([limit, offset])
+    return _inbox_sql(bool(label), unread_only, after), params
+
+
 def get_inbox_emails(
     db: DatabaseInterface,
     folder: str,
     limit: int,
-    offset: int,
+    offset: int = 0,
     unread_only: bool = False,
     label: Optional[str] = None,
+    cursor: Optional[str] = None,
 ) -> list[dict[str, Any]]:
     """Get inbox emails with preview for list view.
 
@@ -496,43 +991,103 @@ def get_inbox_emails(
         db: Database interface
         folder: IMAP folder name (ignored if label is specified)
         limit: Max emails to return
-        offset: Pagination offset
+        offset: Pagination offset (prefer ``cursor`` beyond the first page)
         unread_only: Only return unread emails
         label: Gmail label to filter by (e.g., "Secretary/Priority")
+        cursor: Keyset cursor from ``email_cursor``; rows strictly after it
+
+    Raises:
+        ValueError: If ``cursor`` is malformed
     """
-    # Build filter conditions
-    filters = []
-    params: list[Any] = []
+    sql, params = inbox_emails_query(folder, limit, offset, unread_only, label, cursor)
 
-    if label:
-        # Filter by Gmail label (stored as JSON array)
-        filters.append("gmail_labels::jsonb ? %s")
-        params.append(label)
-    else:
-        # Filter by folder
-        filters.append("folder = %s")
-        params.append(folder)
+    with db.connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(sql, params, prepare=True)
+            return cur.fetchall()
 
-    if unread_only:
-        filters.append("is_unread = true")
 
-    where_clause = " AND ".join(filters)
+def get_inbox_page(
+    db: DatabaseInterface,
+    folder: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    unread_only: bool = False,
+    label: Optional[str] = None,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """One keyset page of the inbox list.
 
-    sql = f"""
-        SELECT uid, folder, from_addr, to_addr, cc_addr, subject, 
-               LEFT(body_text, 200) as preview, date, is_unread, has_attachments,
-               gmail_labels
-        FROM emails 
-        WHERE {where_clause}
-        ORDER BY date DESC 
-        LIMIT %s OFFSET %s
+    Returns:
+        (emails, next_cursor); next_cursor is None on the last page
+    """
+    emails = get_inbox_emails(
+        db, folder, limit + 1, unread_only=unread_only, label=label, cursor=cursor
+    )
+    return split_email_page(emails, limit)
+
+
+def split_email_page(
+    emails: list[dict[str, Any]], limit: int
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """Trim a ``limit + 1`` fetch to one page and its continuation cursor."""
+    if len(emails) <= limit:
+        return emails, None
+    emails = emails[:limit]
+    return emails, email_cursor(emails[-1])
+
+
+def _neighbor_uids_sql(unread_only: bool) -> str:
+    unread = "AND e.is_unread = true" if unread_only else ""
+    # Each branch is a single-row keyset probe on idx_emails_folder_date_uid;
+    # conditions on ``cur`` alone become one-time filters, so only the
+    # branches matching the current row's date (NULL or not) are scanned.
+    # DESC order puts undated rows first, newest uid first.
+    return f"""
+        WITH cur AS (
+            SELECT date, uid FROM emails WHERE uid = %(uid)s AND folder = %(folder)s
+        )
+        SELECT
+            COALESCE(
+                (SELECT e.uid FROM emails e
+                 WHERE cur.date IS NOT NULL AND e.folder = %(folder)s {unread}
+                   AND (e.date, e.uid) < (cur.date, cur.uid)
+                 ORDER BY e.date DESC, e.uid DESC LIMIT 1),
+                (SELECT e.uid FROM emails e
+                 WHERE cur.date IS NULL AND e.folder = %(folder)s {unread}
+                   AND e.date IS NULL AND e.uid < cur.uid
+                 ORDER BY e.uid DESC LIMIT 1),
+                (SELECT e.uid FROM emails e
+                 WHERE cur.date IS NULL AND e.folder = %(folder)s {unread}
+                   AND e.date IS NOT NULL
+                 ORDER BY e.date DESC, e.uid DESC LIMIT 1)
+            ) AS prev,
+            COALESCE(
+                (SELECT e.uid FROM emails e
+                 WHERE cur.date IS NOT NULL AND e.folder = %(folder)s {unread}
+                   AND (e.date, e.uid) > (cur.date, cur.uid)
+                 ORDER BY e.date ASC, e.uid ASC LIMIT 1),
+                (SELECT e.uid FROM emails e
+                 WHERE e.folder = %(folder)s {unread} AND e.date IS NULL
+                   AND (cur.date IS NOT NULL OR e.uid > cur.uid)
+                 ORDER BY e.uid ASC LIMIT 1)
+            ) AS next
+        FROM cur
     """
-    params.extend([limit, offset])
 
-    with db.connection() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(sql, params)
-            return cur.fetchall()
+
+NEIGHBOR_UIDS_SQL = {
+    unread_only: prepared.register(
+        "neighbor_uids:unread" if unread_only else "neighbor_uids",
+        _neighbor_uids_sql(unread_only),
+    )
+    for unread_only in (False, True)
+}
+
+
+def neighbors_from_row(row: Optional[dict[str, Any]]) -> dict[str, Optional[int]]:
+    if not row:
+        return {"next": None, "prev": None}
+    return {"next": row["next"], "prev": row["prev"]}
 
 
 def get_neighbor_uids(
@@ -541,45 +1096,36 @@ def get_neighbor_uids(
     uid: int,
     unread_only: bool = False,
 ) -> dict[str, Optional[int]]:
-    """Get UIDs of next and previous emails for navigation."""
+    """Get UIDs of next (newer) and previous (older) emails for navigation.
+
+    One prepared statement; both directions are keyset probes on
+    idx_emails_folder_date_uid.
+    """
     with db.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
-            # Get current email's date
             cur.execute(
-                "SELECT date FROM emails WHERE uid = %s AND folder = %s",
-                (uid, folder),
+                NEIGHBOR_UIDS_SQL[unread_only],
+                {"uid": uid, "folder": folder},
+                prepare=True,
             )
-            current = cur.fetchone()
-            if not current:
-                return {"next": None, "prev": None}
-
-            current_date = current["date"]
-            unread_filter = "AND is_unread = true" if unread_only else ""
-
-            # Next (Newer) - ORDER BY date ASC
-            sql_next = f"""
-                SELECT uid FROM emails 
-                WHERE folder = %s {unread_filter}
-                AND (date > %s OR (date = %s AND uid > %s))
-                ORDER BY date ASC, uid ASC LIMIT 1
-            """
-            cur.execute(sql_next, (folder, current_date, current_date, uid))
-            next_row = cur.fetchone()
-
-            # Previous (Older) - ORDER BY date DESC
-            sql_prev = f"""
-                SELECT uid FROM emails 
-                WHERE folder = %s {unread_filter}
-                AND (date < %s OR (date = %s AND uid < %s))
-                ORDER BY date DESC, uid DESC LIMIT 1
-            """
-            cur.execute(sql_prev, (folder, current_date, current_date, uid))
-            prev_row = cur.fetchone()
-
-            return {
-                "next": next_row["uid"] if next_row else None,
-                "prev": prev_row["uid"] if prev_row else None,
-            }
+            return neighbors_from_row(cur.fetchone())
+
+
+THREAD_BY_UID_SQL = prepared.register(
+    "thread_by_uid",
+    """
+    SELECT * FROM (
+        SELECT DISTINCT ON (COALESCE(message_id, folder || ':' || uid)) *
+        FROM emails
+        WHERE thread_key = (
+            SELECT thread_key FROM emails WHERE uid = %(uid)s AND folder = %(folder)s
+        )
+        ORDER BY COALESCE(message_id, folder || ':' || uid),
+                 (folder = %(folder)s) DESC, uid DESC
+    ) thread
+    ORDER BY date ASC NULLS FIRST, uid ASC
+    """,
+)
 
 
 def get_thread(
@@ -587,45 +1133,71 @@ def get_thread(
     uid: int,
     folder: str,
 ) -> list[dict[str, Any]]:
-    """Get email thread by reconstructing from message-id/references."""
+    """Get the conversation containing an email, oldest message first.
+
+    Messages share the ``thread_key`` assigned at ingest (X-GM-THRID on
+    Gmail, the References root elsewhere). A message stored in several
+    folders is returned once, preferring the copy in ``folder``.
+    """
     with db.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
-                "SELECT message_id, in_reply_to, references_header FROM emails WHERE uid = %s AND folder = %s",
-                (uid, folder),
-            )
-            row = cur.fetchone()
-            if not row:
-                return []
+            prepared.execute(cur, "thread_by_uid", {"uid": uid, "folder": folder})
+            thread = cur.fetchall()
+            if thread:
+                return thread
 
-            message_id = row["message_id"]
-            in_reply_to = row["in_reply_to"] or ""
-            references = row["references_header"] or ""
+            # No thread key yet: the conversation is just this email
+            prepared.execute(cur, "email_by_uid", (uid, folder))
+            single = cur.fetchone()
+            return [single] if single else []
 
-            related_ids = set()
-            if message_id:
-                related_ids.add(message_id)
-            for ref in (in_reply_to + " " + references).split():
-                if ref:
-                    related_ids.add(ref)
 
-            if not related_ids:
-                cur.execute(
-                    "SELECT * FROM emails WHERE uid = %s AND folder = %s",
-                    (uid, folder),
-                )
-                single = cur.fetchone()
-                return [single] if single else []
+def get_thread_view(
+    db: DatabaseInterface,
+    uid: int,
+    folder: str,
+    unread_only: bool = False,
+) -> dict[str, Any]:
+    """Everything the thread page reads, in one pipelined round trip.
 
-            cur.execute(
-                """
-                SELECT * FROM emails 
-                WHERE message_id = ANY(%s) OR in_reply_to = ANY(%s)
-                ORDER BY date ASC
-            """,
-                (list(related_ids), list(related_ids)),
+    Returns:
+        {"email", "thread", "neighbors"}; ``email`` is None when the UID is
+        not in ``folder``
+    """
+    with db.connection() as conn:
+        with (
+            conn.cursor(row_factory=dict_row) as email_cur,
+            conn.cursor(row_factory=dict_row) as thread_cur,
+            conn.cursor(row_factory=dict_row) as neighbor_cur,
+        ):
+            with conn.pipeline():
+                prepared.execute(email_cur, "email_by_uid", (uid, folder))
+                prepared.execute(
+                    thread_cur, "thread_by_uid", {"uid": uid, "folder": folder}
+                )
+                neighbor_cur.execute(
+                    NEIGHBOR_UIDS_SQL[unread_only],
+                    {"uid": uid, "folder": folder},
+                    prepare=True,
+                )
+            return thread_view(
+                email_cur.fetchone(), thread_cur.fetchall(), neighbor_cur.fetchone()
             )
-            return cur.fetchall()
+
+
+def thread_view(
+    email: Optional[dict[str, Any]],
+    thread: list[dict[str, Any]],
+    neighbors: Optional[dict[str, Any]],
+) -> dict[str, Any]:
+    """Assemble ``get_thread_view`` results from the three pipelined reads."""
+    if email is None:
+        return {"email": None, "thread": [], "neighbors": neighbors_from_row(None)}
+    return {
+        "email": email,
+        "thread": thread or [email],
+        "neighbors": neighbors_from_row(neighbors),
+    }
 
 
 def search_emails_fts(
@@ -634,90 +1206,79 @@ def search_emails_fts(
     folder: str,
     limit: int,
 ) -> list[dict[str, Any]]:
-    """Search emails using PostgreSQL full-text search."""
+    """Search emails using PostgreSQL full-text search, best matches first.
+
+    ``query`` uses web search syntax: ``"exact phrase"``, ``-excluded``, ``or``.
+    """
     with db.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
             cur.execute(
                 """
-                SELECT uid, folder, from_addr, subject, 
-                       LEFT(body_text, 200) as preview, date, is_unread
-                FROM emails 
-                WHERE folder = %s AND (
-                    to_tsvector('english', COALESCE(subject, '') || ' ' || COALESCE(body_text, '')) 
-                    @@ plainto_tsquery('english', %s)
-                )
-                ORDER BY date DESC LIMIT %s
+                SELECT uid, folder, from_addr, subject,
+                       LEFT(body_text, 200) as preview, date, is_unread,
+                       ts_rank_cd(search_tsv, q) as rank
+                FROM emails, websearch_to_tsquery('english', %s) q
+                WHERE folder = %s AND search_tsv @@ q
+                ORDER BY rank DESC, date DESC LIMIT %s
             """,
-                (folder, query, limit),
+                (query, folder, limit),
             )
             return cur.fetchall()
 
 
-def search_emails_advanced(
-    db: DatabaseInterface,
+def search_emails_advanced_query(
     query: str,
     folder: str,
     limit: int,
     filters: dict[str, Any],
-) -> list[dict[str, Any]]:
-    """Search emails with advanced metadata filters."""
+) -> tuple[str, list[Any]]:
+    """SQL and parameters for ``search_emails_advanced``."""
     conditions = ["folder = %s"]
-    params: list[Any] = [folder]
+    params: list[Any] = []
+    rank = "NULL::real"
+    order = "date DESC"
+    source = "emails"
 
     if query.strip():
-        conditions.append(
-            """(
-                to_tsvector('english', COALESCE(subject, '') || ' ' || COALESCE(body_text, '')) 
-                @@ plainto_tsquery('english', %s)
-            )"""
-        )
+        source = "emails, websearch_to_tsquery('english', %s) q"
         params.append(query)
+        conditions.append("search_tsv @@ q")
+        rank = "ts_rank_cd(search_tsv, q)"
+        order = "rank DESC, date DESC"
 
-    if filters.get("from_addr"):
-        conditions.append("from_addr ILIKE %s")
-        params.append(f"%{filters['from_addr']}%")
+    params.append(folder)
 
-    if filters.get("date_from"):
-        conditions.append("date >= %s")
-        params.append(filters["date_from"])
-
-    if filters.get("date_to"):
-        conditions.append("date <= %s")
-        params.append(filters["date_to"])
-
-    if filters.get("has_attachments") is not None:
-        conditions.append("has_attachments = %s")
-        params.append(filters["has_attachments"])
-
-    if filters.get("is_unread") is not None:
-        conditions.append("is_unread = %s")
-        params.append(filters["is_unread"])
-
-    if filters.get("to_addr"):
-        conditions.append("to_addr ILIKE %s")
-        params.append(f"%{filters['to_addr']}%")
-
-    if filters.get("subject_contains"):
-        conditions.append("subject ILIKE %s")
-        params.append(f"%{filters['subject_contains']}%")
-
-    if filters.get("is_starred") is not None:
-        if filters["is_starred"]:
-            conditions.append("gmail_labels ? '\\\\Starred'")
-
-    if filters.get("attachment_filename"):
-        conditions.append("attachment_filenames::text ILIKE %s")
-        params.append(f"%{filters['attachment_filename']}%")
+    for condition in plan_email_filters(filters):
+        conditions.append(condition.sql)
+        params.extend(condition.params)
 
     params.append(limit)
 
     sql = f"""
-        SELECT uid, folder, from_addr, subject, 
-               LEFT(body_text, 200) as preview, date, is_unread, has_attachments
-        FROM emails 
+        SELECT uid, folder, from_addr, subject,
+               LEFT(body_text, 200) as preview, date, is_unread, has_attachments,
+               {rank} as rank
+        FROM {source}
         WHERE {" AND ".join(conditions)}
-        ORDER BY date DESC LIMIT %s
+        ORDER BY {order} LIMIT %s
     """
+    return sql, params
+
+
+def search_emails_advanced(
+    db: DatabaseInterface,
+    query: str,
+    folder: str,
+    limit: int,
+    filters: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """Search emails with advanced metadata filters.
+
+    A non-empty ``query`` is matched against ``search_tsv`` with
+    ``websearch_to_tsquery`` and results are ranked by ``ts_rank_cd``;
+    filter-only searches are ordered by date.
+    """
+    sql, params = search_emails_advanced_query(query, folder, limit, filters)
 
     with db.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
@@ -725,43 +1286,50 @@ def search_emails_advanced(
             return cur.fetchall()
 
 
+SENDER_SUGGESTIONS_SQL = """
+    SELECT email
+    FROM contacts
+    WHERE lower(email) LIKE %s OR lower(display_name) LIKE %s
+    ORDER BY email_count DESC NULLS LAST LIMIT %s
+"""
+
+SUBJECT_SUGGESTIONS_SQL = """
+    SELECT subject
+    FROM subject_suggestions
+    WHERE subject_key LIKE %s
+    ORDER BY last_seen DESC NULLS LAST LIMIT %s
+"""
+
+
+def suggestion_prefix(query: str) -> str:
+    """Case-folded LIKE prefix pattern for ``get_search_suggestions``."""
+    return f"{escape_like(query.strip().lower())}%"
+
+
 def get_search_suggestions(
     db: DatabaseInterface,
     query: str,
     limit: int = 5,
 ) -> list[dict[str, Any]]:
-    """Get search suggestions for autocomplete (senders and subjects)."""
+    """Get search suggestions for autocomplete (senders and subjects).
+
+    Both lookups are indexed prefix scans: senders come from ``contacts``
+    (email or display name), subjects from the ``subject_suggestions``
+    dictionary, so each keystroke is independent of mailbox size.
+    """
+    prefix = suggestion_prefix(query)
     suggestions: list[dict[str, Any]] = []
     with db.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
             # Suggest senders
-            cur.execute(
-                """
-                SELECT DISTINCT from_addr, COUNT(*) as cnt
-                FROM emails
-                WHERE from_addr ILIKE %s
-                GROUP BY from_addr
-                ORDER BY cnt DESC LIMIT %s
-                """,
-                (f"%{query}%", limit),
-            )
+            cur.execute(SENDER_SUGGESTIONS_SQL, (prefix, prefix, limit))
             for row in cur.fetchall():
-                suggestions.append({"type": "sender", "value": row["from_addr"]})
+                suggestions.append({"type": "sender", "value": row["email"]})
 
             # Suggest subjects
-            cur.execute(
-                """
-                SELECT subject
-                FROM emails
-                WHERE subject ILIKE %s
-                GROUP BY subject
-                ORDER BY MAX(date) DESC LIMIT %s
-                """,
-                (f"%{query}%", limit),
-            )
+            cur.execute(SUBJECT_SUGGESTIONS_SQL, (prefix, limit))
             for row in cur.fetchall():
-                if row["subject"]:
-                    suggestions.append({"type": "subject", "value": row["subject"]})
+                suggestions.append({"type": "subject", "value": row["subject"]})
 
     return suggestions[:limit]
 
@@ -2,70 +2,248 @@
 
 from __future__ import annotations
 
-from typing import Any, cast
+from typing import Any, Optional, cast
 
 from psycopg.rows import dict_row
 
+from workspace_secretary.db.queries import counters as counter_q
+from workspace_secretary.db.queries.search_filters import plan_email_filters
+from workspace_secretary.db.schema import folder_vector_predicate
 from workspace_secretary.db.types import DatabaseInterface
 
+DEFAULT_EF_SEARCH = 100
+# hnsw.ef_search upper bound enforced by pgvector
+HNSW_MAX_EF_SEARCH = 1000
+ITERATIVE_SCAN_MIN_VERSION = (0, 8, 0)
+OVERFETCH_FACTOR = 4
+
 
 def upsert_embedding(
     db: DatabaseInterface,
-    uid: int,
-    folder: str,
+    content_hash: str,
     embedding: list[float],
     model: str,
-    content_hash: str,
 ) -> None:
-    """Insert or update email embedding."""
+    """Insert or update the embedding for a content hash.
+
+    Every email whose ``emails.content_hash`` matches shares this vector, so
+    copies of a message in several folders are embedded once.
+    """
     with db.connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 """
-                INSERT INTO email_embeddings (email_uid, email_folder, embedding, model, content_hash)
-                VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (email_uid, email_folder) DO UPDATE SET
+                INSERT INTO embedding_vectors (content_hash, embedding, model)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (content_hash) DO UPDATE SET
                     embedding = EXCLUDED.embedding,
                     model = EXCLUDED.model,
-                    content_hash = EXCLUDED.content_hash,
                     created_at = NOW()
                 """,
-                (uid, folder, embedding, model, content_hash),
+                (content_hash, embedding, model),
             )
             conn.commit()
 
 
-def semantic_search(
+def upsert_embeddings_bulk(
+    db: DatabaseInterface,
+    rows: list[tuple[str, list[float], str]],
+) -> int:
+    """Store ``(content_hash, embedding, model)`` rows in one multi-row INSERT.
+
+    Duplicate hashes within ``rows`` are collapsed (last wins) since a single
+    INSERT ... ON CONFLICT DO UPDATE cannot touch the same row twice.
+    """
+    unique = list({row[0]: row for row in rows}.values())
+    if not unique:
+        return 0
+
+    values = ", ".join(["(%s, %s, %s)"] * len(unique))
+    params: list[Any] = [value for row in unique for value in row]
+
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                INSERT INTO embedding_vectors (content_hash, embedding, model)
+                VALUES {values}
+                ON CONFLICT (content_hash) DO UPDATE SET
+                    embedding = EXCLUDED.embedding,
+                    model = EXCLUDED.model,
+                    created_at = NOW()
+                """,
+                params,
+            )
+        conn.commit()
+    return len(unique)
+
+
+PGVECTOR_VERSION_SQL = "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+
+
+def iterative_scan_supported(extversion: Any) -> bool:
+    """Whether a pgvector ``extversion`` has ``hnsw.iterative_scan`` (0.8.0+)."""
+    version: tuple[int, ...] = ()
+    if extversion:
+        version = tuple(
+            int(part) for part in str(extversion).split(".") if part.isdigit()
+        )
+    return version >= ITERATIVE_SCAN_MIN_VERSION
+
+
+def supports_iterative_scan(db: DatabaseInterface) -> bool:
+    """Whether the installed pgvector has ``hnsw.iterative_scan`` (0.8.0+).
+
+    Checked once per database object.
+    """
+    cached = getattr(db, "_hnsw_iterative_scan", None)
+    if cached is not None:
+        return cached
+
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(PGVECTOR_VERSION_SQL)
+            row = cur.fetchone()
+
+    supported = iterative_scan_supported(row[0] if row else None)
+    cast(Any, db)._hnsw_iterative_scan = supported
+    return supported
+
+
+def hnsw_option_statements(
+    ef_search: int, iterative: bool = False
+) -> list[tuple[str, tuple[Any, ...]]]:
+    """``set_config`` calls applying transaction-local HNSW settings."""
+    statements: list[tuple[str, tuple[Any, ...]]] = [
+        (
+            "SELECT set_config('hnsw.ef_search', %s, true)",
+            (str(min(max(ef_search, 1), HNSW_MAX_EF_SEARCH)),),
+        )
+    ]
+    if iterative:
+        statements.append(
+            ("SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true)", ())
+        )
+    return statements
+
+
+def _set_hnsw_options(cur: Any, ef_search: int, iterative: bool = False) -> None:
+    """Transaction-local HNSW settings for the next vector query."""
+    for sql, params in hnsw_option_statements(ef_search, iterative):
+        if params:
+            cur.execute(sql, params)
+        else:
+            cur.execute(sql)
+
+
+def _filtered_knn(
     db: DatabaseInterface,
     query_embedding: list[float],
     folder: str,
     limit: int,
-    threshold: float = 0.5,
+    filters: dict[str, Any],
+    threshold: float,
+    ef_search: Optional[int],
 ) -> list[dict[str, Any]]:
-    """Semantic search using inner product on normalized vectors."""
+    """k-NN over ``embedding_vectors`` that still returns ``limit`` filtered hits.
+
+    Folder and metadata filters are pushed into the HNSW scan; with pgvector
+    0.8+ ``hnsw.iterative_scan`` keeps walking the graph until enough rows
+    pass them. Older pgvector gets adaptive over-fetch: the nearest
+    ``limit * OVERFETCH_FACTOR`` vectors are filtered, and the candidate pool
+    grows until ``limit`` hits are found or the ef_search ceiling is reached.
+    Folders with a partial HNSW index (``hot_folders``) are scanned through it.
+    The similarity ``threshold`` is applied to the ranked hits, never inside
+    the index scan.
+    """
     vtype = cast(Any, db)._vector_type
+    ef_search = ef_search or getattr(db, "hnsw_ef_search", DEFAULT_EF_SEARCH)
+    hot_folders = getattr(db, "hot_folders", None) or []
+
+    vector_conditions = []
+    if folder in hot_folders:
+        vector_conditions.append(folder_vector_predicate(folder, alias="emb"))
+
+    conditions = ["e.folder = %s"]
+    filter_params: list[Any] = [folder]
+    for condition in plan_email_filters(filters, alias="e"):
+        conditions.append(condition.sql)
+        filter_params.extend(condition.params)
+
+    columns = """e.uid, e.folder, e.from_addr, e.subject,
+               LEFT(e.body_text, 200) as preview, e.date, e.is_unread, e.has_attachments"""
+
+    if supports_iterative_scan(db):
+        sql = f"""
+            SELECT hits.*, -hits.distance AS similarity
+            FROM (
+                SELECT {columns}, emb.embedding <#> %s::{vtype} AS distance
+                FROM embedding_vectors emb
+                JOIN emails e ON e.content_hash = emb.content_hash
+                WHERE {" AND ".join(vector_conditions + conditions)}
+                ORDER BY emb.embedding <#> %s::{vtype}
+                LIMIT %s
+            ) hits
+            WHERE -hits.distance > %s
+            ORDER BY hits.distance
+        """
+        params = [query_embedding, *filter_params, query_embedding, limit, threshold]
+        with db.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                with conn.pipeline():
+                    _set_hnsw_options(cur, ef_search, iterative=True)
+                    cur.execute(sql, params)
+                return cur.fetchall()
+
+    vector_where = (
+        f"WHERE {' AND '.join(vector_conditions)}" if vector_conditions else ""
+    )
+    sql = f"""
+        SELECT {columns}, n.distance, -n.distance AS similarity
+        FROM (
+            SELECT emb.content_hash, emb.embedding <#> %s::{vtype} AS distance
+            FROM embedding_vectors emb
+            {vector_where}
+            ORDER BY emb.embedding <#> %s::{vtype}
+            LIMIT %s
+        ) n
+        JOIN emails e ON e.content_hash = n.content_hash
+        WHERE {" AND ".join(conditions)} AND -n.distance > %s
+        ORDER BY n.distance
+        LIMIT %s
+    """
+    pool = max(limit * OVERFETCH_FACTOR, ef_search)
     with db.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
-                f"""
-                SELECT e.uid, e.folder, e.from_addr, e.subject, 
-                       LEFT(e.body_text, 200) as preview, e.date, e.is_unread,
-                       -(emb.embedding <#> %s::{vtype}) as similarity
-                FROM email_embeddings emb
-                JOIN emails e ON e.uid = emb.email_uid AND e.folder = emb.email_folder
-                WHERE e.folder = %s AND -(emb.embedding <#> %s::{vtype}) > %s
-                ORDER BY emb.embedding <#> %s::{vtype} LIMIT %s
-            """,
-                (
+            while True:
+                pool = min(pool, HNSW_MAX_EF_SEARCH)
+                params = [
                     query_embedding,
-                    folder,
                     query_embedding,
+                    pool,
+                    *filter_params,
                     threshold,
-                    query_embedding,
                     limit,
-                ),
-            )
-            return cur.fetchall()
+                ]
+                with conn.pipeline():
+                    _set_hnsw_options(cur, max(ef_search, pool))
+                    cur.execute(sql, params)
+                rows = cur.fetchall()
+                if len(rows) >= limit or pool >= HNSW_MAX_EF_SEARCH:
+                    return rows
+                pool *= OVERFETCH_FACTOR
+
+
+def semantic_search(
+    db: DatabaseInterface,
+    query_embedding: list[float],
+    folder: str,
+    limit: int,
+    threshold: float = 0.5,
+    ef_search: Optional[int] = None,
+) -> list[dict[str, Any]]:
+    """Semantic search using inner product on normalized vectors."""
+    return _filtered_knn(db, query_embedding, folder, limit, {}, threshold, ef_search)
 
 
 def semantic_search_advanced(
@@ -75,63 +253,135 @@ def semantic_search_advanced(
     limit: int,
     filters: dict[str, Any],
     threshold: float = 0.5,
+    ef_search: Optional[int] = None,
 ) -> list[dict[str, Any]]:
     """Semantic search with advanced metadata filters."""
-    vtype = cast(Any, db)._vector_type
-    conditions = ["e.folder = %s", f"-(emb.embedding <#> %s::{vtype}) > %s"]
-    params: list[Any] = [folder, query_embedding, threshold]
-
-    if filters.get("from_addr"):
-        conditions.append("e.from_addr ILIKE %s")
-        params.append(f"%{filters['from_addr']}%")
-
-    if filters.get("date_from"):
-        conditions.append("e.date >= %s")
-        params.append(filters["date_from"])
+    return _filtered_knn(
+        db, query_embedding, folder, limit, filters, threshold, ef_search
+    )
 
-    if filters.get("date_to"):
-        conditions.append("e.date <= %s")
-        params.append(filters["date_to"])
 
-    if filters.get("has_attachments") is not None:
-        conditions.append("e.has_attachments = %s")
-        params.append(filters["has_attachments"])
-
-    if filters.get("is_unread") is not None:
-        conditions.append("e.is_unread = %s")
-        params.append(filters["is_unread"])
-
-    if filters.get("to_addr"):
-        conditions.append("e.to_addr ILIKE %s")
-        params.append(f"%{filters['to_addr']}%")
+def hybrid_search_query(
+    vtype: str,
+    query: str,
+    query_embedding: list[float],
+    folder: str,
+    limit: int,
+    filters: Optional[dict[str, Any]] = None,
+    candidates: int = 100,
+    rrf_k: int = 60,
+) -> tuple[str, list[Any]]:
+    """SQL and parameters for ``hybrid_search`` over ``vtype`` vectors."""
+    conditions = ["TRUE"]
+    filter_params: list[Any] = []
+    for condition in plan_email_filters(filters or {}, alias="e"):
+        conditions.append(condition.sql)
+        filter_params.extend(condition.params)
 
-    if filters.get("subject_contains"):
-        conditions.append("e.subject ILIKE %s")
-        params.append(f"%{filters['subject_contains']}%")
+    sql = f"""
+        WITH lexical AS (
+            SELECT e.uid, e.folder,
+                   row_number() OVER (
+                       ORDER BY ts_rank_cd(e.search_tsv, q) DESC, e.date DESC
+                   ) AS rnk
+            FROM emails e, websearch_to_tsquery('english', %s) q
+            WHERE e.folder = %s AND e.search_tsv @@ q
+            ORDER BY rnk
+            LIMIT %s
+        ),
+        nearest AS (
+            SELECT content_hash, embedding <#> %s::{vtype} AS distance
+            FROM embedding_vectors
+            WHERE {folder_vector_predicate(folder)}
+            ORDER BY embedding <#> %s::{vtype}
+            LIMIT %s
+        ),
+        semantic AS (
+            SELECT e.uid, e.folder, -n.distance AS similarity,
+                   row_number() OVER (ORDER BY n.distance, e.date DESC) AS rnk
+            FROM nearest n
+            JOIN emails e ON e.content_hash = n.content_hash
+            WHERE e.folder = %s
+        ),
+        fused AS (
+            SELECT uid, folder,
+                   SUM(1.0 / (%s + rnk))::float8 AS score,
+                   MAX(similarity) AS similarity,
+                   MIN(rnk) FILTER (WHERE source = 'lexical') AS lexical_rank,
+                   MIN(rnk) FILTER (WHERE source = 'semantic') AS semantic_rank
+            FROM (
+                SELECT uid, folder, rnk, NULL::float8 AS similarity, 'lexical' AS source
+                FROM lexical
+                UNION ALL
+                SELECT uid, folder, rnk, similarity, 'semantic' AS source
+                FROM semantic
+            ) hits
+            GROUP BY uid, folder
+        )
+        SELECT e.uid, e.folder, e.from_addr, e.subject,
+               LEFT(e.body_text, 200) as preview, e.date, e.is_unread, e.has_attachments,
+               f.score, f.similarity, f.lexical_rank, f.semantic_rank
+        FROM fused f
+        JOIN emails e ON e.uid = f.uid AND e.folder = f.folder
+        WHERE {" AND ".join(conditions)}
+        ORDER BY f.score DESC, e.date DESC
+        LIMIT %s
+    """
+    params: list[Any] = [
+        query,
+        folder,
+        candidates,
+        query_embedding,
+        query_embedding,
+        candidates,
+        folder,
+        rrf_k,
+        *filter_params,
+        limit,
+    ]
+    return sql, params
 
-    if filters.get("is_starred") is not None:
-        if filters["is_starred"]:
-            conditions.append("e.gmail_labels ? '\\\\Starred'")
 
-    if filters.get("attachment_filename"):
-        conditions.append("e.attachment_filenames::text ILIKE %s")
-        params.append(f"%{filters['attachment_filename']}%")
+def hybrid_search(
+    db: DatabaseInterface,
+    query: str,
+    query_embedding: list[float],
+    folder: str,
+    limit: int,
+    filters: Optional[dict[str, Any]] = None,
+    candidates: int = 100,
+    rrf_k: int = 60,
+) -> list[dict[str, Any]]:
+    """Hybrid lexical + vector search fused with reciprocal-rank fusion.
 
-    params.extend([query_embedding, query_embedding, limit])
+    One statement: the ``search_tsv`` full-text match and the HNSW k-NN scan
+    each produce at most ``candidates`` ranked hits, every hit scores
+    ``1 / (rrf_k + rank)`` per list it appears in, and metadata ``filters``
+    are applied to the fused candidates. There is no similarity cutoff.
 
-    sql = f"""
-        SELECT e.uid, e.folder, e.from_addr, e.subject, 
-               LEFT(e.body_text, 200) as preview, e.date, e.is_unread, e.has_attachments,
-               -(emb.embedding <#> %s::{vtype}) as similarity
-        FROM email_embeddings emb
-        JOIN emails e ON e.uid = emb.email_uid AND e.folder = emb.email_folder
-        WHERE {" AND ".join(conditions)}
-        ORDER BY emb.embedding <#> %s::{vtype} LIMIT %s
+    The k-NN scan is limited to vectors filed in ``folder``, as in
+    ``_filtered_knn``; with pgvector 0.8+ the iterative scan keeps walking
+    the graph until ``candidates`` of them are found.
     """
+    sql, params = hybrid_search_query(
+        cast(Any, db)._vector_type,
+        query,
+        query_embedding,
+        folder,
+        limit,
+        filters,
+        candidates,
+        rrf_k,
+    )
 
+    ef_search = getattr(db, "hnsw_ef_search", DEFAULT_EF_SEARCH)
+    iterative = supports_iterative_scan(db)
     with db.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(sql, params)
+            with conn.pipeline():
+                # The k-NN pool can only be as large as the HNSW candidate list
+                _set_hnsw_options(cur, max(ef_search, candidates), iterative=iterative)
+                cur.execute(sql, params)
             return cur.fetchall()
 
 
@@ -141,12 +391,21 @@ def find_related_emails(
     folder: str,
     limit: int = 5,
 ) -> list[dict[str, Any]]:
-    """Find emails similar to a reference email."""
+    """Find emails similar to a reference email.
+
+    Copies of the reference message (same content hash) are excluded and each
+    related message is returned once, even if it is filed in several folders.
+    """
     vtype = cast(Any, db)._vector_type
     with db.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
             cur.execute(
-                "SELECT embedding FROM email_embeddings WHERE email_uid = %s AND email_folder = %s",
+                """
+                SELECT emb.content_hash, emb.embedding
+                FROM emails e
+                JOIN embedding_vectors emb ON emb.content_hash = e.content_hash
+                WHERE e.uid = %s AND e.folder = %s
+                """,
                 (uid, folder),
             )
             row = cur.fetchone()
@@ -156,64 +415,154 @@ def find_related_emails(
             embedding = row["embedding"]
             cur.execute(
                 f"""
-                SELECT e.uid, e.folder, e.from_addr, e.subject, 
-                       LEFT(e.body_text, 150) as preview, e.date,
-                       -(emb.embedding <#> %s::{vtype}) as similarity
-                FROM email_embeddings emb
-                JOIN emails e ON e.uid = emb.email_uid AND e.folder = emb.email_folder
-                WHERE NOT (e.uid = %s AND e.folder = %s)
-                  AND -(emb.embedding <#> %s::{vtype}) > 0.6
-                ORDER BY emb.embedding <#> %s::{vtype} LIMIT %s
+                SELECT uid, folder, from_addr, subject, preview, date, similarity
+                FROM (
+                    SELECT DISTINCT ON (emb.content_hash)
+                           e.uid, e.folder, e.from_addr, e.subject,
+                           LEFT(e.body_text, 150) as preview, e.date,
+                           -(emb.embedding <#> %s::{vtype}) as similarity
+                    FROM embedding_vectors emb
+                    JOIN emails e ON e.content_hash = emb.content_hash
+                    WHERE emb.content_hash <> %s
+                      AND -(emb.embedding <#> %s::{vtype}) > 0.6
+                    ORDER BY emb.content_hash, e.date DESC
+                ) related
+                ORDER BY similarity DESC LIMIT %s
             """,
-                (embedding, uid, folder, embedding, embedding, limit),
+                (embedding, row["content_hash"], embedding, limit),
             )
             return cur.fetchall()
 
 
+HAS_EMBEDDINGS_SQL = "SELECT 1 FROM embedding_vectors LIMIT 1"
+
+
 def has_embeddings(db: DatabaseInterface) -> bool:
     """Check if any embeddings exist in database."""
     try:
         with db.connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT 1 FROM email_embeddings LIMIT 1")
+                cur.execute(HAS_EMBEDDINGS_SQL)
                 return cur.fetchone() is not None
     except Exception:
         return False
 
 
 def count_emails_needing_embedding(db: DatabaseInterface, folder: str) -> int:
-    with db.connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT COUNT(*) FROM emails e
-                LEFT JOIN email_embeddings emb 
-                    ON e.uid = emb.email_uid AND e.folder = emb.email_folder
-                WHERE e.folder = %s AND emb.email_uid IS NULL
-                """,
-                (folder,),
-            )
-            row = cur.fetchone()
-            return row[0] if row else 0
+    """Hydrated emails in ``folder`` whose content hash has no vector yet."""
+    return counter_q.get_folder_counters(db, folder)["needing_embedding"]
 
 
 def get_emails_needing_embedding(
     db: DatabaseInterface,
     folder: str,
     limit: int = 100,
+    uids: Optional[list[int]] = None,
+    before_uid: Optional[int] = None,
 ) -> list[dict[str, Any]]:
+    """Emails in ``folder`` whose content hash has no stored vector yet.
+
+    Messages already embedded via a copy in another folder are skipped.
+    ``uids`` optionally restricts the result to specific messages. Results are
+    newest UID first; pass the last UID of a page as ``before_uid`` to fetch
+    the next page without revisiting rows whose vectors are still in flight.
+    """
+    conditions = [
+        "e.folder = %s",
+        "emb.content_hash IS NULL",
+        "e.content_hash IS NOT NULL",
+        "e.body_hydrated IS NOT FALSE",
+    ]
+    params: list[Any] = [folder]
+    if uids is not None:
+        conditions.append("e.uid = ANY(%s)")
+        params.append(uids)
+    if before_uid is not None:
+        conditions.append("e.uid < %s")
+        params.append(before_uid)
+    params.append(limit)
+
     with db.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
             cur.execute(
-                """
+                f"""
                 SELECT e.uid, e.folder, e.subject, e.body_text, e.content_hash
                 FROM emails e
-                LEFT JOIN email_embeddings emb 
-                    ON e.uid = emb.email_uid AND e.folder = emb.email_folder
-                WHERE e.folder = %s AND emb.email_uid IS NULL
-                ORDER BY e.date DESC
+                LEFT JOIN embedding_vectors emb ON emb.content_hash = e.content_hash
+                WHERE {" AND ".join(conditions)}
+                ORDER BY e.uid DESC
                 LIMIT %s
                 """,
-                (folder, limit),
+                params,
             )
             return cur.fetchall()
+
+
+def prune_orphan_embeddings(db: DatabaseInterface) -> int:
+    """Delete vectors no longer referenced by any email. Returns rows deleted."""
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                DELETE FROM embedding_vectors emb
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM emails e WHERE e.content_hash = emb.content_hash
+                )
+                """
+            )
+            deleted = cur.rowcount
+        conn.commit()
+    return deleted
+
+
+def get_query_embedding(
+    db: DatabaseInterface, cache_key: str, max_age_seconds: float
+) -> Optional[list[float]]:
+    """Cached search-query embedding younger than ``max_age_seconds``."""
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT embedding FROM query_embeddings
+                WHERE cache_key = %s
+                  AND created_at > NOW() - make_interval(secs => %s)
+                """,
+                (cache_key, max_age_seconds),
+            )
+            row = cur.fetchone()
+    return list(row[0]) if row else None
+
+
+def store_query_embedding(
+    db: DatabaseInterface, cache_key: str, embedding: list[float], model: str
+) -> None:
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO query_embeddings (cache_key, embedding, model)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    embedding = EXCLUDED.embedding,
+                    model = EXCLUDED.model,
+                    created_at = NOW()
+                """,
+                (cache_key, embedding, model),
+            )
+        conn.commit()
+
+
+def prune_query_embeddings(db: DatabaseInterface, max_age_seconds: float) -> int:
+    """Delete expired cached query embeddings. Returns rows deleted."""
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                DELETE FROM query_embeddings
+                WHERE created_at <= NOW() - make_interval(secs => %s)
+                """,
+                (max_age_seconds,),
+            )
+            deleted = cur.rowcount
+        conn.commit()
+    return deleted
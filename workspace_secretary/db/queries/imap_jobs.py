@@ -2,10 +2,36 @@ from __future__ import annotations
 
 import json
 import uuid
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 
 from workspace_secretary.db.types import DatabaseInterface
 
+# The imap-executor LISTENs on EXECUTOR_CHANNEL and the web UI's job event
+# streams on JOB_EVENTS_CHANNEL; the payload is the job_id. Notifications are
+# delivered on commit, so a woken listener always sees the new rows.
+EXECUTOR_CHANNEL = "imap_executor"
+JOB_EVENTS_CHANNEL = "imap_job_events"
+
+JOB_BY_ID_SQL = "SELECT * FROM imap_jobs WHERE job_id = %s"
+
+EVENTS_AFTER_SQL = """
+    SELECT id, job_id, created_at, level, message, data
+    FROM imap_job_events
+    WHERE job_id = %s AND id > %s
+    ORDER BY id ASC
+    LIMIT %s
+"""
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+def notify_executor(cur: Any, job_id: str) -> None:
+    cur.execute("SELECT pg_notify(%s, %s)", (EXECUTOR_CHANNEL, str(job_id)))
+
+
+def notify_job_watchers(cur: Any, job_id: str) -> None:
+    cur.execute("SELECT pg_notify(%s, %s)", (JOB_EVENTS_CHANNEL, str(job_id)))
+
 
 def create_job(db: DatabaseInterface, job_type: str, payload: dict[str, Any] | None = None) -> str:
     job_id = str(uuid.uuid4())
@@ -18,6 +44,7 @@ def create_job(db: DatabaseInterface, job_type: str, payload: dict[str, Any] | N
                 """,
                 (job_id, job_type, json.dumps(payload) if payload else None),
             )
+            notify_executor(cur, job_id)
             conn.commit()
     return job_id
 
@@ -25,7 +52,7 @@ def create_job(db: DatabaseInterface, job_type: str, payload: dict[str, Any] | N
 def get_job(db: DatabaseInterface, job_id: str) -> Optional[dict[str, Any]]:
     with db.connection() as conn:
         with conn.cursor() as cur:
-            cur.execute("SELECT * FROM imap_jobs WHERE job_id = %s", (job_id,))
+            cur.execute(JOB_BY_ID_SQL, (job_id,))
             row = cur.fetchone()
             if not row:
                 return None
@@ -46,6 +73,8 @@ def request_cancel(db: DatabaseInterface, job_id: str) -> bool:
                 (job_id,),
             )
             updated = cur.rowcount
+            if updated:
+                notify_job_watchers(cur, job_id)
             conn.commit()
             return updated > 0
 
@@ -70,6 +99,7 @@ def append_event(
                 (job_id, level, message, payload),
             )
             event_id = cur.fetchone()[0]
+            notify_job_watchers(cur, job_id)
             conn.commit()
             return int(event_id)
 
@@ -79,16 +109,7 @@ def list_events(
 ) -> list[dict[str, Any]]:
     with db.connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT id, job_id, created_at, level, message, data
-                FROM imap_job_events
-                WHERE job_id = %s AND id > %s
-                ORDER BY id ASC
-                LIMIT %s
-                """,
-                (job_id, after_id, limit),
-            )
+            cur.execute(EVENTS_AFTER_SQL, (job_id, after_id, limit))
             rows = cur.fetchall()
             columns = [desc[0] for desc in cur.description]
             return [dict(zip(columns, row)) for row in rows]
@@ -122,6 +143,7 @@ def update_progress(
                 f"UPDATE imap_jobs SET {', '.join(sets)} WHERE job_id = %s",
                 tuple(params),
             )
+            notify_job_watchers(cur, job_id)
             conn.commit()
 
 
@@ -136,6 +158,7 @@ def mark_running(db: DatabaseInterface, job_id: str) -> None:
                 """,
                 (job_id,),
             )
+            notify_job_watchers(cur, job_id)
             conn.commit()
 
 
@@ -152,42 +175,66 @@ def mark_finished(
                 """,
                 (status, error, job_id),
             )
+            notify_job_watchers(cur, job_id)
             conn.commit()
 
 
-def claim_next_job(db: DatabaseInterface, job_type: str) -> Optional[dict[str, Any]]:
+# One statement claims the highest-priority eligible job of any type. Keys are
+# "status:job_type"; the position in the priority array decides the order, and
+# jobs of equal priority run oldest first.
+CLAIM_NEXT_ELIGIBLE_SQL = """
+    WITH next AS (
+        SELECT job_id, status AS claimed_status
+        FROM imap_jobs
+        WHERE status IN ('pending', 'approved')
+          AND job_type = ANY(%(job_types)s::text[])
+          AND status || ':' || job_type = ANY(%(priority)s::text[])
+        ORDER BY
+            array_position(%(priority)s::text[], status || ':' || job_type),
+            CASE WHEN status = 'approved' THEN approved_at ELSE created_at END
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE imap_jobs AS j
+    SET status = CASE
+            WHEN next.claimed_status = 'approved' THEN 'executing'
+            ELSE 'running'
+        END,
+        started_at = NOW()
+    FROM next
+    WHERE j.job_id = next.job_id
+    RETURNING j.*, next.claimed_status
+"""
+
+
+def claim_next_eligible_job(
+    db: DatabaseInterface, priority: Sequence[tuple[str, str]]
+) -> Optional[dict[str, Any]]:
+    """Claim the next job across several types in one round trip.
+
+    ``priority`` lists ``(status, job_type)`` pairs, highest priority first;
+    status is ``pending`` (moves to ``running``) or ``approved`` (moves to
+    ``executing``). The returned row carries the pre-claim status as
+    ``claimed_status``.
+    """
+    if not priority:
+        return None
+    params = {
+        "job_types": sorted({job_type for _, job_type in priority}),
+        "priority": [f"{status}:{job_type}" for status, job_type in priority],
+    }
     with db.connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT job_id
-                FROM imap_jobs
-                WHERE status = 'pending' AND job_type = %s
-                ORDER BY created_at ASC
-                FOR UPDATE SKIP LOCKED
-                LIMIT 1
-                """,
-                (job_type,),
-            )
+            cur.execute(CLAIM_NEXT_ELIGIBLE_SQL, params)
             row = cur.fetchone()
             if not row:
                 conn.commit()
                 return None
-
-            job_id = row[0]
-            cur.execute(
-                """
-                UPDATE imap_jobs
-                SET status = 'running', started_at = NOW()
-                WHERE job_id = %s
-                """,
-                (job_id,),
-            )
-            cur.execute("SELECT * FROM imap_jobs WHERE job_id = %s", (job_id,))
-            full_row = cur.fetchone()
             columns = [desc[0] for desc in cur.description]
+            job = dict(zip(columns, row))
+            notify_job_watchers(cur, job["job_id"])
             conn.commit()
-            return dict(zip(columns, full_row))
+            return job
 
 
 def is_cancel_requested(db: DatabaseInterface, job_id: str) -> bool:
@@ -344,43 +391,6 @@ def get_approval(db: DatabaseInterface, job_id: str) -> Optional[dict[str, Any]]
             }
 
 
-def claim_next_approved_job(
-    db: DatabaseInterface, job_type: str
-) -> Optional[dict[str, Any]]:
-    with db.connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT job_id
-                FROM imap_jobs
-                WHERE status = 'approved' AND job_type = %s
-                ORDER BY approved_at ASC
-                FOR UPDATE SKIP LOCKED
-                LIMIT 1
-                """,
-                (job_type,),
-            )
-            row = cur.fetchone()
-            if not row:
-                conn.commit()
-                return None
-
-            job_id = row[0]
-            cur.execute(
-                """
-                UPDATE imap_jobs
-                SET status = 'executing', started_at = NOW()
-                WHERE job_id = %s
-                """,
-                (job_id,),
-            )
-            cur.execute("SELECT * FROM imap_jobs WHERE job_id = %s", (job_id,))
-            full_row = cur.fetchone()
-            columns = [desc[0] for desc in cur.description]
-            conn.commit()
-            return dict(zip(columns, full_row))
-
-
 def mark_approved(db: DatabaseInterface, job_id: str) -> None:
     with db.connection() as conn:
         with conn.cursor() as cur:
@@ -392,4 +402,6 @@ def mark_approved(db: DatabaseInterface, job_id: str) -> None:
                 """,
                 (job_id,),
             )
+            if cur.rowcount:
+                notify_executor(cur, job_id)
             conn.commit()
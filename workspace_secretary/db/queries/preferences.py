@@ -6,21 +6,25 @@ from typing import Any
 from workspace_secretary.db.types import DatabaseInterface
 
 
+USER_PREFERENCES_SQL = "SELECT prefs_json FROM user_preferences WHERE user_id = %s"
+
+
+def preferences_from_row(row: Any) -> dict[str, Any]:
+    """Decode a ``prefs_json`` row; missing or corrupt preferences are empty."""
+    if not row:
+        return {}
+    try:
+        return json.loads(row[0]) if row[0] else {}
+    except Exception:
+        return {}
+
+
 def get_user_preferences(db: DatabaseInterface, user_id: str) -> dict[str, Any]:
     """Get user preferences from database."""
     with db.connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(
-                "SELECT prefs_json FROM user_preferences WHERE user_id = %s",
-                (user_id,),
-            )
-            row = cur.fetchone()
-            if not row:
-                return {}
-            try:
-                return json.loads(row[0]) if row[0] else {}
-            except Exception:
-                return {}
+            cur.execute(USER_PREFERENCES_SQL, (user_id,))
+            return preferences_from_row(cur.fetchone())
 
 
 def upsert_user_preferences(
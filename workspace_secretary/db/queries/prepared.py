@@ -0,0 +1,44 @@
+"""Registry of hot read statements run as server-side prepared statements.
+
+Statements registered here have fixed text, so psycopg can prepare each one
+once per pooled connection (``prepare=True``) and later executions skip
+parsing and planning. ``execute`` works with both sync and async cursors;
+await its result on an async cursor.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+_STATEMENTS: dict[str, str] = {}
+
+
+def register(name: str, sql: str) -> str:
+    """Add a statement to the registry and return its SQL.
+
+    Raises:
+        ValueError: If ``name`` is already registered with different SQL
+    """
+    existing = _STATEMENTS.get(name)
+    if existing is not None and existing != sql:
+        raise ValueError(f"Prepared statement {name!r} is already registered")
+    _STATEMENTS[name] = sql
+    return sql
+
+
+def statement(name: str) -> str:
+    """SQL of a registered statement.
+
+    Raises:
+        KeyError: If ``name`` is not registered
+    """
+    return _STATEMENTS[name]
+
+
+def registered() -> dict[str, str]:
+    return dict(_STATEMENTS)
+
+
+def execute(cur: Any, name: str, params: Any = None) -> Any:
+    """Execute a registered statement, preparing it on first use per connection."""
+    return cur.execute(_STATEMENTS[name], params, prepare=True)
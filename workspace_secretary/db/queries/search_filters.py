@@ -0,0 +1,120 @@
+"""Planner for search operator filters (from:, to:, subject:, attachment:, ...).
+
+Turns a filters dict into WHERE conditions ordered most-selective first, so
+the cheapest, most restrictive predicate leads the conjunction:
+
+1. ``from:`` with a full address -> equality on ``email_address(from_addr)``
+   (btree, idx_emails_from_address)
+2. substring filters with at least three characters -> trigram ILIKE
+   (pg_trgm GIN indexes), longer operands first since they carry more trigrams
+3. date range, then attachment/starred flags, then read state
+4. substring filters shorter than a trigram, which no index can serve
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+ADDRESS_RE = re.compile(r"^[^@\s<>]+@[^@\s<>]+\.[^@\s<>]+$")
+TRIGRAM_MIN_LEN = 3
+
+# Filter key -> column searched with ILIKE
+SUBSTRING_FILTERS = {
+    "from_addr": "from_addr",
+    "to_addr": "to_addr",
+    "subject_contains": "subject",
+    "attachment_filename": "attachment_filenames::text",
+}
+
+
+@dataclass
+class FilterCondition:
+    """One WHERE predicate with its parameters and planning rank."""
+
+    sql: str
+    params: list[Any] = field(default_factory=list)
+    rank: tuple[int, int] = (0, 0)
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def is_full_address(value: str) -> bool:
+    return bool(ADDRESS_RE.match(value.strip()))
+
+
+def plan_email_filters(
+    filters: dict[str, Any], alias: str = ""
+) -> list[FilterCondition]:
+    """Build conditions for ``filters`` ordered most-selective first.
+
+    Args:
+        filters: Search filters as produced by ``parse_search_operators``
+        alias: Optional table alias for the emails table (e.g. ``"e"``)
+    """
+    prefix = f"{alias}." if alias else ""
+    conditions: list[FilterCondition] = []
+
+    for key, column in SUBSTRING_FILTERS.items():
+        value = filters.get(key)
+        if not value:
+            continue
+        value = str(value).strip()
+
+        if key == "from_addr" and is_full_address(value):
+            conditions.append(
+                FilterCondition(
+                    f"email_address({prefix}from_addr) = %s",
+                    [value.lower()],
+                    (0, 0),
+                )
+            )
+            continue
+
+        indexable = len(value) >= TRIGRAM_MIN_LEN
+        if column.endswith("::text"):
+            expr = f"({prefix}{column})"
+        else:
+            expr = f"{prefix}{column}"
+        conditions.append(
+            FilterCondition(
+                f"{expr} ILIKE %s",
+                [f"%{escape_like(value)}%"],
+                (1, -len(value)) if indexable else (5, 0),
+            )
+        )
+
+    if filters.get("date_from"):
+        conditions.append(
+            FilterCondition(f"{prefix}date >= %s", [filters["date_from"]], (2, 0))
+        )
+
+    if filters.get("date_to"):
+        conditions.append(
+            FilterCondition(f"{prefix}date <= %s", [filters["date_to"]], (2, 0))
+        )
+
+    if filters.get("has_attachments") is not None:
+        conditions.append(
+            FilterCondition(
+                f"{prefix}has_attachments = %s", [filters["has_attachments"]], (3, 0)
+            )
+        )
+
+    if filters.get("is_starred"):
+        conditions.append(
+            FilterCondition(f"{prefix}gmail_labels ? '\\\\Starred'", [], (3, 0))
+        )
+
+    if filters.get("is_unread") is not None:
+        conditions.append(
+            FilterCondition(f"{prefix}is_unread = %s", [filters["is_unread"]], (4, 0))
+        )
+
+    # Stable sort keeps the declaration order for equal ranks
+    conditions.sort(key=lambda c: c.rank)
+    return conditions
@@ -0,0 +1,145 @@
+"""Conversation thread queries backed by the maintained ``threads`` table.
+
+Each email carries a ``thread_key`` assigned at ingest (see
+``initialize_threads_schema``); ``threads`` holds one summary row per key,
+kept current by triggers, so listings never aggregate emails at read time.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from psycopg.rows import dict_row
+
+from workspace_secretary.db.types import DatabaseInterface
+
+THREAD_COLUMNS = """
+    thread_key, subject, participants, message_count, unread_count,
+    last_date, last_uid, last_folder, snippet, folders
+"""
+
+
+def encode_thread_cursor(last_date: Optional[datetime], thread_key: str) -> str:
+    """Opaque keyset cursor for the thread at ``(last_date, thread_key)``."""
+    payload = json.dumps(
+        {"d": last_date.isoformat() if last_date else None, "k": thread_key}
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_thread_cursor(cursor: str) -> tuple[Optional[datetime], str]:
+    """Inverse of ``encode_thread_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        date = datetime.fromisoformat(payload["d"]) if payload["d"] else None
+        return date, str(payload["k"])
+    except (binascii.Error, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid thread cursor: {cursor!r}") from e
+
+
+def thread_cursor(thread: dict[str, Any]) -> str:
+    """Cursor positioned after ``thread`` in (last_date DESC, thread_key DESC) order."""
+    return encode_thread_cursor(thread.get("last_date"), thread["thread_key"])
+
+
+def threads_query(
+    folder: str,
+    limit: int,
+    unread_only: bool = False,
+    cursor: Optional[str] = None,
+) -> tuple[str, list[Any]]:
+    """SQL and parameters for ``get_threads``.
+
+    Raises:
+        ValueError: If ``cursor`` is malformed
+    """
+    conditions = ["folders @> ARRAY[%s]::text[]"]
+    params: list[Any] = [folder]
+    if unread_only:
+        conditions.append("unread_count > 0")
+    if cursor:
+        last_date, key = decode_thread_cursor(cursor)
+        if last_date is None:
+            conditions.append("(last_date IS NOT NULL OR thread_key < %s)")
+            params.append(key)
+        else:
+            conditions.append("(last_date, thread_key) < (%s, %s)")
+            params.extend([last_date, key])
+    params.append(limit)
+
+    sql = f"""
+        SELECT {THREAD_COLUMNS}
+        FROM threads
+        WHERE {" AND ".join(conditions)}
+        ORDER BY last_date DESC, thread_key DESC
+        LIMIT %s
+    """
+    return sql, params
+
+
+def get_threads(
+    db: DatabaseInterface,
+    folder: str,
+    limit: int,
+    unread_only: bool = False,
+    cursor: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """Threads with at least one message in ``folder``, most recent first.
+
+    Raises:
+        ValueError: If ``cursor`` is malformed
+    """
+    sql, params = threads_query(folder, limit, unread_only, cursor)
+
+    with db.connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(sql, params)
+            return cur.fetchall()
+
+
+def get_threads_page(
+    db: DatabaseInterface,
+    folder: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    unread_only: bool = False,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """One keyset page of the thread list.
+
+    Returns:
+        (threads, next_cursor); next_cursor is None on the last page
+    """
+    threads = get_threads(db, folder, limit + 1, unread_only=unread_only, cursor=cursor)
+    return split_thread_page(threads, limit)
+
+
+def split_thread_page(
+    threads: list[dict[str, Any]], limit: int
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """Trim a ``limit + 1`` fetch to one page and its continuation cursor."""
+    if len(threads) <= limit:
+        return threads, None
+    threads = threads[:limit]
+    return threads, thread_cursor(threads[-1])
+
+
+def get_thread_summary(
+    db: DatabaseInterface, thread_key: str
+) -> Optional[dict[str, Any]]:
+    """Summary row for one thread."""
+    with db.connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                f"SELECT {THREAD_COLUMNS} FROM threads WHERE thread_key = %s",
+                (thread_key,),
+            )
+            return cur.fetchone()
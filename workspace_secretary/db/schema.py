@@ -5,7 +5,14 @@ Both engine and web can call these functions safely.
 Self-healing logic (type migrations, index repairs) lives in engine only.
 """
 
-from typing import Any
+import hashlib
+import logging
+import re
+from typing import Any, Iterable, Optional
+
+from psycopg import sql
+
+logger = logging.getLogger(__name__)
 
 
 def initialize_core_schema(
@@ -19,8 +26,9 @@ def initialize_core_schema(
         vector_type: "vector" or "halfvec"
         embedding_dimensions: embedding vector size
     """
-    # Enable pgvector extension
+    # Enable pgvector and trigram extensions
     cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
 
     # Emails table
     cur.execute(
@@ -60,6 +68,9 @@ def initialize_core_schema(
             suspicious_sender_signals JSONB,
             security_score INTEGER DEFAULT 100,
             warning_type TEXT,
+            body_hydrated BOOLEAN DEFAULT TRUE,
+            hydrate_attempts INTEGER NOT NULL DEFAULT 0,
+            hydrate_attempted_at TIMESTAMPTZ,
             PRIMARY KEY (uid, folder)
         )
         """
@@ -80,6 +91,20 @@ def initialize_core_schema(
         "ALTER TABLE emails ADD COLUMN IF NOT EXISTS security_score INTEGER DEFAULT 100"
     )
     cur.execute("ALTER TABLE emails ADD COLUMN IF NOT EXISTS warning_type TEXT")
+    cur.execute(
+        "ALTER TABLE emails ADD COLUMN IF NOT EXISTS body_hydrated BOOLEAN DEFAULT TRUE"
+    )
+    cur.execute(
+        "ALTER TABLE emails ADD COLUMN IF NOT EXISTS hydrate_attempts INTEGER NOT NULL DEFAULT 0"
+    )
+    cur.execute(
+        "ALTER TABLE emails ADD COLUMN IF NOT EXISTS hydrate_attempted_at TIMESTAMPTZ"
+    )
+
+    initialize_email_search_schema(cur)
+    initialize_threads_schema(cur)
+    initialize_counters_schema(cur)
+    initialize_change_feed_schema(cur)
 
     # Folder state
     cur.execute(
@@ -135,11 +160,907 @@ def initialize_core_schema(
     )
 
 
+def initialize_email_search_schema(cur: Any) -> None:
+    """
+    Initialize email search support (idempotent).
+
+    emails.search_tsv is the weighted full-text document: subject A,
+    sender/recipients B, body C, attachment filenames D. A trigger
+    re-tokenizes a row only when one of those fields changes, so flag and
+    label updates never re-parse large bodies. Bodies are capped at 512 KiB
+    of text to stay well inside PostgreSQL's 1 MB tsvector limit.
+
+    Also creates email_address() for exact sender lookups and the
+    subject_suggestions dictionary used by autocomplete.
+    """
+    cur.execute("ALTER TABLE emails ADD COLUMN IF NOT EXISTS search_tsv tsvector")
+
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION emails_search_tsv(
+            subject TEXT,
+            from_addr TEXT,
+            to_addr TEXT,
+            cc_addr TEXT,
+            body_text TEXT,
+            attachment_filenames JSONB
+        ) RETURNS tsvector
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT
+                setweight(to_tsvector('english', COALESCE(subject, '')), 'A') ||
+                setweight(to_tsvector('english',
+                    COALESCE(from_addr, '') || ' ' ||
+                    COALESCE(to_addr, '') || ' ' ||
+                    COALESCE(cc_addr, '')), 'B') ||
+                setweight(to_tsvector('english', LEFT(COALESCE(body_text, ''), 524288)), 'C') ||
+                setweight(to_tsvector('english',
+                    COALESCE(attachment_filenames::text, '')), 'D')
+        $$
+        """
+    )
+
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION emails_search_tsv_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT'
+               OR NEW.subject IS DISTINCT FROM OLD.subject
+               OR NEW.from_addr IS DISTINCT FROM OLD.from_addr
+               OR NEW.to_addr IS DISTINCT FROM OLD.to_addr
+               OR NEW.cc_addr IS DISTINCT FROM OLD.cc_addr
+               OR NEW.body_text IS DISTINCT FROM OLD.body_text
+               OR NEW.attachment_filenames IS DISTINCT FROM OLD.attachment_filenames
+               OR NEW.search_tsv IS NULL
+            THEN
+                NEW.search_tsv := emails_search_tsv(
+                    NEW.subject, NEW.from_addr, NEW.to_addr, NEW.cc_addr,
+                    NEW.body_text, NEW.attachment_filenames
+                );
+            END IF;
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    cur.execute("DROP TRIGGER IF EXISTS trg_emails_search_tsv ON emails")
+    cur.execute(
+        """
+        CREATE TRIGGER trg_emails_search_tsv
+        BEFORE INSERT OR UPDATE ON emails
+        FOR EACH ROW EXECUTE FUNCTION emails_search_tsv_trigger()
+        """
+    )
+
+    # One-time backfill for rows written before the column existed
+    cur.execute(
+        """
+        UPDATE emails SET search_tsv = emails_search_tsv(
+            subject, from_addr, to_addr, cc_addr, body_text, attachment_filenames
+        )
+        WHERE search_tsv IS NULL
+        """
+    )
+
+    # Bare, lower-cased address of "Name <addr>" headers, for exact from: lookups
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION email_address(addr TEXT) RETURNS TEXT
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT lower(btrim(COALESCE(substring(addr from '<([^<>]+)>'), addr)))
+        $$
+        """
+    )
+
+    # Subject dictionary for autocomplete: one row per normalized subject
+    # (Re:/Fwd: prefixes stripped) with the number of emails carrying it,
+    # kept current by statement-level triggers.
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS subject_suggestions (
+            subject_key TEXT PRIMARY KEY,
+            subject TEXT NOT NULL,
+            email_count INTEGER NOT NULL DEFAULT 1,
+            last_seen TIMESTAMPTZ
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION normalize_subject(subject TEXT) RETURNS TEXT
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT NULLIF(btrim(LEFT(regexp_replace(
+                subject, '^[[:space:]]*((re|fwd?|aw|sv)[[:space:]]*:[[:space:]]*)+', '', 'i'
+            ), 200)), '')
+        $$
+        """
+    )
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION subject_suggestions_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            changes TEXT;
+        BEGIN
+            -- Rows entering count +1, rows leaving -1; updates only when the
+            -- subject changed
+            changes := CASE TG_OP
+                WHEN 'INSERT' THEN 'SELECT 1 AS sign, subject, date FROM new_rows'
+                WHEN 'DELETE' THEN 'SELECT -1 AS sign, subject, date FROM old_rows'
+                ELSE 'SELECT s.sign, s.subject, s.date'
+                    ' FROM new_rows n JOIN old_rows o'
+                    ' ON o.uid = n.uid AND o.folder = n.folder'
+                    ' CROSS JOIN LATERAL (VALUES (1, n.subject, n.date),'
+                    ' (-1, o.subject, o.date)) AS s(sign, subject, date)'
+                    ' WHERE n.subject IS DISTINCT FROM o.subject'
+            END;
+
+            EXECUTE format($sql$
+                WITH c AS (
+                    SELECT sign, normalize_subject(subject) AS normalized, date
+                    FROM (%s) r
+                ),
+                delta AS (
+                    SELECT lower(normalized) AS subject_key,
+                           MAX(normalized) AS subject,
+                           SUM(sign) AS email_count,
+                           MAX(date) FILTER (WHERE sign > 0) AS last_seen
+                    FROM c WHERE normalized IS NOT NULL
+                    GROUP BY lower(normalized)
+                )
+                INSERT INTO subject_suggestions AS ss (
+                    subject_key, subject, email_count, last_seen
+                )
+                SELECT subject_key, subject, email_count, last_seen
+                FROM delta
+                WHERE email_count <> 0
+                ORDER BY subject_key
+                ON CONFLICT (subject_key) DO UPDATE SET
+                    email_count = ss.email_count + EXCLUDED.email_count,
+                    last_seen = GREATEST(ss.last_seen, EXCLUDED.last_seen)
+            $sql$, changes);
+
+            IF TG_OP <> 'INSERT' THEN
+                EXECUTE format($sql$
+                    DELETE FROM subject_suggestions
+                    WHERE email_count <= 0 AND subject_key IN (
+                        SELECT lower(normalize_subject(subject)) FROM (%s) r
+                        WHERE sign < 0
+                    )
+                $sql$, changes);
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    # The old row-level trigger only ever counted up, so its counts are
+    # rebuilt once when it is replaced
+    cur.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_trigger
+                WHERE tgname = 'trg_emails_subject_suggestions'
+                  AND tgrelid = 'emails'::regclass
+            ) THEN
+                DROP TRIGGER trg_emails_subject_suggestions ON emails;
+                TRUNCATE subject_suggestions;
+            END IF;
+        END
+        $$
+        """
+    )
+    for event in ("insert", "update", "delete"):
+        cur.execute(
+            f"DROP TRIGGER IF EXISTS trg_emails_subject_suggestions_{event} ON emails"
+        )
+
+    # Backfill once, before the delta triggers exist
+    cur.execute(
+        """
+        INSERT INTO subject_suggestions (subject_key, subject, email_count, last_seen)
+        SELECT lower(normalize_subject(subject)), MAX(normalize_subject(subject)),
+               COUNT(*), MAX(date)
+        FROM emails
+        WHERE normalize_subject(subject) IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM subject_suggestions)
+        GROUP BY lower(normalize_subject(subject))
+        """
+    )
+
+    # Transition tables require one trigger per event
+    transitions = {
+        "INSERT": "NEW TABLE AS new_rows",
+        "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "DELETE": "OLD TABLE AS old_rows",
+    }
+    for event, tables in transitions.items():
+        cur.execute(
+            f"""
+            CREATE TRIGGER trg_emails_subject_suggestions_{event.lower()}
+            AFTER {event} ON emails
+            REFERENCING {tables}
+            FOR EACH STATEMENT EXECUTE FUNCTION subject_suggestions_trigger()
+            """
+        )
+
+
+def initialize_threads_schema(cur: Any) -> None:
+    """
+    Initialize conversation threading (idempotent).
+
+    emails.thread_key is assigned once at ingest: ``gm:<X-GM-THRID>`` on
+    Gmail, otherwise ``ref:<root Message-ID>`` taken from References (the
+    root is listed first), or inherited from the In-Reply-To parent when
+    References is missing.
+
+    threads holds one summary row per thread_key (participants, message and
+    unread counts, latest message and snippet, folders). Copies of a message
+    in several folders count once. Statement-level triggers on emails refresh
+    each thread a statement touched once, when a message is inserted, deleted,
+    or changes flags, thread, date or body. Threads are refreshed in
+    ``hashtext`` order under a per-thread advisory lock, so concurrent folder
+    syncs sharing Gmail threads serialize instead of deadlocking.
+    """
+    cur.execute("ALTER TABLE emails ADD COLUMN IF NOT EXISTS thread_key TEXT")
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_emails_thread_key ON emails(thread_key)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_emails_message_id ON emails(message_id)"
+    )
+
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS threads (
+            thread_key TEXT PRIMARY KEY,
+            subject TEXT,
+            participants TEXT[] NOT NULL DEFAULT '{}',
+            message_count INTEGER NOT NULL DEFAULT 0,
+            unread_count INTEGER NOT NULL DEFAULT 0,
+            last_date TIMESTAMPTZ,
+            last_uid INTEGER,
+            last_folder TEXT,
+            snippet TEXT,
+            folders TEXT[] NOT NULL DEFAULT '{}',
+            updated_at TIMESTAMPTZ DEFAULT NOW()
+        )
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_threads_last_date ON threads(last_date DESC, thread_key DESC)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_threads_folders ON threads USING gin(folders)"
+    )
+
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION email_thread_root(
+            message_id TEXT, in_reply_to TEXT, references_header TEXT
+        ) RETURNS TEXT
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT COALESCE(
+                substring(references_header from '<[^<>]+>'),
+                NULLIF(split_part(btrim(references_header), ' ', 1), ''),
+                NULLIF(btrim(in_reply_to), ''),
+                NULLIF(btrim(message_id), '')
+            )
+        $$
+        """
+    )
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION emails_thread_key_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            parent_key TEXT;
+        BEGIN
+            IF TG_OP = 'UPDATE'
+               AND NEW.gmail_thread_id IS NOT DISTINCT FROM OLD.gmail_thread_id
+               AND NEW.message_id IS NOT DISTINCT FROM OLD.message_id
+               AND NEW.in_reply_to IS NOT DISTINCT FROM OLD.in_reply_to
+               AND NEW.references_header IS NOT DISTINCT FROM OLD.references_header
+               AND NEW.thread_key IS NOT NULL
+            THEN
+                RETURN NEW;
+            END IF;
+
+            IF NEW.gmail_thread_id IS NOT NULL THEN
+                NEW.thread_key := 'gm:' || NEW.gmail_thread_id;
+                RETURN NEW;
+            END IF;
+
+            IF NULLIF(btrim(NEW.references_header), '') IS NULL
+               AND NULLIF(btrim(NEW.in_reply_to), '') IS NOT NULL
+            THEN
+                SELECT thread_key INTO parent_key FROM emails
+                WHERE message_id = btrim(NEW.in_reply_to) AND thread_key IS NOT NULL
+                LIMIT 1;
+            END IF;
+            NEW.thread_key := COALESCE(
+                parent_key,
+                'ref:' || email_thread_root(
+                    NEW.message_id, NEW.in_reply_to, NEW.references_header
+                )
+            );
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_thread(key TEXT) RETURNS void
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF key IS NULL THEN
+                RETURN;
+            END IF;
+
+            -- One writer per thread at a time; the recount below is a new
+            -- statement, so it sees whatever the previous holder committed
+            PERFORM pg_advisory_xact_lock(hashtext(key));
+
+            INSERT INTO threads (
+                thread_key, subject, participants, message_count, unread_count,
+                last_date, last_uid, last_folder, snippet, folders, updated_at
+            )
+            SELECT key, COALESCE(normalize_subject(latest.subject), latest.subject),
+                   agg.participants, agg.message_count, agg.unread_count,
+                   latest.date, latest.uid, latest.folder,
+                   LEFT(latest.body_text, 200), agg.folders, NOW()
+            FROM (
+                SELECT COALESCE(array_agg(DISTINCT email_address(from_addr))
+                           FILTER (WHERE from_addr IS NOT NULL), '{}') AS participants,
+                       COUNT(DISTINCT COALESCE(message_id, folder || ':' || uid)) AS message_count,
+                       COUNT(DISTINCT COALESCE(message_id, folder || ':' || uid))
+                           FILTER (WHERE is_unread) AS unread_count,
+                       array_agg(DISTINCT folder) AS folders
+                FROM emails WHERE thread_key = key
+            ) agg,
+            LATERAL (
+                SELECT uid, folder, subject, date, body_text FROM emails
+                WHERE thread_key = key
+                ORDER BY date DESC NULLS LAST, uid DESC
+                LIMIT 1
+            ) latest
+            ON CONFLICT (thread_key) DO UPDATE SET
+                subject = EXCLUDED.subject,
+                participants = EXCLUDED.participants,
+                message_count = EXCLUDED.message_count,
+                unread_count = EXCLUDED.unread_count,
+                last_date = EXCLUDED.last_date,
+                last_uid = EXCLUDED.last_uid,
+                last_folder = EXCLUDED.last_folder,
+                snippet = EXCLUDED.snippet,
+                folders = EXCLUDED.folders,
+                updated_at = NOW();
+
+            IF NOT FOUND THEN
+                DELETE FROM threads WHERE thread_key = key;
+            END IF;
+        END
+        $$
+        """
+    )
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION emails_threads_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            affected TEXT;
+            k TEXT;
+        BEGIN
+            -- Every thread a row of this statement enters or leaves; updates
+            -- that leave the summarized columns alone are skipped
+            affected := CASE TG_OP
+                WHEN 'INSERT' THEN 'SELECT thread_key AS k FROM new_rows'
+                WHEN 'DELETE' THEN 'SELECT thread_key AS k FROM old_rows'
+                ELSE 'SELECT k FROM new_rows n'
+                    ' FULL JOIN old_rows o ON o.folder = n.folder AND o.uid = n.uid'
+                    ' CROSS JOIN LATERAL unnest(ARRAY[n.thread_key, o.thread_key]) AS t(k)'
+                    ' WHERE n.uid IS NULL OR o.uid IS NULL'
+                    ' OR (n.thread_key, n.is_unread, n.date, n.subject, n.from_addr,'
+                    '     n.content_hash, n.message_id)'
+                    ' IS DISTINCT FROM (o.thread_key, o.is_unread, o.date, o.subject,'
+                    '     o.from_addr, o.content_hash, o.message_id)'
+            END;
+
+            -- One refresh per thread, in a fixed order, so concurrent batches
+            -- touching the same threads take their locks in the same order
+            FOR k IN EXECUTE format(
+                'SELECT k FROM (SELECT DISTINCT k FROM (%s) a WHERE k IS NOT NULL) d'
+                ' ORDER BY hashtext(k), k',
+                affected
+            ) LOOP
+                PERFORM refresh_thread(k);
+            END LOOP;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+
+    # Backfill before the triggers exist, so existing mail is keyed in bulk
+    cur.execute("DROP TRIGGER IF EXISTS trg_emails_thread_key ON emails")
+    cur.execute("DROP TRIGGER IF EXISTS trg_emails_threads ON emails")
+    for event in ("insert", "update", "delete"):
+        cur.execute(f"DROP TRIGGER IF EXISTS trg_emails_threads_{event} ON emails")
+    # Keys follow emails_thread_key_trigger: In-Reply-To-only messages inherit
+    # their parent's key (walked down the chain), and fall back to the root
+    # only when the parent is not stored
+    cur.execute(
+        """
+        DO $$
+        DECLARE
+            n integer;
+        BEGIN
+            UPDATE emails SET thread_key = CASE
+                WHEN gmail_thread_id IS NOT NULL THEN 'gm:' || gmail_thread_id
+                ELSE 'ref:' || email_thread_root(message_id, in_reply_to, references_header)
+            END
+            WHERE thread_key IS NULL
+              AND (gmail_thread_id IS NOT NULL
+                   OR NULLIF(btrim(references_header), '') IS NOT NULL
+                   OR NULLIF(btrim(in_reply_to), '') IS NULL)
+              AND (gmail_thread_id IS NOT NULL
+                   OR email_thread_root(message_id, in_reply_to, references_header)
+                      IS NOT NULL);
+
+            UPDATE emails e
+            SET thread_key = 'ref:' || email_thread_root(
+                e.message_id, e.in_reply_to, e.references_header
+            )
+            WHERE e.thread_key IS NULL
+              AND e.gmail_thread_id IS NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM emails p WHERE p.message_id = btrim(e.in_reply_to)
+              );
+
+            LOOP
+                UPDATE emails e SET thread_key = p.thread_key
+                FROM emails p
+                WHERE e.thread_key IS NULL
+                  AND e.gmail_thread_id IS NULL
+                  AND p.message_id = btrim(e.in_reply_to)
+                  AND p.thread_key IS NOT NULL;
+                GET DIAGNOSTICS n = ROW_COUNT;
+                EXIT WHEN n = 0;
+            END LOOP;
+
+            -- Reply cycles never reach a keyed parent
+            UPDATE emails
+            SET thread_key = 'ref:' || email_thread_root(
+                message_id, in_reply_to, references_header
+            )
+            WHERE thread_key IS NULL
+              AND email_thread_root(message_id, in_reply_to, references_header)
+                  IS NOT NULL;
+        END
+        $$
+        """
+    )
+    cur.execute(
+        """
+        SELECT refresh_thread(thread_key)
+        FROM (SELECT DISTINCT thread_key FROM emails WHERE thread_key IS NOT NULL) keys
+        WHERE NOT EXISTS (SELECT 1 FROM threads)
+        """
+    )
+
+    cur.execute(
+        """
+        CREATE TRIGGER trg_emails_thread_key
+        BEFORE INSERT OR UPDATE ON emails
+        FOR EACH ROW EXECUTE FUNCTION emails_thread_key_trigger()
+        """
+    )
+    # Transition tables require one trigger per event
+    transitions = {
+        "INSERT": "NEW TABLE AS new_rows",
+        "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "DELETE": "OLD TABLE AS old_rows",
+    }
+    for event, tables in transitions.items():
+        cur.execute(
+            f"""
+            CREATE TRIGGER trg_emails_threads_{event.lower()}
+            AFTER {event} ON emails
+            REFERENCING {tables}
+            FOR EACH STATEMENT EXECUTE FUNCTION emails_threads_trigger()
+            """
+        )
+
+
+def initialize_counters_schema(cur: Any) -> None:
+    """
+    Initialize materialized mailbox counters (idempotent).
+
+    folder_counters holds per-folder totals (all, unread, flagged, with
+    attachments, needing an embedding) and label_counters per-folder Gmail
+    label totals, so stats and progress reads are a primary-key lookup
+    instead of COUNT(*) over emails.
+
+    Statement-level triggers on emails apply one netted delta per folder and
+    label per statement (a bulk upsert touches each counter row once), and
+    skip the write entirely when nothing counted changed. Embedding inserts
+    and prunes adjust needing_embedding from embedding_vectors (see
+    initialize_embeddings_schema). reconcile_mailbox_counters() recounts from
+    emails and adds any drift to the counter rows as a delta, so it never
+    blocks the triggers; it returns the number of rows it corrected.
+    """
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS folder_counters (
+            folder TEXT PRIMARY KEY,
+            total BIGINT NOT NULL DEFAULT 0,
+            unread BIGINT NOT NULL DEFAULT 0,
+            flagged BIGINT NOT NULL DEFAULT 0,
+            with_attachments BIGINT NOT NULL DEFAULT 0,
+            needing_embedding BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ DEFAULT NOW()
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS label_counters (
+            folder TEXT NOT NULL,
+            label TEXT NOT NULL,
+            total BIGINT NOT NULL DEFAULT 0,
+            unread BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ DEFAULT NOW(),
+            PRIMARY KEY (folder, label)
+        )
+        """
+    )
+
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION emails_counters_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            cols CONSTANT TEXT := 'folder, is_unread, is_important, has_attachments,'
+                ' gmail_labels, content_hash, body_hydrated';
+            changes TEXT;
+            needs_embedding TEXT := '0';
+        BEGIN
+            -- Rows entering count +1, rows leaving count -1
+            changes := CASE TG_OP
+                WHEN 'INSERT' THEN format('SELECT 1 AS sign, %s FROM new_rows', cols)
+                WHEN 'DELETE' THEN format('SELECT -1 AS sign, %s FROM old_rows', cols)
+                ELSE format(
+                    'SELECT 1 AS sign, %1$s FROM new_rows'
+                    ' UNION ALL SELECT -1 AS sign, %1$s FROM old_rows',
+                    cols
+                )
+            END;
+            IF to_regclass('embedding_vectors') IS NOT NULL THEN
+                needs_embedding := 'CASE WHEN content_hash IS NOT NULL'
+                    ' AND body_hydrated IS NOT FALSE'
+                    ' AND NOT EXISTS (SELECT 1 FROM embedding_vectors v'
+                    ' WHERE v.content_hash = c.content_hash)'
+                    ' THEN sign ELSE 0 END';
+            END IF;
+
+            EXECUTE format($sql$
+                WITH c AS (%s),
+                delta AS (
+                    SELECT folder,
+                           SUM(sign) AS total,
+                           SUM(CASE WHEN is_unread THEN sign ELSE 0 END) AS unread,
+                           SUM(CASE WHEN is_important THEN sign ELSE 0 END) AS flagged,
+                           SUM(CASE WHEN has_attachments THEN sign ELSE 0 END)
+                               AS with_attachments,
+                           SUM(%s) AS needing_embedding
+                    FROM c GROUP BY folder
+                )
+                INSERT INTO folder_counters AS fc (
+                    folder, total, unread, flagged, with_attachments,
+                    needing_embedding, updated_at
+                )
+                SELECT folder, total, unread, flagged, with_attachments,
+                       needing_embedding, NOW()
+                FROM delta
+                WHERE (total, unread, flagged, with_attachments, needing_embedding)
+                      <> (0, 0, 0, 0, 0)
+                ORDER BY folder
+                ON CONFLICT (folder) DO UPDATE SET
+                    total = fc.total + EXCLUDED.total,
+                    unread = fc.unread + EXCLUDED.unread,
+                    flagged = fc.flagged + EXCLUDED.flagged,
+                    with_attachments = fc.with_attachments + EXCLUDED.with_attachments,
+                    needing_embedding = fc.needing_embedding + EXCLUDED.needing_embedding,
+                    updated_at = NOW()
+            $sql$, changes, needs_embedding);
+
+            EXECUTE format($sql$
+                WITH c AS (%s),
+                delta AS (
+                    SELECT c.folder, l.label,
+                           SUM(c.sign) AS total,
+                           SUM(CASE WHEN c.is_unread THEN c.sign ELSE 0 END) AS unread
+                    FROM c
+                    CROSS JOIN LATERAL (
+                        SELECT DISTINCT label FROM jsonb_array_elements_text(
+                            CASE WHEN jsonb_typeof(c.gmail_labels) = 'array'
+                                 THEN c.gmail_labels ELSE '[]'::jsonb END
+                        ) AS t(label)
+                    ) l
+                    GROUP BY c.folder, l.label
+                )
+                INSERT INTO label_counters AS lc (folder, label, total, unread, updated_at)
+                SELECT folder, label, total, unread, NOW()
+                FROM delta
+                WHERE (total, unread) <> (0, 0)
+                ORDER BY folder, label
+                ON CONFLICT (folder, label) DO UPDATE SET
+                    total = lc.total + EXCLUDED.total,
+                    unread = lc.unread + EXCLUDED.unread,
+                    updated_at = NOW()
+            $sql$, changes);
+
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION reconcile_mailbox_counters() RETURNS integer
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            corrected integer := 0;
+            n integer;
+        BEGIN
+            -- Each statement measures drift (recount minus counter) within one
+            -- snapshot and adds it to the current row, exactly like a trigger
+            -- delta. Deltas committed after the snapshot are kept, so no table
+            -- lock is needed and rows without drift are not written at all.
+            WITH actual AS (
+                SELECT folder,
+                       COUNT(*) AS total,
+                       COUNT(*) FILTER (WHERE is_unread) AS unread,
+                       COUNT(*) FILTER (WHERE is_important) AS flagged,
+                       COUNT(*) FILTER (WHERE has_attachments) AS with_attachments
+                FROM emails GROUP BY folder
+            ),
+            drift AS (
+                SELECT COALESCE(a.folder, s.folder) AS folder,
+                       COALESCE(a.total, 0) - COALESCE(s.total, 0) AS total,
+                       COALESCE(a.unread, 0) - COALESCE(s.unread, 0) AS unread,
+                       COALESCE(a.flagged, 0) - COALESCE(s.flagged, 0) AS flagged,
+                       COALESCE(a.with_attachments, 0)
+                           - COALESCE(s.with_attachments, 0) AS with_attachments
+                FROM actual a
+                FULL JOIN folder_counters s ON s.folder = a.folder
+            )
+            INSERT INTO folder_counters AS fc (
+                folder, total, unread, flagged, with_attachments, updated_at
+            )
+            SELECT folder, total, unread, flagged, with_attachments, NOW()
+            FROM drift
+            WHERE (total, unread, flagged, with_attachments) <> (0, 0, 0, 0)
+            ORDER BY folder
+            ON CONFLICT (folder) DO UPDATE SET
+                total = fc.total + EXCLUDED.total,
+                unread = fc.unread + EXCLUDED.unread,
+                flagged = fc.flagged + EXCLUDED.flagged,
+                with_attachments = fc.with_attachments + EXCLUDED.with_attachments,
+                updated_at = NOW();
+            GET DIAGNOSTICS n = ROW_COUNT;
+            corrected := corrected + n;
+
+            IF to_regclass('embedding_vectors') IS NOT NULL THEN
+                WITH actual AS (
+                    SELECT e.folder, COUNT(*) AS missing FROM emails e
+                    WHERE e.content_hash IS NOT NULL
+                      AND e.body_hydrated IS NOT FALSE
+                      AND NOT EXISTS (
+                          SELECT 1 FROM embedding_vectors v
+                          WHERE v.content_hash = e.content_hash
+                      )
+                    GROUP BY e.folder
+                ),
+                drift AS (
+                    SELECT COALESCE(a.folder, s.folder) AS folder,
+                           COALESCE(a.missing, 0)
+                               - COALESCE(s.needing_embedding, 0) AS missing
+                    FROM actual a
+                    FULL JOIN folder_counters s ON s.folder = a.folder
+                )
+                INSERT INTO folder_counters AS fc (folder, needing_embedding, updated_at)
+                SELECT folder, missing, NOW() FROM drift
+                WHERE missing <> 0
+                ORDER BY folder
+                ON CONFLICT (folder) DO UPDATE SET
+                    needing_embedding = fc.needing_embedding + EXCLUDED.needing_embedding,
+                    updated_at = NOW();
+                GET DIAGNOSTICS n = ROW_COUNT;
+                corrected := corrected + n;
+            END IF;
+
+            DELETE FROM folder_counters
+            WHERE (total, unread, flagged, with_attachments, needing_embedding)
+                  = (0, 0, 0, 0, 0);
+
+            WITH actual AS (
+                SELECT e.folder, l.label,
+                       COUNT(*) AS total,
+                       COUNT(*) FILTER (WHERE e.is_unread) AS unread
+                FROM emails e
+                CROSS JOIN LATERAL (
+                    SELECT DISTINCT label FROM jsonb_array_elements_text(
+                        CASE WHEN jsonb_typeof(e.gmail_labels) = 'array'
+                             THEN e.gmail_labels ELSE '[]'::jsonb END
+                    ) AS t(label)
+                ) l
+                GROUP BY e.folder, l.label
+            ),
+            drift AS (
+                SELECT COALESCE(a.folder, s.folder) AS folder,
+                       COALESCE(a.label, s.label) AS label,
+                       COALESCE(a.total, 0) - COALESCE(s.total, 0) AS total,
+                       COALESCE(a.unread, 0) - COALESCE(s.unread, 0) AS unread
+                FROM actual a
+                FULL JOIN label_counters s
+                    ON s.folder = a.folder AND s.label = a.label
+            )
+            INSERT INTO label_counters AS lc (folder, label, total, unread, updated_at)
+            SELECT folder, label, total, unread, NOW() FROM drift
+            WHERE (total, unread) <> (0, 0)
+            ORDER BY folder, label
+            ON CONFLICT (folder, label) DO UPDATE SET
+                total = lc.total + EXCLUDED.total,
+                unread = lc.unread + EXCLUDED.unread,
+                updated_at = NOW();
+            GET DIAGNOSTICS n = ROW_COUNT;
+            corrected := corrected + n;
+
+            DELETE FROM label_counters WHERE (total, unread) = (0, 0);
+
+            RETURN corrected;
+        END
+        $$
+        """
+    )
+
+    cur.execute("DROP TRIGGER IF EXISTS trg_emails_counters_insert ON emails")
+    cur.execute("DROP TRIGGER IF EXISTS trg_emails_counters_update ON emails")
+    cur.execute("DROP TRIGGER IF EXISTS trg_emails_counters_delete ON emails")
+
+    # Backfill existing mail once, before the delta triggers exist
+    cur.execute(
+        """
+        SELECT reconcile_mailbox_counters()
+        WHERE NOT EXISTS (SELECT 1 FROM folder_counters)
+          AND EXISTS (SELECT 1 FROM emails)
+        """
+    )
+
+    # Transition tables require one trigger per event
+    transitions = {
+        "INSERT": "NEW TABLE AS new_rows",
+        "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "DELETE": "OLD TABLE AS old_rows",
+    }
+    for event, tables in transitions.items():
+        cur.execute(
+            f"""
+            CREATE TRIGGER trg_emails_counters_{event.lower()}
+            AFTER {event} ON emails
+            REFERENCING {tables}
+            FOR EACH STATEMENT EXECUTE FUNCTION emails_counters_trigger()
+            """
+        )
+
+
+def initialize_change_feed_schema(cur: Any) -> None:
+    """
+    Publish mailbox changes on the ``mailbox_changes`` NOTIFY channel (idempotent).
+
+    Statement-level triggers on emails send one JSON payload per folder and
+    statement: ``new`` (inserted rows), ``flags`` (flags, unread, flagged or
+    labels changed) or ``expunged`` (deleted rows), with the affected UIDs and
+    their count. Every writer (IDLE, sync, engine mutations, executor jobs)
+    goes through these tables, so none of them publishes by hand. Above 200
+    UIDs the list is omitted to stay under the NOTIFY payload limit and
+    listeners re-read the folder. Calendar cache changes are published from
+    initialize_calendar_schema. See db/queries/changes.py.
+    """
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION mailbox_change_notify(
+            kind text, change_folder text, change_uids integer[]
+        ) RETURNS void
+        LANGUAGE sql AS $$
+            SELECT pg_notify('mailbox_changes', json_build_object(
+                'type', kind,
+                'folder', change_folder,
+                'uids', CASE WHEN cardinality(change_uids) <= 200
+                             THEN to_json(change_uids) END,
+                'count', cardinality(change_uids)
+            )::text)
+        $$
+        """
+    )
+
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION emails_change_notify() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            change record;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                FOR change IN
+                    SELECT folder, array_agg(uid ORDER BY uid) AS uids
+                    FROM new_rows GROUP BY folder
+                LOOP
+                    PERFORM mailbox_change_notify('new', change.folder, change.uids);
+                END LOOP;
+            ELSIF TG_OP = 'UPDATE' THEN
+                FOR change IN
+                    SELECT n.folder, array_agg(n.uid ORDER BY n.uid) AS uids
+                    FROM new_rows n
+                    JOIN old_rows o ON o.uid = n.uid AND o.folder = n.folder
+                    WHERE (o.flags, o.is_unread, o.is_important, o.gmail_labels)
+                          IS DISTINCT FROM
+                          (n.flags, n.is_unread, n.is_important, n.gmail_labels)
+                    GROUP BY n.folder
+                LOOP
+                    PERFORM mailbox_change_notify('flags', change.folder, change.uids);
+                END LOOP;
+            ELSE
+                FOR change IN
+                    SELECT folder, array_agg(uid ORDER BY uid) AS uids
+                    FROM old_rows GROUP BY folder
+                LOOP
+                    PERFORM mailbox_change_notify(
+                        'expunged', change.folder, change.uids
+                    );
+                END LOOP;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+
+    transitions = {
+        "INSERT": "NEW TABLE AS new_rows",
+        "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "DELETE": "OLD TABLE AS old_rows",
+    }
+    for event, tables in transitions.items():
+        cur.execute(
+            f"DROP TRIGGER IF EXISTS trg_emails_changes_{event.lower()} ON emails"
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER trg_emails_changes_{event.lower()}
+            AFTER {event} ON emails
+            REFERENCING {tables}
+            FOR EACH STATEMENT EXECUTE FUNCTION emails_change_notify()
+            """
+        )
+
+
 def initialize_embeddings_schema(
     cur: Any, vector_type: str, embedding_dimensions: int
 ) -> None:
     """
-    Initialize email_embeddings table (idempotent).
+    Initialize embedding_vectors table (idempotent).
+
+    Vectors are keyed by emails.content_hash, so a message that appears in
+    several folders (INBOX, [Gmail]/All Mail, label folders) is embedded and
+    indexed once; emails.content_hash is the (uid, folder) -> vector mapping.
+    Vectors in the legacy per-(uid, folder) email_embeddings table are moved
+    by migrations/006_embedding_vectors.sql, not here.
 
     Self-healing type/index corrections are NOT done here (engine-only).
     """
@@ -147,18 +1068,230 @@ def initialize_embeddings_schema(
 
     cur.execute(
         f"""
-        CREATE TABLE IF NOT EXISTS email_embeddings (
-            email_uid INTEGER NOT NULL,
-            email_folder TEXT NOT NULL,
+        CREATE TABLE IF NOT EXISTS embedding_vectors (
+            content_hash TEXT PRIMARY KEY,
             embedding {expected_type},
             model TEXT,
-            content_hash TEXT,
-            created_at TIMESTAMPTZ DEFAULT NOW(),
-            PRIMARY KEY (email_uid, email_folder),
-            FOREIGN KEY (email_uid, email_folder) REFERENCES emails(uid, folder) ON DELETE CASCADE
+            created_at TIMESTAMPTZ DEFAULT NOW()
         )
         """
     )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_emails_content_hash ON emails(content_hash)"
+    )
+
+    cur.execute("SELECT to_regclass('email_embeddings') IS NOT NULL")
+    row = cur.fetchone()
+    if row and row[0]:
+        logger.warning(
+            "Legacy email_embeddings table found; run "
+            "migrations/006_embedding_vectors.sql to move its vectors"
+        )
+
+    # Folders each vector is filed in, so hot folders can have partial HNSW
+    # indexes. Recomputed only when an email's folder membership changes.
+    cur.execute(
+        "ALTER TABLE embedding_vectors ADD COLUMN IF NOT EXISTS folders TEXT[] NOT NULL DEFAULT '{}'"
+    )
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION embedding_vector_folders(hash TEXT) RETURNS TEXT[]
+        LANGUAGE sql STABLE AS $$
+            SELECT COALESCE(array_agg(DISTINCT folder ORDER BY folder), '{}')
+            FROM emails WHERE content_hash = hash
+        $$
+        """
+    )
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION embedding_vectors_folders_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.folders := embedding_vector_folders(NEW.content_hash);
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    cur.execute(
+        "DROP TRIGGER IF EXISTS trg_embedding_vectors_folders ON embedding_vectors"
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER trg_embedding_vectors_folders
+        BEFORE INSERT ON embedding_vectors
+        FOR EACH ROW EXECUTE FUNCTION embedding_vectors_folders_trigger()
+        """
+    )
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION emails_vector_folders_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            hash TEXT;
+        BEGIN
+            FOREACH hash IN ARRAY ARRAY[
+                CASE WHEN TG_OP <> 'DELETE' THEN NEW.content_hash END,
+                CASE WHEN TG_OP <> 'INSERT' THEN OLD.content_hash END
+            ] LOOP
+                IF hash IS NOT NULL THEN
+                    UPDATE embedding_vectors
+                    SET folders = embedding_vector_folders(hash)
+                    WHERE content_hash = hash
+                      AND folders IS DISTINCT FROM embedding_vector_folders(hash);
+                END IF;
+            END LOOP;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    cur.execute("DROP TRIGGER IF EXISTS trg_emails_vector_folders ON emails")
+    cur.execute(
+        """
+        CREATE TRIGGER trg_emails_vector_folders
+        AFTER INSERT OR DELETE OR UPDATE OF folder, content_hash ON emails
+        FOR EACH ROW EXECUTE FUNCTION emails_vector_folders_trigger()
+        """
+    )
+    cur.execute(
+        """
+        UPDATE embedding_vectors SET folders = embedding_vector_folders(content_hash)
+        WHERE folders = '{}'
+        """
+    )
+
+    # folder_counters.needing_embedding: a new vector covers every hydrated
+    # email with its hash, a pruned one uncovers them (initialize_counters_schema)
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION embedding_vectors_counters_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE folder_counters fc
+                SET needing_embedding = fc.needing_embedding - d.n, updated_at = NOW()
+                FROM (
+                    SELECT e.folder, COUNT(*) AS n
+                    FROM new_rows v JOIN emails e ON e.content_hash = v.content_hash
+                    WHERE e.body_hydrated IS NOT FALSE
+                    GROUP BY e.folder
+                ) d
+                WHERE fc.folder = d.folder;
+            ELSE
+                UPDATE folder_counters fc
+                SET needing_embedding = fc.needing_embedding + d.n, updated_at = NOW()
+                FROM (
+                    SELECT e.folder, COUNT(*) AS n
+                    FROM old_rows v JOIN emails e ON e.content_hash = v.content_hash
+                    WHERE e.body_hydrated IS NOT FALSE
+                    GROUP BY e.folder
+                ) d
+                WHERE fc.folder = d.folder;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    cur.execute(
+        "DROP TRIGGER IF EXISTS trg_embedding_vectors_counters_insert ON embedding_vectors"
+    )
+    cur.execute(
+        "DROP TRIGGER IF EXISTS trg_embedding_vectors_counters_delete ON embedding_vectors"
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER trg_embedding_vectors_counters_insert
+        AFTER INSERT ON embedding_vectors
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION embedding_vectors_counters_trigger()
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER trg_embedding_vectors_counters_delete
+        AFTER DELETE ON embedding_vectors
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION embedding_vectors_counters_trigger()
+        """
+    )
+
+    # Shared tier of the query-embedding cache (engine/query_cache.py). Plain
+    # arrays: rows are only looked up by key, and dimension changes are
+    # already part of the key.
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS query_embeddings (
+            cache_key TEXT PRIMARY KEY,
+            embedding REAL[] NOT NULL,
+            model TEXT,
+            created_at TIMESTAMPTZ DEFAULT NOW()
+        )
+        """
+    )
+
+
+def folder_vector_index_name(folder: str) -> str:
+    """Name of the partial HNSW index for ``folder`` (stable, identifier-safe)."""
+    slug = re.sub(r"[^a-z0-9]+", "_", folder.lower()).strip("_")[:32]
+    digest = hashlib.sha1(folder.encode()).hexdigest()[:8]
+    return f"idx_embeddings_vector_f_{slug}_{digest}"
+
+
+def folder_vector_predicate(
+    folder: str, alias: str = "", parameterized: bool = True
+) -> str:
+    """SQL predicate selecting vectors filed in ``folder``.
+
+    The folder is inlined as a literal so the planner can match it against
+    the partial index predicate. ``%`` in the literal is doubled so the
+    predicate can sit in a query run with parameters; pass
+    ``parameterized=False`` for a statement executed without them.
+    """
+    prefix = f"{alias}." if alias else ""
+    literal = sql.Literal(folder).as_string(None)
+    if parameterized:
+        literal = literal.replace("%", "%%")
+    return f"{prefix}folders @> ARRAY[{literal}]::text[]"
+
+
+def drop_folder_vector_indexes(cur: Any, keep: Iterable[str] = ()) -> None:
+    """Drop partial per-folder HNSW indexes except those named in ``keep``."""
+    cur.execute(
+        """
+        SELECT indexname FROM pg_indexes
+        WHERE schemaname = 'public'
+          AND tablename = 'embedding_vectors'
+          AND indexname LIKE 'idx\\_embeddings\\_vector\\_f\\_%'
+        """
+    )
+    keep = set(keep)
+    for (name,) in cur.fetchall():
+        if name not in keep:
+            cur.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+def create_folder_vector_indexes(
+    cur: Any, vector_type: str, hot_folders: Iterable[str]
+) -> None:
+    """Create partial HNSW indexes for hot folders (idempotent).
+
+    A folder-restricted k-NN search can then walk a graph containing only
+    that folder's vectors instead of post-filtering the global index.
+    Indexes for folders no longer configured are dropped.
+    """
+    ops = "halfvec_ip_ops" if vector_type == "halfvec" else "vector_ip_ops"
+    names = {folder_vector_index_name(folder): folder for folder in hot_folders}
+    drop_folder_vector_indexes(cur, keep=names)
+    for name, folder in names.items():
+        cur.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS "{name}"
+            ON embedding_vectors USING hnsw (embedding {ops})
+            WHERE {folder_vector_predicate(folder, parameterized=False)}
+            """
+        )
 
 
 def initialize_contacts_schema(cur: Any) -> None:
@@ -311,6 +1444,47 @@ def initialize_calendar_schema(cur: Any) -> None:
         """
     )
 
+    # Tell the web UI's change feed that cached events changed (one payload per
+    # transaction; NOTIFY folds identical payloads)
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION calendar_change_notify() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            changed boolean;
+        BEGIN
+            -- Separate statements: each only sees its own trigger's transition table
+            IF TG_OP = 'DELETE' THEN
+                changed := EXISTS (SELECT 1 FROM old_rows);
+            ELSE
+                changed := EXISTS (SELECT 1 FROM new_rows);
+            END IF;
+            IF changed THEN
+                PERFORM pg_notify('mailbox_changes', '{"type": "calendar"}');
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for event, tables in {
+        "INSERT": "NEW TABLE AS new_rows",
+        "UPDATE": "NEW TABLE AS new_rows",
+        "DELETE": "OLD TABLE AS old_rows",
+    }.items():
+        cur.execute(
+            f"DROP TRIGGER IF EXISTS trg_calendar_events_changes_{event.lower()} "
+            "ON calendar_events_cache"
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER trg_calendar_events_changes_{event.lower()}
+            AFTER {event} ON calendar_events_cache
+            REFERENCING {tables}
+            FOR EACH STATEMENT EXECUTE FUNCTION calendar_change_notify()
+            """
+        )
+
 
 def initialize_mutation_journal(cur: Any) -> None:
     """Initialize mutation journal (engine-only table, but idempotent)."""
@@ -333,6 +1507,29 @@ def initialize_mutation_journal(cur: Any) -> None:
     )
 
 
+def initialize_attachments_schema(cur: Any) -> None:
+    """Map (folder, uid, MIME part) to content-addressed attachment blobs."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS attachment_blobs (
+            email_uid INTEGER NOT NULL,
+            email_folder TEXT NOT NULL,
+            part TEXT NOT NULL,
+            filename TEXT,
+            content_type TEXT,
+            size BIGINT NOT NULL,
+            sha256 TEXT NOT NULL,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            PRIMARY KEY (email_uid, email_folder, part),
+            FOREIGN KEY (email_uid, email_folder) REFERENCES emails(uid, folder) ON DELETE CASCADE
+        )
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_attachment_blobs_sha256 ON attachment_blobs(sha256)"
+    )
+
+
 def initialize_imap_jobs_schema(cur: Any) -> None:
     cur.execute(
         """
@@ -452,16 +1649,24 @@ def initialize_imap_jobs_schema(cur: Any) -> None:
     )
 
 
-def create_indexes(cur: Any, vector_type: str) -> None:
+def create_indexes(
+    cur: Any, vector_type: str, hot_folders: Optional[Iterable[str]] = None
+) -> None:
     """
     Create all indexes (idempotent).
 
     NOTE: Embeddings index is created WITHOUT self-heal check.
     Engine will run self-heal separately if needed.
+
+    ``hot_folders`` get an additional partial HNSW index each.
     """
     # Email indexes
     cur.execute("CREATE INDEX IF NOT EXISTS idx_emails_folder ON emails(folder)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_emails_date ON emails(date)")
+    # Keyset pagination order of the inbox list: ORDER BY date DESC, uid DESC
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_emails_folder_date_uid ON emails(folder, date DESC, uid DESC)"
+    )
     cur.execute("CREATE INDEX IF NOT EXISTS idx_emails_unread ON emails(is_unread)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_emails_from ON emails(from_addr)")
     cur.execute(
@@ -482,13 +1687,36 @@ def create_indexes(cur: Any, vector_type: str) -> None:
     cur.execute(
         "CREATE INDEX IF NOT EXISTS idx_emails_is_suspicious_sender ON emails(is_suspicious_sender)"
     )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_emails_unhydrated ON emails(folder, uid DESC) WHERE body_hydrated = false"
+    )
 
-    # FTS index
+    # FTS index on the stored, weighted document (replaces the expression index)
+    cur.execute("DROP INDEX IF EXISTS idx_emails_fts")
     cur.execute(
-        """
-        CREATE INDEX IF NOT EXISTS idx_emails_fts
-        ON emails USING gin(to_tsvector('english', COALESCE(subject, '') || ' ' || COALESCE(body_text, '')))
-        """
+        "CREATE INDEX IF NOT EXISTS idx_emails_search_tsv ON emails USING gin(search_tsv)"
+    )
+
+    # Trigram indexes for the from:/to:/subject:/attachment: ILIKE filters
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_emails_from_trgm ON emails USING gin(from_addr gin_trgm_ops)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_emails_to_trgm ON emails USING gin(to_addr gin_trgm_ops)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_emails_subject_trgm ON emails USING gin(subject gin_trgm_ops)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_emails_attachments_trgm ON emails USING gin((attachment_filenames::text) gin_trgm_ops)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_emails_from_address ON emails(email_address(from_addr))"
+    )
+
+    # Prefix indexes for autocomplete
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_subject_suggestions_prefix ON subject_suggestions(subject_key text_pattern_ops)"
     )
 
     # Embeddings index (basic creation, no self-heal)
@@ -496,12 +1724,19 @@ def create_indexes(cur: Any, vector_type: str) -> None:
     cur.execute(
         f"""
         CREATE INDEX IF NOT EXISTS idx_embeddings_vector
-        ON email_embeddings USING hnsw (embedding {ops})
+        ON embedding_vectors USING hnsw (embedding {ops})
         """
     )
+    create_folder_vector_indexes(cur, vector_type, hot_folders or ())
 
     # Contact indexes
     cur.execute("CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts(email)")
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contacts_email_prefix ON contacts(lower(email) text_pattern_ops)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contacts_name_prefix ON contacts(lower(display_name) text_pattern_ops)"
+    )
     cur.execute(
         "CREATE INDEX IF NOT EXISTS idx_contacts_last_email_date ON contacts(last_email_date DESC)"
     )
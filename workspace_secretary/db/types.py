@@ -147,22 +147,44 @@ class DatabaseInterface(ABC):
     @abstractmethod
     def upsert_embedding(
         self,
-        uid: int,
-        folder: str,
+        content_hash: str,
         embedding: list[float],
         model: str,
-        content_hash: str,
     ) -> None:
         raise NotImplementedError
 
+    def upsert_embeddings_bulk(self, rows: list[tuple[str, list[float], str]]) -> int:
+        raise NotImplementedError
+
+    def prune_orphan_embeddings(self) -> int:
+        raise NotImplementedError
+
+    def prune_query_embeddings(self, max_age_seconds: float) -> int:
+        raise NotImplementedError
+
     def get_synced_folders(self) -> list[dict[str, Any]]:
         raise NotImplementedError
 
+    def get_folder_counters(self, folder: str) -> dict[str, int]:
+        raise NotImplementedError
+
+    def reconcile_mailbox_counters(self) -> int:
+        raise NotImplementedError
+
     def get_thread_emails(
         self, uid: int, folder: str = "INBOX"
     ) -> list[dict[str, Any]]:
         raise NotImplementedError
 
+    def get_threads_page(
+        self,
+        folder: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        unread_only: bool = False,
+    ) -> tuple[list[dict[str, Any]], Optional[str]]:
+        raise NotImplementedError
+
     def semantic_search(
         self,
         query_embedding: list[float],
@@ -184,6 +206,16 @@ class DatabaseInterface(ABC):
     ) -> list[dict[str, Any]]:
         raise NotImplementedError
 
+    def hybrid_search(
+        self,
+        query: str,
+        query_embedding: list[float],
+        folder: str = "INBOX",
+        limit: int = 20,
+        filters: Optional[dict[str, Any]] = None,
+    ) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
     def find_similar_emails(
         self, uid: int, folder: str = "INBOX", limit: int = 5
     ) -> list[dict[str, Any]]:
@@ -239,6 +271,35 @@ class DatabaseInterface(ABC):
     ) -> None:
         raise NotImplementedError
 
+    def upsert_emails_bulk(self, emails: list[dict[str, Any]]) -> int:
+        raise NotImplementedError
+
+    def reconcile_email_flags(
+        self, folder: str, changed: dict[int, dict[str, Any]]
+    ) -> int:
+        raise NotImplementedError
+
+    def get_unhydrated_uids(self, folder: str, limit: int = 25) -> list[int]:
+        raise NotImplementedError
+
+    def hydrate_email_bodies(
+        self, folder: str, bodies: dict[int, tuple[str, str]]
+    ) -> int:
+        raise NotImplementedError
+
+    def record_hydrate_failures(self, folder: str, uids: list[int]) -> int:
+        raise NotImplementedError
+
+    def get_attachment_blob(
+        self, folder: str, uid: int, filename: str
+    ) -> Optional[dict[str, Any]]:
+        raise NotImplementedError
+
+    def save_attachment_blobs(
+        self, folder: str, uid: int, blobs: list[dict[str, Any]]
+    ) -> int:
+        raise NotImplementedError
+
     @abstractmethod
     def get_email_by_uid(self, uid: int, folder: str) -> Optional[dict[str, Any]]:
         raise NotImplementedError
@@ -264,10 +325,21 @@ class DatabaseInterface(ABC):
     def delete_email(self, uid: int, folder: str) -> None:
         raise NotImplementedError
 
+    def delete_emails_bulk(self, folder: str, uids: list[int]) -> int:
+        raise NotImplementedError
+
     @abstractmethod
     def mark_email_read(self, uid: int, folder: str, is_read: bool) -> None:
         raise NotImplementedError
 
+    def mark_emails_read_bulk(self, folder: str, uids: list[int], is_read: bool) -> int:
+        raise NotImplementedError
+
+    def modify_email_labels_bulk(
+        self, folder: str, uids: list[int], labels: list[str], action: str
+    ) -> int:
+        raise NotImplementedError
+
     @abstractmethod
     def get_folder_state(self, folder: str) -> Optional[dict[str, Any]]:
         raise NotImplementedError
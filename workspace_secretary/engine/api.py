@@ -4,7 +4,6 @@ import os
 import smtplib
 import threading
 import uuid
-from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 import re
@@ -14,17 +13,40 @@ from email.utils import parseaddr, make_msgid
 import idna
 import imapclient
 from pathlib import Path
-from queue import Queue, Empty
 from typing import Any, Optional, TYPE_CHECKING, cast
 
 import uvicorn
-from fastapi import FastAPI, HTTPException, Query, UploadFile, File, Form, status
-from fastapi.responses import StreamingResponse
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+    File,
+    Form,
+    status,
+)
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-import io
 
 from workspace_secretary.config import load_config, ServerConfig, ImapConfig
-from workspace_secretary.engine.imap_sync import ImapClient
+from workspace_secretary.engine.attachment_store import (
+    AttachmentStore,
+    RangeNotSatisfiable,
+    parse_range,
+)
+from workspace_secretary.engine.idle_supervisor import (
+    IdleSupervisor,
+    parse_idle_responses,
+    plan_watch,
+)
+from workspace_secretary.engine.imap_pool import ImapConnectionPool, PoolTimeout
+from workspace_secretary.engine.imap_sync import AttachmentPart, ImapClient
+from workspace_secretary.engine.sync_planner import (
+    SyncPlan,
+    build_incremental_plan,
+    build_sync_plan,
+)
 from workspace_secretary.engine.calendar_sync import CalendarClient
 from workspace_secretary.db import DatabaseInterface
 from workspace_secretary.engine.database import create_database
@@ -39,6 +61,10 @@ logger = logging.getLogger(__name__)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
 MAX_SYNC_CONNECTIONS = int(os.environ.get("MAX_SYNC_CONNECTIONS", "5"))
+# Pool connections background sync never takes, kept free for mutation endpoints
+IMAP_RESERVED_CONNECTIONS = int(os.environ.get("IMAP_RESERVED_CONNECTIONS", "1"))
+# New mail beyond this per IDLE burst is left to a batched folder sync
+IDLE_FETCH_LIMIT = 50
 
 SOCKET_PATH = os.environ.get("ENGINE_SOCKET", "/tmp/secretary-engine.sock")
 
@@ -123,30 +149,36 @@ class EngineState:
     def __init__(self):
         self.config: Optional[ServerConfig] = None
         self.imap_client: Optional[ImapClient] = None
-        self.idle_client: Optional[ImapClient] = None
+        # imapclient connections are not thread-safe; held around every
+        # executor call on imap_client (see _call_shared_client)
+        self.imap_client_lock = threading.Lock()
+        self.idle_supervisor: Optional[IdleSupervisor] = None
         self.calendar_client: Optional[CalendarClient] = None
         self.database: Optional[DatabaseInterface] = None
         self.phishing_analyzer = PhishingAnalyzer()
         self.sync_task: Optional[asyncio.Task] = None
         self.idle_task: Optional[asyncio.Task] = None
+        self.event_loop: Optional[asyncio.AbstractEventLoop] = None
         self.idle_enabled: bool = False
         self.embeddings_task: Optional[asyncio.Task] = None
         self.enrollment_task: Optional[asyncio.Task] = None
         self.heartbeat_task: Optional[asyncio.Task] = None
         self.contact_sync_task: Optional[asyncio.Task] = None
+        self.hydrator_task: Optional[asyncio.Task] = None
+        self.attachment_store: Optional[AttachmentStore] = None
         self.running = False
         self.enrolled = False
         self.enrollment_error: Optional[str] = None
-        self._sync_debounce_task: Optional[asyncio.Task] = None
+        # Pending debounced syncs keyed by folder (None = every folder)
+        self._sync_debounce_tasks: dict[Optional[str], asyncio.Task] = {}
         self._sync_debounce_delay: float = 2.0
         self._initial_sync_in_progress: bool = (
             False  # Block debounced_sync during lockstep
         )
         self._embeddings_consecutive_failures: int = 0
         self._embeddings_cooldown_until: Optional[datetime] = None
-        self._sync_executor: Optional[ThreadPoolExecutor] = None
-        self._imap_pool: Queue[ImapClient] = Queue()
-        self._imap_pool_size: int = 0
+        self._embeddings_last_prune: Optional[datetime] = None
+        self.imap_pool: Optional[ImapConnectionPool] = None
         self._pool_init_lock: Optional[asyncio.Lock] = (
             None  # Initialized lazily per event loop
         )
@@ -167,6 +199,11 @@ class EmailMarkRequest(BaseModel):
     folder: str
 
 
+class EmailHydrateRequest(BaseModel):
+    folder: str
+    uids: list[int]
+
+
 class EmailLabelsRequest(BaseModel):
     uid: int
     folder: str
@@ -174,6 +211,18 @@ class EmailLabelsRequest(BaseModel):
     action: str  # "add", "remove", "set"
 
 
+class EmailBatchOperation(BaseModel):
+    uid: int
+    folder: str
+    action: str  # see BATCH_ACTIONS
+    destination: Optional[str] = None  # "move"
+    labels: list[str] = []  # "add_labels", "remove_labels", "set_labels"
+
+
+class EmailBatchRequest(BaseModel):
+    operations: list[EmailBatchOperation]
+
+
 class CalendarEventRequest(BaseModel):
     summary: str
     start_time: str
@@ -257,14 +306,8 @@ async def try_enroll() -> bool:
         state.imap_client.connect()
         logger.info("IMAP connected successfully")
 
-        # Create separate IDLE client for push notifications
-        if state.imap_client.has_idle_capability():
-            state.idle_client = ImapClient(
-                state.config.imap,
-                allowed_folders=["INBOX"],
-            )
-            state.idle_client.connect()
-            logger.info("IDLE client connected for push notifications")
+        # Pooled connections for sync and mutation endpoints
+        await _ensure_imap_pool()
 
         # Connect Calendar if enabled
         if state.config.calendar and state.config.calendar.enabled:
@@ -294,18 +337,13 @@ async def try_enroll() -> bool:
         state.enrollment_error = str(e)
         logger.warning(f"Enrollment attempt failed: {e}")
         # Clean up partial state
+        _shutdown_connection_pool()
         if state.imap_client:
             try:
                 state.imap_client.disconnect()
             except Exception:
                 pass
             state.imap_client = None
-        if state.idle_client:
-            try:
-                state.idle_client.disconnect()
-            except Exception:
-                pass
-            state.idle_client = None
         state.calendar_client = None
         state.database = None
         return False
@@ -435,12 +473,16 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
 
+    if state.idle_task:
+        state.idle_task.cancel()
+        try:
+            await state.idle_task
+        except asyncio.CancelledError:
+            pass
+
     if state.imap_client:
         state.imap_client.disconnect()
 
-    if state.idle_client:
-        state.idle_client.disconnect()
-
     if Path(SOCKET_PATH).exists():
         Path(SOCKET_PATH).unlink()
 
@@ -450,6 +492,7 @@ async def embeddings_loop():
     max_consecutive_failures = 5
     cooldown_minutes = 10
     idle_sleep = 30
+    prune_interval = timedelta(hours=1)
 
     logger.info("Embeddings loop started")
 
@@ -471,6 +514,20 @@ async def embeddings_loop():
             embedded = await generate_embeddings()
             state._embeddings_consecutive_failures = 0
 
+            if (
+                state._embeddings_last_prune is None
+                or datetime.now() - state._embeddings_last_prune >= prune_interval
+            ):
+                state._embeddings_last_prune = datetime.now()
+                pruned = state.database.prune_orphan_embeddings()
+                if pruned:
+                    logger.info(f"Pruned {pruned} orphaned embedding vectors")
+                embeddings_config = state.config.database.embeddings
+                if embeddings_config.query_cache_shared:
+                    state.database.prune_query_embeddings(
+                        embeddings_config.query_cache_ttl
+                    )
+
             if not embedded:
                 await asyncio.sleep(idle_sleep)
 
@@ -510,13 +567,19 @@ async def imap_heartbeat_loop():
         try:
             # Run NOOP in thread pool to avoid blocking event loop
             loop = asyncio.get_event_loop()
-            success = await loop.run_in_executor(None, state.imap_client.noop)
+            success = await loop.run_in_executor(
+                None, _call_shared_client, lambda client: client.noop()
+            )
 
             if not success:
                 # NOOP failed - connection is likely dead, trigger reconnect
                 logger.warning("Heartbeat failed, reconnecting imap_client...")
-                await loop.run_in_executor(None, state.imap_client.disconnect)
-                await loop.run_in_executor(None, state.imap_client.connect)
+
+                def _reconnect(client: ImapClient) -> None:
+                    client.disconnect()
+                    client.connect()
+
+                await loop.run_in_executor(None, _call_shared_client, _reconnect)
                 logger.info("imap_client reconnected after heartbeat failure")
         except Exception as e:
             logger.error(f"Heartbeat error: {e}")
@@ -552,7 +615,7 @@ async def _contact_sync_scheduler():
 async def sync_loop():
     """Background sync loop for email and calendar.
 
-    - IDLE starts immediately for real-time new email notifications
+    - IDLE/STATUS watching starts immediately for real-time folder changes
     - Initial sync runs in background (lockstep batch sync+embed)
     - After initial: periodic sync catches any missed updates
     """
@@ -563,13 +626,8 @@ async def sync_loop():
 
     initial_sync_done = False
 
-    # Start IDLE immediately - don't wait for initial sync
-    if (
-        not state.idle_enabled
-        and state.idle_client
-        and state.idle_client.has_idle_capability()
-    ):
-        logger.info("Starting IDLE monitor for push notifications")
+    # Start watching folders immediately - don't wait for initial sync
+    if not state.idle_enabled:
         state.idle_task = asyncio.create_task(idle_monitor())
         state.idle_enabled = True
 
@@ -586,6 +644,10 @@ async def sync_loop():
                         _contact_sync_scheduler()
                     )
 
+                    if _header_first_folders():
+                        logger.info("Starting body hydrator for header-first folders")
+                        state.hydrator_task = asyncio.create_task(body_hydrator_loop())
+
                     if state.database.supports_embeddings():
                         logger.info(
                             "Starting embeddings background task for steady-state"
@@ -598,6 +660,7 @@ async def sync_loop():
                 else:
                     logger.debug("Running periodic catch-up sync...")
                     await sync_emails_parallel()
+                    await reconcile_counters()
         except Exception as e:
             logger.error(f"Sync error: {e}")
 
@@ -607,142 +670,148 @@ async def sync_loop():
             await asyncio.sleep(5)
 
 
+async def reconcile_counters():
+    """Recount folder/label counters so trigger drift never outlives a catch-up."""
+    try:
+        corrected = await asyncio.to_thread(state.database.reconcile_mailbox_counters)
+    except Exception as e:
+        logger.warning(f"Mailbox counter reconcile failed: {e}")
+        return
+    if corrected:
+        logger.info(f"Reconciled {corrected} drifted mailbox counter rows")
+
+
 def _init_connection_pool():
-    """Initialize the IMAP connection pool for parallel sync."""
-    if not state.config:
+    """Initialize the shared IMAP connection pool (sync + mutation endpoints)."""
+    if not state.config or state.imap_pool is not None:
         return
 
-    pool_size = min(
+    sync_connections = min(
         MAX_SYNC_CONNECTIONS, len(state.config.allowed_folders or ["INBOX"])
     )
-    state._sync_executor = ThreadPoolExecutor(
-        max_workers=pool_size, thread_name_prefix="imap-sync"
+    config = state.config
+    pool = ImapConnectionPool(
+        lambda: ImapClient(config.imap, allowed_folders=config.allowed_folders),
+        size=sync_connections + IMAP_RESERVED_CONNECTIONS,
+        reserved=IMAP_RESERVED_CONNECTIONS,
     )
 
-    logger.info(f"Creating {pool_size} IMAP connections for sync pool...")
-
-    for i in range(pool_size):
-        try:
-            logger.debug(f"Connecting sync connection {i + 1}/{pool_size}...")
-            client = ImapClient(
-                state.config.imap,
-                allowed_folders=state.config.allowed_folders,
-            )
-            client.connect()
-            state._imap_pool.put(client)
-            state._imap_pool_size += 1
-            logger.debug(f"Created sync connection {i + 1}/{pool_size}")
-        except Exception as e:
-            logger.error(f"Failed to create sync connection {i + 1}: {e}")
-
     logger.info(
-        f"IMAP connection pool initialized with {state._imap_pool_size} connections"
+        f"Creating {sync_connections} sync + {IMAP_RESERVED_CONNECTIONS} reserved "
+        "IMAP connections..."
     )
+    if pool.start():
+        state.imap_pool = pool
 
 
 def _shutdown_connection_pool():
     """Shutdown the IMAP connection pool."""
-    if state._sync_executor:
-        state._sync_executor.shutdown(wait=False)
-        state._sync_executor = None
+    if state.imap_pool:
+        state.imap_pool.close()
+        state.imap_pool = None
 
-    while not state._imap_pool.empty():
-        try:
-            client = state._imap_pool.get_nowait()
-            try:
-                client.disconnect()
-            except Exception:
-                pass
-        except Empty:
-            break
-
-    state._imap_pool_size = 0
-    logger.info("IMAP connection pool shutdown")
 
+async def _ensure_imap_pool() -> Optional[ImapConnectionPool]:
+    """Create the connection pool once per process, off the event loop."""
+    if state._pool_init_lock is None:
+        state._pool_init_lock = asyncio.Lock()
 
-def _sync_folder_worker(folder: str) -> int:
-    """Sync a single folder using a connection from the pool.
-
-    Returns the number of emails synced.
-    """
-    if not state.database or not state.config:
-        return 0
-
-    try:
-        client = state._imap_pool.get(timeout=60)
-    except Empty:
-        logger.warning(f"No available connection for folder {folder}")
-        return 0
+    if state.imap_pool is None:
+        async with state._pool_init_lock:
+            if state.imap_pool is None:
+                logger.info("Initializing IMAP connection pool...")
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, _init_connection_pool)
 
-    try:
-        return _sync_single_folder(client, folder)
-    finally:
-        state._imap_pool.put(client)
+    return state.imap_pool
 
 
 def _sync_single_folder(client: ImapClient, folder: str) -> int:
     """Sync a single folder with the given client. Returns emails synced.
 
-    Delegates to _sync_next_batch for gap-aware, newest-first sync.
-    Also handles CONDSTORE flag updates.
+    With QRESYNC the folder is selected with the stored UIDVALIDITY/MODSEQ so
+    the server reports expunged UIDs (VANISHED) and flag changes in the SELECT
+    response; only UIDs above the stored UIDNEXT are then fetched. Otherwise
+    CONDSTORE flag updates are applied and the missing UIDs are planned once
+    and streamed newest-first through _sync_next_batch.
     """
     if not state.database:
         return 0
 
     try:
         folder_state = state.database.get_folder_state(folder)
-        folder_info = client.select_folder(folder, readonly=True)
-
-        current_uidvalidity = folder_info.get("uidvalidity", 0)
         stored_uidvalidity = folder_state.get("uidvalidity", 0) if folder_state else 0
+        stored_uidnext = folder_state.get("uidnext", 0) if folder_state else 0
         stored_highestmodseq = (
             folder_state.get("highestmodseq", 0) if folder_state else 0
         )
+
+        use_qresync = (
+            client.has_qresync_capability()
+            and stored_uidvalidity > 0
+            and stored_highestmodseq > 0
+        )
+        if use_qresync:
+            folder_info = client.select_folder_qresync(
+                folder, stored_uidvalidity, stored_highestmodseq
+            )
+        else:
+            folder_info = client.select_folder(folder, readonly=True)
+
         current_highestmodseq = folder_info.get("highestmodseq", 0)
 
-        if stored_uidvalidity != current_uidvalidity and stored_uidvalidity != 0:
-            logger.warning(f"UIDVALIDITY changed for {folder}, clearing cache")
-            state.database.clear_folder(folder)
+        if _check_uidvalidity(folder, folder_state, folder_info):
             stored_highestmodseq = 0
+            use_qresync = False
 
         has_condstore = client.has_condstore_capability()
 
-        # Fast-path: if HIGHESTMODSEQ unchanged, nothing to do
+        # Fast-path: if HIGHESTMODSEQ unchanged, nothing to do. A held-back
+        # UIDNEXT (UIDs a fetch skipped) still needs its pass.
         if (
             has_condstore
             and stored_highestmodseq > 0
             and current_highestmodseq == stored_highestmodseq
+            and folder_info.get("uidnext", 0) == stored_uidnext
         ):
             logger.debug(f"HIGHESTMODSEQ unchanged for {folder}, skipping sync")
             return 0
 
-        # Update flags for changed emails (CONDSTORE optimization)
-        if has_condstore and stored_highestmodseq > 0:
-            changed = client.fetch_changed_since(folder, stored_highestmodseq)
-            for uid, data in changed.items():
-                state.database.update_email_flags(
-                    uid=uid,
-                    folder=folder,
-                    flags=",".join(data["flags"]),
-                    is_unread="\\Seen" not in data["flags"],
-                    modseq=data["modseq"],
-                    gmail_labels=data.get("gmail_labels"),
+        if use_qresync:
+            vanished = folder_info.get("vanished") or []
+            if vanished:
+                deleted = state.database.delete_emails_bulk(folder, vanished)
+                logger.info(
+                    f"Removed {deleted} expunged emails from {folder} (VANISHED)"
                 )
-            if changed:
-                logger.info(f"Updated flags for {len(changed)} emails in {folder}")
+            changed = folder_info.get("changed") or {}
+        elif has_condstore and stored_highestmodseq > 0:
+            # Update flags for changed emails (CONDSTORE optimization)
+            changed = client.fetch_changed_since(folder, stored_highestmodseq)
+        else:
+            changed = {}
 
-        # Sync missing emails using shared batch logic
-        total_synced = 0
-        synced_uids_set = set(state.database.get_synced_uids(folder))
+        if changed:
+            applied = state.database.reconcile_email_flags(folder, changed)
+            logger.info(
+                f"Reconciled flags in {folder}: {applied} of {len(changed)} "
+                "reported changes updated the cache"
+            )
+
+        if use_qresync and stored_uidnext > 0:
+            plan = build_incremental_plan(folder, folder_info, stored_uidnext)
+        else:
+            plan = build_sync_plan(client, state.database, folder, folder_info)
+        if plan.done:
+            _save_plan_state(plan)
+            return 0
+
+        logger.info(f"[{folder}] Starting sync of {plan.total} missing emails")
 
+        total_synced = 0
         while True:
-            synced_uids, has_more = _sync_next_batch(
-                client, folder, batch_size=50, synced_uids_set=synced_uids_set
-            )
-            if not synced_uids:
-                break
+            synced_uids, has_more = _sync_next_batch(client, plan, batch_size=50)
             total_synced += len(synced_uids)
-            synced_uids_set.update(synced_uids)
             if not has_more:
                 break
 
@@ -752,176 +821,138 @@ def _sync_single_folder(client: ImapClient, folder: str) -> int:
         logger.error(f"Error syncing folder {folder}: {e}")
         return 0
 
-    try:
-        folder_state = state.database.get_folder_state(folder)
-        folder_info = client.select_folder(folder, readonly=True)
-
-        current_uidvalidity = folder_info.get("uidvalidity", 0)
-        current_highestmodseq = folder_info.get("highestmodseq", 0)
-
-        stored_uidvalidity = folder_state.get("uidvalidity", 0) if folder_state else 0
-        stored_highestmodseq = (
-            folder_state.get("highestmodseq", 0) if folder_state else 0
-        )
-
-        if stored_uidvalidity != current_uidvalidity and stored_uidvalidity != 0:
-            logger.warning(f"UIDVALIDITY changed for {folder}, clearing cache")
-            state.database.clear_folder(folder)
-            stored_highestmodseq = 0
-
-        has_condstore = client.has_condstore_capability()
-
-        # Fast-path: if HIGHESTMODSEQ unchanged, nothing to do
-        if (
-            has_condstore
-            and stored_highestmodseq > 0
-            and current_highestmodseq == stored_highestmodseq
-        ):
-            logger.debug(f"HIGHESTMODSEQ unchanged for {folder}, skipping sync")
-            return 0
 
-        # Update flags for changed emails (CONDSTORE optimization)
-        if has_condstore and stored_highestmodseq > 0:
-            changed = client.fetch_changed_since(folder, stored_highestmodseq)
-            for uid, data in changed.items():
-                state.database.update_email_flags(
-                    uid=uid,
-                    folder=folder,
-                    flags=",".join(data["flags"]),
-                    is_unread="\\Seen" not in data["flags"],
-                    modseq=data["modseq"],
-                    gmail_labels=data.get("gmail_labels"),
-                )
-            if changed:
-                logger.info(f"Updated flags for {len(changed)} emails in {folder}")
+def _check_uidvalidity(
+    folder: str,
+    folder_state: Optional[dict[str, Any]],
+    folder_info: dict[str, Any],
+) -> bool:
+    """Clear the folder cache if UIDVALIDITY changed. Returns True if cleared."""
+    if not state.database:
+        return False
 
-        # Gap-aware sync: find UIDs that exist on IMAP but not in DB
-        all_imap_uids = client.search("ALL", folder=folder)
-        synced_uids_set = set(state.database.get_synced_uids(folder))
-        missing_uids = sorted(
-            [uid for uid in all_imap_uids if uid not in synced_uids_set],
-            reverse=True,  # Newest first
-        )
+    current_uidvalidity = folder_info.get("uidvalidity", 0)
+    stored_uidvalidity = folder_state.get("uidvalidity", 0) if folder_state else 0
 
-        total_synced = 0
-        total_to_sync = len(missing_uids)
+    if stored_uidvalidity != current_uidvalidity and stored_uidvalidity != 0:
+        logger.warning(f"UIDVALIDITY changed for {folder}, clearing cache")
+        state.database.clear_folder(folder)
+        return True
+    return False
 
-        if missing_uids:
-            logger.info(f"[{folder}] Starting sync of {total_to_sync} missing emails")
 
-            for i in range(0, len(missing_uids), 50):
-                batch = missing_uids[i : i + 50]
-                emails = client.fetch_emails(batch, folder, limit=50)
-                for uid, email_obj in emails.items():
-                    params = _email_to_db_params(email_obj, folder)
-                    state.database.upsert_email(**params)
-                total_synced += len(emails)
-                logger.info(f"[{folder}] {total_synced}/{total_to_sync} emails synced")
+def _plan_folder_sync(client: ImapClient, folder: str) -> SyncPlan:
+    """SELECT the folder, reset the cache on UIDVALIDITY change, and plan it."""
+    if not state.database:
+        raise RuntimeError("Database not initialized")
 
-        # Save folder state with current max UID
-        max_uid = max(all_imap_uids) if all_imap_uids else 0
-        state.database.save_folder_state(
-            folder=folder,
-            uidvalidity=current_uidvalidity,
-            uidnext=max_uid + 1,
-            highestmodseq=current_highestmodseq,
-        )
+    folder_state = state.database.get_folder_state(folder)
+    folder_info = client.select_folder(folder, readonly=True)
+    _check_uidvalidity(folder, folder_state, folder_info)
+    return build_sync_plan(client, state.database, folder, folder_info)
 
-        return total_synced
 
-    except Exception as e:
-        logger.error(f"Error syncing folder {folder}: {e}")
-        return 0
+def _save_plan_state(plan: SyncPlan) -> None:
+    """Persist folder state once a sync plan has been fully applied."""
+    if not state.database:
+        return
+    state.database.save_folder_state(
+        folder=plan.folder,
+        uidvalidity=plan.uidvalidity,
+        uidnext=plan.uidnext,
+        highestmodseq=plan.highestmodseq,
+    )
 
 
 def _sync_next_batch(
     client: ImapClient,
-    folder: str,
+    plan: SyncPlan,
     batch_size: int = 50,
-    synced_uids_set: set[int] | None = None,
 ) -> tuple[list[int], bool]:
-    """Sync next batch of emails not yet in DB.
+    """Fetch and store the next batch of UIDs from a folder sync plan.
+
+    Between batches the plan is re-validated against a fresh SELECT
+    (UIDVALIDITY/UIDNEXT) rather than re-searching the whole mailbox.
 
-    Returns (synced_uids, has_more).
+    Returns (synced_uids, has_more). synced_uids may be empty while has_more
+    is True when every UID in the batch was expunged in the meantime. UIDs
+    the server still has but the fetch skipped stay pending: the saved UIDNEXT
+    is held back to the first of them.
     """
     if not state.database or not state.config:
         return [], False
 
+    folder = plan.folder
+
     try:
         folder_info = client.select_folder(folder, readonly=True)
-        current_uidvalidity = folder_info.get("uidvalidity", 0)
-        current_highestmodseq = folder_info.get("highestmodseq", 0)
-
-        all_imap_uids = client.search("ALL", folder=folder)
-
-        if synced_uids_set is None:
-            synced_uids_set = set(state.database.get_synced_uids(folder))
-
-        missing_uids = sorted(
-            [uid for uid in all_imap_uids if uid not in synced_uids_set],
-            reverse=True,  # Newest first - users care about recent emails
-        )
-
-        if not missing_uids:
-            state.database.save_folder_state(
-                folder=folder,
-                uidvalidity=current_uidvalidity,
-                uidnext=max(all_imap_uids) + 1 if all_imap_uids else 1,
-                highestmodseq=current_highestmodseq,
-            )
+        if not plan.revalidate(folder_info):
+            state.database.clear_folder(folder)
             return [], False
 
-        # Take from front (highest UIDs = newest emails)
-        batch_uids = missing_uids[:batch_size]
-        emails = client.fetch_emails(batch_uids, folder, limit=batch_size)
-
-        synced_uids: list[int] = []
-        for uid, email_obj in emails.items():
-            params = _email_to_db_params(email_obj, folder)
-            state.database.upsert_email(**params)
-            synced_uids.append(uid)
+        batch_uids = plan.next_batch(batch_size)
+        synced_uids = _store_email_batch(client, folder, batch_uids)
+        plan.record_stored(batch_uids, synced_uids)
 
-        has_more = len(missing_uids) > batch_size
-
-        if not has_more:
-            state.database.save_folder_state(
-                folder=folder,
-                uidvalidity=current_uidvalidity,
-                uidnext=max(all_imap_uids) + 1 if all_imap_uids else 1,
-                highestmodseq=current_highestmodseq,
-            )
+        if plan.done:
+            if plan.skipped:
+                # Expunged UIDs are gone for good; the rest failed to fetch
+                plan.hold_back(
+                    client.search(["UID", plan.skipped.to_imap()], folder=folder)
+                )
+            _save_plan_state(plan)
 
-        return synced_uids, has_more
+        return synced_uids, not plan.done
 
     except Exception as e:
         logger.error(f"Error in batch sync for {folder}: {e}")
         return [], False
 
 
-async def sync_emails_parallel():
-    """Sync all folders in parallel using the connection pool."""
-    if not state.database or not state.config:
-        return
+def _store_email_batch(client: ImapClient, folder: str, uids: list[int]) -> list[int]:
+    """Fetch UIDs in the folder's body mode and upsert them. Returns stored UIDs."""
+    if not uids or not state.database or not state.config:
+        return []
 
-    if state._pool_init_lock is None:
-        state._pool_init_lock = asyncio.Lock()
+    headers_only = state.config.sync.body_mode_for(folder) == "headers"
+    attachments: dict[int, list[AttachmentPart]] = {}
+    if headers_only:
+        emails = client.fetch_email_headers(
+            uids, folder, state.config.sync.preview_bytes
+        )
+    else:
+        on_attachment = (
+            (lambda uid, att: attachments.setdefault(uid, []).append(att))
+            if state.config.attachments.store_on_sync
+            else None
+        )
+        emails = client.fetch_emails(uids, folder, on_attachment=on_attachment)
+    state.database.upsert_emails_bulk(
+        [
+            _email_to_db_params(email_obj, folder, body_hydrated=not headers_only)
+            for email_obj in emails.values()
+        ]
+    )
+    for uid, parts in attachments.items():
+        _store_attachment_parts(folder, uid, parts)
+    return list(emails.keys())
 
-    if state._imap_pool_size == 0:
-        async with state._pool_init_lock:
-            if state._imap_pool_size == 0:
-                logger.info("Initializing IMAP connection pool...")
-                loop = asyncio.get_running_loop()
-                await loop.run_in_executor(None, _init_connection_pool)
 
-    if state._imap_pool_size == 0:
+async def sync_emails_parallel(folders: Optional[list[str]] = None):
+    """Sync folders (default: all) in parallel using the connection pool."""
+    if not state.database or not state.config:
+        return
+
+    pool = await _ensure_imap_pool()
+    if pool is None:
         logger.error("No IMAP connections available after pool init")
         return
 
-    folders = state.config.allowed_folders or ["INBOX"]
-    loop = asyncio.get_running_loop()
+    if folders is None:
+        folders = state.config.allowed_folders or ["INBOX"]
 
     tasks = [
-        loop.run_in_executor(state._sync_executor, _sync_folder_worker, folder)
+        pool.run_async(_sync_single_folder, folder, folder=folder, background=True)
         for folder in folders
     ]
 
@@ -940,8 +971,13 @@ async def sync_emails_parallel():
         )
 
 
-def _email_to_db_params(email_obj: "Email", folder: str) -> dict[str, Any]:
-    """Convert Email dataclass to database upsert parameters."""
+def _email_to_db_params(
+    email_obj: "Email", folder: str, body_hydrated: bool = True
+) -> dict[str, Any]:
+    """Convert Email dataclass to database upsert parameters.
+
+    body_hydrated=False marks a header-first row whose body is only a preview.
+    """
     date_str = email_obj.date.isoformat() if email_obj.date else None
     internal_date_str = (
         email_obj.internal_date.isoformat() if email_obj.internal_date else None
@@ -1010,9 +1046,90 @@ def _email_to_db_params(email_obj: "Email", folder: str) -> dict[str, Any]:
             "display_name_mismatch": signals["display_name_mismatch"],
             "punycode_domain": signals["punycode_domain"],
         },
+        "body_hydrated": body_hydrated,
     }
 
 
+async def _run_imap_job(
+    fn, *args, folder: Optional[str] = None, background: bool = False
+):
+    """Run blocking ``fn(client, *args)`` off the event loop.
+
+    Uses a folder-affine connection from the pool when it is up, otherwise the
+    shared client on the default executor (before the first sync created the
+    pool, or when pool connections failed), one call at a time.
+    """
+    if state.imap_pool is not None:
+        return await state.imap_pool.run_async(
+            fn, *args, folder=folder, background=background
+        )
+    if not state.imap_client:
+        raise RuntimeError("IMAP client not connected")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _call_shared_client, fn, *args)
+
+
+def _call_shared_client(fn, *args):
+    """Run ``fn(state.imap_client, *args)`` holding the shared client's lock."""
+    with state.imap_client_lock:
+        if not state.imap_client:
+            raise RuntimeError("IMAP client not connected")
+        return fn(state.imap_client, *args)
+
+
+def _hydrate_with_client(client: ImapClient, folder: str, uids: list[int]) -> int:
+    """Fetch and store bodies; UIDs that fail are backed off, not retried at once."""
+    if not state.database or not uids:
+        return 0
+    try:
+        bodies = client.fetch_email_bodies(uids, folder)
+    except Exception:
+        state.database.record_hydrate_failures(folder, uids)
+        raise
+    missing = [uid for uid in uids if uid not in bodies]
+    if missing:
+        logger.warning(f"No body returned for {len(missing)} emails in {folder}")
+        state.database.record_hydrate_failures(folder, missing)
+    return state.database.hydrate_email_bodies(folder, bodies)
+
+
+def _header_first_folders() -> list[str]:
+    if not state.config:
+        return []
+    folders = state.config.allowed_folders or ["INBOX"]
+    return [f for f in folders if state.config.sync.body_mode_for(f) == "headers"]
+
+
+async def body_hydrator_loop():
+    """Fill in bodies of header-first emails in the background, newest first."""
+    idle_sleep = 60
+    logger.info("Body hydrator started")
+
+    while state.running:
+        hydrated = 0
+        try:
+            if state.database and state.config and state.imap_pool:
+                batch_size = state.config.sync.hydrate_batch_size
+                for folder in _header_first_folders():
+                    uids = state.database.get_unhydrated_uids(folder, batch_size)
+                    if not uids:
+                        continue
+                    hydrated += await state.imap_pool.run_async(
+                        _hydrate_with_client,
+                        folder,
+                        uids,
+                        folder=folder,
+                        background=True,
+                    )
+        except Exception as e:
+            logger.error(f"Body hydration error: {e}")
+
+        if hydrated:
+            logger.debug(f"Hydrated {hydrated} email bodies")
+        else:
+            await asyncio.sleep(idle_sleep)
+
+
 async def generate_embeddings() -> int:
     """Generate embeddings for emails that don't have them yet."""
     if not state.database or not state.database.supports_embeddings():
@@ -1053,6 +1170,7 @@ async def generate_embeddings() -> int:
             database=state.database,
             folders=folders,
             batch_size=50,
+            max_concurrent=embeddings_config.max_concurrent,
         )
 
         total = await worker.sync_all_folders()
@@ -1078,29 +1196,36 @@ async def embed_specific_uids(folder: str, uids: list[int]) -> int:
         return 0
 
     try:
-        from workspace_secretary.engine.embeddings import create_embeddings_client
+        from workspace_secretary.engine.embeddings import (
+            create_embeddings_client,
+            unique_by_content_hash,
+        )
+
+        # Only UIDs whose content hash has no vector yet; copies of messages
+        # already embedded from another folder are skipped.
+        emails = unique_by_content_hash(
+            await asyncio.to_thread(
+                state.database.get_emails_needing_embedding,
+                folder,
+                limit=len(uids),
+                uids=uids,
+            )
+        )
+        if not emails:
+            return 0
 
         client = create_embeddings_client(embeddings_config)
         if not client:
             return 0
 
-        emails = state.database.get_emails_by_uids(uids, folder)
-        if not emails:
-            return 0
-
         results = await client.embed_emails(emails)
 
-        stored = 0
-        for email, result in zip(emails, results):
-            if result.embedding:
-                state.database.upsert_embedding(
-                    uid=email["uid"],
-                    folder=folder,
-                    embedding=result.embedding,
-                    model=result.model,
-                    content_hash=result.content_hash,
-                )
-                stored += 1
+        rows = [
+            (email["content_hash"], result.embedding, result.model)
+            for email, result in zip(emails, results)
+            if result.embedding
+        ]
+        stored = await asyncio.to_thread(state.database.upsert_embeddings_bulk, rows)
 
         await client.close()
         return stored
@@ -1123,22 +1248,11 @@ async def initial_lockstep_sync_and_embed():
 
     try:
         folders = state.config.allowed_folders or ["INBOX"]
-        loop = asyncio.get_running_loop()
         batch_size = 50
         supports_embeddings = state.database.supports_embeddings()
 
-        if state._pool_init_lock is None:
-            state._pool_init_lock = asyncio.Lock()
-
-        if state._imap_pool_size == 0:
-            async with state._pool_init_lock:
-                if state._imap_pool_size == 0:
-                    logger.info(
-                        "Initializing IMAP connection pool for lockstep sync..."
-                    )
-                    await loop.run_in_executor(None, _init_connection_pool)
-
-        if state._imap_pool_size == 0:
+        pool = await _ensure_imap_pool()
+        if pool is None:
             logger.error("No IMAP connections available for lockstep sync")
             return
 
@@ -1149,61 +1263,47 @@ async def initial_lockstep_sync_and_embed():
             folder_synced = 0
             folder_embedded = 0
 
-            db_count = state.database.count_emails(folder)
-
-            def _get_folder_count():
-                try:
-                    client = state._imap_pool.get(timeout=60)
-                except Empty:
-                    return 0
-                try:
-                    info = client.select_folder(folder, readonly=True)
-                    return info.get("exists", 0)
-                finally:
-                    state._imap_pool.put(client)
+            try:
+                plan = await pool.run_async(
+                    _plan_folder_sync, folder, folder=folder, background=True
+                )
+            except PoolTimeout:
+                plan = None
+            except Exception as e:
+                logger.error(f"[{folder}] Failed to plan sync: {e}")
+                continue
 
-            folder_total = await loop.run_in_executor(
-                state._sync_executor, _get_folder_count
-            )
+            if plan is None:
+                logger.warning(f"[{folder}] No available connection for sync plan")
+                continue
 
-            remaining = folder_total - db_count
-            if remaining <= 0:
-                logger.info(
-                    f"[{folder}] Already fully synced ({db_count}/{folder_total} emails)"
-                )
+            if plan.done:
+                _save_plan_state(plan)
+                logger.info(f"[{folder}] Already fully synced")
                 continue
 
             logger.info(
-                f"[{folder}] Resuming lockstep sync+embed ({db_count}/{folder_total} done, {remaining} remaining)..."
+                f"[{folder}] Starting lockstep sync+embed ({plan.total} emails to sync)..."
             )
 
             while state.running:
-
-                def _sync_batch():
-                    try:
-                        client = state._imap_pool.get(timeout=60)
-                    except Empty:
-                        return [], False
-                    try:
-                        return _sync_next_batch(client, folder, batch_size)
-                    finally:
-                        state._imap_pool.put(client)
-
-                synced_uids, has_more = await loop.run_in_executor(
-                    state._sync_executor, _sync_batch
-                )
-
-                if not synced_uids:
-                    break
+                try:
+                    synced_uids, has_more = await pool.run_async(
+                        _sync_next_batch,
+                        plan,
+                        batch_size,
+                        folder=folder,
+                        background=True,
+                    )
+                except PoolTimeout:
+                    synced_uids, has_more = [], False
 
                 folder_synced += len(synced_uids)
-                total_done = db_count + folder_synced
-                pct = (total_done / folder_total * 100) if folder_total > 0 else 0
                 logger.info(
-                    f"[{folder}] Synced {total_done}/{folder_total} ({pct:.1f}%)"
+                    f"[{folder}] Synced {plan.synced}/{plan.total} ({plan.progress_pct:.1f}%)"
                 )
 
-                if supports_embeddings:
+                if supports_embeddings and synced_uids:
                     embedded = await embed_specific_uids(folder, synced_uids)
                     folder_embedded += embedded
 
@@ -1224,114 +1324,158 @@ async def initial_lockstep_sync_and_embed():
         logger.info("Initial lockstep sync finished - debounced_sync unblocked")
 
 
-def _idle_worker(
-    client: ImapClient,
-    loop: asyncio.AbstractEventLoop,
-    stop_event: threading.Event,
-):
-    """Dedicated thread worker for IMAP IDLE operations."""
-    idle_timeout = 25 * 60  # 25 minutes (Gmail requires re-IDLE every 29 min)
-    logger.info("IDLE worker thread started")
+def _handle_idle_responses(
+    client: ImapClient, folder: str, responses: list[tuple[Any, ...]]
+) -> None:
+    """Apply an IDLE burst straight to the cache.
 
-    while not stop_event.is_set():
-        try:
-            logger.info("IDLE: Selecting INBOX...")
-            client.select_folder("INBOX", readonly=True)
-            logger.info("IDLE: Starting IDLE mode...")
-            client.idle_start()
+    Runs on the folder's IDLE thread, outside IDLE, with the folder still
+    selected. VANISHED UIDs are deleted, FETCH flags (mapping sequence
+    numbers to UIDs on this connection when needed) are written as they are,
+    and EXISTS fetches only UIDs from the stored UIDNEXT up. A folder sync
+    (CONDSTORE reconciliation) is scheduled only when that is not possible.
+    """
+    if not state.database:
+        return
 
-            try:
-                logger.info(
-                    f"IDLE: Waiting for notifications (timeout={idle_timeout}s)..."
-                )
-                responses = client.idle_check(timeout=idle_timeout)
+    events = parse_idle_responses(responses)
+    needs_sync = False
 
-                if responses:
-                    logger.info(
-                        f"IDLE: Received {len(responses)} responses: {responses}"
-                    )
-                    should_sync = False
-                    for response in responses:
-                        # Handle different IDLE response formats:
-                        # EXISTS: (count, b'EXISTS') - new message
-                        # EXPUNGE: (seq, b'EXPUNGE') - message deleted
-                        # FETCH: (seq, b'FETCH', (...)) - flags/modseq changed
-                        if len(response) >= 2:
-                            if response[1] in (b"EXISTS", b"EXPUNGE"):
-                                logger.info(f"IDLE: New mail or expunge: {response}")
-                                should_sync = True
-                                break
-                            elif response[1] == b"FETCH":
-                                logger.info(f"IDLE: Flag change detected: {response}")
-                                should_sync = True
-                                break
-
-                    if should_sync:
-                        loop.call_soon_threadsafe(
-                            lambda: asyncio.create_task(debounced_sync())
-                        )
-                else:
-                    logger.debug("IDLE: Timeout, no responses - restarting IDLE")
-            finally:
-                client.idle_done()
+    if events.vanished:
+        deleted = state.database.delete_emails_bulk(folder, events.vanished)
+        logger.info(f"IDLE {folder}: removed {deleted} vanished emails")
 
-        except Exception as e:
-            logger.error(f"IDLE worker error: {e}")
-            for _ in range(30):
-                if stop_event.is_set():
-                    break
-                stop_event.wait(1.0)
+    if events.expunged:
+        # Which message went is unknown, and later sequence numbers shifted
+        needs_sync = True
+        events.sequences = []
 
-    logger.info("IDLE worker thread stopped")
+    if events.fetched or events.sequences:
+        changed = client.resolve_idle_fetches(events.fetched, events.sequences)
+        applied = state.database.reconcile_email_flags(folder, changed)
+        logger.info(f"IDLE {folder}: applied {applied} flag changes")
 
+    if events.exists and not _fetch_new_mail(client, folder):
+        needs_sync = True
 
-async def idle_monitor():
-    """Background task that manages the IDLE worker thread.
+    if needs_sync:
+        _schedule_folder_sync(folder)
+
+
+def _fetch_new_mail(client: ImapClient, folder: str) -> bool:
+    """Store messages from the stored UIDNEXT up. False if a sync must do it.
 
-    Monitors INBOX for changes and triggers sync when new mail arrives.
-    Uses a dedicated IMAP connection and runs on a separate thread
-    to avoid blocking the asyncio event loop.
+    UIDNEXT is saved at the first UID that was not stored, so a skipped
+    message is picked up again by the folder sync scheduled for it.
+
+    The stored HIGHESTMODSEQ is left alone, so the next folder sync still
+    reconciles any flag change IDLE did not report. A UIDVALIDITY change
+    means the stored UIDs are void; the folder sync handles the reset.
     """
-    if not state.config or not state.idle_client:
-        return
+    if not state.database:
+        return False
 
-    client = state.idle_client
+    folder_state = state.database.get_folder_state(folder)
+    uidnext = folder_state.get("uidnext", 0) if folder_state else 0
+    if not uidnext:
+        return False
+    if client.selected_uidvalidity != folder_state.get("uidvalidity"):
+        logger.warning(
+            f"IDLE {folder}: UIDVALIDITY changed "
+            f"({folder_state.get('uidvalidity')} -> {client.selected_uidvalidity})"
+        )
+        return False
 
-    if not client.has_idle_capability():
-        logger.info("Server does not support IDLE, skipping idle monitor")
+    uids = client.search_uids_from(folder, uidnext)
+    if len(uids) > IDLE_FETCH_LIMIT:
+        return False
+    if not uids:
+        return True
+
+    stored = set(_store_email_batch(client, folder, uids))
+    logger.info(f"IDLE {folder}: stored {len(stored)} new emails")
+    # Advance only past the UIDs stored without a gap; a skipped message
+    # (body not yet available) must be fetched again
+    skipped = [uid for uid in sorted(uids) if uid not in stored]
+    state.database.save_folder_state(
+        folder=folder,
+        uidvalidity=folder_state["uidvalidity"],
+        uidnext=skipped[0] if skipped else max(uids) + 1,
+        highestmodseq=folder_state.get("highestmodseq", 0),
+    )
+    return not skipped
+
+
+def _schedule_folder_sync(folder: str) -> None:
+    """Queue a debounced sync of one folder from a watcher thread."""
+    loop = state.event_loop
+    if loop is None or loop.is_closed():
         return
+    loop.call_soon_threadsafe(lambda: asyncio.create_task(debounced_sync(folder)))
+
 
-    logger.info("Starting IDLE monitor for push notifications")
+def _build_idle_supervisor() -> IdleSupervisor:
+    """Plan IDLE vs STATUS watching for the synced folders within the budget."""
+    if not state.config or not state.imap_client:
+        raise RuntimeError("Engine not enrolled")
 
-    loop = asyncio.get_event_loop()
-    stop_event = threading.Event()
+    sync_config = state.config.sync
+    max_idle = sync_config.idle_max_connections
+    if max_idle and not state.imap_client.has_idle_capability():
+        logger.info("Server does not support IDLE, polling every folder")
+        max_idle = 0
 
-    # Start the IDLE worker on a dedicated thread
-    idle_thread = threading.Thread(
-        target=_idle_worker,
-        args=(client, loop, stop_event),
-        name="idle-worker",
-        daemon=True,
+    idle_folders, polled_folders = plan_watch(
+        state.config.allowed_folders or ["INBOX"],
+        sync_config.idle_folders,
+        max_idle,
+    )
+    imap_config = state.config.imap
+    return IdleSupervisor(
+        lambda folders: ImapClient(imap_config, allowed_folders=folders),
+        idle_folders,
+        polled_folders,
+        on_idle_responses=_handle_idle_responses,
+        on_folder_changed=_schedule_folder_sync,
+        status_interval=sync_config.status_interval,
     )
-    idle_thread.start()
 
-    # Wait until we should stop
+
+async def idle_monitor():
+    """Background task that owns the folder watchers.
+
+    Hot folders are watched with IMAP IDLE and the rest with a rotating STATUS
+    poll, each on dedicated connections and threads so the asyncio event loop
+    never blocks. A change triggers a debounced sync of that folder only.
+    """
+    if not state.config or not state.imap_client:
+        return
+
+    state.event_loop = asyncio.get_running_loop()
+    try:
+        supervisor = await asyncio.to_thread(_build_idle_supervisor)
+    except Exception as e:
+        logger.error(f"Could not start folder watchers: {e}")
+        state.idle_enabled = False
+        return
+    state.idle_supervisor = supervisor
+    supervisor.start()
+
     try:
         while state.running and state.enrolled:
             await asyncio.sleep(1.0)
     finally:
-        # Signal the worker thread to stop
-        logger.info("Stopping IDLE worker thread...")
-        stop_event.set()
-        idle_thread.join(timeout=5.0)
-        if idle_thread.is_alive():
-            logger.warning("IDLE worker thread did not stop cleanly")
+        logger.info("Stopping folder watchers...")
+        await asyncio.to_thread(supervisor.stop)
+        state.idle_supervisor = None
+        state.idle_enabled = False
 
 
-async def debounced_sync():
+async def debounced_sync(folder: Optional[str] = None):
     """Trigger a sync with debouncing to batch rapid changes.
 
-    If called multiple times within the debounce window, only one sync runs.
+    Syncs only ``folder`` when given, otherwise every folder. Calls for the
+    same folder within the debounce window collapse into one sync.
     Skips if initial lockstep sync is still in progress.
     """
     # Don't interfere with lockstep sync - it handles its own batching
@@ -1339,18 +1483,19 @@ async def debounced_sync():
         logger.debug("Skipping debounced_sync - initial lockstep sync in progress")
         return
 
-    if state._sync_debounce_task and not state._sync_debounce_task.done():
-        state._sync_debounce_task.cancel()
+    pending = state._sync_debounce_tasks.get(folder)
+    if pending and not pending.done():
+        pending.cancel()
         try:
-            await state._sync_debounce_task
+            await pending
         except asyncio.CancelledError:
             pass
 
     async def _delayed_sync():
         await asyncio.sleep(state._sync_debounce_delay)
-        await sync_emails_parallel()
+        await sync_emails_parallel([folder] if folder else None)
 
-    state._sync_debounce_task = asyncio.create_task(_delayed_sync())
+    state._sync_debounce_tasks[folder] = asyncio.create_task(_delayed_sync())
 
 
 app = FastAPI(title="Secretary Engine", lifespan=lifespan)
@@ -1376,6 +1521,10 @@ async def get_status():
         if state.database
         else False,
         "waiting_for_oauth": state.running and not state.enrolled,
+        "imap_pool": state.imap_pool.metrics() if state.imap_pool else None,
+        "folder_watch": state.idle_supervisor.describe()
+        if state.idle_supervisor
+        else None,
     }
 
 
@@ -1465,13 +1614,22 @@ async def move_email(req: EmailMoveRequest):
         )
 
     try:
-        state.imap_client.move_email(req.uid, req.folder, req.destination)
+        await _run_imap_job(
+            lambda client: client.move_email(req.uid, req.folder, req.destination),
+            folder=req.folder,
+        )
         if state.database:
             state.database.delete_email(req.uid, req.folder)
         await debounced_sync()
         return {"status": "ok"}
     except HTTPException:
         raise
+    except PoolTimeout as e:
+        logger.warning(f"IMAP move waited too long for a connection: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
     except imapclient.IMAPClient.Error as e:  # type: ignore[attr-defined]
         logger.error(f"IMAP move error: {e}")
         raise HTTPException(
@@ -1486,6 +1644,40 @@ async def move_email(req: EmailMoveRequest):
         )
 
 
+@app.post("/api/email/hydrate")
+async def hydrate_email(req: EmailHydrateRequest):
+    """Fetch bodies for header-first emails now, e.g. when a reader opens one."""
+    if not state.enrolled:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No account configured. Run auth_setup to add an account.",
+        )
+
+    if not state.database or not state.imap_client:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="IMAP not connected",
+        )
+
+    try:
+        hydrated = await _run_imap_job(
+            _hydrate_with_client, req.folder, req.uids, folder=req.folder
+        )
+        return {"status": "ok", "hydrated": hydrated}
+    except imapclient.IMAPClient.Error as e:  # type: ignore[attr-defined]
+        logger.error(f"IMAP hydrate error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"IMAP hydrate failed: {e}",
+        )
+    except Exception:
+        logger.exception("Unexpected hydrate_email error")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to hydrate email",
+        )
+
+
 @app.post("/api/email/mark-read")
 async def mark_read(req: EmailMarkRequest):
     if not state.enrolled:
@@ -1501,12 +1693,21 @@ async def mark_read(req: EmailMarkRequest):
         )
 
     try:
-        state.imap_client.mark_email(req.uid, req.folder, "read")
+        await _run_imap_job(
+            lambda client: client.mark_email(req.uid, req.folder, "read"),
+            folder=req.folder,
+        )
         if state.database:
             state.database.mark_email_read(req.uid, req.folder, True)
         return {"status": "ok"}
     except HTTPException:
         raise
+    except PoolTimeout as e:
+        logger.warning(f"IMAP mark-read waited too long for a connection: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
     except imapclient.IMAPClient.Error as e:  # type: ignore[attr-defined]
         logger.error(f"IMAP mark-read error: {e}")
         raise HTTPException(
@@ -1536,12 +1737,21 @@ async def mark_unread(req: EmailMarkRequest):
         )
 
     try:
-        state.imap_client.mark_email(req.uid, req.folder, "unread")
+        await _run_imap_job(
+            lambda client: client.mark_email(req.uid, req.folder, "unread"),
+            folder=req.folder,
+        )
         if state.database:
             state.database.mark_email_read(req.uid, req.folder, False)
         return {"status": "ok"}
     except HTTPException:
         raise
+    except PoolTimeout as e:
+        logger.warning(f"IMAP mark-unread waited too long for a connection: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
     except imapclient.IMAPClient.Error as e:  # type: ignore[attr-defined]
         logger.error(f"IMAP mark-unread error: {e}")
         raise HTTPException(
@@ -1571,22 +1781,33 @@ async def modify_labels(req: EmailLabelsRequest):
         )
 
     try:
-        if req.action == "add":
-            state.imap_client.add_gmail_labels(req.uid, req.folder, req.labels)
-        elif req.action == "remove":
-            state.imap_client.remove_gmail_labels(req.uid, req.folder, req.labels)
-        elif req.action == "set":
-            state.imap_client.set_gmail_labels(req.uid, req.folder, req.labels)
-        else:
+        label_methods = {
+            "add": "add_gmail_labels",
+            "remove": "remove_gmail_labels",
+            "set": "set_gmail_labels",
+        }
+        method = label_methods.get(req.action)
+        if not method:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid action: {req.action}",
             )
 
+        await _run_imap_job(
+            lambda client: getattr(client, method)(req.uid, req.folder, req.labels),
+            folder=req.folder,
+        )
+
         await debounced_sync()
         return {"status": "ok"}
     except HTTPException:
         raise
+    except PoolTimeout as e:
+        logger.warning(f"IMAP label modification waited too long for a connection: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
     except imapclient.IMAPClient.Error as e:  # type: ignore[attr-defined]
         logger.error(f"IMAP label modification error: {e}")
         raise HTTPException(
@@ -1601,6 +1822,168 @@ async def modify_labels(req: EmailLabelsRequest):
         )
 
 
+# Execution order within a folder: moves change UIDs, so they run last
+BATCH_ACTIONS = (
+    "remove_labels",
+    "add_labels",
+    "set_labels",
+    "mark_read",
+    "mark_unread",
+    "move",
+)
+
+
+def _group_batch_operations(
+    operations: list[EmailBatchOperation],
+) -> dict[str, list[tuple[str, Optional[str], tuple[str, ...], list[int]]]]:
+    """Group operations by folder, then by (action, destination, labels).
+
+    Returns folder -> [(action, destination, labels, uids)] in BATCH_ACTIONS
+    order, with duplicate UIDs dropped.
+    """
+    grouped: dict[str, dict[tuple[str, Optional[str], tuple[str, ...]], list[int]]] = {}
+    for op in operations:
+        key = (
+            op.action,
+            op.destination if op.action == "move" else None,
+            tuple(op.labels) if op.action.endswith("_labels") else (),
+        )
+        uids = grouped.setdefault(op.folder, {}).setdefault(key, [])
+        if op.uid not in uids:
+            uids.append(op.uid)
+
+    return {
+        folder: [
+            (action, destination, labels, uids)
+            for (action, destination, labels), uids in sorted(
+                groups.items(), key=lambda item: BATCH_ACTIONS.index(item[0][0])
+            )
+        ]
+        for folder, groups in grouped.items()
+    }
+
+
+def _apply_batch_groups(
+    client: ImapClient,
+    folder: str,
+    groups: list[tuple[str, Optional[str], tuple[str, ...], list[int]]],
+) -> list[dict[str, Any]]:
+    """Run each group as set-based IMAP commands, then one DB update per group."""
+    results = []
+    for action, destination, labels, uids in groups:
+        if action in ("mark_read", "mark_unread"):
+            outcome = client.mark_email_batch(uids, folder, action.replace("mark_", ""))
+        elif action == "move":
+            outcome = client.move_email_batch(uids, folder, cast(str, destination))
+        else:
+            outcome = client.modify_gmail_labels_batch(
+                uids, folder, list(labels), action.replace("_labels", "")
+            )
+
+        done = [uid for uid in uids if outcome.get(uid)]
+        if state.database and done:
+            if action in ("mark_read", "mark_unread"):
+                state.database.mark_emails_read_bulk(
+                    folder, done, action == "mark_read"
+                )
+            elif action == "move":
+                state.database.delete_emails_bulk(folder, done)
+            else:
+                state.database.modify_email_labels_bulk(
+                    folder, done, list(labels), action.replace("_labels", "")
+                )
+
+        results.append(
+            {
+                "folder": folder,
+                "action": action,
+                "destination": destination,
+                "labels": list(labels),
+                "succeeded": len(done),
+                "failed_uids": [uid for uid in uids if not outcome.get(uid)],
+            }
+        )
+    return results
+
+
+@app.post("/api/email/batch")
+async def batch_mutate(req: EmailBatchRequest):
+    """Apply many mutations with one UID STORE/MOVE per folder and action."""
+    if not state.enrolled:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No account configured. Run auth_setup to add an account.",
+        )
+
+    if not state.imap_client:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="IMAP not connected",
+        )
+
+    for op in req.operations:
+        if op.action not in BATCH_ACTIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid action: {op.action}",
+            )
+        if op.action == "move" and not op.destination:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="move requires a destination",
+            )
+        if op.action.endswith("_labels") and not op.labels:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{op.action} requires labels",
+            )
+
+    try:
+        grouped = _group_batch_operations(req.operations)
+        folder_results = await asyncio.gather(
+            *(
+                _run_imap_job(_apply_batch_groups, folder, groups, folder=folder)
+                for folder, groups in grouped.items()
+            )
+        )
+        results = [r for folder_result in folder_results for r in folder_result]
+
+        if any(
+            r["succeeded"] and r["action"] not in ("mark_read", "mark_unread")
+            for r in results
+        ):
+            await debounced_sync()
+
+        return {
+            "status": "ok",
+            "succeeded": sum(r["succeeded"] for r in results),
+            "failed": sum(len(r["failed_uids"]) for r in results),
+            "results": results,
+        }
+    except HTTPException:
+        raise
+    except PoolTimeout as e:
+        logger.warning(f"IMAP batch waited too long for a connection: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except imapclient.IMAPClient.Error as e:  # type: ignore[attr-defined]
+        logger.error(f"IMAP batch error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"IMAP batch failed: {e}",
+        )
+    except Exception:
+        logger.exception("Unexpected batch_mutate error")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to apply batch",
+        )
+
+
 @app.post("/api/email/send")
 async def send_email(req: SendEmailRequest):
     """Send an email via SMTP."""
@@ -1825,53 +2208,126 @@ async def setup_labels(req: SetupLabelsRequest):
         )
 
 
-@app.get("/api/email/{folder}/{uid}/attachment/{filename}")
-async def download_attachment(folder: str, uid: int, filename: str):
-    """Download an email attachment."""
-    if not state.enrolled:
-        raise HTTPException(status_code=401, detail="No account configured")
+def _get_attachment_store() -> AttachmentStore:
+    if state.attachment_store is None:
+        path = state.config.attachments.path if state.config else "config/attachments"
+        state.attachment_store = AttachmentStore(path)
+    return state.attachment_store
 
-    if not state.imap_client:
-        raise HTTPException(status_code=500, detail="IMAP client not connected")
 
-    try:
-        email = state.imap_client.fetch_email(uid, folder)
-        if not email:
-            raise HTTPException(status_code=404, detail="Email not found")
+def _store_attachment_parts(
+    folder: str, uid: int, parts: list[AttachmentPart]
+) -> list[dict[str, Any]]:
+    """Write attachment payloads to the blob store and index them."""
+    if not state.database:
+        return []
+
+    store = _get_attachment_store()
+    blobs = []
+    for att in parts:
+        sha256, size = store.put_bytes(att.data)
+        blobs.append(
+            {
+                "part": att.part,
+                "filename": att.filename,
+                "content_type": att.content_type,
+                "size": size,
+                "sha256": sha256,
+            }
+        )
+    state.database.save_attachment_blobs(folder, uid, blobs)
+    return blobs
+
+
+def _fetch_and_store_attachment(
+    client: ImapClient, folder: str, uid: int, filename: str
+) -> Optional[dict[str, Any]]:
+    """Fetch one attachment's MIME part over IMAP and add it to the store."""
+    att = client.fetch_attachment_part(uid, folder, filename)
+    if not att:
+        return None
+    return _store_attachment_parts(folder, uid, [att])[0]
+
+
+def _blob_response(
+    request: Request, blob: dict[str, Any], filename: str
+) -> Response:
+    """Serve a stored blob with ETag/conditional GET and single-range support."""
+    store = _get_attachment_store()
+    sha256 = blob["sha256"]
+    size = store.size(sha256)
+    etag = f'"{sha256}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=86400",
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
 
-        if not email.attachments:
-            raise HTTPException(status_code=404, detail="No attachments found")
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-        attachment = next(
-            (att for att in email.attachments if att.filename == filename), None
-        )
-        if not attachment:
-            raise HTTPException(
-                status_code=404, detail=f"Attachment '{filename}' not found"
-            )
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != etag:
+        range_header = None
 
-        if not attachment.content:
-            raise HTTPException(status_code=500, detail="Attachment content is empty")
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={**headers, "Content-Range": f"bytes */{size}"},
+        )
 
+    media_type = blob.get("content_type") or "application/octet-stream"
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
         return StreamingResponse(
-            io.BytesIO(attachment.content),
-            media_type=attachment.content_type or "application/octet-stream",
-            headers={
-                "Content-Disposition": f'attachment; filename="{attachment.filename}"'
-            },
-        )
-        if not attachment:
+            store.iter_range(sha256, 0, size - 1),
+            media_type=media_type,
+            headers=headers,
+        )
+
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        store.iter_range(sha256, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+@app.get("/api/email/{folder}/{uid}/attachment/{filename}")
+async def download_attachment(request: Request, folder: str, uid: int, filename: str):
+    """Download an email attachment.
+
+    Served from the content-addressed attachment store; on a miss only the
+    attachment's MIME part is fetched over IMAP and stored first. Supports
+    Range and If-None-Match/If-Range.
+    """
+    if not state.enrolled:
+        raise HTTPException(status_code=401, detail="No account configured")
+
+    if not state.database:
+        raise HTTPException(status_code=500, detail="Database not initialized")
+
+    try:
+        store = _get_attachment_store()
+        blob = state.database.get_attachment_blob(folder, uid, filename)
+        if not blob or not store.exists(blob["sha256"]):
+            blob = await _run_imap_job(
+                _fetch_and_store_attachment, folder, uid, filename, folder=folder
+            )
+        if not blob:
             raise HTTPException(
                 status_code=404, detail=f"Attachment '{filename}' not found"
             )
 
-        return StreamingResponse(
-            io.BytesIO(attachment.content),
-            media_type=attachment.content_type or "application/octet-stream",
-            headers={
-                "Content-Disposition": f'attachment; filename="{attachment.filename}"'
-            },
-        )
+        return _blob_response(request, blob, blob.get("filename") or filename)
 
     except HTTPException:
         raise
@@ -2545,10 +3001,19 @@ async def internal_delete_email(req: EmailDeleteRequest):
         )
 
     try:
-        state.imap_client.move_email(req.uid, req.folder, "[Gmail]/Trash")
+        await _run_imap_job(
+            lambda client: client.move_email(req.uid, req.folder, "[Gmail]/Trash"),
+            folder=req.folder,
+        )
         return {"status": "ok", "message": f"Email {req.uid} moved to Trash"}
     except HTTPException:
         raise
+    except PoolTimeout as e:
+        logger.warning(f"IMAP delete waited too long for a connection: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
     except imapclient.IMAPClient.Error as e:  # type: ignore[attr-defined]
         logger.error(f"IMAP delete error: {e}")
         raise HTTPException(
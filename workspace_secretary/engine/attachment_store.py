@@ -0,0 +1,135 @@
+"""Content-addressed on-disk store for email attachments.
+
+Blobs are stored once per sha256 under sharded directories
+(``<root>/ab/cd/abcd...``), so the same PDF sent to several threads occupies
+disk once and can be served repeatedly without IMAP traffic. Files are written
+to a temporary name and renamed into place, so readers never observe a
+partially written blob.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(ValueError):
+    """Raised when a Range header cannot be served for a blob of given size."""
+
+
+class AttachmentStore:
+    """Sharded, content-addressed blob directory."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root).expanduser()
+        self._tmp = self.root / "tmp"
+
+    def path_for(self, sha256: str) -> Path:
+        if not _SHA256_RE.match(sha256):
+            raise ValueError(f"Invalid sha256 digest: {sha256!r}")
+        return self.root / sha256[:2] / sha256[2:4] / sha256
+
+    def exists(self, sha256: str) -> bool:
+        return self.path_for(sha256).is_file()
+
+    def size(self, sha256: str) -> int:
+        return self.path_for(sha256).stat().st_size
+
+    def put_bytes(self, data: bytes) -> tuple[str, int]:
+        """Store ``data`` and return ``(sha256, size)``."""
+        return self.put_stream([data])
+
+    def put_stream(self, chunks: Iterable[bytes]) -> tuple[str, int]:
+        """Store a stream of chunks without holding it in memory.
+
+        Returns:
+            ``(sha256, size)`` of the stored blob
+        """
+        self._tmp.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+
+        fd, tmp_name = tempfile.mkstemp(dir=self._tmp)
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    size += len(chunk)
+                    tmp_file.write(chunk)
+
+            sha256 = digest.hexdigest()
+            target = self.path_for(sha256)
+            if target.is_file():
+                os.unlink(tmp_name)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_name, target)
+            return sha256, size
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+    def iter_range(
+        self, sha256: str, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Yield the inclusive byte range ``[start, end]`` in CHUNK_SIZE pieces."""
+        path = self.path_for(sha256)
+        if end is None:
+            end = path.stat().st_size - 1
+
+        remaining = end - start + 1
+        with open(path, "rb") as blob:
+            blob.seek(start)
+            while remaining > 0:
+                chunk = blob.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """Parse a single-range ``Range`` header into an inclusive ``(start, end)``.
+
+    Returns None when the header is absent or not a single byte range (the
+    caller then serves the full body, as RFC 9110 allows).
+
+    Raises:
+        RangeNotSatisfiable: If the range lies outside the blob
+    """
+    if not header:
+        return None
+
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size - 1)
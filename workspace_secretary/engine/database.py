@@ -16,6 +16,9 @@ from workspace_secretary.db.queries import contacts as contact_q
 from workspace_secretary.db.queries import calendar as cal_q
 from workspace_secretary.db.queries import preferences as pref_q
 from workspace_secretary.db.queries import mutations as mut_q
+from workspace_secretary.db.queries import attachments as att_q
+from workspace_secretary.db.queries import threads as thread_q
+from workspace_secretary.db.queries import counters as counter_q
 
 logger = logging.getLogger(__name__)
 
@@ -29,32 +32,20 @@ class PostgresDatabase(DatabaseInterface):
             """
             SELECT a.atttypid::regtype::text AS type_name
             FROM pg_attribute a
-            WHERE a.attrelid = 'email_embeddings'::regclass
+            WHERE a.attrelid = 'embedding_vectors'::regclass
               AND a.attname = 'embedding'
               AND NOT a.attisdropped
             """
         )
         row = cur.fetchone()
         if not row:
-            raise RuntimeError("email_embeddings.embedding column not found")
+            raise RuntimeError("embedding_vectors.embedding column not found")
         return str(row[0])
 
     def _ensure_embeddings_schema(self, cur: Any) -> None:
         expected_type = self._expected_embedding_type()
-
-        cur.execute(
-            f"""
-            CREATE TABLE IF NOT EXISTS email_embeddings (
-                email_uid INTEGER NOT NULL,
-                email_folder TEXT NOT NULL,
-                embedding {expected_type},
-                model TEXT,
-                content_hash TEXT,
-                created_at TIMESTAMPTZ DEFAULT NOW(),
-                PRIMARY KEY (email_uid, email_folder),
-                FOREIGN KEY (email_uid, email_folder) REFERENCES emails(uid, folder) ON DELETE CASCADE
-            )
-            """
+        schema.initialize_embeddings_schema(
+            cur, self._vector_type, self.embedding_dimensions
         )
 
         actual_type_name = self._get_embedding_column_type_name(cur)
@@ -62,9 +53,10 @@ class PostgresDatabase(DatabaseInterface):
 
         if actual_type_name != expected_base_type:
             cur.execute("DROP INDEX IF EXISTS idx_embeddings_vector")
+            schema.drop_folder_vector_indexes(cur)
             cur.execute(
                 f"""
-                ALTER TABLE email_embeddings
+                ALTER TABLE embedding_vectors
                 ALTER COLUMN embedding TYPE {expected_type}
                 USING embedding::{expected_type}
                 """
@@ -79,7 +71,7 @@ class PostgresDatabase(DatabaseInterface):
             SELECT indexdef
             FROM pg_indexes
             WHERE schemaname = 'public'
-              AND tablename = 'email_embeddings'
+              AND tablename = 'embedding_vectors'
               AND indexname = 'idx_embeddings_vector'
             """
         )
@@ -93,7 +85,7 @@ class PostgresDatabase(DatabaseInterface):
         cur.execute(
             f"""
             CREATE INDEX IF NOT EXISTS idx_embeddings_vector
-            ON email_embeddings USING hnsw (embedding {ops})
+            ON embedding_vectors USING hnsw (embedding {ops})
             """
         )
 
@@ -106,6 +98,8 @@ class PostgresDatabase(DatabaseInterface):
         password: str = "",
         ssl_mode: str = "prefer",
         embedding_dimensions: int = 1536,
+        hnsw_ef_search: int = 100,
+        hot_folders: Optional[list[str]] = None,
     ):
         super().__init__()
 
@@ -116,6 +110,8 @@ class PostgresDatabase(DatabaseInterface):
         self.password = password
         self.ssl_mode = ssl_mode
         self.embedding_dimensions = embedding_dimensions
+        self.hnsw_ef_search = hnsw_ef_search
+        self.hot_folders = list(hot_folders or [])
         self._pool: Any = None
         self._vector_type = "halfvec" if embedding_dimensions > 2000 else "vector"
         self._vector_ops = (
@@ -149,7 +145,8 @@ class PostgresDatabase(DatabaseInterface):
                 schema.initialize_contacts_schema(cur)
                 schema.initialize_calendar_schema(cur)
                 schema.initialize_mutation_journal(cur)
-                schema.create_indexes(cur, self._vector_type)
+                schema.initialize_attachments_schema(cur)
+                schema.create_indexes(cur, self._vector_type, self.hot_folders)
                 self._ensure_embeddings_index(cur)
                 conn.commit()
 
@@ -249,6 +246,35 @@ class PostgresDatabase(DatabaseInterface):
             self, uid, folder, flags, is_unread, modseq, gmail_labels
         )
 
+    def upsert_emails_bulk(self, emails: list[dict[str, Any]]) -> int:
+        return email_q.upsert_emails_bulk(self, emails)
+
+    def reconcile_email_flags(
+        self, folder: str, changed: dict[int, dict[str, Any]]
+    ) -> int:
+        return email_q.reconcile_email_flags(self, folder, changed)
+
+    def get_unhydrated_uids(self, folder: str, limit: int = 25) -> list[int]:
+        return email_q.get_unhydrated_uids(self, folder, limit)
+
+    def hydrate_email_bodies(
+        self, folder: str, bodies: dict[int, tuple[str, str]]
+    ) -> int:
+        return email_q.hydrate_email_bodies(self, folder, bodies)
+
+    def record_hydrate_failures(self, folder: str, uids: list[int]) -> int:
+        return email_q.record_hydrate_failures(self, folder, uids)
+
+    def get_attachment_blob(
+        self, folder: str, uid: int, filename: str
+    ) -> Optional[dict[str, Any]]:
+        return att_q.get_attachment_blob(self, folder, uid, filename)
+
+    def save_attachment_blobs(
+        self, folder: str, uid: int, blobs: list[dict[str, Any]]
+    ) -> int:
+        return att_q.save_attachment_blobs(self, folder, uid, blobs)
+
     def get_email_by_uid(self, uid: int, folder: str) -> Optional[dict[str, Any]]:
         return email_q.get_email(self, uid, folder)
 
@@ -279,9 +305,20 @@ class PostgresDatabase(DatabaseInterface):
     def delete_email(self, uid: int, folder: str) -> None:
         return email_q.delete_email(self, uid, folder)
 
+    def delete_emails_bulk(self, folder: str, uids: list[int]) -> int:
+        return email_q.delete_emails_bulk(self, folder, uids)
+
     def mark_email_read(self, uid: int, folder: str, is_read: bool) -> None:
         return email_q.mark_email_read(self, uid, folder, is_read)
 
+    def mark_emails_read_bulk(self, folder: str, uids: list[int], is_read: bool) -> int:
+        return email_q.mark_emails_read_bulk(self, folder, uids, is_read)
+
+    def modify_email_labels_bulk(
+        self, folder: str, uids: list[int], labels: list[str], action: str
+    ) -> int:
+        return email_q.modify_email_labels_bulk(self, folder, uids, labels, action)
+
     def get_folder_state(self, folder: str) -> Optional[dict[str, Any]]:
         return email_q.get_folder_state(self, folder)
 
@@ -338,23 +375,64 @@ class PostgresDatabase(DatabaseInterface):
     def get_synced_folders(self) -> list[dict[str, Any]]:
         return email_q.get_synced_folders(self)
 
-    def upsert_embedding(
+    def get_folder_counters(self, folder: str) -> dict[str, int]:
+        return counter_q.get_folder_counters(self, folder)
+
+    def reconcile_mailbox_counters(self) -> int:
+        return counter_q.reconcile_counters(self)
+
+    def get_thread_emails(
+        self, uid: int, folder: str = "INBOX"
+    ) -> list[dict[str, Any]]:
+        return email_q.get_thread(self, uid, folder)
+
+    def get_threads_page(
         self,
-        uid: int,
         folder: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        unread_only: bool = False,
+    ) -> tuple[list[dict[str, Any]], Optional[str]]:
+        return thread_q.get_threads_page(self, folder, limit, cursor, unread_only)
+
+    def upsert_embedding(
+        self,
+        content_hash: str,
         embedding: list[float],
         model: str,
-        content_hash: str,
     ) -> None:
-        return emb_q.upsert_embedding(self, uid, folder, embedding, model, content_hash)
+        return emb_q.upsert_embedding(self, content_hash, embedding, model)
+
+    def upsert_embeddings_bulk(self, rows: list[tuple[str, list[float], str]]) -> int:
+        return emb_q.upsert_embeddings_bulk(self, rows)
+
+    def prune_orphan_embeddings(self) -> int:
+        return emb_q.prune_orphan_embeddings(self)
+
+    def prune_query_embeddings(self, max_age_seconds: float) -> int:
+        return emb_q.prune_query_embeddings(self, max_age_seconds)
+
+    def hybrid_search(
+        self,
+        query: str,
+        query_embedding: list[float],
+        folder: str = "INBOX",
+        limit: int = 20,
+        filters: Optional[dict[str, Any]] = None,
+    ) -> list[dict[str, Any]]:
+        return emb_q.hybrid_search(self, query, query_embedding, folder, limit, filters)
 
     def count_emails_needing_embedding(self, folder: str) -> int:
         return emb_q.count_emails_needing_embedding(self, folder)
 
     def get_emails_needing_embedding(
-        self, folder: str, limit: int = 100
+        self,
+        folder: str,
+        limit: int = 100,
+        uids: Optional[list[int]] = None,
+        before_uid: Optional[int] = None,
     ) -> list[dict[str, Any]]:
-        return emb_q.get_emails_needing_embedding(self, folder, limit)
+        return emb_q.get_emails_needing_embedding(self, folder, limit, uids, before_uid)
 
     def get_user_preferences(self, user_id: str) -> dict[str, Any]:
         return pref_q.get_user_preferences(self, user_id)
@@ -540,8 +618,12 @@ def create_database(config: Any) -> DatabaseInterface:
         raise ValueError("PostgreSQL config is required (database.postgres)")
 
     embedding_dimensions = 1536
+    hnsw_ef_search = 100
+    hot_folders: list[str] = []
     if hasattr(config, "embeddings") and config.embeddings:
         embedding_dimensions = getattr(config.embeddings, "dimensions", 1536)
+        hnsw_ef_search = getattr(config.embeddings, "hnsw_ef_search", 100)
+        hot_folders = getattr(config.embeddings, "hot_folders", [])
 
     return PostgresDatabase(
         host=postgres_config.host,
@@ -551,4 +633,6 @@ def create_database(config: Any) -> DatabaseInterface:
         password=postgres_config.password,
         ssl_mode=getattr(postgres_config, "ssl_mode", "prefer"),
         embedding_dimensions=embedding_dimensions,
+        hnsw_ef_search=hnsw_ef_search,
+        hot_folders=hot_folders,
     )
@@ -29,6 +29,23 @@ class EmbeddingResult:
     tokens_used: int
 
 
+def unique_by_content_hash(emails: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Keep the first email per ``content_hash``.
+
+    Vectors are stored per content hash, so identical copies of a message
+    (e.g. INBOX and [Gmail]/All Mail) only need to be sent to the provider once.
+    """
+    seen: set[str] = set()
+    unique = []
+    for email in emails:
+        content_hash = email.get("content_hash")
+        if not content_hash or content_hash in seen:
+            continue
+        seen.add(content_hash)
+        unique.append(email)
+    return unique
+
+
 class EmbeddingsClient:
     """Client for generating embeddings via OpenAI-compatible API."""
 
@@ -290,6 +307,7 @@ class EmbeddingsSyncWorker:
         database: Any,  # DatabaseInterface
         folders: list[str],
         batch_size: int = 50,
+        max_concurrent: int = 4,
     ):
         """Initialize sync worker.
 
@@ -297,77 +315,149 @@ class EmbeddingsSyncWorker:
             client: Embeddings client for generating vectors
             database: Database interface with embedding support
             folders: List of folders to sync embeddings for
-            batch_size: Emails to process per sync cycle
+            batch_size: Emails per provider request and per vector write
+            max_concurrent: Provider requests kept in flight per folder
         """
         self.client = client
         self.database = database
         self.folders = folders
         self.batch_size = batch_size
+        self.max_concurrent = max(1, max_concurrent)
         self._running = False
         self._task: Optional[asyncio.Task] = None
 
+    async def _embed_batch(
+        self, folder: str, emails: list[dict[str, Any]]
+    ) -> tuple[int, int]:
+        """Embed one batch and store its vectors. Returns (stored, failed)."""
+        try:
+            results = await self.client.embed_emails(emails)
+        except httpx.TimeoutException:
+            logger.error(f"Embeddings timeout for {len(emails)} emails in {folder}")
+            raise
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"Embeddings API error {e.response.status_code}: {e.response.text[:200]}"
+            )
+            raise
+
+        rows = [
+            (email["content_hash"], result.embedding, result.model)
+            for email, result in zip(emails, results)
+            if result.embedding
+        ]
+        failed = len(emails) - len(rows)
+        if not rows:
+            return 0, failed
+
+        try:
+            await asyncio.to_thread(self.database.upsert_embeddings_bulk, rows)
+        except Exception as e:
+            logger.error(
+                f"[{folder}] Failed to store {len(rows)} embeddings "
+                f"(UIDs {emails[0]['uid']}..{emails[-1]['uid']}): {e}"
+            )
+            return 0, len(emails)
+        return len(rows), failed
+
     async def sync_folder(self, folder: str) -> int:
+        """Embed every email in ``folder`` whose content has no vector yet.
+
+        Candidates are paged newest-first with a UID keyset cursor while up to
+        ``max_concurrent`` provider requests are in flight; each completed
+        batch is written with a single multi-row insert. Database calls run in
+        worker threads so the event loop is never blocked.
+        """
         if not self.database.supports_embeddings():
             logger.warning("Database does not support embeddings")
             return 0
 
-        total_needing = self.database.count_emails_needing_embedding(folder)
-        total_stored = 0
-        total_failed = 0
-
+        total_needing = await asyncio.to_thread(
+            self.database.count_emails_needing_embedding, folder
+        )
         if total_needing == 0:
             logger.debug(f"No emails need embedding in {folder}")
             return 0
 
         logger.info(f"[{folder}] Starting embeddings for {total_needing} emails")
 
-        while True:
-            emails = self.database.get_emails_needing_embedding(
-                folder, limit=self.batch_size
-            )
-
-            if not emails:
+        total_stored = 0
+        total_failed = 0
+        last_logged = 0
+        seen_hashes: set[str] = set()
+        slots = asyncio.Semaphore(self.max_concurrent)
+        in_flight: set[asyncio.Task] = set()
+        errors: list[BaseException] = []
+
+        def _collect(task: asyncio.Task) -> None:
+            nonlocal total_stored, total_failed, last_logged
+            in_flight.discard(task)
+            slots.release()
+            if task.cancelled():
+                return
+            if task.exception():
+                errors.append(task.exception())  # type: ignore[arg-type]
+                return
+            stored, failed = task.result()
+            total_stored += stored
+            total_failed += failed
+            done = total_stored + total_failed
+            if done - last_logged >= 200:
+                last_logged = done
                 logger.info(
-                    f"[{folder}] Embeddings complete: {total_stored} succeeded, {total_failed} failed"
+                    f"[{folder}] {done}/{total_needing} embeddings done "
+                    f"({total_stored} stored, {total_failed} skipped)"
                 )
-                return total_stored
 
-            try:
-                results = await self.client.embed_emails(emails)
-            except httpx.TimeoutException:
-                logger.error(f"Embeddings timeout for {len(emails)} emails in {folder}")
-                raise
-            except httpx.HTTPStatusError as e:
-                logger.error(
-                    f"Embeddings API error {e.response.status_code}: {e.response.text[:200]}"
+        cursor: Optional[int] = None
+        try:
+            while True:
+                # Wait for a free slot first so the next page is fetched while
+                # the in-flight requests are still running.
+                await slots.acquire()
+                if errors:
+                    slots.release()
+                    break
+
+                page = await asyncio.to_thread(
+                    self.database.get_emails_needing_embedding,
+                    folder,
+                    limit=self.batch_size,
+                    before_uid=cursor,
                 )
-                raise
-
-            for email, result in zip(emails, results):
-                if not result.embedding:
-                    total_failed += 1
+                if not page:
+                    slots.release()
+                    break
+                cursor = page[-1]["uid"]
+
+                batch = [
+                    email
+                    for email in unique_by_content_hash(page)
+                    if email["content_hash"] not in seen_hashes
+                ]
+                seen_hashes.update(email["content_hash"] for email in batch)
+                if not batch:
+                    slots.release()
                     continue
-                try:
-                    self.database.upsert_embedding(
-                        uid=email["uid"],
-                        folder=email["folder"],
-                        embedding=result.embedding,
-                        model=result.model,
-                        content_hash=email["content_hash"],
-                    )
-                    total_stored += 1
-                except Exception as e:
-                    total_failed += 1
-                    logger.error(
-                        f"Failed to store embedding for UID {email['uid']}: {e}"
-                    )
 
-            current_remaining = self.database.count_emails_needing_embedding(folder)
-            done = total_needing - current_remaining
-            if done % 200 == 0 or current_remaining == 0:
-                logger.info(
-                    f"[{folder}] {done}/{total_needing} embeddings done ({total_stored} stored, {total_failed} skipped)"
-                )
+                task = asyncio.create_task(self._embed_batch(folder, batch))
+                in_flight.add(task)
+                task.add_done_callback(_collect)
+
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        except BaseException:
+            for task in in_flight:
+                task.cancel()
+            raise
+
+        # Surface the first provider error, like the sequential loop did
+        if errors:
+            raise errors[0]
+
+        logger.info(
+            f"[{folder}] Embeddings complete: {total_stored} succeeded, {total_failed} failed"
+        )
+        return total_stored
 
     async def sync_all_folders(self) -> int:
         """Sync embeddings for all configured folders.
@@ -0,0 +1,243 @@
+"""Change detection for every synced folder: IDLE for hot folders, STATUS for the rest.
+
+IMAP IDLE only reports changes to the selected mailbox, and Gmail does not
+implement NOTIFY (RFC 5465), so watching several folders needs a connection
+per folder. ``IdleSupervisor`` spends a fixed budget of connections on IDLE
+for the configured hot folders and watches every other folder from one extra
+connection that cycles ``STATUS`` through them, spacing the commands so each
+cold folder is checked once per ``status_interval``.
+
+Each worker runs on its own thread because every IMAP call blocks. Changes
+are reported per folder so the caller can sync only the folder that changed.
+IDLE responses are handed over raw; ``parse_idle_responses`` sorts them into
+what can be applied directly and what needs a folder sync.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Optional
+
+from workspace_secretary.engine.imap_sync import ImapClient, parse_vanished_response
+
+logger = logging.getLogger(__name__)
+
+# Gmail drops IDLE after 29 minutes without a re-IDLE
+IDLE_TIMEOUT_S = 25 * 60
+ERROR_BACKOFF_S = 30.0
+MIN_STATUS_STEP_S = 1.0
+
+IdleResponseHandler = Callable[[ImapClient, str, list[tuple[Any, ...]]], None]
+FolderChangeHandler = Callable[[str], None]
+
+
+def plan_watch(
+    folders: Iterable[str], hot_folders: Iterable[str], max_idle: int
+) -> tuple[list[str], list[str]]:
+    """Split folders into IDLE-watched and STATUS-polled.
+
+    Hot folders get IDLE in the order configured, up to ``max_idle``. Hot
+    folders over the budget and every other folder are polled.
+
+    Returns:
+        (idle_folders, polled_folders)
+    """
+    folders = list(dict.fromkeys(folders))
+    idle = [f for f in dict.fromkeys(hot_folders) if f in folders][:max_idle]
+    polled = [f for f in folders if f not in idle]
+    return idle, polled
+
+
+@dataclass
+class IdleEvents:
+    """One burst of IDLE responses for the selected folder.
+
+    ``fetched`` holds FETCH data items of responses that named their UID;
+    ``sequences`` the sequence numbers of those that did not. EXPUNGE only
+    carries a sequence number and renumbers every later message, so once
+    ``expunged`` is set no sequence number in the burst can be trusted.
+    """
+
+    exists: bool = False
+    expunged: bool = False
+    vanished: list[int] = field(default_factory=list)
+    fetched: dict[int, dict[bytes, Any]] = field(default_factory=dict)
+    sequences: list[int] = field(default_factory=list)
+
+
+def _fetch_items(data: Any) -> dict[bytes, Any]:
+    items = list(data) if isinstance(data, (list, tuple)) else []
+    return {
+        (key.upper() if isinstance(key, bytes) else key): value
+        for key, value in zip(items[::2], items[1::2])
+    }
+
+
+def parse_idle_responses(responses: Iterable[tuple[Any, ...]]) -> IdleEvents:
+    """Sort IDLE responses by what they allow us to do.
+
+    Formats (as parsed by imapclient):
+    EXISTS: (count, b'EXISTS') - new message
+    EXPUNGE: (seq, b'EXPUNGE') - message deleted
+    FETCH: (seq, b'FETCH', (b'UID', 50, b'FLAGS', (...), ...)) - flags changed
+    VANISHED: (b'VANISHED', b'41,43:45') - QRESYNC expunge
+    """
+    events = IdleEvents()
+    for response in responses:
+        if not response:
+            continue
+        if response[0] == b"VANISHED":
+            events.vanished.extend(parse_vanished_response(response))
+        elif len(response) < 2:
+            continue
+        elif response[1] == b"EXISTS":
+            events.exists = True
+        elif response[1] == b"EXPUNGE":
+            events.expunged = True
+        elif response[1] == b"FETCH":
+            items = _fetch_items(response[2] if len(response) > 2 else ())
+            uid = items.get(b"UID")
+            if isinstance(uid, int):
+                events.fetched[uid] = items
+            elif isinstance(response[0], int):
+                events.sequences.append(response[0])
+    return events
+
+
+def status_changed(previous: Optional[dict[str, int]], current: dict[str, int]) -> bool:
+    """Whether a STATUS result differs from the last one seen for the folder.
+
+    UIDNEXT moves on new mail, MESSAGES on expunge, and HIGHESTMODSEQ (with
+    CONDSTORE) on any flag change. The first result is only a baseline.
+    """
+    return previous is not None and previous != current
+
+
+class IdleSupervisor:
+    """Owns the IDLE and STATUS threads and their IMAP connections."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[list[str]], ImapClient],
+        idle_folders: list[str],
+        polled_folders: list[str],
+        on_idle_responses: IdleResponseHandler,
+        on_folder_changed: FolderChangeHandler,
+        status_interval: float = 60.0,
+    ):
+        """
+        Args:
+            client_factory: Builds an unconnected client limited to the folders
+            idle_folders: Folders that get a dedicated IDLE connection
+            polled_folders: Folders checked by the rotating STATUS poll
+            on_idle_responses: Called with (client, folder, responses) after
+                leaving IDLE, so it may issue commands on that connection
+            on_folder_changed: Called with a folder whose STATUS changed
+            status_interval: Seconds to cycle through all polled folders
+        """
+        self.client_factory = client_factory
+        self.idle_folders = idle_folders
+        self.polled_folders = polled_folders
+        self.on_idle_responses = on_idle_responses
+        self.on_folder_changed = on_folder_changed
+        self.status_interval = status_interval
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._clients: list[ImapClient] = []
+        self._last_status: dict[str, dict[str, int]] = {}
+
+    @property
+    def connections(self) -> int:
+        """IMAP connections this supervisor holds once started."""
+        return len(self.idle_folders) + (1 if self.polled_folders else 0)
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "idle": self.idle_folders,
+            "polled": self.polled_folders,
+            "status_interval": self.status_interval,
+            "connections": self.connections,
+        }
+
+    def start(self) -> None:
+        for folder in self.idle_folders:
+            client = self.client_factory([folder])
+            self._spawn(f"idle-{folder}", self._idle_worker, client, folder)
+        if self.polled_folders:
+            client = self.client_factory(self.polled_folders)
+            self._spawn("idle-status", self._status_worker, client)
+        logger.info(
+            f"Watching {len(self.idle_folders)} folders with IDLE "
+            f"({', '.join(self.idle_folders) or 'none'}) and "
+            f"{len(self.polled_folders)} with STATUS every {self.status_interval}s"
+        )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+            if thread.is_alive():
+                logger.warning(f"{thread.name} thread did not stop cleanly")
+        for client in self._clients:
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+        self._threads = []
+        self._clients = []
+
+    def _spawn(self, name: str, target: Callable[..., None], *args: Any) -> None:
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        self._clients.append(args[0])
+        self._threads.append(thread)
+        thread.start()
+
+    def _backoff(self) -> None:
+        self._stop.wait(ERROR_BACKOFF_S)
+
+    def _idle_worker(self, client: ImapClient, folder: str) -> None:
+        logger.info(f"IDLE worker for {folder} started")
+        while not self._stop.is_set():
+            try:
+                client.select_folder(folder, readonly=True)
+                client.idle_start()
+                responses: list[tuple[Any, ...]] = []
+                try:
+                    responses = client.idle_check(timeout=IDLE_TIMEOUT_S)
+                finally:
+                    # Anything that arrived after idle_check comes back with DONE
+                    responses.extend(client.idle_done())
+                if responses:
+                    logger.debug(f"IDLE {folder}: {responses}")
+                    self.on_idle_responses(client, folder, responses)
+            except Exception as e:
+                logger.error(f"IDLE worker for {folder} failed: {e}")
+                self._backoff()
+        logger.info(f"IDLE worker for {folder} stopped")
+
+    def _status_worker(self, client: ImapClient) -> None:
+        step = max(self.status_interval / len(self.polled_folders), MIN_STATUS_STEP_S)
+        while not self._stop.is_set():
+            for folder in self.polled_folders:
+                if self._stop.is_set():
+                    break
+                try:
+                    self.poll_folder(client, folder)
+                except Exception as e:
+                    logger.error(f"STATUS poll of {folder} failed: {e}")
+                    self._backoff()
+                    break
+                self._stop.wait(step)
+
+    def poll_folder(self, client: ImapClient, folder: str) -> bool:
+        """STATUS one folder and report it if it changed. Returns True if so."""
+        current = client.get_folder_status(folder)
+        previous = self._last_status.get(folder)
+        self._last_status[folder] = current
+        if not status_changed(previous, current):
+            return False
+        logger.info(f"STATUS change in {folder}: {previous} -> {current}")
+        self.on_folder_changed(folder)
+        return True
@@ -0,0 +1,240 @@
+"""Thread-safe pool of IMAP connections shared by sync and mutation endpoints.
+
+imaplib connections are not safe for concurrent use, so every blocking IMAP
+call is made on a connection leased exclusively from this pool and runs on
+the pool's own worker threads rather than on the asyncio event loop.
+
+Leases are folder-affine: when an idle connection already has the requested
+folder SELECTed it is preferred, so ``ImapClient.ensure_selected`` can skip
+the SELECT round trip. Background work (sync, body hydration) may not take the
+last ``reserved`` idle connections, which keeps interactive requests such as
+mark-read responsive while a long folder sync is running.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterator, List, Optional
+
+from workspace_secretary.engine.imap_sync import ImapClient
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(RuntimeError):
+    """Raised when no IMAP connection could be leased within the timeout."""
+
+
+@dataclass
+class PoolMetrics:
+    """Counters describing how the pool is being used."""
+
+    leases: int = 0
+    folder_hits: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    reconnects: int = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["wait_seconds_avg"] = (
+            self.wait_seconds_total / self.leases if self.leases else 0.0
+        )
+        return data
+
+
+class ImapConnectionPool:
+    """Fixed-size pool of connected ``ImapClient`` instances."""
+
+    def __init__(
+        self,
+        factory: Callable[[], ImapClient],
+        size: int,
+        reserved: int = 0,
+        name: str = "imap",
+    ):
+        self._factory = factory
+        self._target_size = size
+        self._reserved = max(0, reserved)
+        self._name = name
+        self._cond = threading.Condition()
+        self._idle: List[ImapClient] = []
+        self._all: List[ImapClient] = []
+        self._metrics = PoolMetrics()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._background_executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        return len(self._all)
+
+    @property
+    def background_slots(self) -> int:
+        """Connections background work may hold at once (never below one)."""
+        return max(1, self.size - self._reserved)
+
+    def start(self) -> int:
+        """Open the pool's connections. Returns the number that connected."""
+        for i in range(self._target_size):
+            try:
+                logger.debug(
+                    f"Connecting {self._name} connection {i + 1}/{self._target_size}..."
+                )
+                client = self._factory()
+                client.connect()
+            except Exception as e:
+                logger.error(f"Failed to create {self._name} connection {i + 1}: {e}")
+                continue
+            with self._cond:
+                self._all.append(client)
+                self._idle.append(client)
+                self._cond.notify()
+
+        if self._all:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.size, thread_name_prefix=self._name
+            )
+            self._background_executor = ThreadPoolExecutor(
+                max_workers=self.background_slots,
+                thread_name_prefix=f"{self._name}-bg",
+            )
+        logger.info(
+            f"IMAP connection pool initialized with {self.size} connections "
+            f"({self._reserved} reserved for interactive requests)"
+        )
+        return self.size
+
+    def close(self) -> None:
+        """Shut down worker threads and log out every connection."""
+        with self._cond:
+            self._closed = True
+            clients = list(self._all)
+            self._all.clear()
+            self._idle.clear()
+            self._cond.notify_all()
+
+        for executor in (self._executor, self._background_executor):
+            if executor:
+                executor.shutdown(wait=False)
+        self._executor = None
+        self._background_executor = None
+
+        for client in clients:
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+        logger.info("IMAP connection pool shutdown")
+
+    def _pick(self, folder: Optional[str]) -> Optional[ImapClient]:
+        if folder is not None:
+            for client in self._idle:
+                if client.current_folder == folder:
+                    self._idle.remove(client)
+                    self._metrics.folder_hits += 1
+                    return client
+        # Least recently released first, so connections stay evenly warm
+        return self._idle.pop(0)
+
+    @contextmanager
+    def lease(
+        self,
+        folder: Optional[str] = None,
+        timeout: float = 60.0,
+        background: bool = False,
+    ) -> Iterator[ImapClient]:
+        """Lease a connection exclusively, preferring one with ``folder`` selected.
+
+        Raises:
+            PoolTimeout: If no connection became available within ``timeout``
+        """
+        keep_free = self._reserved if background else 0
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with self._cond:
+            while not self._closed and (
+                not self._idle or len(self._idle) <= min(keep_free, self.size - 1)
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics.timeouts += 1
+                    raise PoolTimeout(
+                        f"No IMAP connection available after {timeout:.0f}s"
+                    )
+                self._cond.wait(remaining)
+            if self._closed:
+                raise PoolTimeout("IMAP connection pool is closed")
+
+            client = self._pick(folder)
+            waited = time.monotonic() - started
+            self._metrics.leases += 1
+            self._metrics.wait_seconds_total += waited
+            self._metrics.wait_seconds_max = max(self._metrics.wait_seconds_max, waited)
+            reconnects_before = client.reconnects
+
+        try:
+            yield client
+        finally:
+            with self._cond:
+                self._metrics.reconnects += client.reconnects - reconnects_before
+                if not self._closed:
+                    self._idle.append(client)
+                    self._cond.notify()
+
+    def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        folder: Optional[str] = None,
+        timeout: float = 60.0,
+        background: bool = False,
+    ) -> Any:
+        """Run ``fn(client, *args)`` on a leased connection in the calling thread."""
+        with self.lease(folder, timeout=timeout, background=background) as client:
+            return fn(client, *args)
+
+    async def run_async(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        folder: Optional[str] = None,
+        timeout: float = 60.0,
+        background: bool = False,
+    ) -> Any:
+        """Run ``fn(client, *args)`` on a pool worker thread, off the event loop."""
+        executor = self._background_executor if background else self._executor
+        if executor is None:
+            raise PoolTimeout("IMAP connection pool is not started")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor,
+            functools.partial(
+                self.run,
+                fn,
+                *args,
+                folder=folder,
+                timeout=timeout,
+                background=background,
+            ),
+        )
+
+    def metrics(self) -> dict[str, Any]:
+        with self._cond:
+            data = self._metrics.snapshot()
+            data.update(
+                size=self.size,
+                idle=len(self._idle),
+                in_use=self.size - len(self._idle),
+                reserved=self._reserved,
+            )
+        return data
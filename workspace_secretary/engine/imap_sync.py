@@ -1,12 +1,15 @@
 """IMAP client implementation."""
 
+import base64
+import binascii
 import email
 import logging
+import quopri
 import re
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from email.message import Message
-from typing import Dict, List, Optional, Tuple, Union, Any, cast
+from typing import Callable, Dict, List, Optional, Tuple, Union, Any, cast
 
 import imapclient
 
@@ -42,6 +45,285 @@ class MarkResult:
     uids_not_modified: Optional[List[int]] = None  # UIDs that weren't modified (race)
 
 
+def parse_uid_set(value: Any) -> List[int]:
+    """Expand an IMAP UID set (e.g. ``b"41,43:45"`` or ``41``) into UIDs."""
+    if value is None:
+        return []
+    if isinstance(value, int):
+        return [value]
+    if isinstance(value, bytes):
+        value = value.decode("ascii", errors="ignore")
+
+    uids: List[int] = []
+    for part in str(value).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if ":" in part:
+            start_s, end_s = part.split(":", 1)
+            if not (start_s.isdigit() and end_s.isdigit()):
+                continue
+            start, end = sorted((int(start_s), int(end_s)))
+            uids.extend(range(start, end + 1))
+        elif part.isdigit():
+            uids.append(int(part))
+    return uids
+
+
+def parse_vanished_response(response: Tuple[Any, ...]) -> List[int]:
+    """Extract UIDs from a parsed ``VANISHED`` untagged response (RFC 7162).
+
+    Handles both ``(b"VANISHED", b"41,43:45")`` and the
+    ``(b"VANISHED", (b"EARLIER",), b"1:3")`` form.
+    """
+    if not response or response[0] != b"VANISHED":
+        return []
+    uids: List[int] = []
+    for item in response[1:]:
+        if isinstance(item, tuple):
+            continue  # (EARLIER) tag
+        uids.extend(parse_uid_set(item))
+    return uids
+
+
+# Keep UID STORE/MOVE command lines well under common server limits (~8 KB)
+UID_SET_MAX_LEN = 4000
+
+
+def format_uid_set(uids: List[int]) -> str:
+    """Compress UIDs into an IMAP sequence set, e.g. ``[1, 5, 9, 10, 11]`` -> ``"1,5,9:11"``."""
+    ranges: List[str] = []
+    ordered = sorted(set(uids))
+    i = 0
+    while i < len(ordered):
+        start = end = ordered[i]
+        while i + 1 < len(ordered) and ordered[i + 1] == end + 1:
+            i += 1
+            end = ordered[i]
+        ranges.append(str(start) if start == end else f"{start}:{end}")
+        i += 1
+    return ",".join(ranges)
+
+
+def uid_set_chunks(uids: List[int], max_len: int = UID_SET_MAX_LEN) -> List[str]:
+    """Split UIDs into as few IMAP sequence sets as fit in ``max_len`` characters."""
+    chunks: List[str] = []
+    current = ""
+    for part in format_uid_set(uids).split(","):
+        if not part:
+            continue
+        if current and len(current) + 1 + len(part) > max_len:
+            chunks.append(current)
+            current = part
+        else:
+            current = f"{current},{part}" if current else part
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# imapclient has no public API for SELECT parameters (RFC 4466), so
+# select_with_parameters drives its internals. They are unchanged across
+# these major versions; anything else falls back to a plain SELECT.
+SELECT_PARAMETERS_IMAPCLIENT_MAJORS = (2, 3, 4)
+_SELECT_PARAMETERS_INTERNALS = (
+    "_imap",
+    "_normalise_folder",
+    "_checkok",
+    "_process_select_response",
+)
+
+
+def supports_select_parameters(client: Any) -> bool:
+    """Whether select_with_parameters can drive this imapclient connection."""
+    try:
+        major = int(imapclient.__version__.split(".")[0])
+    except (AttributeError, ValueError):
+        return False
+    if major not in SELECT_PARAMETERS_IMAPCLIENT_MAJORS:
+        return False
+    return all(hasattr(client, name) for name in _SELECT_PARAMETERS_INTERNALS) and (
+        hasattr(client._imap, "_simple_command")
+    )
+
+
+def select_with_parameters(
+    client: Any, folder: str, parameters: bytes, readonly: bool = True
+) -> Dict[bytes, Any]:
+    """SELECT (or EXAMINE) ``folder`` with a select parameter list.
+
+    Args:
+        client: Connected imapclient.IMAPClient
+        folder: Folder to select
+        parameters: Parenthesised parameter list, e.g. ``b"(QRESYNC (7 850))"``
+        readonly: If True, use EXAMINE instead of SELECT
+
+    Returns:
+        The untagged responses in imapclient's select_folder shape; keys it
+        does not know (VANISHED, FETCH) are passed through as raw lines
+
+    Raises:
+        NotImplementedError: If the installed imapclient is not supported
+        imapclient.IMAPClient.Error: If the server rejects the command
+    """
+    if not supports_select_parameters(client):
+        raise NotImplementedError(
+            f"SELECT parameters are not supported with imapclient "
+            f"{getattr(imapclient, '__version__', '?')}"
+        )
+    imap = client._imap
+    command = "EXAMINE" if readonly else "SELECT"
+    imap.untagged_responses = {}
+    typ, data = imap._simple_command(
+        command, client._normalise_folder(folder), parameters
+    )
+    client._checkok(command.lower(), typ, data)
+    imap.state = "SELECTED"
+    imap.is_readonly = readonly
+    return client._process_select_response(imap.untagged_responses)
+
+
+@dataclass
+class BodyPart:
+    """Leaf MIME part described by a BODYSTRUCTURE response."""
+
+    part: str  # IMAP part specifier, e.g. "1" or "2.1"
+    content_type: str  # lowercase "maintype/subtype"
+    charset: str
+    encoding: str  # lowercase Content-Transfer-Encoding
+    filename: Optional[str] = None
+    is_attachment: bool = False
+
+
+def _bs_str(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value) if value is not None else ""
+
+
+def _bs_params(value: Any) -> Dict[str, str]:
+    """Turn a BODYSTRUCTURE ``("KEY" "value" ...)`` list into a dict."""
+    if not isinstance(value, (list, tuple)):
+        return {}
+    items = list(value)
+    return {
+        _bs_str(items[i]).lower(): _bs_str(items[i + 1])
+        for i in range(0, len(items) - 1, 2)
+    }
+
+
+def walk_bodystructure(structure: Any, prefix: str = "") -> List[BodyPart]:
+    """Flatten a parsed BODYSTRUCTURE into its leaf parts.
+
+    Nested ``message/rfc822`` parts are reported as a single attachment and
+    not descended into.
+    """
+    if not structure:
+        return []
+
+    if isinstance(structure[0], list):
+        parts: List[BodyPart] = []
+        for index, child in enumerate(structure[0], start=1):
+            parts.extend(walk_bodystructure(child, f"{prefix}{index}."))
+        return parts
+
+    maintype = _bs_str(structure[0]).lower()
+    subtype = _bs_str(structure[1]).lower()
+    params = _bs_params(structure[2]) if len(structure) > 2 else {}
+    encoding = _bs_str(structure[5]).lower() if len(structure) > 5 else ""
+
+    disposition = ""
+    disposition_params: Dict[str, str] = {}
+    for ext in structure[7:]:
+        if (
+            isinstance(ext, tuple)
+            and len(ext) == 2
+            and isinstance(ext[0], bytes)
+            and ext[0].lower() in (b"attachment", b"inline")
+        ):
+            disposition = ext[0].decode().lower()
+            disposition_params = _bs_params(ext[1])
+            break
+
+    filename = disposition_params.get("filename") or params.get("name") or None
+    is_attachment = disposition == "attachment" or maintype != "text"
+
+    return [
+        BodyPart(
+            part=prefix.rstrip(".") or "1",
+            content_type=f"{maintype}/{subtype}",
+            charset=params.get("charset", "utf-8") or "utf-8",
+            encoding=encoding,
+            filename=filename,
+            is_attachment=is_attachment,
+        )
+    ]
+
+
+@dataclass
+class AttachmentPart:
+    """Decoded attachment payload together with its IMAP part specifier."""
+
+    part: str
+    filename: Optional[str]
+    content_type: str
+    data: bytes
+
+
+def decode_transfer_encoding(data: bytes, encoding: str) -> bytes:
+    """Undo a Content-Transfer-Encoding on a raw ``BODY[part]`` payload."""
+    if encoding == "base64":
+        try:
+            return base64.b64decode(data)
+        except (binascii.Error, ValueError):
+            return data
+    if encoding == "quoted-printable":
+        return quopri.decodestring(data)
+    return data
+
+
+def decode_body_part(data: bytes, encoding: str, charset: str) -> str:
+    """Decode a raw ``BODY[part]`` payload using its transfer encoding."""
+    data = decode_transfer_encoding(data, encoding)
+    try:
+        return data.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        return data.decode("utf-8", errors="replace")
+
+
+def message_attachment_parts(message: Message, prefix: str = "") -> List[AttachmentPart]:
+    """Collect attachments from a parsed message, numbered like BODYSTRUCTURE.
+
+    Uses the same part numbering and attachment rule as walk_bodystructure so
+    blobs stored during sync line up with lazily fetched ``BODY[<part>]``.
+    """
+    if message.is_multipart() and message.get_content_type() != "message/rfc822":
+        parts: List[AttachmentPart] = []
+        for index, child in enumerate(message.get_payload(), start=1):
+            parts.extend(message_attachment_parts(child, f"{prefix}{index}."))
+        return parts
+
+    maintype = message.get_content_maintype()
+    disposition = (message.get_content_disposition() or "").lower()
+    if disposition != "attachment" and maintype == "text":
+        return []
+
+    if message.get_content_type() == "message/rfc822":
+        payload = message.get_payload()
+        data = payload[0].as_bytes() if payload else b""
+    else:
+        data = message.get_payload(decode=True) or b""
+
+    return [
+        AttachmentPart(
+            part=prefix.rstrip(".") or "1",
+            filename=message.get_filename(),
+            content_type=message.get_content_type(),
+            data=data,
+        )
+    ]
+
+
 class ImapClient:
     """IMAP client for interacting with email servers."""
 
@@ -61,6 +343,10 @@ class ImapClient:
             str, Dict[str, Tuple[int, datetime]]
         ] = {}  # Cache for message counts
         self.current_folder: Optional[str] = None  # Store the currently selected folder
+        self._selected_readonly = True  # Whether current_folder was EXAMINEd
+        self.selected_uidvalidity: Optional[int] = None  # UIDVALIDITY of current_folder
+        self.reconnects = 0  # Reconnect-and-retry count, surfaced in pool metrics
+        self.qresync_enabled = False  # Set once ENABLE QRESYNC succeeds
         self.folder_message_counts: Dict[
             str, Dict[str, int]
         ] = {}  # Cache for folder message counts
@@ -104,7 +390,23 @@ class ImapClient:
             logger.info(f"Connected to IMAP server {self.config.host}")
 
             capabilities = self.get_capabilities()
-            if "CONDSTORE" in capabilities:
+            self.qresync_enabled = False
+            if "QRESYNC" in capabilities and not supports_select_parameters(
+                self.client
+            ):
+                logger.info(
+                    "QRESYNC not used: SELECT parameters unsupported with "
+                    f"imapclient {imapclient.__version__}"
+                )
+            elif "QRESYNC" in capabilities:
+                # ENABLE QRESYNC implies CONDSTORE (RFC 7162 section 3.2.3)
+                try:
+                    self.client.enable("QRESYNC")
+                    self.qresync_enabled = True
+                    logger.info("QRESYNC enabled")
+                except Exception as e:
+                    logger.warning(f"Failed to enable QRESYNC: {e}")
+            if "CONDSTORE" in capabilities and not self.qresync_enabled:
                 try:
                     self.client.enable("CONDSTORE")
                     logger.info("CONDSTORE enabled")
@@ -126,6 +428,9 @@ class ImapClient:
             finally:
                 self.client = None
                 self.connected = False
+                self.qresync_enabled = False
+                self.current_folder = None
+                self.selected_uidvalidity = None
                 logger.info("Disconnected from IMAP server")
 
     def ensure_connected(self) -> None:
@@ -180,6 +485,7 @@ class ImapClient:
             if not self._is_retryable_error(error):
                 raise
             logger.warning(f"IMAP {operation} failed, reconnecting and retrying")
+            self.reconnects += 1
             self.disconnect()
             self.connect()
             return fn()
@@ -223,7 +529,7 @@ class ImapClient:
 
         def _fetch_modseq() -> Optional[int]:
             client = self._get_client()
-            self.select_folder(folder, readonly=True)
+            self.ensure_selected(folder, readonly=True)
             result = client.fetch([uid], ["MODSEQ"])
             if uid in result:
                 modseq_raw = result[uid].get(b"MODSEQ")
@@ -269,7 +575,7 @@ class ImapClient:
 
         def _do_store() -> MarkResult:
             client = self._get_client()
-            self.select_folder(folder)
+            self.ensure_selected(folder)
 
             # Build the STORE command with UNCHANGEDSINCE modifier
             # Format: UID STORE <uid> (UNCHANGEDSINCE <modseq>) +FLAGS.SILENT (<flag>)
@@ -487,8 +793,12 @@ class ImapClient:
             return client.select_folder(folder, readonly=readonly)
 
         try:
+            self.current_folder = None
+            self.selected_uidvalidity = None
             result = self._run_with_reconnect("select_folder", _select)
             self.current_folder = folder
+            self._selected_readonly = readonly
+            self.selected_uidvalidity = result.get(b"UIDVALIDITY")
             logger.debug(f"Selected folder '{folder}'")
 
             folder_info: Dict[str, Any] = {
@@ -505,6 +815,21 @@ class ImapClient:
             logger.error(f"Error selecting folder {folder}: {e}")
             raise ConnectionError(f"Failed to select folder {folder}: {e}")
 
+    def ensure_selected(self, folder: str, readonly: bool = False) -> None:
+        """SELECT ``folder`` unless this connection already has it selected.
+
+        A read-write selection satisfies read-only callers; a read-only
+        (EXAMINE) selection is upgraded when a write is needed. Callers that
+        need fresh EXISTS/UIDNEXT/HIGHESTMODSEQ values use select_folder.
+        """
+        if (
+            self.connected
+            and self.current_folder == folder
+            and (readonly or not self._selected_readonly)
+        ):
+            return
+        self.select_folder(folder, readonly=readonly)
+
     def search(
         self,
         criteria: Union[str, List, Tuple, Dict[str, Any]],
@@ -635,6 +960,7 @@ class ImapClient:
         uids: List[int],
         folder: str = "INBOX",
         limit: Optional[int] = None,
+        on_attachment: Optional[Callable[[int, AttachmentPart], None]] = None,
     ) -> Dict[int, Email]:
         """Fetch multiple emails by UIDs.
 
@@ -642,6 +968,8 @@ class ImapClient:
             uids: List of email UIDs
             folder: Folder to fetch from
             limit: Maximum number of emails to fetch
+            on_attachment: Optional callback receiving ``(uid, AttachmentPart)``
+                for every attachment, e.g. to fill the attachment store
 
         Returns:
             Dictionary mapping UIDs to Email objects
@@ -650,7 +978,7 @@ class ImapClient:
             ConnectionError: If not connected and connection fails
         """
         client = self._get_client()
-        self.select_folder(folder, readonly=True)
+        self.ensure_selected(folder, readonly=True)
 
         if limit is not None and limit > 0:
             uids = uids[:limit]
@@ -680,50 +1008,11 @@ class ImapClient:
             raw_message = message_data.get(b"BODY[]") or message_data.get(
                 b"BODY.PEEK[]"
             )
-            flags = message_data.get(b"FLAGS", [])
 
             if not raw_message:
                 logger.warning(f"No body found for message {uid}")
                 continue
 
-            gmail_thread_id = None
-            gmail_labels = None
-            gmail_msgid = None
-            if is_gmail:
-                gmail_thread_id_raw = message_data.get(b"X-GM-THRID")
-                if isinstance(gmail_thread_id_raw, bytes):
-                    gmail_thread_id = int(gmail_thread_id_raw.decode("utf-8"))
-                elif gmail_thread_id_raw is not None:
-                    gmail_thread_id = int(gmail_thread_id_raw)
-
-                gmail_labels_raw = message_data.get(b"X-GM-LABELS")
-                if gmail_labels_raw and isinstance(gmail_labels_raw, (list, tuple)):
-                    gmail_labels = [
-                        label.decode("utf-8")
-                        if isinstance(label, bytes)
-                        else str(label)
-                        for label in gmail_labels_raw
-                    ]
-
-                gmail_msgid_raw = message_data.get(b"X-GM-MSGID")
-                if gmail_msgid_raw is not None:
-                    gmail_msgid = int(gmail_msgid_raw)
-
-            modseq = 0
-            if has_condstore:
-                modseq_raw = message_data.get(b"MODSEQ")
-                if modseq_raw and isinstance(modseq_raw, tuple) and len(modseq_raw) > 0:
-                    modseq = int(modseq_raw[0])
-
-            internal_date = message_data.get(b"INTERNALDATE")
-            size = message_data.get(b"RFC822.SIZE", 0)
-
-            str_flags = []
-            if flags and isinstance(flags, (list, tuple)):
-                str_flags = [
-                    f.decode("utf-8") if isinstance(f, bytes) else str(f) for f in flags
-                ]
-
             if not isinstance(raw_message, bytes):
                 logger.warning(f"Message data for {uid} is not bytes")
                 continue
@@ -734,25 +1023,256 @@ class ImapClient:
                 message
             )
 
-            email_obj = Email.from_message(
-                message,
-                uid=uid,
-                folder=folder,
-                gmail_thread_id=str(gmail_thread_id) if gmail_thread_id else None,
-                gmail_labels=gmail_labels,
+            email_obj = self._build_email(
+                uid, message, message_data, folder, is_gmail, has_condstore
             )
-            email_obj.flags = str_flags
-            email_obj.modseq = modseq
-            email_obj.gmail_msgid = gmail_msgid
-            email_obj.internal_date = internal_date
-            email_obj.size = size
             email_obj.has_attachments = has_attachments
             email_obj.attachment_filenames = attachment_filenames
 
+            if on_attachment and has_attachments:
+                for attachment in message_attachment_parts(message):
+                    on_attachment(uid, attachment)
+
+            emails[uid] = email_obj
+
+        return emails
+
+    def fetch_email_headers(
+        self,
+        uids: List[int],
+        folder: str = "INBOX",
+        preview_bytes: int = 2048,
+    ) -> Dict[int, Email]:
+        """Fetch headers, BODYSTRUCTURE and a bounded text preview.
+
+        Header-first counterpart of fetch_emails: attachments and the rest of
+        the body are never downloaded. ``content.text`` holds at most
+        ``preview_bytes`` of the message text; attachment info comes from
+        BODYSTRUCTURE.
+
+        Args:
+            uids: List of email UIDs
+            folder: Folder to fetch from
+            preview_bytes: Size of the ``BODY.PEEK[TEXT]`` prefix to fetch
+
+        Returns:
+            Dictionary mapping UIDs to Email objects
+        """
+        client = self._get_client()
+        self.ensure_selected(folder, readonly=True)
+
+        if not uids:
+            return {}
+
+        fetch_attributes = [
+            "BODY.PEEK[HEADER]",
+            "BODYSTRUCTURE",
+            f"BODY.PEEK[TEXT]<0.{preview_bytes}>",
+            "FLAGS",
+            "INTERNALDATE",
+            "RFC822.SIZE",
+        ]
+
+        capabilities = self.get_capabilities()
+        is_gmail = "X-GM-EXT-1" in capabilities
+        has_condstore = "CONDSTORE" in capabilities
+
+        if has_condstore:
+            fetch_attributes.append("MODSEQ")
+
+        if is_gmail:
+            fetch_attributes.extend(["X-GM-THRID", "X-GM-LABELS", "X-GM-MSGID"])
+
+        result: Any = client.fetch(uids, fetch_attributes)
+
+        emails = {}
+        for uid, message_data in result.items():
+            header = message_data.get(b"BODY[HEADER]")
+            if not isinstance(header, bytes):
+                logger.warning(f"No header found for message {uid}")
+                continue
+
+            preview = message_data.get(b"BODY[TEXT]<0>") or b""
+            if not isinstance(preview, bytes):
+                preview = b""
+
+            # Parsing header + prefix lets multipart messages yield a readable
+            # preview from whatever leading text part fits in the prefix.
+            message = email.message_from_bytes(header + preview)
+
+            parts = walk_bodystructure(message_data.get(b"BODYSTRUCTURE"))
+            attachments = [p for p in parts if p.is_attachment]
+
+            email_obj = self._build_email(
+                uid, message, message_data, folder, is_gmail, has_condstore
+            )
+            email_obj.content.text = (email_obj.content.text or "")[:preview_bytes]
+            email_obj.content.html = None
+            email_obj.attachments = []
+            email_obj.has_attachments = bool(attachments)
+            email_obj.attachment_filenames = [
+                p.filename for p in attachments if p.filename
+            ]
+
             emails[uid] = email_obj
 
         return emails
 
+    def fetch_email_bodies(
+        self, uids: List[int], folder: str = "INBOX"
+    ) -> Dict[int, Tuple[str, str]]:
+        """Fetch only the text/plain and text/html parts of messages.
+
+        BODYSTRUCTURE is fetched first and walked so attachment parts are
+        skipped; messages with the same part layout are then fetched together
+        with ``BODY.PEEK[<part>]``.
+
+        Returns:
+            Dictionary mapping UIDs to ``(body_text, body_html)``
+        """
+        client = self._get_client()
+        self.ensure_selected(folder, readonly=True)
+
+        if not uids:
+            return {}
+
+        structures: Any = client.fetch(uids, ["BODYSTRUCTURE"])
+
+        layouts: Dict[Tuple[str, ...], List[int]] = {}
+        text_parts: Dict[int, List[BodyPart]] = {}
+        for uid, data in structures.items():
+            parts = [
+                p
+                for p in walk_bodystructure(data.get(b"BODYSTRUCTURE"))
+                if not p.is_attachment
+                and p.content_type in ("text/plain", "text/html")
+            ]
+            text_parts[uid] = parts
+            layouts.setdefault(tuple(p.part for p in parts), []).append(uid)
+
+        bodies: Dict[int, Tuple[str, str]] = {}
+        for part_ids, group in layouts.items():
+            if not part_ids:
+                bodies.update({uid: ("", "") for uid in group})
+                continue
+
+            result: Any = client.fetch(
+                group, [f"BODY.PEEK[{part_id}]" for part_id in part_ids]
+            )
+            for uid, data in result.items():
+                plain: List[str] = []
+                html: List[str] = []
+                for part in text_parts.get(uid, []):
+                    raw = data.get(f"BODY[{part.part}]".encode())
+                    if not isinstance(raw, bytes):
+                        continue
+                    decoded = decode_body_part(raw, part.encoding, part.charset)
+                    if part.content_type == "text/html":
+                        html.append(decoded)
+                    else:
+                        plain.append(decoded)
+                bodies[uid] = ("\n".join(plain), "\n".join(html))
+
+        logger.debug(f"Hydrated {len(bodies)} message bodies from {folder}")
+        return bodies
+
+    def fetch_attachment_part(
+        self, uid: int, folder: str, filename: str
+    ) -> Optional[AttachmentPart]:
+        """Fetch a single attachment by filename without downloading the message.
+
+        BODYSTRUCTURE locates the part, then only ``BODY.PEEK[<part>]`` is
+        fetched and its transfer encoding undone.
+
+        Returns:
+            The decoded attachment, or None if the message or part is missing
+        """
+        client = self._get_client()
+        self.ensure_selected(folder, readonly=True)
+
+        structures: Any = client.fetch([uid], ["BODYSTRUCTURE"])
+        data = structures.get(uid)
+        if not data:
+            return None
+
+        parts = walk_bodystructure(data.get(b"BODYSTRUCTURE"))
+        match = next(
+            (p for p in parts if p.is_attachment and p.filename == filename),
+            None,
+        ) or next((p for p in parts if p.filename == filename), None)
+        if not match:
+            return None
+
+        result: Any = client.fetch([uid], [f"BODY.PEEK[{match.part}]"])
+        raw = result.get(uid, {}).get(f"BODY[{match.part}]".encode())
+        if not isinstance(raw, bytes):
+            return None
+
+        return AttachmentPart(
+            part=match.part,
+            filename=match.filename,
+            content_type=match.content_type,
+            data=decode_transfer_encoding(raw, match.encoding),
+        )
+
+    def _build_email(
+        self,
+        uid: int,
+        message: Message,
+        message_data: Dict[bytes, Any],
+        folder: str,
+        is_gmail: bool,
+        has_condstore: bool,
+    ) -> Email:
+        """Build an Email from a parsed message plus FETCH metadata."""
+        gmail_thread_id = None
+        gmail_labels = None
+        gmail_msgid = None
+        if is_gmail:
+            gmail_thread_id_raw = message_data.get(b"X-GM-THRID")
+            if isinstance(gmail_thread_id_raw, bytes):
+                gmail_thread_id = int(gmail_thread_id_raw.decode("utf-8"))
+            elif gmail_thread_id_raw is not None:
+                gmail_thread_id = int(gmail_thread_id_raw)
+
+            gmail_labels_raw = message_data.get(b"X-GM-LABELS")
+            if gmail_labels_raw and isinstance(gmail_labels_raw, (list, tuple)):
+                gmail_labels = [
+                    label.decode("utf-8") if isinstance(label, bytes) else str(label)
+                    for label in gmail_labels_raw
+                ]
+
+            gmail_msgid_raw = message_data.get(b"X-GM-MSGID")
+            if gmail_msgid_raw is not None:
+                gmail_msgid = int(gmail_msgid_raw)
+
+        modseq = 0
+        if has_condstore:
+            modseq_raw = message_data.get(b"MODSEQ")
+            if modseq_raw and isinstance(modseq_raw, tuple) and len(modseq_raw) > 0:
+                modseq = int(modseq_raw[0])
+
+        flags = message_data.get(b"FLAGS", [])
+        str_flags = []
+        if flags and isinstance(flags, (list, tuple)):
+            str_flags = [
+                f.decode("utf-8") if isinstance(f, bytes) else str(f) for f in flags
+            ]
+
+        email_obj = Email.from_message(
+            message,
+            uid=uid,
+            folder=folder,
+            gmail_thread_id=str(gmail_thread_id) if gmail_thread_id else None,
+            gmail_labels=gmail_labels,
+        )
+        email_obj.flags = str_flags
+        email_obj.modseq = modseq
+        email_obj.gmail_msgid = gmail_msgid
+        email_obj.internal_date = message_data.get(b"INTERNALDATE")
+        email_obj.size = message_data.get(b"RFC822.SIZE", 0)
+        return email_obj
+
     def _extract_attachment_info(self, message: Message) -> Tuple[bool, List[str]]:
         """Extract attachment information from a MIME message."""
         has_attachments = False
@@ -1010,7 +1530,7 @@ class ImapClient:
 
         def _mark():
             client = self._get_client()
-            self.select_folder(folder)
+            self.ensure_selected(folder)
             if should_set:
                 client.add_flags([uid], normalized_flag)
                 logger.debug(f"Added flag {normalized_flag} to message {uid}")
@@ -1089,7 +1609,7 @@ class ImapClient:
                 if result.modified:
                     # Race condition - check if flag is already in desired state
                     client = self._get_client()
-                    self.select_folder(folder, readonly=True)
+                    self.ensure_selected(folder, readonly=True)
                     fetch_result = client.fetch([uid], ["FLAGS", "MODSEQ"])
 
                     if uid not in fetch_result:
@@ -1151,7 +1671,7 @@ class ImapClient:
 
         def _mark():
             client = self._get_client()
-            self.select_folder(folder)
+            self.ensure_selected(folder)
             if value:
                 client.add_flags([uid], flag)
             else:
@@ -1164,39 +1684,69 @@ class ImapClient:
             logger.error(f"Failed to mark email: {e}")
             return False
 
+    def _run_uid_set_batch(
+        self,
+        operation: str,
+        uids: List[int],
+        folder: str,
+        command: Callable[[imapclient.IMAPClient, str], Any],
+    ) -> Dict[int, bool]:
+        """Run ``command(client, uid_set)`` once per UID-set chunk of ``uids``.
+
+        Returns a UID -> success map; a failed chunk marks only its own UIDs.
+        """
+        results: Dict[int, bool] = {}
+        if not uids:
+            return results
+
+        for uid_set in uid_set_chunks(uids):
+
+            def _run(uid_set: str = uid_set):
+                client = self._get_client()
+                self.ensure_selected(folder)
+                return command(client, uid_set)
+
+            ok = True
+            try:
+                self._run_with_reconnect(operation, _run)
+            except Exception as e:
+                logger.error(f"{operation} failed for UIDs {uid_set} in {folder}: {e}")
+                ok = False
+            for uid in parse_uid_set(uid_set):
+                results[uid] = ok
+        return results
+
     def mark_email_batch(
         self,
         uids: List[int],
         folder: str,
         flag: str,
         value: bool = True,
-        use_condstore: bool = True,
     ) -> Dict[int, bool]:
-        """Mark multiple emails with flag, with optional CONDSTORE support.
+        """Set or clear a flag on many emails with one UID STORE per UID set.
+
+        Adding or removing a single flag is idempotent, so unlike mark_email no
+        per-message MODSEQ fetch / UNCHANGEDSINCE is needed.
 
         Args:
             uids: List of email UIDs
             folder: Folder containing the emails
-            flag: Flag to set or remove
-            value: True to set, False to remove
-            use_condstore: Whether to use CONDSTORE if available
+            flag: Flag to set or remove (supports "read"/"unread" aliases)
+            value: True to set, False to remove (ignored for aliases)
 
         Returns:
             Dictionary mapping UIDs to success status
         """
-        results = {}
-        for uid in uids:
-            try:
-                results[uid] = self.mark_email(
-                    uid, folder, flag, value, use_condstore=use_condstore
-                )
-            except ModifiedError as e:
-                logger.warning(f"Mark failed for uid {uid} after retries: {e}")
-                results[uid] = False
-            except Exception as e:
-                logger.error(f"Mark failed for uid {uid}: {e}")
-                results[uid] = False
-        return results
+        normalized_flag, should_set = self._normalize_flag(flag)
+        if flag.lower() not in ("read", "unread"):
+            should_set = value
+
+        def _store(client: imapclient.IMAPClient, uid_set: str):
+            if should_set:
+                return client.add_flags(uid_set, normalized_flag, silent=True)
+            return client.remove_flags(uid_set, normalized_flag, silent=True)
+
+        return self._run_uid_set_batch("mark_email_batch", uids, folder, _store)
 
     def move_email(self, uid: int, source_folder: str, target_folder: str) -> bool:
         """Move email to another folder.
@@ -1223,7 +1773,7 @@ class ImapClient:
         def _move():
             client = self._get_client()
             # Select source folder
-            self.select_folder(source_folder)
+            self.ensure_selected(source_folder)
             # Move email (copy + delete)
             client.copy([uid], target_folder)
             client.add_flags([uid], r"\Deleted")
@@ -1237,6 +1787,48 @@ class ImapClient:
             logger.error(f"Failed to move email: {e}")
             return False
 
+    def move_email_batch(
+        self, uids: List[int], source_folder: str, target_folder: str
+    ) -> Dict[int, bool]:
+        """Move many emails with one UID MOVE (RFC 6851) per UID set.
+
+        Falls back to UID COPY + STORE \\Deleted + UID EXPUNGE (or EXPUNGE
+        without UIDPLUS) when the server lacks MOVE.
+
+        Returns:
+            Dictionary mapping UIDs to success status
+
+        Raises:
+            ValueError: If folder is not allowed
+        """
+        if self.allowed_folders is not None:
+            if source_folder not in self.allowed_folders:
+                raise ValueError(f"Source folder '{source_folder}' is not allowed")
+            if target_folder not in self.allowed_folders:
+                raise ValueError(f"Target folder '{target_folder}' is not allowed")
+
+        capabilities = self.get_capabilities()
+        has_move = "MOVE" in capabilities
+        has_uidplus = "UIDPLUS" in capabilities
+
+        def _move(client: imapclient.IMAPClient, uid_set: str):
+            if has_move:
+                return client.move(uid_set, target_folder)
+            client.copy(uid_set, target_folder)
+            client.add_flags(uid_set, r"\Deleted", silent=True)
+            if has_uidplus:
+                return client.uid_expunge(uid_set)
+            return client.expunge()
+
+        results = self._run_uid_set_batch(
+            "move_email_batch", uids, source_folder, _move
+        )
+        logger.debug(
+            f"Moved {sum(results.values())}/{len(results)} messages "
+            f"from {source_folder} to {target_folder}"
+        )
+        return results
+
     def delete_email(self, uid: int, folder: str) -> bool:
         """Delete email.
 
@@ -1253,7 +1845,7 @@ class ImapClient:
 
         def _delete():
             client = self._get_client()
-            self.select_folder(folder)
+            self.ensure_selected(folder)
             client.add_flags([uid], r"\Deleted")
             client.expunge()
             logger.debug(f"Deleted message {uid} from {folder}")
@@ -1283,7 +1875,7 @@ class ImapClient:
 
         def _set_labels():
             client = self._get_client()
-            self.select_folder(folder)
+            self.ensure_selected(folder)
             # X-GM-LABELS requires the server to support X-GM-EXT-1
             client.set_gmail_labels([uid], labels)
             return True
@@ -1312,7 +1904,7 @@ class ImapClient:
 
         def _add_labels():
             client = self._get_client()
-            self.select_folder(folder)
+            self.ensure_selected(folder)
             client.add_gmail_labels([uid], labels)
             return True
 
@@ -1340,7 +1932,7 @@ class ImapClient:
 
         def _remove_labels():
             client = self._get_client()
-            self.select_folder(folder)
+            self.ensure_selected(folder)
             client.remove_gmail_labels([uid], labels)
             return True
 
@@ -1350,6 +1942,39 @@ class ImapClient:
             logger.error(f"Failed to remove Gmail labels: {e}")
             return False
 
+    def modify_gmail_labels_batch(
+        self, uids: List[int], folder: str, labels: List[str], action: str = "add"
+    ) -> Dict[int, bool]:
+        """Add, remove or set Gmail labels with one UID STORE X-GM-LABELS per UID set.
+
+        Args:
+            uids: List of email UIDs
+            folder: Folder containing the emails
+            labels: Labels to apply
+            action: "add", "remove" or "set"
+
+        Returns:
+            Dictionary mapping UIDs to success status
+        """
+        if action not in ("add", "remove", "set"):
+            raise ValueError(f"Invalid label action: {action}")
+
+        capabilities = self.get_capabilities()
+        if "X-GM-EXT-1" not in capabilities:
+            logger.warning("Gmail extensions not supported by server")
+            return {uid: False for uid in uids}
+
+        def _store(client: imapclient.IMAPClient, uid_set: str):
+            if action == "add":
+                return client.add_gmail_labels(uid_set, labels, silent=True)
+            if action == "remove":
+                return client.remove_gmail_labels(uid_set, labels, silent=True)
+            return client.set_gmail_labels(uid_set, labels, silent=True)
+
+        return self._run_uid_set_batch(
+            "modify_gmail_labels_batch", uids, folder, _store
+        )
+
     def has_sort_capability(self) -> bool:
         """Check if server supports SORT extension (RFC 5256)."""
         capabilities = self.get_capabilities()
@@ -1365,6 +1990,10 @@ class ImapClient:
         capabilities = self.get_capabilities()
         return "CONDSTORE" in capabilities
 
+    def has_qresync_capability(self) -> bool:
+        """Check if QRESYNC (RFC 7162) is enabled on this connection."""
+        return self.qresync_enabled
+
     def has_idle_capability(self) -> bool:
         """Check if server supports IDLE extension (RFC 2177)."""
         capabilities = self.get_capabilities()
@@ -1681,6 +2310,38 @@ class ImapClient:
                 raise ValueError(f"Folder '{folder}' is not allowed")
             return 0
 
+    def get_folder_status(self, folder: str) -> Dict[str, int]:
+        """STATUS a folder without selecting it.
+
+        Args:
+            folder: Folder name
+
+        Returns:
+            Dictionary with messages, uidnext, uidvalidity and highestmodseq
+            (0 unless the server supports CONDSTORE)
+
+        Raises:
+            ValueError: If folder is not allowed
+            ConnectionError: If connection error occurs
+        """
+        if not self._is_folder_allowed(folder):
+            raise ValueError(f"Folder '{folder}' is not allowed")
+
+        items = [b"MESSAGES", b"UIDNEXT", b"UIDVALIDITY"]
+        if self.has_condstore_capability():
+            items.append(b"HIGHESTMODSEQ")
+
+        def _status():
+            return self._get_client().folder_status(folder, items)
+
+        result = self._run_with_reconnect("folder_status", _status)
+        return {
+            "messages": result.get(b"MESSAGES", 0),
+            "uidnext": result.get(b"UIDNEXT", 0),
+            "uidvalidity": result.get(b"UIDVALIDITY", 0),
+            "highestmodseq": result.get(b"HIGHESTMODSEQ", 0),
+        }
+
     def get_unread_messages(
         self,
         folder: str = "INBOX",
@@ -1813,35 +2474,7 @@ class ImapClient:
                 "1:*", fetch_attrs, modifiers=[f"CHANGEDSINCE {modseq}"]
             )
 
-            changed: Dict[int, Dict[str, Any]] = {}
-            for uid, data in result.items():
-                flags_raw = data.get(b"FLAGS", [])
-                flags = [
-                    f.decode("utf-8") if isinstance(f, bytes) else str(f)
-                    for f in flags_raw
-                ]
-
-                msg_modseq = 0
-                modseq_raw = data.get(b"MODSEQ")
-                if modseq_raw and isinstance(modseq_raw, tuple) and len(modseq_raw) > 0:
-                    msg_modseq = int(modseq_raw[0])
-
-                gmail_labels = None
-                if self._has_gmail_extensions():
-                    labels_raw = data.get(b"X-GM-LABELS")
-                    if labels_raw and isinstance(labels_raw, (list, tuple)):
-                        gmail_labels = [
-                            label.decode("utf-8")
-                            if isinstance(label, bytes)
-                            else str(label)
-                            for label in labels_raw
-                        ]
-
-                changed[uid] = {
-                    "flags": flags,
-                    "modseq": msg_modseq,
-                    "gmail_labels": gmail_labels,
-                }
+            changed = self._parse_flag_changes(result)
 
             logger.debug(
                 f"CHANGEDSINCE {modseq} returned {len(changed)} changed messages"
@@ -1851,6 +2484,131 @@ class ImapClient:
             logger.error(f"fetch_changed_since failed: {e}")
             raise
 
+    def _parse_flag_changes(self, result: Any) -> Dict[int, Dict[str, Any]]:
+        """Convert FLAGS/MODSEQ/X-GM-LABELS FETCH data into change records."""
+        has_gmail = self._has_gmail_extensions()
+        changed: Dict[int, Dict[str, Any]] = {}
+        for uid, data in result.items():
+            flags_raw = data.get(b"FLAGS", [])
+            flags = [
+                f.decode("utf-8") if isinstance(f, bytes) else str(f)
+                for f in flags_raw
+            ]
+
+            msg_modseq = 0
+            modseq_raw = data.get(b"MODSEQ")
+            if modseq_raw and isinstance(modseq_raw, tuple) and len(modseq_raw) > 0:
+                msg_modseq = int(modseq_raw[0])
+
+            gmail_labels = None
+            if has_gmail:
+                labels_raw = data.get(b"X-GM-LABELS")
+                if labels_raw and isinstance(labels_raw, (list, tuple)):
+                    gmail_labels = [
+                        label.decode("utf-8")
+                        if isinstance(label, bytes)
+                        else str(label)
+                        for label in labels_raw
+                    ]
+
+            changed[uid] = {
+                "flags": flags,
+                "modseq": msg_modseq,
+                "gmail_labels": gmail_labels,
+            }
+        return changed
+
+    def select_folder_qresync(
+        self,
+        folder: str,
+        uidvalidity: int,
+        modseq: int,
+        known_uids: Optional[str] = None,
+        readonly: bool = True,
+    ) -> Dict[str, Any]:
+        """SELECT a folder with the QRESYNC parameter (RFC 7162 section 3.2.5).
+
+        The server answers the SELECT with ``VANISHED (EARLIER)`` for UIDs
+        expunged since ``modseq`` and untagged FETCH responses for messages
+        whose flags changed, so a resync costs one round trip and no
+        ``SEARCH ALL`` comparison.
+
+        Args:
+            folder: Folder to select
+            uidvalidity: UIDVALIDITY stored from the last sync
+            modseq: HIGHESTMODSEQ stored from the last sync
+            known_uids: Optional IMAP UID set the client has cached
+            readonly: If True, use EXAMINE instead of SELECT
+
+        Returns:
+            Folder info as returned by select_folder, plus:
+            - vanished: UIDs expunged since ``modseq``
+            - changed: UID -> {flags, modseq, gmail_labels} (fetch_changed_since shape)
+
+        Raises:
+            ValueError: If QRESYNC is not enabled or folder is not allowed
+            ConnectionError: If the SELECT fails
+        """
+        if not self.has_qresync_capability():
+            raise ValueError("QRESYNC is not enabled on this connection")
+        if not self._is_folder_allowed(folder):
+            raise ValueError(f"Folder '{folder}' is not allowed")
+
+        qresync_args = f"{uidvalidity} {modseq}"
+        if known_uids:
+            qresync_args += f" {known_uids}"
+
+        def _select():
+            return select_with_parameters(
+                self._get_client(),
+                folder,
+                f"(QRESYNC ({qresync_args}))".encode(),
+                readonly,
+            )
+
+        try:
+            result = self._run_with_reconnect("select_folder_qresync", _select)
+        except (imapclient.IMAPClient.Error, ConnectionError) as e:
+            self.current_folder = None
+            logger.error(f"Error selecting folder {folder} with QRESYNC: {e}")
+            raise ConnectionError(f"Failed to select folder {folder}: {e}")
+
+        self.current_folder = folder
+        self._selected_readonly = readonly
+        self.selected_uidvalidity = result.get(b"UIDVALIDITY")
+
+        vanished: List[int] = []
+        for line in result.get(b"VANISHED", []):
+            if isinstance(line, bytes):
+                line = line.replace(b"(EARLIER)", b"").strip()
+            vanished.extend(parse_uid_set(line))
+
+        changed: Dict[int, Dict[str, Any]] = {}
+        fetch_lines = result.get(b"FETCH", [])
+        if fetch_lines:
+            from imapclient.response_parser import parse_fetch_response
+
+            changed = self._parse_flag_changes(
+                parse_fetch_response(fetch_lines, uid_is_key=True)
+            )
+
+        logger.debug(
+            f"QRESYNC select of {folder}: {len(vanished)} vanished, "
+            f"{len(changed)} changed since modseq {modseq}"
+        )
+
+        return {
+            "exists": result.get(b"EXISTS", 0),
+            "recent": result.get(b"RECENT", 0),
+            "uidvalidity": result.get(b"UIDVALIDITY"),
+            "uidnext": result.get(b"UIDNEXT"),
+            "highestmodseq": result.get(b"HIGHESTMODSEQ", 0),
+            "flags": result.get(b"FLAGS", []),
+            "permanentflags": result.get(b"PERMANENTFLAGS", []),
+            "vanished": vanished,
+            "changed": changed,
+        }
+
     def idle_start(self) -> None:
         """Start IDLE mode for push-based notifications.
 
@@ -1885,14 +2643,80 @@ class ImapClient:
         logger.debug(f"IDLE check returned {len(responses)} responses")
         return responses
 
-    def idle_done(self) -> None:
+    def idle_done(self) -> List[Tuple[Any, ...]]:
         """Exit IDLE mode.
 
         Must be called after idle_start() before issuing any other IMAP commands.
+
+        Returns:
+            Responses the server sent after the last idle_check()
         """
         client = self._get_client()
-        client.idle_done()
+        _, responses = client.idle_done()
         logger.debug("IDLE mode ended")
+        return list(responses)
+
+    def search_uids_from(self, folder: str, since_uid: int) -> List[int]:
+        """UIDs at or above ``since_uid`` (e.g. a stored UIDNEXT), ascending.
+
+        ``UID n:*`` always matches the highest UID even when it is below
+        ``n``, so the result is filtered. Reuses the current selection.
+        """
+        client = self._get_client()
+        self.ensure_selected(folder, readonly=True)
+        uids = client.search(["UID", f"{since_uid}:*"])
+        return sorted(uid for uid in uids if uid >= since_uid)
+
+    def resolve_idle_fetches(
+        self,
+        by_uid: Dict[int, Dict[bytes, Any]],
+        sequences: List[int],
+    ) -> Dict[int, Dict[str, Any]]:
+        """Turn unsolicited FETCH responses from IDLE into flag change records.
+
+        Responses that carry a UID and FLAGS are used as they are. Those with a
+        UID but no FLAGS (a MODSEQ- or label-only update) are re-fetched by
+        UID, since an empty flag list would clear \\Seen. The rest are
+        re-fetched by sequence number, so this must run on the connection that
+        received them, with the folder still selected and no EXPUNGE seen since.
+
+        Args:
+            by_uid: FETCH data items keyed by UID
+            sequences: Sequence numbers of FETCH responses without a UID
+
+        Returns:
+            UID -> {flags, modseq, gmail_labels} (fetch_changed_since shape)
+        """
+        complete = {uid: data for uid, data in by_uid.items() if b"FLAGS" in data}
+        partial = sorted(uid for uid in by_uid if uid not in complete)
+        changed = self._parse_flag_changes(complete) if complete else {}
+        if not partial and not sequences:
+            return changed
+
+        fetch_attrs = ["UID", "FLAGS"]
+        if self.has_condstore_capability():
+            fetch_attrs.append("MODSEQ")
+        if self._has_gmail_extensions():
+            fetch_attrs.append("X-GM-LABELS")
+
+        client = self._get_client()
+        if partial:
+            changed.update(self._parse_flag_changes(client.fetch(partial, fetch_attrs)))
+        if not sequences:
+            return changed
+
+        client.use_uid = False
+        try:
+            result = client.fetch(sorted(set(sequences)), fetch_attrs)
+        finally:
+            client.use_uid = True
+
+        changed.update(
+            self._parse_flag_changes(
+                {data[b"UID"]: data for data in result.values() if b"UID" in data}
+            )
+        )
+        return changed
 
     def gmail_raw_search(self, query: str, folder: str = "INBOX") -> List[int]:
         """Search using Gmail's X-GM-RAW query syntax.
@@ -0,0 +1,206 @@
+"""
+Process-wide cache of search-query embeddings.
+
+Semantic and hybrid search embed the query string on every request, although
+users repeat the same searches ("invoices from last month") constantly. This
+cache sits in front of ``embed_query`` for the web UI, the MCP server and the
+assistant:
+
+- an in-process LRU, bounded by ``max_entries`` and expiring after ``ttl_seconds``
+- an optional Postgres tier (``query_embeddings`` table) shared by every
+  process using the same database
+
+Entries are keyed by (provider, model, dimensions, normalized query), so
+switching models or providers never returns a vector from another space.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from workspace_secretary.engine.embeddings import (
+    CohereEmbeddingsClient,
+    EmbeddingResult,
+    FallbackEmbeddingsClient,
+    GeminiEmbeddingsClient,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query."""
+    return " ".join(query.split()).casefold()
+
+
+def embedder_identity(client: Any) -> tuple[str, str, int]:
+    """(provider, model, dimensions) of the client that answers queries.
+
+    A failover client is identified by its primary; vectors served by the
+    fallback provider are returned but not cached under that key.
+    """
+    if isinstance(client, FallbackEmbeddingsClient):
+        client = client.clients[0]
+    if isinstance(client, CohereEmbeddingsClient):
+        provider = "cohere"
+    elif isinstance(client, GeminiEmbeddingsClient):
+        provider = "gemini"
+    else:
+        provider = "openai_compat"
+    return provider, client.model, client.dimensions
+
+
+def query_cache_key(provider: str, model: str, dimensions: int, query: str) -> str:
+    raw = f"{provider}\0{model}\0{dimensions}\0{normalize_query(query)}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU of query embeddings with an optional Postgres tier."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 86400,
+        database: Any = None,
+    ):
+        """
+        Args:
+            max_entries: In-process entries kept before evicting the least recent
+            ttl_seconds: Age after which an entry is embedded again
+            database: Database for the shared tier (anything exposing
+                ``connection()``); None keeps the cache in-process only
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.database = database
+        self._entries: OrderedDict[str, tuple[float, list[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def _get_local(self, key: str) -> Optional[list[float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, embedding = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return embedding
+
+    def _put_local(self, key: str, embedding: list[float]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[list[float]]:
+        embedding = self._get_local(key)
+        if embedding is not None:
+            self.hits += 1
+            return embedding
+
+        if self.database is not None:
+            from workspace_secretary.db.queries import embeddings as emb_q
+
+            try:
+                embedding = emb_q.get_query_embedding(
+                    self.database, key, self.ttl_seconds
+                )
+            except Exception as e:
+                logger.debug(f"Shared query embedding lookup failed: {e}")
+                embedding = None
+            if embedding is not None:
+                self.shared_hits += 1
+                self._put_local(key, embedding)
+                return embedding
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, embedding: list[float], model: str) -> None:
+        self._put_local(key, embedding)
+        if self.database is not None:
+            from workspace_secretary.db.queries import embeddings as emb_q
+
+            try:
+                emb_q.store_query_embedding(self.database, key, embedding, model)
+            except Exception as e:
+                logger.debug(f"Shared query embedding store failed: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "size": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "shared": self.database is not None,
+        }
+
+
+_cache = QueryEmbeddingCache()
+
+
+def get_query_cache() -> QueryEmbeddingCache:
+    return _cache
+
+
+def configure_query_cache(config: Any, database: Any = None) -> QueryEmbeddingCache:
+    """Apply ``EmbeddingsConfig`` cache settings to the process-wide cache.
+
+    The Postgres tier is only used when ``query_cache_shared`` is enabled.
+    """
+    _cache.max_entries = getattr(config, "query_cache_size", _cache.max_entries)
+    _cache.ttl_seconds = getattr(config, "query_cache_ttl", _cache.ttl_seconds)
+    _cache.database = database if getattr(config, "query_cache_shared", False) else None
+    return _cache
+
+
+async def embed_query_cached(
+    client: Any, query: str, cache: Optional[QueryEmbeddingCache] = None
+) -> EmbeddingResult:
+    """``client.embed_query(query)`` answered from the cache when possible."""
+    cache = cache or _cache
+    provider, model, dimensions = embedder_identity(client)
+    key = query_cache_key(provider, model, dimensions, query)
+
+    if cache.database is not None:
+        embedding = await asyncio.to_thread(cache.get, key)
+    else:
+        embedding = cache.get(key)
+    if embedding is not None:
+        return EmbeddingResult(
+            text=query,
+            embedding=embedding,
+            model=model,
+            content_hash=key,
+            tokens_used=0,
+        )
+
+    result = await client.embed_query(query)
+    served_by_primary = (
+        not isinstance(client, FallbackEmbeddingsClient) or client.current_index == 0
+    )
+    # Queries too short to embed come back empty and are not cached
+    if served_by_primary and result.embedding and result.model == model:
+        if cache.database is not None:
+            await asyncio.to_thread(cache.put, key, result.embedding, model)
+        else:
+            cache.put(key, result.embedding, model)
+    return result
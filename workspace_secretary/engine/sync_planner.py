@@ -0,0 +1,295 @@
+"""Sync planning: compute the IMAP-vs-DB UID difference once per folder pass.
+
+The planner runs a single ``SEARCH ALL`` per folder, subtracts the UIDs already
+stored in the database and keeps the result as a compact set of UID ranges.
+Batches are then streamed newest-first from the plan. Between batches the plan
+is re-validated against UIDVALIDITY/UIDNEXT from a cheap SELECT instead of
+re-running the full mailbox search.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from workspace_secretary.db import DatabaseInterface
+    from workspace_secretary.engine.imap_sync import ImapClient
+
+logger = logging.getLogger(__name__)
+
+
+class UidRangeSet:
+    """Sorted, non-overlapping set of inclusive UID ranges.
+
+    A 200k-message folder that is mostly synced collapses to a handful of
+    ``(start, end)`` tuples, so the plan stays small no matter how large the
+    mailbox is.
+    """
+
+    def __init__(self, ranges: Optional[Iterable[tuple[int, int]]] = None):
+        self._ranges: list[tuple[int, int]] = []
+        self._count = 0
+        for start, end in ranges or []:
+            self.add_range(start, end)
+
+    @classmethod
+    def from_uids(cls, uids: Iterable[int]) -> "UidRangeSet":
+        """Build a range set from an arbitrary iterable of UIDs."""
+        result = cls()
+        ordered = sorted(set(uids))
+        if not ordered:
+            return result
+        start = prev = ordered[0]
+        for uid in ordered[1:]:
+            if uid != prev + 1:
+                result._append(start, prev)
+                start = uid
+            prev = uid
+        result._append(start, prev)
+        return result
+
+    @classmethod
+    def difference(
+        cls, imap_uids: Iterable[int], synced_uids: Iterable[int]
+    ) -> "UidRangeSet":
+        """UIDs present on the server but not yet in the database."""
+        synced = (
+            synced_uids
+            if isinstance(synced_uids, (set, frozenset))
+            else set(synced_uids)
+        )
+        return cls.from_uids(uid for uid in imap_uids if uid not in synced)
+
+    def _append(self, start: int, end: int) -> None:
+        self._ranges.append((start, end))
+        self._count += end - start + 1
+
+    def add_range(self, start: int, end: int) -> None:
+        """Add an inclusive range, merging with overlapping/adjacent ranges."""
+        if end < start:
+            return
+        merged: list[tuple[int, int]] = []
+        placed = False
+        for r_start, r_end in self._ranges:
+            if r_end + 1 < start:
+                merged.append((r_start, r_end))
+            elif end + 1 < r_start:
+                if not placed:
+                    merged.append((start, end))
+                    placed = True
+                merged.append((r_start, r_end))
+            else:
+                start = min(start, r_start)
+                end = max(end, r_end)
+        if not placed:
+            merged.append((start, end))
+        self._ranges = merged
+        self._count = sum(e - s + 1 for s, e in merged)
+
+    def pop_highest(self, n: int) -> list[int]:
+        """Remove and return up to ``n`` of the highest UIDs (descending)."""
+        taken: list[int] = []
+        while self._ranges and len(taken) < n:
+            start, end = self._ranges[-1]
+            want = n - len(taken)
+            new_end = max(start - 1, end - want)
+            taken.extend(range(end, new_end, -1))
+            self._count -= end - new_end
+            if new_end < start:
+                self._ranges.pop()
+            else:
+                self._ranges[-1] = (start, new_end)
+        return taken
+
+    @property
+    def ranges(self) -> list[tuple[int, int]]:
+        return list(self._ranges)
+
+    def max(self) -> Optional[int]:
+        return self._ranges[-1][1] if self._ranges else None
+
+    def to_imap(self) -> str:
+        """Render as an IMAP sequence-set string (e.g. ``1:5,9,12:40``)."""
+        return ",".join(str(s) if s == e else f"{s}:{e}" for s, e in self._ranges)
+
+    def __contains__(self, uid: object) -> bool:
+        if not isinstance(uid, int):
+            return False
+        return any(s <= uid <= e for s, e in self._ranges)
+
+    def __iter__(self) -> Iterator[int]:
+        for start, end in self._ranges:
+            yield from range(start, end + 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __repr__(self) -> str:
+        return f"UidRangeSet({self.to_imap()!r})"
+
+
+@dataclass
+class SyncPlan:
+    """Work plan for one folder sync pass.
+
+    ``total`` is the number of UIDs the pass intends to fetch (including UIDs
+    that appeared after the plan was built); ``synced`` counts UIDs already
+    handed out as batches. ``skipped`` collects handed-out UIDs that were not
+    stored, either expunged meanwhile or dropped by a failed fetch.
+    """
+
+    folder: str
+    uidvalidity: int
+    uidnext: int
+    highestmodseq: int
+    pending: UidRangeSet = field(default_factory=UidRangeSet)
+    skipped: UidRangeSet = field(default_factory=UidRangeSet)
+    total: int = 0
+    synced: int = 0
+    invalidated: bool = False
+
+    @property
+    def remaining(self) -> int:
+        return len(self.pending)
+
+    @property
+    def done(self) -> bool:
+        return self.invalidated or not self.pending
+
+    @property
+    def progress_pct(self) -> float:
+        return (self.synced / self.total * 100) if self.total > 0 else 100.0
+
+    def next_batch(self, batch_size: int) -> list[int]:
+        """Hand out the next ``batch_size`` UIDs, newest first."""
+        batch = self.pending.pop_highest(batch_size)
+        self.synced += len(batch)
+        return batch
+
+    def record_stored(self, batch: list[int], stored: Iterable[int]) -> None:
+        """Note which UIDs of a handed-out ``batch`` were actually stored."""
+        stored_set = set(stored)
+        for uid in batch:
+            if uid not in stored_set:
+                self.skipped.add_range(uid, uid)
+
+    def hold_back(self, still_present: Iterable[int]) -> None:
+        """Keep skipped UIDs the server still has pending for the next pass.
+
+        UIDNEXT is lowered to the first of them, so an incremental plan built
+        from the saved state fetches them again.
+        """
+        first = min(still_present, default=None)
+        if first is not None and first < self.uidnext:
+            logger.warning(
+                f"[{self.folder}] Fetch skipped UIDs from {first}, "
+                f"keeping them pending (UIDNEXT {self.uidnext} -> {first})"
+            )
+            self.uidnext = first
+
+    def revalidate(self, folder_info: dict[str, Any]) -> bool:
+        """Check a fresh SELECT response against the plan.
+
+        Returns False (and marks the plan invalid) when UIDVALIDITY changed.
+        When UIDNEXT advanced, the newly assigned UID range is appended to the
+        plan so new mail is picked up without another ``SEARCH ALL``.
+        HIGHESTMODSEQ is deliberately kept at its plan-time value so flag
+        changes made during the pass are still seen by the next CONDSTORE sync.
+        """
+        current_uidvalidity = folder_info.get("uidvalidity") or 0
+        if self.uidvalidity and current_uidvalidity != self.uidvalidity:
+            logger.warning(
+                f"[{self.folder}] UIDVALIDITY changed mid-sync "
+                f"({self.uidvalidity} -> {current_uidvalidity}), abandoning plan"
+            )
+            self.invalidated = True
+            return False
+
+        current_uidnext = folder_info.get("uidnext") or 0
+        if current_uidnext > self.uidnext:
+            before = len(self.pending)
+            self.pending.add_range(self.uidnext, current_uidnext - 1)
+            added = len(self.pending) - before
+            self.total += added
+            logger.info(
+                f"[{self.folder}] UIDNEXT advanced {self.uidnext} -> "
+                f"{current_uidnext}, added {added} UIDs to sync plan"
+            )
+            self.uidnext = current_uidnext
+
+        return True
+
+
+def build_sync_plan(
+    client: "ImapClient",
+    database: "DatabaseInterface",
+    folder: str,
+    folder_info: Optional[dict[str, Any]] = None,
+) -> SyncPlan:
+    """Compute the IMAP-vs-DB UID difference for ``folder`` once.
+
+    Args:
+        client: Connected IMAP client (will SELECT ``folder``)
+        database: Database to read synced UIDs from
+        folder: Folder to plan
+        folder_info: Optional SELECT response already obtained by the caller
+
+    Returns:
+        SyncPlan holding the missing UIDs as a compact range set
+    """
+    if folder_info is None:
+        folder_info = client.select_folder(folder, readonly=True)
+
+    imap_uids = client.search("ALL", folder=folder)
+    synced_uids = set(database.get_synced_uids(folder))
+    pending = UidRangeSet.difference(imap_uids, synced_uids)
+
+    uidnext = folder_info.get("uidnext") or 0
+    if not uidnext:
+        uidnext = (max(imap_uids) + 1) if imap_uids else 1
+
+    plan = SyncPlan(
+        folder=folder,
+        uidvalidity=folder_info.get("uidvalidity") or 0,
+        uidnext=uidnext,
+        highestmodseq=folder_info.get("highestmodseq") or 0,
+        pending=pending,
+        total=len(pending),
+    )
+
+    logger.debug(
+        f"[{folder}] Sync plan: {plan.total} missing of {len(imap_uids)} "
+        f"({len(pending.ranges)} ranges)"
+    )
+    return plan
+
+
+def build_incremental_plan(
+    folder: str,
+    folder_info: dict[str, Any],
+    since_uidnext: int,
+) -> SyncPlan:
+    """Plan only the UIDs assigned since the last completed pass.
+
+    Used after a QRESYNC select: expunges arrive as ``VANISHED`` and flag
+    changes as untagged FETCH, so everything below the stored UIDNEXT is
+    already reconciled and no ``SEARCH ALL`` is needed.
+    """
+    uidnext = folder_info.get("uidnext") or 0
+    pending = UidRangeSet()
+    if since_uidnext and uidnext > since_uidnext:
+        pending.add_range(since_uidnext, uidnext - 1)
+
+    return SyncPlan(
+        folder=folder,
+        uidvalidity=folder_info.get("uidvalidity") or 0,
+        uidnext=uidnext or since_uidnext,
+        highestmodseq=folder_info.get("highestmodseq") or 0,
+        pending=pending,
+        total=len(pending),
+    )
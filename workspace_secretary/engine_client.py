@@ -111,6 +111,13 @@ class EngineClient:
             json={"uid": uid, "folder": folder, "destination": destination},
         )
 
+    def hydrate_emails(self, folder: str, uids: list[int]) -> dict[str, Any]:
+        return self._request(
+            "POST",
+            "/api/email/hydrate",
+            json={"folder": folder, "uids": uids},
+        )
+
     def mark_read(self, uid: int, folder: str) -> dict[str, Any]:
         return self._request(
             "POST",
@@ -134,6 +141,13 @@ class EngineClient:
             json={"uid": uid, "folder": folder, "labels": labels, "action": action},
         )
 
+    def batch_mutate(self, operations: list[dict[str, Any]]) -> dict[str, Any]:
+        return self._request(
+            "POST",
+            "/api/email/batch",
+            json={"operations": operations},
+        )
+
     def create_calendar_event(
         self,
         summary: str,
@@ -4,15 +4,15 @@ import asyncio
 import logging
 from contextlib import contextmanager
 from dataclasses import dataclass
-from queue import Empty
-from typing import Generator, Optional
+from typing import Generator
 
 from workspace_secretary.config import load_config_with_oauth2 as load_config
+from workspace_secretary.db.notify import NotificationHub
 from workspace_secretary.db.postgres import PostgresDatabase
 from workspace_secretary.db.queries import imap_jobs as imap_jobs_q
 from workspace_secretary.db.queries import emails as email_queries
 from workspace_secretary.engine import api as engine_api
-from workspace_secretary.imap_client import ImapClient
+from workspace_secretary.engine.imap_sync import ImapClient
 from workspace_secretary.classifier import triage_emails
 
 logger = logging.getLogger(__name__)
@@ -20,21 +20,26 @@ logger = logging.getLogger(__name__)
 
 @dataclass(frozen=True)
 class ExecutorConfig:
+    """
+    Args:
+        max_concurrent_jobs: Jobs run at the same time
+        poll_interval_s: Safety-net poll when no notification arrives; jobs
+            are normally dispatched as soon as ``pg_notify`` wakes the loop
+        listen_retry_s: Delay before reconnecting a dropped LISTEN connection
+    """
+
     max_concurrent_jobs: int = 3
-    poll_interval_s: float = 1.0
+    poll_interval_s: float = 30.0
+    listen_retry_s: float = 5.0
 
 
 @contextmanager
 def get_imap_from_pool(timeout: float = 60) -> Generator[ImapClient, None, None]:
-    client: Optional[ImapClient] = None
-    try:
-        client = engine_api.state._imap_pool.get(timeout=timeout)
-        yield client
-    except Empty:
+    pool = engine_api.state.imap_pool
+    if pool is None:
         raise RuntimeError("No IMAP connections available in pool")
-    finally:
-        if client:
-            engine_api.state._imap_pool.put(client)
+    with pool.lease(timeout=timeout, background=True) as client:
+        yield client
 
 
 async def _run_sync_job(job_id: str) -> None:
@@ -133,36 +138,44 @@ async def _run_triage_preview_job(job_id: str, db: PostgresDatabase) -> None:
     imap_jobs_q.append_event(db, job_id, f"Stored {processed} candidates for review")
 
 
-def _claim_next_sync_job(db: PostgresDatabase) -> str | None:
-    job = imap_jobs_q.claim_next_job(db, job_type="sync")
-    if not job:
-        return None
-    return str(job["job_id"])
+# (status, job_type) pairs the executor claims, highest priority first
+JOB_PRIORITY: tuple[tuple[str, str], ...] = (
+    ("pending", "sync"),
+    ("pending", "triage_preview"),
+    ("approved", "triage_preview"),
+    ("pending", "bulk_cleanup"),
+    ("pending", "triage_apply"),
+)
 
 
-def _claim_next_triage_preview_job(db: PostgresDatabase) -> str | None:
-    job = imap_jobs_q.claim_next_job(db, job_type="triage_preview")
-    if not job:
-        return None
-    return str(job["job_id"])
+def _claim_next_job(db: PostgresDatabase) -> dict | None:
+    return imap_jobs_q.claim_next_eligible_job(db, JOB_PRIORITY)
 
 
-def _claim_next_approved_triage_job(db: PostgresDatabase) -> dict | None:
-    return imap_jobs_q.claim_next_approved_job(db, job_type="triage_preview")
+# Jobs are chunked only for progress/cancellation; each chunk is applied with one
+# UID STORE/MOVE per folder and action.
+JOB_CHUNK_SIZE = 500
 
 
-def _claim_next_bulk_cleanup_job(db: PostgresDatabase) -> str | None:
-    job = imap_jobs_q.claim_next_job(db, job_type="bulk_cleanup")
-    if not job:
-        return None
-    return str(job["job_id"])
+def _group_by_folder(items: list[dict]) -> dict[str, list[dict]]:
+    grouped: dict[str, list[dict]] = {}
+    for item in items:
+        grouped.setdefault(item.get("folder", "INBOX"), []).append(item)
+    return grouped
 
 
-def _claim_next_triage_apply_job(db: PostgresDatabase) -> str | None:
-    job = imap_jobs_q.claim_next_job(db, job_type="triage_apply")
-    if not job:
-        return None
-    return str(job["job_id"])
+def _succeeded(results: dict[int, bool]) -> list[int]:
+    return [uid for uid, ok in results.items() if ok]
+
+
+def _record_failures(
+    results: dict[int, bool], action: str, errors: dict[int, str]
+) -> list[int]:
+    """Note the first failed action per UID in ``errors``; return the successes."""
+    for uid, ok in results.items():
+        if not ok:
+            errors.setdefault(uid, f"error: {action} failed")
+    return _succeeded(results)
 
 
 def _run_bulk_cleanup_job_sync(job_id: str, db: PostgresDatabase) -> None:
@@ -183,40 +196,41 @@ def _run_bulk_cleanup_job_sync(job_id: str, db: PostgresDatabase) -> None:
     imap_jobs_q.append_event(db, job_id, f"Processing {total} emails for cleanup")
     imap_jobs_q.update_progress(db, job_id, total_estimate=total, processed=0)
 
-    batch_size = 10
     processed = 0
     failed = 0
 
     with get_imap_from_pool() as imap_client:
-        for i in range(0, total, batch_size):
+        for i in range(0, total, JOB_CHUNK_SIZE):
             if imap_jobs_q.is_cancel_requested(db, job_id):
                 imap_jobs_q.append_event(db, job_id, "Cleanup cancelled by user")
                 break
 
-            batch = uids_data[i : i + batch_size]
-            for item in batch:
-                uid = item["uid"]
-                folder = item.get("folder", "INBOX")
-
+            chunk = uids_data[i : i + JOB_CHUNK_SIZE]
+            for folder, items in _group_by_folder(chunk).items():
+                uids = [item["uid"] for item in items]
                 try:
                     if mark_read:
-                        imap_client.mark_email(uid, folder, "read")
-                        email_queries.mark_email_read(db, uid, folder, is_read=True)
+                        read = _succeeded(
+                            imap_client.mark_email_batch(uids, folder, "read")
+                        )
+                        email_queries.mark_emails_read_bulk(db, folder, read, True)
 
-                    imap_client.move_email(uid, folder, destination)
-                    email_queries.delete_email(db, uid, folder)
+                    moved = _succeeded(
+                        imap_client.move_email_batch(uids, folder, destination)
+                    )
+                    email_queries.delete_emails_bulk(db, folder, moved)
 
-                    processed += 1
+                    processed += len(moved)
+                    failed += len(uids) - len(moved)
 
                 except Exception as e:
-                    logger.warning(f"Failed to cleanup UID {uid} in {folder}: {e}")
-                    failed += 1
+                    logger.warning(f"Failed to cleanup {len(uids)} UIDs in {folder}: {e}")
+                    failed += len(uids)
 
             imap_jobs_q.update_progress(db, job_id, processed=processed)
-            if (i // batch_size + 1) % 5 == 0:
-                imap_jobs_q.append_event(
-                    db, job_id, f"Progress: {processed}/{total} processed, {failed} failed"
-                )
+            imap_jobs_q.append_event(
+                db, job_id, f"Progress: {processed}/{total} processed, {failed} failed"
+            )
 
     imap_jobs_q.append_event(
         db, job_id, f"Cleanup complete: {processed} moved, {failed} failed"
@@ -257,7 +271,6 @@ def _run_triage_apply_job_sync(job_id: str, db: PostgresDatabase) -> None:
     imap_jobs_q.append_event(db, job_id, f"Applying labels to {total} emails")
     imap_jobs_q.update_progress(db, job_id, total_estimate=total, processed=0)
 
-    batch_size = 10
     processed = 0
     labels_applied = 0
     labels_removed = 0
@@ -266,69 +279,82 @@ def _run_triage_apply_job_sync(job_id: str, db: PostgresDatabase) -> None:
     failed = 0
 
     with get_imap_from_pool() as imap_client:
-        for i in range(0, total, batch_size):
+        for i in range(0, total, JOB_CHUNK_SIZE):
             if imap_jobs_q.is_cancel_requested(db, job_id):
                 imap_jobs_q.append_event(db, job_id, "Triage apply cancelled by user")
                 break
 
-            batch = items[i : i + batch_size]
-            for item in batch:
-                uid = item.get("uid")
-                folder = item.get("folder", "INBOX")
-                label = item.get("label")
-                remove_label = item.get("remove_label")
-                actions = item.get("actions", [])
-                confidence = item.get("confidence", 0)
-
-                if not uid:
-                    continue
-
-                try:
-                    if remove_label:
-                        try:
-                            imap_client.remove_gmail_labels(uid, folder, [remove_label])
-                            email_queries.remove_email_label(db, uid, folder, remove_label)
-                            labels_removed += 1
-                        except Exception as e:
-                            logger.warning(f"Failed to remove label {remove_label} from {uid}: {e}")
-
-                    if label:
-                        try:
-                            imap_client.add_gmail_labels(uid, folder, [label])
-                            email_queries.add_email_label(db, uid, folder, label)
-                            labels_applied += 1
-                        except Exception as e:
-                            logger.warning(f"Failed to apply label {label} to {uid}: {e}")
-
-                    if confidence >= 0.90 and auto_apply_high_confidence:
+            chunk = [item for item in items[i : i + JOB_CHUNK_SIZE] if item.get("uid")]
+            for folder, folder_items in _group_by_folder(chunk).items():
+                to_remove: dict[str, list[int]] = {}
+                to_add: dict[str, list[int]] = {}
+                to_read: list[int] = []
+                to_archive: list[int] = []
+
+                for item in folder_items:
+                    uid = item["uid"]
+                    if item.get("remove_label"):
+                        to_remove.setdefault(item["remove_label"], []).append(uid)
+                    if item.get("label"):
+                        to_add.setdefault(item["label"], []).append(uid)
+                    if item.get("confidence", 0) >= 0.90 and auto_apply_high_confidence:
+                        actions = item.get("actions", [])
                         if "mark_read" in actions:
-                            try:
-                                imap_client.mark_email(uid, folder, "read")
-                                email_queries.mark_email_read(db, uid, folder, is_read=True)
-                                marked_read += 1
-                            except Exception as e:
-                                logger.warning(f"Failed to mark {uid} as read: {e}")
-
+                            to_read.append(uid)
                         if "archive" in actions:
-                            try:
-                                imap_client.move_email(uid, folder, "[Gmail]/All Mail")
-                                email_queries.delete_email(db, uid, folder)
-                                archived += 1
-                            except Exception as e:
-                                logger.warning(f"Failed to archive {uid}: {e}")
+                            to_archive.append(uid)
 
-                    processed += 1
+                try:
+                    # Label changes first: archiving moves messages out of the folder
+                    for remove_label, uids in to_remove.items():
+                        done = _succeeded(
+                            imap_client.modify_gmail_labels_batch(
+                                uids, folder, [remove_label], "remove"
+                            )
+                        )
+                        email_queries.modify_email_labels_bulk(
+                            db, folder, done, [remove_label], "remove"
+                        )
+                        labels_removed += len(done)
+
+                    for label, uids in to_add.items():
+                        done = _succeeded(
+                            imap_client.modify_gmail_labels_batch(
+                                uids, folder, [label], "add"
+                            )
+                        )
+                        email_queries.modify_email_labels_bulk(
+                            db, folder, done, [label], "add"
+                        )
+                        labels_applied += len(done)
+
+                    if to_read:
+                        done = _succeeded(
+                            imap_client.mark_email_batch(to_read, folder, "read")
+                        )
+                        email_queries.mark_emails_read_bulk(db, folder, done, True)
+                        marked_read += len(done)
+
+                    if to_archive:
+                        done = _succeeded(
+                            imap_client.move_email_batch(
+                                to_archive, folder, "[Gmail]/All Mail"
+                            )
+                        )
+                        email_queries.delete_emails_bulk(db, folder, done)
+                        archived += len(done)
+
+                    processed += len(folder_items)
 
                 except Exception as e:
-                    logger.warning(f"Failed to process UID {uid}: {e}")
-                    failed += 1
+                    logger.warning(f"Failed to apply triage in {folder}: {e}")
+                    failed += len(folder_items)
 
             imap_jobs_q.update_progress(db, job_id, processed=processed)
-            if (i // batch_size + 1) % 5 == 0:
-                imap_jobs_q.append_event(
-                    db, job_id, 
-                    f"Progress: {processed}/{total} - +{labels_applied}/-{labels_removed} labels, {marked_read} read, {archived} archive"
-                )
+            imap_jobs_q.append_event(
+                db, job_id, 
+                f"Progress: {processed}/{total} - +{labels_applied}/-{labels_removed} labels, {marked_read} read, {archived} archive"
+            )
 
     imap_jobs_q.append_event(
         db, job_id, 
@@ -359,48 +385,70 @@ def _run_triage_execute_job_sync(job_id: str, db: PostgresDatabase) -> None:
         return
 
     total = len(selected)
-    batch_size = 10
     processed = 0
     failed = 0
 
     imap_jobs_q.update_progress(db, job_id, total_estimate=total, processed=0)
 
     with get_imap_from_pool() as imap_client:
-        for i in range(0, total, batch_size):
+        for i in range(0, total, JOB_CHUNK_SIZE):
             if imap_jobs_q.is_cancel_requested(db, job_id):
                 imap_jobs_q.append_event(db, job_id, "Execution cancelled by user")
                 break
 
-            batch = selected[i : i + batch_size]
-            for cand in batch:
-                uid = cand["uid"]
-                folder = cand["folder"]
-                category = cand["category"]
+            chunk = selected[i : i + JOB_CHUNK_SIZE]
+            for folder, cands in _group_by_folder(chunk).items():
+                uids = [c["uid"] for c in cands]
+                errors: dict[int, str] = {}
 
                 try:
+                    if "add_label" in actions:
+                        by_label: dict[str, list[int]] = {}
+                        for cand in cands:
+                            label = f"Secretary/{cand['category'].replace('_', '-').title()}"
+                            by_label.setdefault(label, []).append(cand["uid"])
+                        for label, label_uids in by_label.items():
+                            _record_failures(
+                                imap_client.modify_gmail_labels_batch(
+                                    label_uids, folder, [label], "add"
+                                ),
+                                "add_label",
+                                errors,
+                            )
+
                     if "mark_read" in actions:
-                        imap_client.mark_email(uid, folder, "read")
-                        email_queries.mark_email_read(db, uid, folder, is_read=True)
+                        done = _record_failures(
+                            imap_client.mark_email_batch(uids, folder, "read"),
+                            "mark_read",
+                            errors,
+                        )
+                        email_queries.mark_emails_read_bulk(db, folder, done, True)
 
                     if "archive" in actions:
-                        imap_client.move_email(uid, folder, "[Gmail]/All Mail")
-                        email_queries.delete_email(db, uid, folder)
-
-                    label = f"Secretary/{category.replace('_', '-').title()}"
-                    if "add_label" in actions:
-                        imap_client.add_gmail_labels(uid, folder, [label])
-
-                    imap_jobs_q.set_candidate_decision(db, cand["id"], "executed")
-                    processed += 1
+                        done = _record_failures(
+                            imap_client.move_email_batch(
+                                uids, folder, "[Gmail]/All Mail"
+                            ),
+                            "archive",
+                            errors,
+                        )
+                        email_queries.delete_emails_bulk(db, folder, done)
 
                 except Exception as e:
-                    logger.exception(f"Failed to process candidate {cand['id']}")
-                    imap_jobs_q.set_candidate_decision(db, cand["id"], f"error: {e}")
-                    failed += 1
+                    logger.exception(f"Failed to process candidates in {folder}")
+                    errors = {uid: f"error: {e}" for uid in uids}
+
+                for cand in cands:
+                    decision = errors.get(cand["uid"], "executed")
+                    imap_jobs_q.set_candidate_decision(db, cand["id"], decision)
+                    if decision == "executed":
+                        processed += 1
+                    else:
+                        failed += 1
 
             imap_jobs_q.update_progress(db, job_id, processed=processed)
             imap_jobs_q.append_event(
-                db, job_id, f"Processed batch {i // batch_size + 1}: {processed} done, {failed} failed"
+                db, job_id, f"Processed batch {i // JOB_CHUNK_SIZE + 1}: {processed} done, {failed} failed"
             )
 
     imap_jobs_q.append_event(
@@ -491,38 +539,39 @@ async def run_forever(cfg: ExecutorConfig = ExecutorConfig()) -> None:
                 imap_jobs_q.append_event(db, job_id, f"Job failed: {e}", level="error")
                 imap_jobs_q.mark_finished(db, job_id, status="failed", error=str(e))
 
-    running: set[asyncio.Task[None]] = set()
-
-    while True:
-        done = {t for t in running if t.done()}
-        running -= done
-
-        while sem.locked() is False and len(running) < cfg.max_concurrent_jobs:
-            job_id = await asyncio.to_thread(_claim_next_sync_job, db)
-            if job_id:
-                running.add(asyncio.create_task(_sync_worker(job_id)))
-                continue
-
-            job_id = await asyncio.to_thread(_claim_next_triage_preview_job, db)
-            if job_id:
-                running.add(asyncio.create_task(_triage_preview_worker(job_id)))
-                continue
-
-            approved_job = await asyncio.to_thread(_claim_next_approved_triage_job, db)
-            if approved_job:
-                running.add(asyncio.create_task(_triage_execute_worker(str(approved_job["job_id"]))))
-                continue
-
-            job_id = await asyncio.to_thread(_claim_next_bulk_cleanup_job, db)
-            if job_id:
-                running.add(asyncio.create_task(_bulk_cleanup_worker(job_id)))
-                continue
+    workers = {
+        ("pending", "sync"): _sync_worker,
+        ("pending", "triage_preview"): _triage_preview_worker,
+        ("approved", "triage_preview"): _triage_execute_worker,
+        ("pending", "bulk_cleanup"): _bulk_cleanup_worker,
+        ("pending", "triage_apply"): _triage_apply_worker,
+    }
 
-            job_id = await asyncio.to_thread(_claim_next_triage_apply_job, db)
-            if job_id:
-                running.add(asyncio.create_task(_triage_apply_worker(job_id)))
-                continue
+    hub = NotificationHub(
+        db._get_connection_string(),
+        [imap_jobs_q.EXECUTOR_CHANNEL],
+        retry_s=cfg.listen_retry_s,
+    )
+    await hub.start()
+    wake = hub.subscribe(imap_jobs_q.EXECUTOR_CHANNEL)
+    running: set[asyncio.Task[None]] = set()
 
-            break
+    def _job_done(task: asyncio.Task[None]) -> None:
+        running.discard(task)
+        # A freed slot may let a job that was skipped while we were full start
+        wake.notify()
 
-        await asyncio.sleep(cfg.poll_interval_s)
+    try:
+        while True:
+            while len(running) < cfg.max_concurrent_jobs:
+                job = await asyncio.to_thread(_claim_next_job, db)
+                if not job:
+                    break
+                worker = workers[(job["claimed_status"], job["job_type"])]
+                task = asyncio.create_task(worker(str(job["job_id"])))
+                running.add(task)
+                task.add_done_callback(_job_done)
+
+            await wake.wait(cfg.poll_interval_s)
+    finally:
+        await hub.close()
@@ -1,15 +1,22 @@
 """MCP server - reads from database (read-only), mutations via Engine API."""
 
 import argparse
+import asyncio
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
 from typing import AsyncIterator, Dict, Optional, cast
 
 from mcp.server.fastmcp import FastMCP
 from workspace_secretary.config import ServerConfig, load_config
-from workspace_secretary.db import DatabaseInterface
+from workspace_secretary.db import AsyncPostgresDatabase, DatabaseInterface
+from workspace_secretary.db.queries import aio
 from workspace_secretary.engine.database import create_database
+from workspace_secretary.engine.query_cache import (
+    configure_query_cache,
+    embed_query_cached,
+)
 from workspace_secretary.engine_client import EngineClient, get_engine_client
 
 logging.basicConfig(
@@ -20,6 +27,9 @@ logger = logging.getLogger("workspace_secretary")
 
 STATIC_TOKEN = "your-very-secure-static-token"
 
+# Seconds before retrying the async pool after it failed to open
+ASYNC_DATABASE_RETRY_S = 30.0
+
 
 async def verify_static_token(token: str) -> bool:
     return token == STATIC_TOKEN
@@ -29,6 +39,9 @@ class MCPState:
     def __init__(self):
         self.config: Optional[ServerConfig] = None
         self.database: Optional[DatabaseInterface] = None
+        self.async_database: Optional[AsyncPostgresDatabase] = None
+        self._async_database_lock = asyncio.Lock()
+        self._async_database_retry_at = 0.0
         self.engine_client: Optional[EngineClient] = None
         self.embeddings_client = None
         self._initialized = False
@@ -46,6 +59,9 @@ class MCPState:
         if self.config.database:
             try:
                 self.database = create_database(self.config.database)
+                self.async_database = AsyncPostgresDatabase.from_config(
+                    self.config.database
+                )
                 logger.info(f"Database connected: {self.config.database.backend.value}")
             except Exception as e:
                 logger.warning(f"Database connection failed (will retry): {e}")
@@ -58,14 +74,14 @@ class MCPState:
             and self.database.supports_embeddings()
         ):
             try:
-                from workspace_secretary.engine.embeddings import EmbeddingsClient
+                from workspace_secretary.engine.embeddings import (
+                    create_embeddings_client,
+                )
 
-                self.embeddings_client = EmbeddingsClient(
-                    endpoint=self.config.database.embeddings.endpoint,
-                    api_key=self.config.database.embeddings.api_key,
-                    model=self.config.database.embeddings.model,
-                    dimensions=self.config.database.embeddings.dimensions,
+                self.embeddings_client = create_embeddings_client(
+                    self.config.database.embeddings
                 )
+                configure_query_cache(self.config.database.embeddings, self.database)
                 logger.info("Embeddings client initialized for semantic search")
             except Exception as e:
                 logger.warning(f"Embeddings client failed: {e}")
@@ -74,6 +90,33 @@ class MCPState:
         self._initialized = True
         logger.info("MCP server initialized")
 
+    async def open_async_database(self) -> Optional[AsyncPostgresDatabase]:
+        """Open the async pool once; tools fall back to threads without it.
+
+        After a failed open the pool is not retried for
+        ``ASYNC_DATABASE_RETRY_S``, so tool calls do not each wait on a
+        database that is down.
+        """
+        if self.async_database is None:
+            return None
+        if time.monotonic() < self._async_database_retry_at:
+            return None
+        async with self._async_database_lock:
+            if time.monotonic() < self._async_database_retry_at:
+                return None
+            try:
+                await self.async_database.open()
+            except Exception as e:
+                logger.warning(
+                    f"Async database pool unavailable, retrying in "
+                    f"{ASYNC_DATABASE_RETRY_S:.0f}s: {e}"
+                )
+                self._async_database_retry_at = (
+                    time.monotonic() + ASYNC_DATABASE_RETRY_S
+                )
+                return None
+        return self.async_database
+
     def get_engine_status(self) -> dict:
         if not self.engine_client:
             return {"status": "no_client"}
@@ -90,12 +133,17 @@ _state = MCPState()
 
 @asynccontextmanager
 async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict]:
-    yield {
-        "config": _state.config,
-        "database": _state.database,
-        "engine_client": _state.engine_client,
-        "embeddings_client": _state.embeddings_client,
-    }
+    try:
+        yield {
+            "config": _state.config,
+            "database": _state.database,
+            "async_database": await _state.open_async_database(),
+            "engine_client": _state.engine_client,
+            "embeddings_client": _state.embeddings_client,
+        }
+    finally:
+        if _state.async_database is not None:
+            await _state.async_database.close()
 
 
 def create_server(
@@ -154,7 +202,7 @@ def _register_tools(server: FastMCP, config: ServerConfig) -> None:
         return "\n".join(lines)
 
     @server.tool()
-    def search_emails(
+    async def search_emails(
         folder: str = "INBOX",
         from_addr: Optional[str] = None,
         to_addr: Optional[str] = None,
@@ -167,7 +215,8 @@ def _register_tools(server: FastMCP, config: ServerConfig) -> None:
             return "Database not available. Engine may still be syncing."
 
         try:
-            emails = _state.database.search_emails(
+            emails = await asyncio.to_thread(
+                _state.database.search_emails,
                 folder=folder,
                 from_addr=from_addr,
                 to_addr=to_addr,
@@ -197,12 +246,13 @@ def _register_tools(server: FastMCP, config: ServerConfig) -> None:
             return f"Search error: {e}"
 
     @server.tool()
-    def get_email(uid: int, folder: str = "INBOX") -> str:
-        if not _state.database:
+    async def get_email(uid: int, folder: str = "INBOX") -> str:
+        adb = await _state.open_async_database()
+        if not adb:
             return "Database not available."
 
         try:
-            email = _state.database.get_email_by_uid(uid, folder)
+            email = await aio.get_email(adb, uid, folder)
             if not email:
                 return f"Email {uid} not found in {folder}."
 
@@ -225,14 +275,13 @@ def _register_tools(server: FastMCP, config: ServerConfig) -> None:
             return f"Error: {e}"
 
     @server.tool()
-    def get_unread_emails(folder: str = "INBOX", limit: int = 50) -> str:
-        if not _state.database:
+    async def get_unread_emails(folder: str = "INBOX", limit: int = 50) -> str:
+        adb = await _state.open_async_database()
+        if not adb:
             return "Database not available."
 
         try:
-            emails = _state.database.search_emails(
-                folder=folder, is_unread=True, limit=limit
-            )
+            emails = await aio.get_inbox_emails(adb, folder, limit, unread_only=True)
 
             if not emails:
                 return "No unread emails."
@@ -253,20 +302,22 @@ def _register_tools(server: FastMCP, config: ServerConfig) -> None:
             return f"Error: {e}"
 
     @server.tool()
-    def get_folder_stats(folder: str = "INBOX") -> str:
-        if not _state.database:
+    async def get_folder_stats(folder: str = "INBOX") -> str:
+        adb = await _state.open_async_database()
+        if not adb or not _state.database:
             return "Database not available."
 
         try:
-            state = _state.database.get_folder_state(folder)
+            state = await asyncio.to_thread(_state.database.get_folder_state, folder)
             if not state:
                 return f"No data for folder {folder}."
+            counters = await aio.get_folder_counters(adb, folder)
 
             return "\n".join(
                 [
                     f"Folder: {folder}",
-                    f"Total: {state.get('total_count', 0)}",
-                    f"Unread: {state.get('unread_count', 0)}",
+                    f"Total: {counters['total']}",
+                    f"Unread: {counters['unread']}",
                     f"Last sync: {state.get('last_sync', 'Never')}",
                 ]
             )
@@ -286,9 +337,10 @@ def _register_tools(server: FastMCP, config: ServerConfig) -> None:
             emb = _state.embeddings_client
             if db is None or emb is None:
                 return "Semantic search not available."
-            result = await emb.embed_query(query)
+            result = await embed_query_cached(emb, query)
             try:
-                emails = db.semantic_search(
+                emails = await asyncio.to_thread(
+                    db.semantic_search,
                     query_embedding=result.embedding,
                     folder=folder,
                     limit=limit,
@@ -314,7 +366,44 @@ def _register_tools(server: FastMCP, config: ServerConfig) -> None:
                 return f"Semantic search error: {e}"
 
         @server.tool()
-        def find_similar_emails(
+        async def hybrid_search(
+            query: str, folder: str = "INBOX", limit: int = 20
+        ) -> str:
+            """Search emails by keywords and meaning together (rank fusion)."""
+            adb = await _state.open_async_database()
+            emb = _state.embeddings_client
+            if adb is None or emb is None:
+                return "Hybrid search not available."
+            result = await embed_query_cached(emb, query)
+            try:
+                emails = await aio.hybrid_search(
+                    adb,
+                    query=query,
+                    query_embedding=result.embedding,
+                    folder=folder,
+                    limit=limit,
+                )
+
+                if not emails:
+                    return "No matching emails found."
+
+                lines = [f"Found {len(emails)} relevant emails:\n"]
+                for e in emails:
+                    lines.extend(
+                        [
+                            f"UID: {e.get('uid')} (score: {e.get('score', 0):.4f})",
+                            f"From: {e.get('from_addr')}",
+                            f"Subject: {e.get('subject')}",
+                            f"Date: {e.get('date')}",
+                            "---",
+                        ]
+                    )
+                return "\n".join(lines)
+            except Exception as e:
+                return f"Hybrid search error: {e}"
+
+        @server.tool()
+        async def find_similar_emails(
             uid: int, folder: str = "INBOX", limit: int = 10
         ) -> str:
             """Find emails similar to a specific email."""
@@ -322,7 +411,9 @@ def _register_tools(server: FastMCP, config: ServerConfig) -> None:
             if db is None:
                 return "Database not available."
             try:
-                emails = db.find_similar_emails(uid, folder, limit)
+                emails = await asyncio.to_thread(
+                    db.find_similar_emails, uid, folder, limit
+                )
 
                 if not emails:
                     return f"No similar emails found for UID {uid}."
@@ -6,6 +6,7 @@ Architecture:
 - No direct IMAP/Gmail/Calendar client access
 """
 
+import asyncio
 import json
 import logging
 import re
@@ -17,9 +18,11 @@ from typing import Any, Dict, List, Optional
 from mcp.server.fastmcp import FastMCP, Context
 
 from workspace_secretary.config import ServerConfig
-from workspace_secretary.db import DatabaseInterface
+from workspace_secretary.db import AsyncPostgresDatabase, DatabaseInterface
+from workspace_secretary.db.queries import aio
 from workspace_secretary.engine_client import EngineClient
 from workspace_secretary.engine.analysis import PhishingAnalyzer
+from workspace_secretary.engine.query_cache import embed_query_cached
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +43,14 @@ def _get_database(ctx: Context) -> DatabaseInterface:
     return db
 
 
+def _get_async_database(ctx: Context) -> AsyncPostgresDatabase:
+    """Get the async database (request-path reads) from context."""
+    db = ctx.request_context.lifespan_context.get("async_database")
+    if not db:
+        raise RuntimeError("Database not available. Engine may still be syncing.")
+    return db
+
+
 def _get_engine(ctx: Context) -> EngineClient:
     """Get engine client from context."""
     engine = ctx.request_context.lifespan_context.get("engine_client")
@@ -136,7 +147,7 @@ async def list_folders(ctx: Context) -> str:
     """
     try:
         db = _get_database(ctx)
-        folders = db.get_synced_folders()
+        folders = await asyncio.to_thread(db.get_synced_folders)
         return json.dumps(folders, indent=2, default=str)
     except Exception as e:
         logger.error(f"Error listing folders: {e}")
@@ -171,7 +182,8 @@ async def search_emails(
     """
     try:
         db = _get_database(ctx)
-        emails = db.search_emails(
+        emails = await asyncio.to_thread(
+            db.search_emails,
             folder=folder,
             from_addr=from_addr,
             to_addr=to_addr,
@@ -204,10 +216,17 @@ async def get_email_details(
         JSON with email details including body
     """
     try:
-        db = _get_database(ctx)
-        email = db.get_email_by_uid(uid, folder)
+        adb = _get_async_database(ctx)
+        email = await aio.get_email(adb, uid, folder)
         if not email:
             return json.dumps({"error": f"Email {uid} not found in {folder}"})
+        if email.get("body_hydrated") is False:
+            # Header-first sync stored only a preview; fetch the body now
+            try:
+                await asyncio.to_thread(_get_engine(ctx).hydrate_emails, folder, [uid])
+                email = await aio.get_email(adb, uid, folder) or email
+            except Exception as e:
+                logger.warning(f"Body hydration failed for {folder}/{uid}: {e}")
         return json.dumps(_format_email_detail(email), indent=2, default=str)
     except Exception as e:
         logger.error(f"Error getting email details: {e}")
@@ -231,19 +250,16 @@ async def get_email_thread(
         JSON list of emails in the thread, sorted by date
     """
     try:
-        db = _get_database(ctx)
-        thread_emails = db.get_thread_emails(uid, folder)
+        adb = _get_async_database(ctx)
+        thread_emails = await aio.get_thread(adb, uid, folder)
         if not thread_emails:
             # Fall back to single email
-            email = db.get_email_by_uid(uid, folder)
+            email = await aio.get_email(adb, uid, folder)
             if email:
                 thread_emails = [email]
             else:
                 return json.dumps({"error": f"Email {uid} not found"})
 
-        # Sort by date
-        thread_emails.sort(key=lambda e: e.get("date") or "")
-
         results = []
         for email in thread_emails:
             result = _format_email_summary(email)
@@ -258,6 +274,53 @@ async def get_email_thread(
         return json.dumps({"error": str(e)})
 
 
+@mcp.tool()
+async def list_email_threads(
+    folder: str = "INBOX",
+    limit: int = 25,
+    unread_only: bool = False,
+    cursor: Optional[str] = None,
+    ctx: Context = None,  # type: ignore
+) -> str:
+    """List conversations in a folder, most recently active first.
+
+    Args:
+        folder: Folder name
+        limit: Maximum threads to return
+        unread_only: Only threads with unread messages
+        cursor: next_cursor from a previous call, to continue the listing
+        ctx: MCP context
+
+    Returns:
+        JSON with threads (participants, message/unread counts, latest
+        message uid/folder, snippet) and next_cursor
+    """
+    try:
+        threads, next_cursor = await aio.get_threads_page(
+            _get_async_database(ctx), folder, limit, cursor, unread_only
+        )
+        results = [
+            {
+                "thread_key": t["thread_key"],
+                "subject": t.get("subject"),
+                "participants": t.get("participants") or [],
+                "message_count": t.get("message_count", 0),
+                "unread_count": t.get("unread_count", 0),
+                "last_date": t.get("last_date"),
+                "latest_uid": t.get("last_uid"),
+                "latest_folder": t.get("last_folder"),
+                "snippet": t.get("snippet") or "",
+            }
+            for t in threads
+        ]
+        return json.dumps(
+            {"threads": results, "next_cursor": next_cursor}, indent=2, default=str
+        )
+    except Exception as e:
+        logger.error(f"Error listing email threads: {e}")
+        return json.dumps({"error": str(e)})
+
+
 @mcp.tool()
 async def get_unread_messages(
     folder: str = "INBOX",
@@ -276,7 +339,9 @@ async def get_unread_messages(
     """
     try:
         db = _get_database(ctx)
-        emails = db.search_emails(folder=folder, is_unread=True, limit=limit)
+        emails = await asyncio.to_thread(
+            db.search_emails, folder=folder, is_unread=True, limit=limit
+        )
         results = []
         for email in emails:
             result = _format_email_summary(email)
@@ -335,7 +400,8 @@ async def gmail_search(
         if subject_match:
             subject_contains = subject_match.group(2)
 
-        emails = db.search_emails(
+        emails = await asyncio.to_thread(
+            db.search_emails,
             folder="INBOX",
             from_addr=from_addr,
             to_addr=to_addr,
@@ -822,7 +888,9 @@ async def get_daily_briefing(
             logger.warning(f"Could not fetch calendar: {cal_err}")
 
         # Get unread emails from database
-        emails = db.search_emails(folder="INBOX", is_unread=True, limit=50)
+        emails = await asyncio.to_thread(
+            db.search_emails, folder="INBOX", is_unread=True, limit=50
+        )
 
         for email in emails:
             sender = (email.get("from_addr") or "").lower()
@@ -1081,10 +1149,11 @@ if enable_semantic_search:
                 return json.dumps({"error": "Database does not support embeddings"})
 
             # Get query embedding
-            result = await embeddings.embed_query(query)
+            result = await embed_query_cached(embeddings, query)
 
             # Search
-            emails = db.semantic_search(
+            emails = await asyncio.to_thread(
+                db.semantic_search,
                 query_embedding=result.embedding,
                 folder=folder,
                 limit=limit,
@@ -1128,7 +1197,7 @@ if enable_semantic_search:
             if not db.supports_embeddings():
                 return json.dumps({"error": "Database does not support embeddings"})
 
-            emails = db.find_similar_emails(uid, folder, limit)
+            emails = await asyncio.to_thread(db.find_similar_emails, uid, folder, limit)
 
             if not emails:
                 return json.dumps({"message": f"No similar emails found for UID {uid}"})
@@ -1186,9 +1255,10 @@ if enable_semantic_search:
             if not db.supports_embeddings():
                 return json.dumps({"error": "Database does not support embeddings"})
 
-            result = await embeddings.embed_query(query)
+            result = await embed_query_cached(embeddings, query)
 
-            emails = db.semantic_search_filtered(
+            emails = await asyncio.to_thread(
+                db.semantic_search_filtered,
                 query_embedding=result.embedding,
                 folder=folder,
                 from_addr=from_addr,
@@ -1261,7 +1331,7 @@ async def quick_clean_inbox(
         processed_uids = set(state.get("processed_uids", []))
 
         # Fetch batch of emails
-        emails = db.search_emails(folder="INBOX", limit=100)
+        emails = await asyncio.to_thread(db.search_emails, folder="INBOX", limit=100)
 
         candidates = []
         new_processed = []
@@ -1357,28 +1427,40 @@ async def execute_clean_batch(
     try:
         engine = _get_engine(ctx)
 
-        results = {"success": 0, "failed": 0, "errors": []}
-
-        for uid in uids:
-            try:
-                if action == "archive":
-                    # Mark read and apply label
-                    engine.mark_read(uid, "INBOX")
-                    engine.modify_labels(
-                        uid, "INBOX", ["Secretary/Auto-Cleaned"], "add"
-                    )
-                    engine.move_email(uid, "INBOX", "[Gmail]/All Mail")
-                elif action == "mark_read":
-                    engine.mark_read(uid, "INBOX")
-                elif action == "label":
-                    engine.modify_labels(
-                        uid, "INBOX", ["Secretary/Auto-Cleaned"], "add"
-                    )
+        label = ["Secretary/Auto-Cleaned"]
+        steps: dict[str, list[dict[str, Any]]] = {
+            "archive": [
+                {"action": "mark_read"},
+                {"action": "add_labels", "labels": label},
+                {"action": "move", "destination": "[Gmail]/All Mail"},
+            ],
+            "mark_read": [{"action": "mark_read"}],
+            "label": [{"action": "add_labels", "labels": label}],
+        }
+        if action not in steps:
+            return json.dumps({"error": f"Unknown action: {action}"})
+
+        # One engine call; the engine issues one UID STORE/MOVE per step
+        response = engine.batch_mutate(
+            [
+                {"uid": uid, "folder": "INBOX", **step}
+                for step in steps[action]
+                for uid in uids
+            ]
+        )
 
-                results["success"] += 1
-            except Exception as e:
-                results["failed"] += 1
-                results["errors"].append(f"UID {uid}: {e}")
+        failed_uids = sorted(
+            {uid for r in response.get("results", []) for uid in r["failed_uids"]}
+        )
+        results = {
+            "success": len(set(uids)) - len(failed_uids),
+            "failed": len(failed_uids),
+            "errors": [
+                f"UID {r_uid}: {r['action']} failed"
+                for r in response.get("results", [])
+                for r_uid in r["failed_uids"]
+            ],
+        }
 
         return json.dumps(results, indent=2)
 
@@ -1434,7 +1516,9 @@ async def triage_priority_emails(
         offset = state.get("offset", 0)
         processed_uids = set(state.get("processed_uids", []))
 
-        emails = db.search_emails(folder="INBOX", is_unread=True, limit=100)
+        emails = await asyncio.to_thread(
+            db.search_emails, folder="INBOX", is_unread=True, limit=100
+        )
 
         priority_emails = []
         new_processed = []
@@ -99,7 +99,8 @@ async def _init_shared_state():
     
     loop = asyncio.get_event_loop()
     await loop.run_in_executor(None, _init_connection_pool)
-    logger.info(f"Shared IMAP pool initialized with {state._imap_pool_size} connections")
+    pool_size = state.imap_pool.size if state.imap_pool else 0
+    logger.info(f"Shared IMAP pool initialized with {pool_size} connections")
 
 
 async def _executor_loop():
@@ -142,6 +143,10 @@ async def lifespan(app):
         pass
     logger.info("Background health check stopped")
 
+    from workspace_secretary.web.async_database import close_async_db
+
+    await close_async_db()
+
 
 web_app = FastAPI(
     title="Secretary Web",
@@ -0,0 +1,301 @@
+"""
+Web UI async database access layer.
+
+Route handlers await these instead of calling ``web.database`` on the event
+loop. Hot read paths run natively on ``AsyncPostgresDatabase`` through
+``db.queries.aio``; the remaining queries run the synchronous functions in a
+worker thread. Both kinds are timed into the same latency histograms.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar
+
+from workspace_secretary.db.async_postgres import AsyncPostgresDatabase
+from workspace_secretary.db.notify import NotificationHub
+from workspace_secretary.db.queries import aio
+from workspace_secretary.db.queries import changes as changes_q
+from workspace_secretary.db.queries import imap_jobs as imap_jobs_q
+from workspace_secretary.web import database as sync_db
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_adb: Optional[AsyncPostgresDatabase] = None
+_adb_lock = asyncio.Lock()
+
+_hub: Optional[NotificationHub] = None
+_hub_lock = asyncio.Lock()
+
+# Channels the web UI's NotificationHub listens on
+LISTEN_CHANNELS = (imap_jobs_q.JOB_EVENTS_CHANNEL, changes_q.MAILBOX_CHANNEL)
+
+
+async def get_async_db() -> AsyncPostgresDatabase:
+    """Get or open the singleton AsyncPostgresDatabase for the web UI.
+
+    The schema is created by the synchronous ``get_db()``, which is
+    initialized first.
+    """
+    global _adb
+    if _adb is not None:
+        return _adb
+    async with _adb_lock:
+        if _adb is None:
+            from workspace_secretary.config import load_config
+
+            await asyncio.to_thread(sync_db.get_db)
+            config = load_config()
+            adb = AsyncPostgresDatabase.from_config(config.database)
+            await adb.open()
+            logger.info("Web UI async database pool opened (max_size=%d)", adb.max_size)
+            _adb = adb
+    return _adb
+
+
+async def close_async_db() -> None:
+    global _adb
+    await close_notification_hub()
+    if _adb is not None:
+        await _adb.close()
+        _adb = None
+
+
+async def get_notification_hub() -> NotificationHub:
+    """Get or start the web UI's single LISTEN connection."""
+    global _hub
+    if _hub is not None:
+        return _hub
+    async with _hub_lock:
+        if _hub is None:
+            adb = await get_async_db()
+            hub = NotificationHub(adb._get_connection_string(), LISTEN_CHANNELS)
+            await hub.start()
+            _hub = hub
+    return _hub
+
+
+async def close_notification_hub() -> None:
+    global _hub
+    if _hub is not None:
+        await _hub.close()
+        _hub = None
+
+
+@asynccontextmanager
+async def get_conn(name: str) -> AsyncIterator[Any]:
+    """Async connection from the shared pool; the block is timed as ``name``."""
+    adb = await get_async_db()
+    with adb.metrics.time(name):
+        async with adb.connection() as conn:
+            yield conn
+
+
+async def run_sync(name: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking database call in a worker thread, timed as ``name``."""
+    adb = await get_async_db()
+    with adb.metrics.time(name):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+async def query_metrics() -> dict[str, Any]:
+    """Latency histograms per query and async pool statistics."""
+    adb = await get_async_db()
+    return {"queries": adb.metrics.snapshot(), "pool": adb.pool_stats()}
+
+
+# ============================================================================
+# Native async queries
+# ============================================================================
+
+
+async def get_inbox_emails(
+    folder: str,
+    limit: int,
+    offset: int,
+    unread_only: bool = False,
+    label: str | None = None,
+) -> list[dict]:
+    return await aio.get_inbox_emails(
+        await get_async_db(), folder, limit, offset, unread_only, label
+    )
+
+
+async def get_inbox_page(
+    folder: str,
+    limit: int,
+    cursor: str | None = None,
+    unread_only: bool = False,
+    label: str | None = None,
+) -> tuple[list[dict], Optional[str]]:
+    return await aio.get_inbox_page(
+        await get_async_db(), folder, limit, cursor, unread_only, label
+    )
+
+
+async def get_email(uid: int, folder: str) -> Optional[dict]:
+    return await aio.get_email(await get_async_db(), uid, folder)
+
+
+async def get_thread(uid: int, folder: str) -> list[dict]:
+    return await aio.get_thread(await get_async_db(), uid, folder)
+
+
+async def get_neighbor_uids(
+    folder: str, uid: int, unread_only: bool = False
+) -> dict[str, Optional[int]]:
+    return await aio.get_neighbor_uids(await get_async_db(), folder, uid, unread_only)
+
+
+async def get_thread_view(
+    uid: int, folder: str, unread_only: bool = False
+) -> dict[str, Any]:
+    return await aio.get_thread_view(await get_async_db(), uid, folder, unread_only)
+
+
+async def get_threads_page(
+    folder: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    unread_only: bool = False,
+) -> tuple[list[dict], Optional[str]]:
+    return await aio.get_threads_page(
+        await get_async_db(), folder, limit, cursor, unread_only
+    )
+
+
+async def has_embeddings() -> bool:
+    return await aio.has_embeddings(await get_async_db())
+
+
+async def get_folder_counters(folder: str) -> dict[str, int]:
+    return await aio.get_folder_counters(await get_async_db(), folder)
+
+
+async def list_folder_counters() -> list[dict]:
+    return await aio.list_folder_counters(await get_async_db())
+
+
+async def search_emails_advanced(
+    query: str, folder: str, limit: int, filters: dict
+) -> list[dict]:
+    return await aio.search_emails_advanced(
+        await get_async_db(), query, folder, limit, filters
+    )
+
+
+async def hybrid_search(
+    query: str,
+    query_embedding: list[float],
+    folder: str,
+    limit: int,
+    filters: dict,
+) -> list[dict]:
+    return await aio.hybrid_search(
+        await get_async_db(), query, query_embedding, folder, limit, filters
+    )
+
+
+async def get_search_suggestions(query: str, limit: int = 5) -> list[dict]:
+    return await aio.get_search_suggestions(await get_async_db(), query, limit)
+
+
+async def get_user_preferences(user_id: str = "default") -> dict:
+    return await aio.get_user_preferences(await get_async_db(), user_id)
+
+
+async def get_changed_emails(
+    folder: str, uids: list[int], limit: int = 10
+) -> list[dict]:
+    return await aio.get_changed_emails(await get_async_db(), folder, uids, limit)
+
+
+async def get_job(job_id: str) -> Optional[dict]:
+    return await aio.get_job(await get_async_db(), job_id)
+
+
+async def get_job_delta(
+    job_id: str, after_id: int = 0
+) -> tuple[list[dict], Optional[dict]]:
+    return await aio.get_job_delta(await get_async_db(), job_id, after_id)
+
+
+# ============================================================================
+# Offloaded to a worker thread
+# ============================================================================
+
+
+async def get_folders() -> list[str]:
+    return await run_sync("get_folders", sync_db.get_folders)
+
+
+async def semantic_search_advanced(
+    query_embedding: list[float],
+    folder: str,
+    limit: int,
+    filters: dict,
+    threshold: float = 0.5,
+) -> list[dict]:
+    return await run_sync(
+        "semantic_search_advanced",
+        sync_db.semantic_search_advanced,
+        query_embedding,
+        folder,
+        limit,
+        filters,
+        threshold,
+    )
+
+
+async def find_related_emails(uid: int, folder: str, limit: int = 5) -> list[dict]:
+    return await run_sync(
+        "find_related_emails", sync_db.find_related_emails, uid, folder, limit
+    )
+
+
+async def get_booking_link(link_id: str) -> Optional[dict[str, Any]]:
+    return await run_sync("get_booking_link", sync_db.get_booking_link, link_id)
+
+
+async def get_selected_calendar_ids(user_id: str = "default") -> list[str]:
+    return await run_sync(
+        "get_selected_calendar_ids", sync_db.get_selected_calendar_ids, user_id
+    )
+
+
+async def get_user_calendar_events_with_state(
+    user_id: str, time_min: str, time_max: str
+) -> tuple[dict, list[dict]]:
+    return await run_sync(
+        "get_user_calendar_events_with_state",
+        sync_db.get_user_calendar_events_with_state,
+        user_id,
+        time_min,
+        time_max,
+    )
+
+
+async def get_user_calendar_events(
+    user_id: str, time_min: str, time_max: str
+) -> tuple[list[str], list[dict]]:
+    return await run_sync(
+        "get_user_calendar_events",
+        sync_db.get_user_calendar_events,
+        user_id,
+        time_min,
+        time_max,
+    )
+
+
+async def get_user_calendar_event(
+    user_id: str, calendar_id: str, event_id: str
+) -> Optional[dict]:
+    return await run_sync(
+        "get_user_calendar_event",
+        sync_db.get_user_calendar_event,
+        user_id,
+        calendar_id,
+        event_id,
+    )
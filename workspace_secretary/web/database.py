@@ -14,6 +14,8 @@ from workspace_secretary.db.queries import contacts as contact_q
 from workspace_secretary.db.queries import calendar as calendar_q
 from workspace_secretary.db.queries import preferences as prefs_q
 from workspace_secretary.db.queries import booking_links as booking_q
+from workspace_secretary.db.queries import threads as thread_q
+from workspace_secretary.db.queries import counters as counter_q
 
 logger = logging.getLogger(__name__)
 
@@ -33,10 +35,14 @@ def get_db() -> PostgresDatabase:
 
         db_config = config.database.postgres
         embedding_dimensions = 1536
+        hnsw_ef_search = 100
+        hot_folders: list[str] = []
         if hasattr(config.database, "embeddings") and config.database.embeddings:
             embedding_dimensions = getattr(
                 config.database.embeddings, "dimensions", 1536
             )
+            hnsw_ef_search = getattr(config.database.embeddings, "hnsw_ef_search", 100)
+            hot_folders = getattr(config.database.embeddings, "hot_folders", [])
 
         _db = PostgresDatabase(
             host=db_config.host,
@@ -46,6 +52,8 @@ def get_db() -> PostgresDatabase:
             password=db_config.password,
             ssl_mode=getattr(db_config, "ssl_mode", "prefer"),
             embedding_dimensions=embedding_dimensions,
+            hnsw_ef_search=hnsw_ef_search,
+            hot_folders=hot_folders,
         )
         _db.initialize()
         logger.info("Web UI database initialized")
@@ -86,6 +94,16 @@ def get_inbox_emails(
     return email_q.get_inbox_emails(get_db(), folder, limit, offset, unread_only, label)
 
 
+def get_inbox_page(
+    folder: str,
+    limit: int,
+    cursor: str | None = None,
+    unread_only: bool = False,
+    label: str | None = None,
+) -> tuple[list[dict], Optional[str]]:
+    return email_q.get_inbox_page(get_db(), folder, limit, cursor, unread_only, label)
+
+
 def get_email(uid: int, folder: str) -> Optional[dict]:
     return email_q.get_email(get_db(), uid, folder)
 
@@ -100,6 +118,15 @@ def get_thread(uid: int, folder: str) -> list[dict]:
     return email_q.get_thread(get_db(), uid, folder)
 
 
+def get_threads_page(
+    folder: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    unread_only: bool = False,
+) -> tuple[list[dict], Optional[str]]:
+    return thread_q.get_threads_page(get_db(), folder, limit, cursor, unread_only)
+
+
 def search_emails(query: str, folder: str, limit: int) -> list[dict]:
     return email_q.search_emails_fts(get_db(), query, folder, limit)
 
@@ -112,6 +139,14 @@ def get_folders() -> list[str]:
     return email_q.get_folders(get_db())
 
 
+def get_folder_counters(folder: str) -> dict[str, int]:
+    return counter_q.get_folder_counters(get_db(), folder)
+
+
+def list_folder_counters() -> list[dict]:
+    return counter_q.list_folder_counters(get_db())
+
+
 def search_emails_advanced(
     query: str, folder: str, limit: int, filters: dict
 ) -> list[dict]:
@@ -136,6 +171,16 @@ def semantic_search_advanced(
     )
 
 
+def hybrid_search(
+    query: str,
+    query_embedding: list[float],
+    folder: str,
+    limit: int,
+    filters: dict,
+) -> list[dict]:
+    return emb_q.hybrid_search(get_db(), query, query_embedding, folder, limit, filters)
+
+
 def get_search_suggestions(query: str, limit: int = 5) -> list[dict]:
     return email_q.get_search_suggestions(get_db(), query, limit)
 
@@ -74,6 +74,12 @@ async def _request(method: str, path: str, json: Optional[dict] = None) -> dict:
         )
 
 
+async def hydrate_emails(folder: str, uids: list[int]) -> dict:
+    return await _request(
+        "POST", "/api/email/hydrate", {"folder": folder, "uids": uids}
+    )
+
+
 async def mark_read(uid: int, folder: str) -> dict:
     return await _request(
         "POST", "/api/email/mark-read", {"uid": uid, "folder": folder}
@@ -108,6 +114,11 @@ async def modify_labels(uid: int, folder: str, labels: list[str], action: str) -
     )
 
 
+async def batch_mutate(operations: list[dict]) -> dict:
+    """Apply many {uid, folder, action, destination?, labels?} operations at once."""
+    return await _request("POST", "/api/email/batch", {"operations": operations})
+
+
 async def send_email(
     to: str,
     subject: str,
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Request, Depends
 from fastapi.responses import HTMLResponse, JSONResponse
 from datetime import datetime, timedelta, timezone
 
-from workspace_secretary.web import database as db
+from workspace_secretary.web import async_database as adb, database as db
 from workspace_secretary.web import templates, get_template_context
 from workspace_secretary.web.auth import require_auth, Session
 from workspace_secretary.web.alerting import check_and_alert
@@ -134,39 +134,16 @@ def get_sync_stats() -> dict:
 
 
 def get_db_stats() -> dict:
-    with db.get_conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute("SELECT COUNT(*) FROM emails")
-            row = cur.fetchone()
-            total_emails = row[0] if row else 0
+    folders = db.list_folder_counters()
 
-            cur.execute("SELECT COUNT(DISTINCT folder) FROM emails")
-            row = cur.fetchone()
-            folder_count = row[0] if row else 0
-
-            cur.execute("SELECT COUNT(*) FROM emails WHERE is_unread = true")
-            row = cur.fetchone()
-            unread_count = row[0] if row else 0
-
-            cur.execute(
-                """
-                SELECT folder, COUNT(*) as count 
-                FROM emails 
-                GROUP BY folder 
-                ORDER BY count DESC
-                LIMIT 10
-                """
-            )
-            folder_breakdown = [
-                {"folder": row[0], "count": row[1]} for row in cur.fetchall()
-            ]
-
-            return {
-                "total_emails": total_emails,
-                "folder_count": folder_count,
-                "unread_count": unread_count,
-                "folder_breakdown": folder_breakdown,
-            }
+    return {
+        "total_emails": sum(f["total"] for f in folders),
+        "folder_count": len(folders),
+        "unread_count": sum(f["unread"] for f in folders),
+        "folder_breakdown": [
+            {"folder": f["folder"], "count": f["total"]} for f in folders[:10]
+        ],
+    }
 
 
 def get_integrity_stats() -> dict:
@@ -178,13 +155,9 @@ def get_integrity_stats() -> dict:
                     fs.folder,
                     fs.uidnext,
                     fs.last_sync,
-                    COALESCE(e.email_count, 0) as db_count
+                    COALESCE(fc.total, 0) as db_count
                 FROM folder_state fs
-                LEFT JOIN (
-                    SELECT folder, COUNT(*) as email_count
-                    FROM emails
-                    GROUP BY folder
-                ) e ON fs.folder = e.folder
+                LEFT JOIN folder_counters fc ON fc.folder = fs.folder
                 ORDER BY fs.folder
                 """
             )
@@ -193,9 +166,9 @@ def get_integrity_stats() -> dict:
 
             cur.execute(
                 """
-                SELECT COUNT(*) FROM emails e
+                SELECT COALESCE(SUM(fc.total), 0) FROM folder_counters fc
                 WHERE NOT EXISTS (
-                    SELECT 1 FROM folder_state fs WHERE fs.folder = e.folder
+                    SELECT 1 FROM folder_state fs WHERE fs.folder = fc.folder
                 )
                 """
             )
@@ -214,10 +187,10 @@ async def admin_dashboard(
     request: Request,
     session: Session = Depends(require_auth),
 ):
-    mutation_stats = get_mutation_stats()
-    sync_stats = get_sync_stats()
-    db_stats = get_db_stats()
-    integrity_stats = get_integrity_stats()
+    mutation_stats = await adb.run_sync("admin_mutation_stats", get_mutation_stats)
+    sync_stats = await adb.run_sync("admin_sync_stats", get_sync_stats)
+    db_stats = await adb.run_sync("admin_db_stats", get_db_stats)
+    integrity_stats = await adb.run_sync("admin_integrity_stats", get_integrity_stats)
 
     overall_health = "healthy"
     if mutation_stats["health"] == "critical" or sync_stats["health"] == "critical":
@@ -289,9 +262,7 @@ async def admin_dashboard(
     )
 
 
-@router.get("/api/activity/log")
-async def activity_log(session: Session = Depends(require_auth)):
-    """Get recent activity log from mutation journal."""
+def get_activity_log() -> dict:
     with db.get_conn() as conn:
         with conn.cursor() as cur:
             cur.execute(
@@ -313,3 +284,15 @@ async def activity_log(session: Session = Depends(require_auth)):
                     entry["completed_at"] = entry["completed_at"].isoformat()
 
             return {"log": log_entries}
+
+
+@router.get("/api/activity/log")
+async def activity_log(session: Session = Depends(require_auth)):
+    """Get recent activity log from mutation journal."""
+    return await adb.run_sync("admin_activity_log", get_activity_log)
+
+
+@router.get("/api/admin/query-metrics")
+async def query_metrics(session: Session = Depends(require_auth)):
+    """Per-query latency histograms and async pool statistics."""
+    return await adb.query_metrics()
@@ -6,7 +6,7 @@ from email.utils import parseaddr
 
 from workspace_secretary.email_auth import parse_authentication_results
 
-from workspace_secretary.web import database as db
+from workspace_secretary.web import async_database as adb
 from workspace_secretary.web import templates, get_template_context
 from workspace_secretary.config import load_config
 from workspace_secretary.web.auth import require_auth, Session
@@ -224,7 +224,7 @@ def compute_priority(signals: dict) -> tuple[str, str]:
 async def get_email_analysis(
     folder: str, uid: int, session: Session = Depends(require_auth)
 ):
-    email = db.get_email(uid, folder)
+    email = await adb.get_email(uid, folder)
     if not email:
         return JSONResponse({"error": "Email not found"}, status_code=404)
 
@@ -232,9 +232,9 @@ async def get_email_analysis(
     priority, priority_reason = compute_priority(signals)
 
     related = []
-    if db.has_embeddings():
+    if await adb.has_embeddings():
         try:
-            related = db.find_related_emails(uid, folder, limit=5)
+            related = await adb.find_related_emails(uid, folder, limit=5)
         except Exception:
             pass
 
@@ -272,7 +272,7 @@ async def get_email_analysis(
             for r in related
         ],
         "suggested_actions": suggested_actions,
-        "has_embeddings": db.has_embeddings(),
+        "has_embeddings": await adb.has_embeddings(),
     }
 
 
@@ -280,7 +280,7 @@ async def get_email_analysis(
 async def analysis_sidebar(
     request: Request, folder: str, uid: int, session: Session = Depends(require_auth)
 ):
-    email = db.get_email(uid, folder)
+    email = await adb.get_email(uid, folder)
     if not email:
         return HTMLResponse("<div class='p-4 text-red-400'>Email not found</div>")
 
@@ -288,9 +288,9 @@ async def analysis_sidebar(
     priority, priority_reason = compute_priority(signals)
 
     related = []
-    if db.has_embeddings():
+    if await adb.has_embeddings():
         try:
-            related = db.find_related_emails(uid, folder, limit=5)
+            related = await adb.find_related_emails(uid, folder, limit=5)
         except Exception:
             pass
 
@@ -317,7 +317,7 @@ async def analysis_sidebar(
             priority_reason=priority_reason,
             related_emails=related,
             suggested_actions=suggested_actions,
-            has_embeddings=db.has_embeddings(),
+            has_embeddings=await adb.has_embeddings(),
             folder=folder,
             uid=uid,
         ),
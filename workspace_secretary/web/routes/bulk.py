@@ -12,6 +12,33 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+async def _apply_batch(emails: List[dict], action: str, **params) -> int:
+    """Send the selection to the engine as one batch; returns the success count."""
+    operations = [
+        {
+            "uid": int(email["uid"]),
+            "folder": email["folder"],
+            "action": action,
+            **params,
+        }
+        for email in emails
+    ]
+    try:
+        result = await engine_client.batch_mutate(operations)
+    except Exception:
+        logger.exception("Bulk %s failed for %d emails", action, len(operations))
+        return 0
+
+    if result.get("failed"):
+        logger.warning(
+            "Bulk %s: %s of %d emails failed",
+            action,
+            result["failed"],
+            len(operations),
+        )
+    return int(result.get("succeeded", 0))
+
+
 @router.post("/api/bulk/mark-read")
 async def bulk_mark_read(request: Request, session: Session = Depends(require_auth)):
     data = await request.json()
@@ -20,17 +47,7 @@ async def bulk_mark_read(request: Request, session: Session = Depends(require_au
     if not uids:
         raise HTTPException(status_code=400, detail="No emails selected")
 
-    success_count = 0
-    for email in uids:
-        try:
-            await engine_client.mark_read(int(email["uid"]), email["folder"])
-            success_count += 1
-        except Exception:
-            logger.exception(
-                "Failed to mark email uid=%s in folder=%s as read",
-                email.get("uid"),
-                email.get("folder"),
-            )
+    success_count = await _apply_batch(uids, "mark_read")
 
     return JSONResponse(
         {
@@ -49,17 +66,7 @@ async def bulk_mark_unread(request: Request, session: Session = Depends(require_
     if not uids:
         raise HTTPException(status_code=400, detail="No emails selected")
 
-    success_count = 0
-    for email in uids:
-        try:
-            await engine_client.mark_unread(int(email["uid"]), email["folder"])
-            success_count += 1
-        except Exception:
-            logger.exception(
-                "Failed to mark email uid=%s in folder=%s as unread",
-                email.get("uid"),
-                email.get("folder"),
-            )
+    success_count = await _apply_batch(uids, "mark_unread")
 
     return JSONResponse(
         {
@@ -78,19 +85,7 @@ async def bulk_archive(request: Request, session: Session = Depends(require_auth
     if not uids:
         raise HTTPException(status_code=400, detail="No emails selected")
 
-    success_count = 0
-    for email in uids:
-        try:
-            await engine_client.move_email(
-                int(email["uid"]), email["folder"], "[Gmail]/All Mail"
-            )
-            success_count += 1
-        except Exception:
-            logger.exception(
-                "Failed to archive email uid=%s from folder=%s",
-                email.get("uid"),
-                email.get("folder"),
-            )
+    success_count = await _apply_batch(uids, "move", destination="[Gmail]/All Mail")
 
     return JSONResponse(
         {
@@ -109,19 +104,7 @@ async def bulk_delete(request: Request, session: Session = Depends(require_auth)
     if not uids:
         raise HTTPException(status_code=400, detail="No emails selected")
 
-    success_count = 0
-    for email in uids:
-        try:
-            await engine_client.move_email(
-                int(email["uid"]), email["folder"], "[Gmail]/Trash"
-            )
-            success_count += 1
-        except Exception:
-            logger.exception(
-                "Failed to delete email uid=%s from folder=%s",
-                email.get("uid"),
-                email.get("folder"),
-            )
+    success_count = await _apply_batch(uids, "move", destination="[Gmail]/Trash")
 
     return JSONResponse(
         {
@@ -144,20 +127,7 @@ async def bulk_move(request: Request, session: Session = Depends(require_auth)):
     if not destination:
         raise HTTPException(status_code=400, detail="No destination folder")
 
-    success_count = 0
-    for email in uids:
-        try:
-            await engine_client.move_email(
-                int(email["uid"]), email["folder"], destination
-            )
-            success_count += 1
-        except Exception:
-            logger.exception(
-                "Failed to move email uid=%s from folder=%s to %s",
-                email.get("uid"),
-                email.get("folder"),
-                destination,
-            )
+    success_count = await _apply_batch(uids, "move", destination=destination)
 
     return JSONResponse(
         {
@@ -170,10 +140,10 @@ async def bulk_move(request: Request, session: Session = Depends(require_auth)):
 
 @router.post("/api/email/toggle-star/{folder}/{uid}")
 async def toggle_star(folder: str, uid: int, session: Session = Depends(require_auth)):
-    from workspace_secretary.web import database as db
+    from workspace_secretary.web import async_database as adb
 
     try:
-        email = db.get_email(uid, folder)
+        email = await adb.get_email(uid, folder)
         if not email:
             raise HTTPException(status_code=404, detail="Email not found")
 
@@ -210,20 +180,7 @@ async def bulk_label(request: Request, session: Session = Depends(require_auth))
     if not label:
         raise HTTPException(status_code=400, detail="No label specified")
 
-    success_count = 0
-    for email in uids:
-        try:
-            await engine_client.modify_labels(
-                int(email["uid"]), email["folder"], [label], "add"
-            )
-            success_count += 1
-        except Exception:
-            logger.exception(
-                "Failed to label email uid=%s in folder=%s with %s",
-                email.get("uid"),
-                email.get("folder"),
-                label,
-            )
+    success_count = await _apply_batch(uids, "add_labels", labels=[label])
 
     return JSONResponse(
         {
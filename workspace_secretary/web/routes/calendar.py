@@ -12,7 +12,7 @@ from workspace_secretary.web import (
     get_template_context,
 )
 from workspace_secretary.web.auth import require_auth, Session
-from workspace_secretary.web import database as db
+from workspace_secretary.web import async_database as adb
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -134,12 +134,12 @@ def _generate_booking_slots(
     return slots
 
 
-def _get_booking_link_context(
+async def _get_booking_link_context(
     link_id: str,
 ) -> tuple[Optional[dict[str, Any]], Optional[dict[str, Any]]]:
     """Fetch booking link along with an error descriptor if invalid/inactive."""
 
-    link = db.get_booking_link(link_id)
+    link = await adb.get_booking_link(link_id)
     if not link:
         return None, {"status": 404, "detail": "Booking link not found"}
     if not link.get("is_active", True):
@@ -147,8 +147,8 @@ def _get_booking_link_context(
     return link, None
 
 
-def _require_booking_link(link_id: str) -> dict[str, Any]:
-    link, error = _get_booking_link_context(link_id)
+async def _require_booking_link(link_id: str) -> dict[str, Any]:
+    link, error = await _get_booking_link_context(link_id)
     if error:
         raise HTTPException(status_code=error["status"], detail=error["detail"])
     assert link is not None  # For type-checkers
@@ -216,7 +216,7 @@ async def calendar_view(
     events: list[dict] = []
 
     try:
-        selection_state, events = db.get_user_calendar_events_with_state(
+        selection_state, events = await adb.get_user_calendar_events_with_state(
             session.user_id, time_min, time_max
         )
     except Exception as e:
@@ -447,7 +447,7 @@ async def find_time_slots(
         time_min = start_dt.strftime("%Y-%m-%dT00:00:00Z")
         time_max = end_dt.strftime("%Y-%m-%dT23:59:59Z")
 
-        selection_state, my_busy = db.get_user_calendar_events_with_state(
+        selection_state, my_busy = await adb.get_user_calendar_events_with_state(
             session.user_id, time_min, time_max
         )
 
@@ -554,7 +554,7 @@ async def availability_widget(
     time_max = (now + timedelta(days=days)).strftime("%Y-%m-%dT23:59:59Z")
 
     try:
-        selection_state, _ = db.get_user_calendar_events_with_state(
+        selection_state, _ = await adb.get_user_calendar_events_with_state(
             session.user_id, time_min, time_max
         )
         freebusy_response = await engine.freebusy_query(
@@ -583,7 +583,7 @@ async def get_calendar_event_detail(
     event_id: str,
     session: Session = Depends(require_auth),
 ):
-    event = db.get_user_calendar_event(session.user_id, calendar_id, event_id)
+    event = await adb.get_user_calendar_event(session.user_id, calendar_id, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return JSONResponse({"success": True, "event": event})
@@ -609,7 +609,7 @@ async def create_event(
             else None
         )
         target_calendar_id = (
-            calendar_id or db.get_selected_calendar_ids(session.user_id)[0]
+            calendar_id or (await adb.get_selected_calendar_ids(session.user_id))[0]
         )
 
         meeting_type: Optional[str] = None
@@ -698,7 +698,7 @@ async def respond_to_event(
 
     try:
         target_calendar_id = (
-            calendar_id or db.get_selected_calendar_ids(session.user_id)[0]
+            calendar_id or (await adb.get_selected_calendar_ids(session.user_id))[0]
         )
         result = await engine.respond_to_invite(event_id, response, target_calendar_id)
         if result.get("status") == "error":
@@ -721,7 +721,7 @@ async def public_booking_page(
     request: Request,
     link_id: str,
 ):
-    link, error = _get_booking_link_context(link_id)
+    link, error = await _get_booking_link_context(link_id)
     context = {
         "link_id": link_id,
         "booking_link": link,
@@ -741,7 +741,7 @@ async def get_booking_slots(
     link_id: str = Query(...),
 ):
     try:
-        link = _require_booking_link(link_id)
+        link = await _require_booking_link(link_id)
         booking_tz = _get_timezone(link.get("timezone") or "UTC")
 
         now = datetime.now(booking_tz)
@@ -754,7 +754,7 @@ async def get_booking_slots(
         time_min = start_dt.astimezone(ZoneInfo("UTC")).strftime("%Y-%m-%dT%H:%M:%SZ")
         time_max = end_dt.astimezone(ZoneInfo("UTC")).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        selected_ids, busy_events = db.get_user_calendar_events(
+        selected_ids, busy_events = await adb.get_user_calendar_events(
             user_id, time_min, time_max
         )
         busy_events = [
@@ -904,7 +904,7 @@ async def book_meeting(
     slot_end: str = Form(...),
 ):
     try:
-        link = _require_booking_link(link_id)
+        link = await _require_booking_link(link_id)
         summary = link.get("meeting_title") or f"Meeting with {name}"
         description = link.get("meeting_description") or "Booked via scheduling link"
         description += f"\n\nAttendee: {name} ({email})"
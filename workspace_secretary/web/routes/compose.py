@@ -12,7 +12,7 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from typing import Optional, List
 import logging
 
-from workspace_secretary.web import database as db
+from workspace_secretary.web import async_database as adb
 from workspace_secretary.web import engine_client as engine
 from workspace_secretary.web import templates, get_template_context
 from workspace_secretary.web.auth import require_auth, Session
@@ -54,7 +54,7 @@ async def compose_modal(
     if uid:
         # Fetch original email for reply/forward context
         try:
-            email = db.get_email(uid, folder)
+            email = await adb.get_email(uid, folder)
         except Exception as e:
             logger.warning(f"Failed to fetch email uid={uid} folder={folder}: {e}")
             email = None
@@ -184,7 +184,7 @@ async def contacts_autocomplete(
     q: str = Query(..., min_length=1),
     session: Session = Depends(require_auth),
 ):
-    emails_raw = db.get_inbox_emails("INBOX", limit=100, offset=0)
+    emails_raw = await adb.get_inbox_emails("INBOX", limit=100, offset=0)
     contacts = set()
     for email in emails_raw:
         addr = email.get("from_addr", "")
@@ -3,7 +3,7 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from datetime import datetime, timezone
 import logging
 
-from workspace_secretary.web import database as db
+from workspace_secretary.web import async_database as adb
 from workspace_secretary.web import engine_client as engine
 from workspace_secretary.web import templates, get_template_context
 from workspace_secretary.web.routes.analysis import analyze_signals, compute_priority
@@ -15,10 +15,12 @@ logger = logging.getLogger(__name__)
 
 @router.get("/", response_class=HTMLResponse, name="dashboard")
 async def dashboard(request: Request, session: Session = Depends(require_auth)):
-    unread_emails = db.get_inbox_emails("INBOX", limit=50, offset=0, unread_only=True)
+    unread_emails = await adb.get_inbox_emails(
+        "INBOX", limit=20, offset=0, unread_only=True
+    )
 
     priority_emails = []
-    for email in unread_emails[:20]:
+    for email in unread_emails:
         signals = analyze_signals(email)
         priority, reason = compute_priority(signals)
         if priority in ("high", "medium"):
@@ -49,7 +51,7 @@ async def dashboard(request: Request, session: Session = Depends(require_auth)):
     upcoming_events: list[dict] = []
 
     try:
-        selection_state, events = db.get_user_calendar_events_with_state(
+        selection_state, events = await adb.get_user_calendar_events_with_state(
             session.user_id, today_start, today_end
         )
         for event in events:
@@ -75,7 +77,7 @@ async def dashboard(request: Request, session: Session = Depends(require_auth)):
     meetings_today = len(upcoming_events)
     upcoming_events = upcoming_events[:5]
 
-    unread_count = len(unread_emails)
+    unread_count = (await adb.get_folder_counters("INBOX"))["unread"]
     priority_count = len([e for e in priority_emails if e["priority"] == "high"])
 
     stats = {
@@ -102,10 +104,12 @@ async def dashboard(request: Request, session: Session = Depends(require_auth)):
 
 @router.get("/api/stats", response_class=HTMLResponse)
 async def get_stats(request: Request, session: Session = Depends(require_auth)):
-    unread_emails = db.get_inbox_emails("INBOX", limit=100, offset=0, unread_only=True)
+    unread_emails = await adb.get_inbox_emails(
+        "INBOX", limit=30, offset=0, unread_only=True
+    )
 
     high_priority = 0
-    for email in unread_emails[:30]:
+    for email in unread_emails:
         signals = analyze_signals(email)
         priority, _ = compute_priority(signals)
         if priority == "high":
@@ -120,7 +124,7 @@ async def get_stats(request: Request, session: Session = Depends(require_auth)):
     )
 
     try:
-        selection_state, events = db.get_user_calendar_events_with_state(
+        selection_state, events = await adb.get_user_calendar_events_with_state(
             session.user_id, today_start, today_end
         )
         meetings_today = len(events)
@@ -131,7 +135,7 @@ async def get_stats(request: Request, session: Session = Depends(require_auth)):
         "partials/stats_badges.html",
         get_template_context(
             request,
-            unread_count=len(unread_emails),
+            unread_count=(await adb.get_folder_counters("INBOX"))["unread"],
             priority_count=high_priority,
             meetings_today=meetings_today,
         ),
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 import json
-import time
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
 from workspace_secretary.db.queries import imap_jobs as imap_jobs_q
+from workspace_secretary.web import async_database as adb
 from workspace_secretary.web.auth import require_auth
 from workspace_secretary.web.database import get_db
 
@@ -44,64 +44,68 @@ def _sse(event: dict[str, Any]) -> str:
     return f"data: {json.dumps(event, default=str)}\n\n"
 
 
+# Without a notification the stream still re-reads the job this often, and
+# sends an SSE comment so proxies keep the connection open.
+STREAM_KEEPALIVE_S = 15.0
+
+
+def _job_status(job_row: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "type": "job_status",
+        "status": job_row.get("status"),
+        "processed": job_row.get("processed"),
+        "total_estimate": job_row.get("total_estimate"),
+    }
+
+
 @router.get("/{job_id}/events")
-def stream_job_events(
+async def stream_job_events(
     job_id: str,
     request: Request,
     after_id: int = 0,
     _: Any = Depends(require_auth),
 ) -> StreamingResponse:
-    db = get_db()
-
-    job = imap_jobs_q.get_job(db, job_id)
-    if job is None:
+    if await adb.get_job(job_id) is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    def gen():
+    hub = await adb.get_notification_hub()
+
+    async def gen():
         last_id = after_id
-        while True:
-            if request.client is None:
-                break
-
-            if getattr(request, "is_disconnected", None):
-                try:
-                    if request.is_disconnected():
-                        break
-                except Exception:
-                    pass
-
-            events = imap_jobs_q.list_events(db, job_id, after_id=last_id)
-            for e in events:
-                last_id = int(e["id"])
-                yield _sse(
-                    {
-                        "type": "job_event",
-                        "id": e["id"],
-                        "created_at": e["created_at"],
-                        "level": e["level"],
-                        "message": e["message"],
-                        "data": e["data"],
-                    }
-                )
-
-            job_row = imap_jobs_q.get_job(db, job_id)
-            if job_row is None:
-                yield _sse({"type": "error", "message": "Job disappeared"})
-                break
-
-            yield _sse(
-                {
-                    "type": "job_status",
-                    "status": job_row.get("status"),
-                    "processed": job_row.get("processed"),
-                    "total_estimate": job_row.get("total_estimate"),
-                }
-            )
-
-            if job_row.get("status") in ("completed", "failed", "cancelled"):
-                break
-
-            time.sleep(0.75)
+        last_status = None
+        # Subscribe before the first read so no notification can fall between
+        with hub.subscription(imap_jobs_q.JOB_EVENTS_CHANNEL, job_id) as sub:
+            while True:
+                events, job_row = await adb.get_job_delta(job_id, last_id)
+                for e in events:
+                    last_id = int(e["id"])
+                    yield _sse(
+                        {
+                            "type": "job_event",
+                            "id": e["id"],
+                            "created_at": e["created_at"],
+                            "level": e["level"],
+                            "message": e["message"],
+                            "data": e["data"],
+                        }
+                    )
+
+                if job_row is None:
+                    yield _sse({"type": "error", "message": "Job disappeared"})
+                    break
+
+                status = _job_status(job_row)
+                if status != last_status:
+                    yield _sse(status)
+                    last_status = status
+
+                if job_row.get("status") in imap_jobs_q.TERMINAL_STATUSES:
+                    break
+
+                if not await sub.wait(STREAM_KEEPALIVE_S):
+                    yield ": keepalive\n\n"
+                if await request.is_disconnected():
+                    break
 
     return StreamingResponse(gen(), media_type="text/event-stream")
 
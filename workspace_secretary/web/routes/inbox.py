@@ -3,7 +3,11 @@ from fastapi.responses import HTMLResponse
 from datetime import datetime
 import html
 
-from workspace_secretary.web import database as db, templates, get_template_context
+from workspace_secretary.web import (
+    async_database as adb,
+    templates,
+    get_template_context,
+)
 from workspace_secretary.web.auth import require_auth, Session
 
 router = APIRouter()
@@ -56,37 +60,118 @@ def extract_name(addr: str) -> str:
     return addr.split("@")[0]
 
 
+def page_links(
+    cursor: str | None, back: str | None
+) -> tuple[str | None, str | None, str]:
+    """Cursors for the no-JS Previous/Next links.
+
+    Keyset cursors only go forward, so ``back`` carries the cursors of the
+    earlier pages, dot-separated (cursors are URL-safe base64), with an
+    empty entry for the first page. ``back`` is None on the first page.
+
+    Returns:
+        (previous cursor, previous ``back``, ``back`` for the next page)
+    """
+    stack = back.split(".") if back is not None else []
+    next_back = ".".join([*stack, cursor or ""])
+    if not stack:
+        return None, None, next_back
+    prev_back = ".".join(stack[:-1]) if len(stack) > 1 else None
+    return stack[-1] or None, prev_back, next_back
+
+
+async def load_page(
+    folder: str,
+    per_page: int,
+    cursor: str | None,
+    unread_only: bool,
+    label: str | None,
+) -> tuple[list[dict], str | None]:
+    """Keyset page of the email list; a stale or malformed cursor restarts at the top."""
+    try:
+        return await adb.get_inbox_page(folder, per_page, cursor, unread_only, label)
+    except ValueError:
+        return await adb.get_inbox_page(folder, per_page, None, unread_only, label)
+
+
+def email_row(e: dict) -> dict:
+    return {
+        "uid": e["uid"],
+        "folder": e["folder"],
+        "from_name": extract_name(e.get("from_addr", "")),
+        "from_addr": e.get("from_addr", ""),
+        "subject": e.get("subject", "(no subject)"),
+        "preview": truncate(e.get("preview") or "", 120),
+        "date": format_date(e.get("date")),
+        "is_unread": e.get("is_unread", False),
+        "is_starred": is_starred(e),
+        "has_attachments": e.get("has_attachments", False),
+        "thread_count": 1,
+    }
+
+
+def thread_row(t: dict) -> dict:
+    """Thread summary shaped like an email row; it opens the latest message."""
+    participants = [extract_name(p) for p in t.get("participants") or []]
+    return {
+        "uid": t["last_uid"],
+        "folder": t["last_folder"],
+        "from_name": ", ".join(participants[:3])
+        + (f" +{len(participants) - 3}" if len(participants) > 3 else ""),
+        "from_addr": "",
+        "subject": t.get("subject") or "(no subject)",
+        "preview": truncate(t.get("snippet") or "", 120),
+        "date": format_date(t.get("last_date")),
+        "is_unread": (t.get("unread_count") or 0) > 0,
+        "is_starred": False,
+        "has_attachments": False,
+        "thread_count": t.get("message_count") or 1,
+    }
+
+
+async def load_rows(
+    folder: str,
+    per_page: int,
+    cursor: str | None,
+    unread_only: bool,
+    label: str | None,
+    threaded: bool,
+) -> tuple[list[dict], str | None]:
+    """Rows for the list view: one per email, or one per conversation."""
+    if not threaded or label:
+        emails, next_cursor = await load_page(
+            folder, per_page, cursor, unread_only, label
+        )
+        return [email_row(e) for e in emails], next_cursor
+    try:
+        threads, next_cursor = await adb.get_threads_page(
+            folder, per_page, cursor, unread_only
+        )
+    except ValueError:
+        threads, next_cursor = await adb.get_threads_page(
+            folder, per_page, None, unread_only
+        )
+    return [thread_row(t) for t in threads], next_cursor
+
+
 @router.get("/inbox", response_class=HTMLResponse)
 async def inbox(
     request: Request,
     page: int = Query(1, ge=1),
+    cursor: str | None = Query(None),
+    back: str | None = Query(None),
     per_page: int = Query(50, ge=10, le=100),
     folder: str = Query("INBOX"),
     unread_only: bool = Query(False),
     label: str | None = Query(None),
+    threaded: bool = Query(False),
     session: Session = Depends(require_auth),
 ):
-    offset = (page - 1) * per_page
-    emails_raw = db.get_inbox_emails(folder, per_page + 1, offset, unread_only, label)
-
-    has_more = len(emails_raw) > per_page
-    emails_raw = emails_raw[:per_page]
-
-    emails = [
-        {
-            "uid": e["uid"],
-            "folder": e["folder"],
-            "from_name": extract_name(e.get("from_addr", "")),
-            "from_addr": e.get("from_addr", ""),
-            "subject": e.get("subject", "(no subject)"),
-            "preview": truncate(e.get("preview") or "", 120),
-            "date": format_date(e.get("date")),
-            "is_unread": e.get("is_unread", False),
-            "is_starred": is_starred(e),
-            "has_attachments": e.get("has_attachments", False),
-        }
-        for e in emails_raw
-    ]
+    emails, next_cursor = await load_rows(
+        folder, per_page, cursor, unread_only, label, threaded
+    )
+    has_more = next_cursor is not None
+    prev_cursor, prev_back, next_back = page_links(cursor, back)
 
     return templates.TemplateResponse(
         "inbox.html",
@@ -94,11 +179,18 @@ async def inbox(
             request,
             emails=emails,
             page=page,
+            cursor=cursor,
+            next_cursor=next_cursor,
+            has_previous=back is not None,
+            prev_cursor=prev_cursor,
+            prev_back=prev_back,
+            next_back=next_back,
             per_page=per_page,
             has_more=has_more,
             folder=folder,
             unread_only=unread_only,
             label=label,
+            threaded=threaded,
         ),
     )
 
@@ -107,38 +199,31 @@ async def inbox(
 async def emails_partial(
     request: Request,
     page: int = Query(1, ge=1),
+    cursor: str | None = Query(None),
     per_page: int = Query(50, ge=10, le=100),
     folder: str = Query("INBOX"),
     unread_only: bool = Query(False),
     label: str | None = Query(None),
+    threaded: bool = Query(False),
     session: Session = Depends(require_auth),
 ):
-    offset = (page - 1) * per_page
-    emails_raw = db.get_inbox_emails(folder, per_page + 1, offset, unread_only, label)
-
-    has_more = len(emails_raw) > per_page
-    emails_raw = emails_raw[:per_page]
-
-    emails = [
-        {
-            "uid": e["uid"],
-            "folder": e["folder"],
-            "from_name": extract_name(e.get("from_addr", "")),
-            "from_addr": e.get("from_addr", ""),
-            "subject": e.get("subject", "(no subject)"),
-            "preview": truncate(e.get("preview") or "", 120),
-            "date": format_date(e.get("date")),
-            "is_unread": e.get("is_unread", False),
-            "is_starred": is_starred(e),
-            "has_attachments": e.get("has_attachments", False),
-        }
-        for e in emails_raw
-    ]
+    emails, next_cursor = await load_rows(
+        folder, per_page, cursor, unread_only, label, threaded
+    )
+    has_more = next_cursor is not None
 
     return templates.TemplateResponse(
         "partials/email_list.html",
         get_template_context(
-            request, emails=emails, page=page, has_more=has_more, label=label
+            request,
+            emails=emails,
+            page=page,
+            next_cursor=next_cursor,
+            has_more=has_more,
+            folder=folder,
+            unread_only=unread_only,
+            label=label,
+            threaded=threaded,
         ),
     )
 
@@ -147,33 +232,18 @@ async def emails_partial(
 async def inbox_more(
     request: Request,
     page: int = Query(1, ge=1),
+    cursor: str | None = Query(None),
     per_page: int = Query(50, ge=10, le=100),
     folder: str = Query("INBOX"),
     unread_only: bool = Query(False),
     label: str | None = Query(None),
+    threaded: bool = Query(False),
     session: Session = Depends(require_auth),
 ):
-    offset = (page - 1) * per_page
-    emails_raw = db.get_inbox_emails(folder, per_page + 1, offset, unread_only, label)
-
-    has_more = len(emails_raw) > per_page
-    emails_raw = emails_raw[:per_page]
-
-    emails = [
-        {
-            "uid": e["uid"],
-            "folder": e["folder"],
-            "from_name": extract_name(e.get("from_addr", "")),
-            "from_addr": e.get("from_addr", ""),
-            "subject": e.get("subject", "(no subject)"),
-            "preview": truncate(e.get("preview") or "", 120),
-            "date": format_date(e.get("date")),
-            "is_unread": e.get("is_unread", False),
-            "is_starred": is_starred(e),
-            "has_attachments": e.get("has_attachments", False),
-        }
-        for e in emails_raw
-    ]
+    emails, next_cursor = await load_rows(
+        folder, per_page, cursor, unread_only, label, threaded
+    )
+    has_more = next_cursor is not None
 
     return templates.TemplateResponse(
         "partials/inbox_more.html",
@@ -181,9 +251,11 @@ async def inbox_more(
             request,
             emails=emails,
             page=page,
+            next_cursor=next_cursor,
             has_more=has_more,
             folder=folder,
             unread_only=unread_only,
+            threaded=threaded,
         ),
     )
 
@@ -195,7 +267,7 @@ async def inbox_widget(
     unread_only: bool = Query(False),
     session: Session = Depends(require_auth),
 ):
-    emails_raw = db.get_inbox_emails("INBOX", limit, 0, unread_only)
+    emails_raw = await adb.get_inbox_emails("INBOX", limit, 0, unread_only)
 
     emails = [
         {
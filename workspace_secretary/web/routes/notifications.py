@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Request, Depends, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Sequence
 import json
 import logging
+from functools import partial
 
-from workspace_secretary.web import database as db, engine_client as engine
+from workspace_secretary.db.notify import NotificationHub
+from workspace_secretary.db.queries import changes as changes_q
+from workspace_secretary.web import async_database as adb, engine_client as engine
 from workspace_secretary.web import templates, get_template_context
 from workspace_secretary.web.auth import require_auth, Session
 
@@ -35,111 +38,208 @@ async def sync_status(session: Session = Depends(require_auth)):
     }
 
 
-# Track last check time per session (in production, use Redis or DB)
-_last_check: dict[str, datetime] = {}
-IGNORED_SESSION_IDS = {"test-session"}
+# The change stream wakes at least this often: it sends an SSE comment so
+# proxies keep the connection open, and checks for due calendar reminders.
+STREAM_KEEPALIVE_S = 15.0
+# Upcoming events are loaded this far ahead and re-read halfway through, or
+# as soon as the calendar cache changes
+REMINDER_WINDOW = timedelta(hours=1)
+REMINDER_LEAD = timedelta(minutes=30)
 
 
-@router.get("/api/notifications/check")
-async def check_notifications(
-    request: Request, session: Session = Depends(require_auth)
-):
-    """Check for new priority emails and upcoming calendar reminders since last check."""
-    session_id = request.cookies.get("session_id", "default")
-    last_check = _last_check.get(session_id)
-    now = datetime.now(timezone.utc)
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
-    # Update last check time
-    _last_check[session_id] = now
 
-    if last_check is None and session_id not in IGNORED_SESSION_IDS:
-        # First check - don't flood with notifications
-        return JSONResponse(
-            {
-                "new_emails": [],
-                "calendar_reminders": [],
-                "count": 0,
-            }
-        )
+def _format_date(date_val) -> Optional[str]:
+    if not date_val:
+        return None
+    if isinstance(date_val, datetime):
+        return date_val.isoformat()
+    return str(date_val)
 
-    # Get new priority emails since last check
-    new_emails = db.get_new_priority_emails(since=last_check)
 
-    # Get upcoming calendar events in the next hour for reminders
-    time_min = now.strftime("%Y-%m-%dT%H:%M:%SZ")
-    time_max = (now + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+def _email_notification(email: dict) -> dict:
+    return {
+        "uid": email["uid"],
+        "folder": email.get("folder", "INBOX"),
+        "from": email.get("from_addr", "Unknown"),
+        "subject": email.get("subject", "(no subject)"),
+        "preview": (email.get("preview") or "")[:100],
+        "date": _format_date(email.get("date")),
+    }
+
+
+def _notification(
+    new_emails: Sequence[dict] = (), calendar_reminders: Sequence[dict] = ()
+) -> dict:
+    return {
+        "new_emails": list(new_emails),
+        "calendar_reminders": list(calendar_reminders),
+        "count": len(new_emails) + len(calendar_reminders),
+    }
 
-    calendar_reminders = []
+
+async def _upcoming_events(user_id: str, now: datetime) -> list[dict]:
+    """Selected-calendar events starting within REMINDER_WINDOW of ``now``."""
+    time_min = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+    time_max = (now + REMINDER_WINDOW).strftime("%Y-%m-%dT%H:%M:%SZ")
     try:
-        selection_state, events = db.get_user_calendar_events_with_state(
-            session.user_id, time_min, time_max
+        selection_state, events = await adb.get_user_calendar_events_with_state(
+            user_id, time_min, time_max
         )
     except Exception as e:
         logger.error(
             "Failed to fetch calendar reminders for notifications: %s", e, exc_info=True
         )
-        selection_state = {"selected_ids": ["primary"], "available_ids": []}
-        events = []
-        calendar_reminders = []
+        return []
+    return [
+        event
+        for event in events
+        if event.get("calendarId") in selection_state["selected_ids"]
+    ]
+
 
+def due_reminders(events: list[dict], now: datetime, sent: set[str]) -> list[dict]:
+    """Reminders for events starting within REMINDER_LEAD; adds them to ``sent``."""
+    reminders = []
     for event in events:
-        if event.get("calendarId") not in selection_state["selected_ids"]:
+        key = f"{event.get('calendarId')}/{event.get('id')}"
+        if key in sent:
             continue
 
-        # Parse event start time
         start = event.get("start", {})
         if isinstance(start, dict):
             start_time = start.get("dateTime") or start.get("date")
         else:
             start_time = str(start) if start else None
-
         if not start_time:
             continue
 
-        # Parse event start datetime
         try:
             event_start = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
-            # Only remind about events starting within 30 minutes
-            if (event_start - now).total_seconds() <= 1800:
-                calendar_reminders.append(
-                    {
-                        "id": event.get("id"),
-                        "calendarId": event.get("calendarId"),
-                        "summary": event.get("summary", "Untitled Event"),
-                        "start": start_time,
-                        "location": event.get("location", ""),
-                    }
-                )
+            if event_start.tzinfo is None:
+                event_start = event_start.replace(tzinfo=timezone.utc)
+            if event_start - now > REMINDER_LEAD:
+                continue
         except (ValueError, TypeError, AttributeError):
             continue
 
-    def format_date(date_val):
-        if not date_val:
-            return None
-        try:
-            if isinstance(date_val, datetime):
-                return date_val.isoformat()
-            return str(date_val)
-        except Exception:
-            return None
+        sent.add(key)
+        reminders.append(
+            {
+                "id": event.get("id"),
+                "calendarId": event.get("calendarId"),
+                "summary": event.get("summary", "Untitled Event"),
+                "start": start_time,
+                "location": event.get("location", ""),
+            }
+        )
+    return reminders
 
-    return JSONResponse(
-        {
-            "new_emails": [
-                {
-                    "uid": e["uid"],
-                    "folder": e.get("folder", "INBOX"),
-                    "from": e.get("from_addr", "Unknown"),
-                    "subject": e.get("subject", "(no subject)"),
-                    "preview": (e.get("preview") or "")[:100],
-                    "date": format_date(e.get("date")),
-                }
-                for e in new_emails
-            ],
-            "calendar_reminders": calendar_reminders,
-            "count": len(new_emails) + len(calendar_reminders),
-        }
-    )
+
+async def change_messages(
+    payloads: list[Optional[str]],
+    hub: Optional[NotificationHub] = None,
+    since: int = 0,
+) -> list[tuple[str, dict]]:
+    """SSE messages for a burst of mailbox change notifications.
+
+    Each changed folder gets one ``mailbox`` message with its fresh counters;
+    new unread mail also becomes a ``notification``. A ``None`` payload means
+    changes may have been missed, so clients are told to ``resync``.
+
+    With a ``hub``, the database reads go through ``hub.shared_read`` so every
+    stream woken by the same burst (``since`` is the hub sequence at drain)
+    shares one query per folder instead of running its own.
+    """
+
+    def _read(key: tuple, fn, *args):
+        if hub is None:
+            return fn(*args)
+        return hub.shared_read(key, since, partial(fn, *args))
+
+    messages: list[tuple[str, dict]] = []
+    if any(payload is None for payload in payloads):
+        messages.append(("mailbox", {"type": "resync"}))
+        messages.append(("calendar", {"type": "calendar"}))
+
+    changes = [
+        change
+        for change in map(changes_q.parse_change, filter(None, payloads))
+        if change is not None
+    ]
+    for change in changes_q.merge_changes(changes):
+        if change["type"] == "calendar":
+            messages.append(("calendar", change))
+            continue
+
+        folder = change["folder"]
+        change["counters"] = await _read(
+            ("counters", folder), adb.get_folder_counters, folder
+        )
+        messages.append(("mailbox", change))
+
+        if change["type"] == "new" and change.get("uids"):
+            emails = await _read(
+                ("changed", folder, tuple(change["uids"])),
+                adb.get_changed_emails,
+                folder,
+                change["uids"],
+            )
+            unread = [_email_notification(e) for e in emails if e.get("is_unread")]
+            if unread:
+                messages.append(("notification", _notification(new_emails=unread)))
+    return messages
+
+
+@router.get("/api/notifications/stream")
+async def notification_stream(
+    request: Request, session: Session = Depends(require_auth)
+):
+    """Server-sent events for mailbox changes, new mail and calendar reminders.
+
+    Events: ``mailbox`` (new/flags/expunged per folder, with counters, or
+    resync), ``calendar`` (the calendar cache changed) and ``notification``
+    (new unread emails and due reminders). The stream holds no database
+    connection while idle.
+    """
+    hub = await adb.get_notification_hub()
+    user_id = session.user_id
+
+    async def gen():
+        sent_reminders: set[str] = set()
+        events: list[dict] = []
+        events_loaded_at: Optional[datetime] = None
+
+        with hub.subscription(changes_q.MAILBOX_CHANNEL) as sub:
+            while True:
+                now = datetime.now(timezone.utc)
+                if (
+                    events_loaded_at is None
+                    or now - events_loaded_at >= REMINDER_WINDOW / 2
+                ):
+                    events = await _upcoming_events(user_id, now)
+                    events_loaded_at = now
+
+                reminders = due_reminders(events, now, sent_reminders)
+                if reminders:
+                    yield _sse(
+                        "notification", _notification(calendar_reminders=reminders)
+                    )
+
+                if not await sub.wait(STREAM_KEEPALIVE_S):
+                    yield ": keepalive\n\n"
+                if await request.is_disconnected():
+                    break
+
+                payloads, since = sub.drain(), hub.sequence
+                for event, data in await change_messages(payloads, hub, since):
+                    if event == "calendar":
+                        events_loaded_at = None
+                    yield _sse(event, data)
+
+    return StreamingResponse(gen(), media_type="text/event-stream")
 
 
 @router.post("/api/notifications/subscribe")
@@ -1,15 +1,24 @@
 from fastapi import APIRouter, Request, Query, Depends
 from fastapi.responses import HTMLResponse
-from typing import Optional
+from typing import Any, Optional
 from datetime import datetime, timedelta
 import html
+import logging
 import os
-import httpx
 import json
 
-from workspace_secretary.web import database as db, templates, get_template_context
+from workspace_secretary.config import EmbeddingsConfig, load_config
+from workspace_secretary.engine.embeddings import create_embeddings_client
+from workspace_secretary.engine.query_cache import (
+    configure_query_cache,
+    embed_query_cached,
+)
+from workspace_secretary.web import async_database as adb, database as db
+from workspace_secretary.web import templates, get_template_context
 from workspace_secretary.web.auth import require_auth, Session
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 # In-memory saved searches (in production, store in DB or config)
@@ -53,34 +62,29 @@ def parse_search_operators(query: str) -> tuple[str, dict]:
     Supported operators:
     - from:email@example.com
     - to:email@example.com
-    - subject:keyword
+    - subject:keyword or subject:"quoted words"
     - has:attachment
     - attachment:filename.pdf
     - is:unread
     - is:read
     - is:starred
 
+    Everything else is returned as the full-text query, which the database
+    compiles with websearch_to_tsquery: "exact phrase", -excluded and
+    ``or`` keep their meaning and are answered from the search_tsv index.
+
     Returns: (plain_query, filters_dict)
     """
     import re
 
     filters = {}
-    remaining_parts = []
-
-    operators = {
-        "from": "from_addr",
-        "to": "to_addr",
-        "subject": "subject_contains",
-        "has": "has_type",
-        "is": "is_state",
-        "attachment": "attachment_filename",
-    }
 
-    pattern = r"(\w+):([^\s]+)"
+    # Only known operators are consumed, so "re:" or URLs stay searchable text
+    pattern = r'(?<!\S)(from|to|subject|has|is|attachment):("[^"]*"|\S+)'
 
-    for match in re.finditer(pattern, query):
+    for match in re.finditer(pattern, query, flags=re.IGNORECASE):
         operator = match.group(1).lower()
-        value = match.group(2)
+        value = match.group(2).strip('"')
 
         if operator == "from":
             filters["from_addr"] = value
@@ -101,59 +105,75 @@ def parse_search_operators(query: str) -> tuple[str, dict]:
             elif value == "starred":
                 filters["is_starred"] = True
 
-    plain_query = re.sub(pattern, "", query).strip()
+    plain_query = re.sub(pattern, "", query, flags=re.IGNORECASE).strip()
     plain_query = re.sub(r"\s+", " ", plain_query)
 
     return plain_query, filters
 
 
-async def get_embedding(text: str) -> Optional[list[float]]:
+def _env_embeddings_config(dimensions: int) -> Optional[EmbeddingsConfig]:
+    """Embeddings settings from EMBEDDINGS_* variables (web-only deployments)."""
     provider = os.environ.get("EMBEDDINGS_PROVIDER", "openai_compat")
-
     if provider == "cohere":
         api_key = os.environ.get("EMBEDDINGS_API_KEY") or os.environ.get(
             "COHERE_API_KEY"
         )
-        model = os.environ.get("EMBEDDINGS_MODEL", "embed-v4.0")
-        if not api_key:
-            return None
-        try:
-            import cohere
-
-            client = cohere.ClientV2(api_key=api_key)
-            response = client.embed(
-                texts=[text],
-                model=model,
-                input_type="search_query",
-                embedding_types=["float"],
-            )
-            return (
-                list(response.embeddings.float_[0])
-                if response.embeddings.float_
-                else None
-            )
-        except Exception:
-            return None
+        default_model = "embed-v4.0"
+    else:
+        api_key = os.environ.get("EMBEDDINGS_API_KEY", "")
+        default_model = "text-embedding-3-small"
+    if provider != "openai_compat" and not api_key:
+        return None
 
-    api_base = os.environ.get("EMBEDDINGS_API_BASE")
-    api_key = os.environ.get("EMBEDDINGS_API_KEY", "")
-    model = os.environ.get("EMBEDDINGS_MODEL", "text-embedding-3-small")
+    return EmbeddingsConfig.from_dict(
+        {
+            "enabled": True,
+            "provider": provider,
+            "endpoint": os.environ.get("EMBEDDINGS_API_BASE", ""),
+            "model": os.environ.get("EMBEDDINGS_MODEL", default_model),
+            "api_key": api_key,
+            "dimensions": dimensions,
+        }
+    )
 
-    if not api_base:
-        return None
+
+_embeddings_client: Any = None
+_embeddings_client_loaded = False
+
+
+def get_embeddings_client() -> Any:
+    """Query embeddings client, built once per process.
+
+    Uses ``database.embeddings`` from config.yaml, falling back to the
+    EMBEDDINGS_* environment variables.
+    """
+    global _embeddings_client, _embeddings_client_loaded
+    if _embeddings_client_loaded:
+        return _embeddings_client
+    _embeddings_client_loaded = True
 
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(
-                f"{api_base}/embeddings",
-                headers={"Authorization": f"Bearer {api_key}"},
-                json={"model": model, "input": text},
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["data"][0]["embedding"]
+        embeddings_config = load_config().database.embeddings
+        if not embeddings_config.enabled:
+            embeddings_config = _env_embeddings_config(embeddings_config.dimensions)
+        if embeddings_config:
+            _embeddings_client = create_embeddings_client(embeddings_config)
+            configure_query_cache(embeddings_config, db.get_db())
+    except Exception as e:
+        logger.warning(f"Embeddings client unavailable for search: {e}")
+        _embeddings_client = None
+    return _embeddings_client
+
+
+async def get_embedding(text: str) -> Optional[list[float]]:
+    client = get_embeddings_client()
+    if client is None:
+        return None
+    try:
+        result = await embed_query_cached(client, text)
     except Exception:
         return None
+    return result.embedding or None
 
 
 @router.get("/search", response_class=HTMLResponse)
@@ -171,8 +191,8 @@ async def search(
     is_unread: Optional[bool] = Query(None),
     session: Session = Depends(require_auth),
 ):
-    supports_semantic = db.has_embeddings()
-    folders = db.get_folders()
+    supports_semantic = await adb.has_embeddings()
+    folders = await adb.get_folders()
 
     # Parse search operators from query string
     parsed_query, parsed_filters = parse_search_operators(q)
@@ -221,16 +241,24 @@ async def search(
         )
 
     results_raw = []
-    if mode == "semantic" and supports_semantic and parsed_query.strip():
+    if mode in ("semantic", "hybrid") and supports_semantic and parsed_query.strip():
         embedding = await get_embedding(parsed_query)
-        if embedding:
-            results_raw = db.semantic_search_advanced(embedding, folder, limit, filters)
+        if embedding and mode == "hybrid":
+            results_raw = await adb.hybrid_search(
+                parsed_query, embedding, folder, limit, filters
+            )
+        elif embedding:
+            results_raw = await adb.semantic_search_advanced(
+                embedding, folder, limit, filters
+            )
         else:
-            results_raw = db.search_emails_advanced(
+            results_raw = await adb.search_emails_advanced(
                 parsed_query, folder, limit, filters
             )
     else:
-        results_raw = db.search_emails_advanced(parsed_query, folder, limit, filters)
+        results_raw = await adb.search_emails_advanced(
+            parsed_query, folder, limit, filters
+        )
 
     results = [
         {
@@ -325,7 +353,7 @@ async def search_suggestions(
     if len(q) < 2:
         return HTMLResponse("")
 
-    suggestions = db.get_search_suggestions(q)
+    suggestions = await adb.get_search_suggestions(q)
     if not suggestions:
         return HTMLResponse("")
 
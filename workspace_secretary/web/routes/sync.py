@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
 from psycopg.rows import dict_row
 
-from workspace_secretary.web import database as db
+from workspace_secretary.web import async_database as adb
 from workspace_secretary.web.auth import Session, require_auth
 
 router = APIRouter()
@@ -17,9 +17,9 @@ async def get_sync_status(
     error_limit: int = Query(20, ge=1, le=200),
 ):
     try:
-        with db.get_conn() as conn:
-            with conn.cursor(row_factory=dict_row) as cur:
-                cur.execute(
+        async with adb.get_conn("sync_status") as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(
                     """
                     SELECT folder, uidvalidity, uidnext, highestmodseq, last_sync
                     FROM folder_state
@@ -28,9 +28,9 @@ async def get_sync_status(
                     """,
                     (folder_limit,),
                 )
-                folders = cur.fetchall()
+                folders = await cur.fetchall()
 
-                cur.execute(
+                await cur.execute(
                     """
                     SELECT id, folder, email_uid, error_type, error_message, created_at, resolved_at
                     FROM sync_errors
@@ -39,9 +39,9 @@ async def get_sync_status(
                     """,
                     (error_limit,),
                 )
-                errors = cur.fetchall()
+                errors = await cur.fetchall()
 
-                cur.execute(
+                await cur.execute(
                     """
                     SELECT component, metric, value, recorded_at
                     FROM system_health
@@ -49,7 +49,7 @@ async def get_sync_status(
                     LIMIT 50
                     """
                 )
-                recent_metrics = cur.fetchall()
+                recent_metrics = await cur.fetchall()
 
         last_sync = None
         if folders:
@@ -101,9 +101,9 @@ async def get_activity_log(
     include_email: bool = Query(False),
 ):
     try:
-        with db.get_conn() as conn:
-            with conn.cursor(row_factory=dict_row) as cur:
-                cur.execute(
+        async with adb.get_conn("activity_log") as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(
                     """
                     SELECT id, email_uid, email_folder, action, status, error, created_at, updated_at
                     FROM mutation_journal
@@ -112,7 +112,7 @@ async def get_activity_log(
                     """,
                     (limit,),
                 )
-                items = cur.fetchall()
+                items = await cur.fetchall()
 
                 if include_email and items:
                     keys = {(i.get("email_uid"), i.get("email_folder")) for i in items}
@@ -124,7 +124,7 @@ async def get_activity_log(
                     email_map: dict[tuple[int, str], dict] = {}
                     if uids and len(set(folders)) == 1:
                         folder = folders[0]
-                        cur.execute(
+                        await cur.execute(
                             """
                             SELECT uid, folder, from_addr, subject, date
                             FROM emails
@@ -132,13 +132,13 @@ async def get_activity_log(
                             """,
                             (folder, uids),
                         )
-                        for e in cur.fetchall():
+                        for e in await cur.fetchall():
                             email_map[(e["uid"], e["folder"])] = e
                     else:
                         for uid, folder in keys:
                             if uid is None or folder is None:
                                 continue
-                            cur.execute(
+                            await cur.execute(
                                 """
                                 SELECT uid, folder, from_addr, subject, date
                                 FROM emails
@@ -146,7 +146,7 @@ async def get_activity_log(
                                 """,
                                 (uid, folder),
                             )
-                            e = cur.fetchone()
+                            e = await cur.fetchone()
                             if e:
                                 email_map[(uid, folder)] = e
 
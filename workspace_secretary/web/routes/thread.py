@@ -1,13 +1,19 @@
 from fastapi import APIRouter, Request, HTTPException, Depends, Query, BackgroundTasks
 from fastapi.responses import HTMLResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from datetime import datetime
 import html
 import re
 import httpx
 import logging
 
-from workspace_secretary.web import database as db, templates, get_template_context
+from workspace_secretary.web import (
+    async_database as adb,
+    templates,
+    get_template_context,
+)
 from workspace_secretary.web.auth import require_auth, Session
+from workspace_secretary.web import engine_client
 from workspace_secretary.web.engine_client import get_engine_url
 
 router = APIRouter()
@@ -30,6 +36,24 @@ async def _mark_read_background(uid: int, folder: str) -> None:
         logger.debug(f"Auto mark-read failed for {folder}/{uid}: {e}")
 
 
+async def _hydrate_missing_bodies(emails: list[dict]) -> bool:
+    """Ask the engine to fetch bodies for header-first emails. Returns True if any."""
+    pending: dict[str, list[int]] = {}
+    for e in emails:
+        if e.get("body_hydrated") is False:
+            pending.setdefault(e["folder"], []).append(e["uid"])
+
+    hydrated = False
+    for pending_folder, uids in pending.items():
+        try:
+            await engine_client.hydrate_emails(pending_folder, uids)
+            hydrated = True
+        except HTTPException as e:
+            # Fall back to the stored preview rather than failing the page
+            logger.debug(f"Body hydration failed for {pending_folder}: {e.detail}")
+    return hydrated
+
+
 def format_datetime(date_val) -> str:
     if not date_val:
         return ""
@@ -159,7 +183,9 @@ async def thread_view(
     load_images: bool = Query(False),
     session: Session = Depends(require_auth),
 ):
-    email = db.get_email(uid, folder)
+    # Email, conversation and navigation neighbours in one round trip
+    view = await adb.get_thread_view(uid, folder, unread_only)
+    email = view["email"]
     if not email:
         raise HTTPException(status_code=404, detail="Email not found")
 
@@ -175,12 +201,11 @@ async def thread_view(
     else:
         is_starred = "\\Starred" in (labels or [])
 
-    thread_emails = db.get_thread(uid, folder)
-    if not thread_emails:
-        thread_emails = [email]
+    thread_emails = view["thread"]
+    if await _hydrate_missing_bodies(thread_emails):
+        thread_emails = await adb.get_thread(uid, folder) or [email]
 
-    # Get neighbors for navigation
-    neighbors = db.get_neighbor_uids(folder, uid, unread_only)
+    neighbors = view["neighbors"]
 
     messages = []
     calendar_invite = None
@@ -235,32 +260,74 @@ async def thread_view(
     )
 
 
+_FORWARDED_REQUEST_HEADERS = ("range", "if-range", "if-none-match")
+_FORWARDED_RESPONSE_HEADERS = (
+    "content-type",
+    "content-disposition",
+    "content-length",
+    "content-range",
+    "accept-ranges",
+    "etag",
+    "cache-control",
+)
+
+
 @router.get("/api/attachment/{folder}/{uid}/{filename}")
 async def download_attachment(
-    folder: str, uid: int, filename: str, session: Session = Depends(require_auth)
+    request: Request,
+    folder: str,
+    uid: int,
+    filename: str,
+    session: Session = Depends(require_auth),
 ):
-    """Proxy attachment downloads from the engine API."""
+    """Proxy attachment downloads from the engine API.
+
+    The body is streamed through and Range/conditional headers are forwarded,
+    so previews and resumed downloads are served from the engine's blob store.
+    """
     engine_url = get_engine_url()
     url = f"{engine_url}/api/email/{folder}/{uid}/attachment/{filename}"
+    forward = {
+        name: request.headers[name]
+        for name in _FORWARDED_REQUEST_HEADERS
+        if name in request.headers
+    }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, timeout=30.0)
-
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=response.status_code, detail="Attachment not found"
-            )
-
-        return StreamingResponse(
-            iter([response.content]),
-            media_type=response.headers.get("Content-Type", "application/octet-stream"),
-            headers={
-                "Content-Disposition": response.headers.get(
-                    "Content-Disposition", f'attachment; filename="{filename}"'
-                )
-            },
+    client = httpx.AsyncClient()
+    try:
+        response = await client.send(
+            client.build_request("GET", url, headers=forward, timeout=30.0),
+            stream=True,
+        )
+    except Exception:
+        await client.aclose()
+        raise
+
+    async def _close():
+        await response.aclose()
+        await client.aclose()
+
+    if response.status_code not in (200, 206, 304, 416):
+        await _close()
+        raise HTTPException(
+            status_code=response.status_code, detail="Attachment not found"
         )
 
+    headers = {
+        name: response.headers[name]
+        for name in _FORWARDED_RESPONSE_HEADERS
+        if name in response.headers
+    }
+    headers.setdefault("content-disposition", f'attachment; filename="{filename}"')
+
+    return StreamingResponse(
+        response.aiter_raw(),
+        status_code=response.status_code,
+        media_type=response.headers.get("Content-Type", "application/octet-stream"),
+        headers=headers,
+        background=BackgroundTask(_close),
+    )
+
 
 @router.get("/api/attachment/{folder}/{uid}/download-all")
 async def download_all_attachments(
@@ -273,7 +340,7 @@ async def download_all_attachments(
 
     engine_url = get_engine_url()
 
-    email = db.get_email(uid, folder)
+    email = await adb.get_email(uid, folder)
     if not email or not email.get("attachment_filenames"):
         raise HTTPException(status_code=404, detail="No attachments found")
 